@@ -30,6 +30,7 @@ SYSTEM_PERMISSIONS = [
 
     # Report module
     {"code": "REPORT_VIEW", "module": "Report", "description": "View Reports"},
+    {"code": "REPORT_REGENERATE", "module": "Report", "description": "Regenerate Reports"},
 
 
     ## Job Mapping module
@@ -1,4 +1,7 @@
-from app.database import ROLES_COLLECTION,get_database
+from app.database import ROLES_COLLECTION,get_database, apply_dashboard_counter_changes
+from app.utils.dashboard_counters import COUNTER_FIELDS
+from app.utils.org_tree_cache import invalidate_org_tree
+from pymongo import ReturnDocument
 from datetime import datetime, timezone
 import logging
 
@@ -36,6 +39,7 @@ async def create_role(
         print(30*"-")
 
         data= await db[ROLES_COLLECTION].insert_one(role_data)
+        await apply_dashboard_counter_changes("role", None, role_data)
         logger.info(f"Created role: {role_name}")
         return str(data.inserted_id)
     
@@ -84,15 +88,21 @@ async def update_role(
             update_data["permissions"] = permissions
 
         # Update the role
-        result = await db[ROLES_COLLECTION].update_one(
+        previous_role = await db[ROLES_COLLECTION].find_one_and_update(
             {"_id": ObjectId(role_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection=COUNTER_FIELDS["role"],
+            return_document=ReturnDocument.BEFORE
         )
 
-        if result.modified_count == 0:
+        if previous_role is None:
             logger.warning(f"No changes made to role {role_id}")
             return {"message": "No changes made"}
 
+        await apply_dashboard_counter_changes("role", previous_role, {**previous_role, **update_data})
+        # Role names are shown in the org tree
+        invalidate_org_tree()
+
         logger.info(f"Updated role: {role_id}")
         return {"message": "Role updated successfully"}
     
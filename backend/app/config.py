@@ -9,11 +9,41 @@ class Settings(BaseSettings):
     # =========================================
     # Code Execution Provider
     # =========================================
-    # Options: "judge0" or "piston"
+    # Options: "judge0" or "local"
+    # ("local" runs python/javascript/java/cpp on this host; other languages still use Judge0)
     CODE_EXECUTOR_PROVIDER: str = "judge0"
 
     # Judge0 Configuration
     JUDGE0_API_URL: str = "https://ce.judge0.com"
+    JUDGE0_MAX_CONNECTIONS: int = 20
+    JUDGE0_REQUEST_TIMEOUT_SECONDS: float = 30.0
+    # Judge0's default MAX_SUBMISSION_BATCH_SIZE
+    JUDGE0_BATCH_SIZE: int = 20
+    # Concurrent submissions in flight (whole process / one candidate)
+    JUDGE0_GLOBAL_CONCURRENCY: int = 16
+    JUDGE0_PER_CANDIDATE_CONCURRENCY: int = 2
+    # Adaptive polling: initial interval, backoff factor, cap and overall deadline
+    JUDGE0_POLL_INITIAL_SECONDS: float = 0.2
+    JUDGE0_POLL_BACKOFF: float = 1.5
+    JUDGE0_POLL_MAX_SECONDS: float = 2.0
+    JUDGE0_POLL_DEADLINE_SECONDS: float = 30.0
+    # Programs up to this many characters use wait=true instead of polling
+    JUDGE0_WAIT_SOURCE_LIMIT: int = 4000
+
+    # Local executor (CODE_EXECUTOR_PROVIDER="local")
+    LOCAL_EXECUTOR_WORK_DIR: str = ""
+    LOCAL_EXECUTOR_TIME_LIMIT_SECONDS: int = 10
+    LOCAL_EXECUTOR_MEMORY_LIMIT_MB: int = 512
+    LOCAL_EXECUTOR_OUTPUT_LIMIT_BYTES: int = 1024 * 1024
+    LOCAL_EXECUTOR_COMPILE_TIMEOUT_SECONDS: int = 30
+    # Memory for g++ / javac, which run under the same sandbox as programs
+    LOCAL_EXECUTOR_COMPILE_MEMORY_LIMIT_MB: int = 1024
+    # 0 = one concurrent program per CPU
+    LOCAL_EXECUTOR_CONCURRENCY: int = 0
+    # Pre-spawned Python / Node processes kept ready per language
+    LOCAL_EXECUTOR_WARM_WORKERS: int = 4
+    # Compiled Java / C++ builds kept on disk (by source hash)
+    LOCAL_EXECUTOR_ARTIFACT_CACHE_SIZE: int = 256
 
     # Piiston Configuration (optional fallback)
     # PIiSTON_API_URL: str = ""
@@ -26,6 +56,89 @@ class Settings(BaseSettings):
     DB_NAME: str = "interview_assistant"
 
 
+    # =========================================
+    # Report Pipeline
+    # =========================================
+    # Concurrent report builds / processes rendering PDFs
+    REPORT_PIPELINE_WORKERS: int = 2
+    REPORT_PDF_PROCESSES: int = 2
+    # A worker claims a pending report for this long (renewed while it builds); reports whose
+    # claim expired (their worker died) are picked up again by any worker, checked this often
+    REPORT_BUILD_LEASE_SECONDS: int = 300
+
+
+    # =========================================
+    # Exports
+    # =========================================
+    # Documents read per Mongo batch / rows per Parquet row group
+    EXPORT_BATCH_SIZE: int = 1000
+
+
+    # =========================================
+    # Dashboard Counters
+    # =========================================
+    # How often the counters are rebuilt from the source collections
+    DASHBOARD_COUNTERS_RECONCILE_SECONDS: int = 3600
+    # Hourly trend buckets expire after this many days (daily buckets are kept)
+    METRIC_ROLLUP_HOURLY_RETENTION_DAYS: int = 35
+
+
+    # =========================================
+    # Organization Tree
+    # =========================================
+    # Max age of the cached user hierarchy (writes in this process invalidate it at once)
+    ORG_TREE_CACHE_SECONDS: int = 300
+
+
+    # =========================================
+    # Job Access
+    # =========================================
+    # Max age of a user's cached accessible job ids (assignments in this process invalidate them at once)
+    JOB_ACCESS_CACHE_SECONDS: int = 60
+
+
+    # =========================================
+    # Proctoring
+    # =========================================
+    # Detection batches run at once on frames uploaded by candidates (shared by all sessions)
+    PROCTORING_WORKERS: int = 2
+    # Frames from different sessions analyzed together, and how long a frame waits for a batch to fill
+    PROCTORING_BATCH_SIZE: int = 16
+    PROCTORING_BATCH_WAIT_MS: float = 30
+    # Phone detection runs every Nth frame, or sooner on motion / face-count changes
+    PROCTORING_YOLO_EVERY_N_FRAMES: int = 5
+    PROCTORING_MOTION_THRESHOLD: float = 12.0
+    # Pre-bundled model files, relative to the backend directory (python -m app.services.proctoring_models)
+    PROCTORING_MODELS_DIR: str = "models"
+    # Download a missing model file on first use instead of failing
+    PROCTORING_ALLOW_MODEL_DOWNLOAD: bool = True
+    # Load the models in the background at startup rather than on the first frame
+    PROCTORING_WARMUP: bool = True
+    # Phone detector: ultralytics (PyTorch), onnxruntime or openvino
+    PROCTORING_DETECTOR_BACKEND: str = "ultralytics"
+    PROCTORING_DETECTOR_MODEL: str = "yolov8n.pt"
+    # Dynamic INT8 quantization of the ONNX export (onnxruntime backend)
+    PROCTORING_DETECTOR_INT8: bool = False
+    # Largest input side; smaller crops run at their own stride-aligned size
+    PROCTORING_DETECTOR_IMGSZ: int = 320
+    # COCO classes detected (person, cell phone) and the minimum confidence
+    PROCTORING_DETECTOR_CLASSES: str = "0,67"
+    PROCTORING_DETECTOR_CONFIDENCE: float = 0.25
+    # Intra-op threads for the ONNX backends (0 = runtime default)
+    PROCTORING_DETECTOR_THREADS: int = 0
+    # Frames per second analyzed per session; faster uploads are dropped
+    PROCTORING_MAX_FPS: float = 2.0
+    # Larger uploads are rejected (clients send downscaled JPEGs)
+    PROCTORING_MAX_FRAME_BYTES: int = 262144
+    # Unix socket(s) of dedicated model worker processes, comma-separated (python -m app.services.proctoring_worker);
+    # empty runs inference inside each API process
+    PROCTORING_WORKER_SOCKET: str = ""
+    # Seconds an API process waits for the worker to analyze a frame
+    PROCTORING_WORKER_TIMEOUT_SECONDS: float = 10
+    # The worker forgets a session's detection cadence after this long without frames
+    PROCTORING_WORKER_SESSION_IDLE_SECONDS: int = 300
+
+
     # =========================================
     # AI API Keys
     # =========================================
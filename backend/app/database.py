@@ -1,15 +1,21 @@
 import re
+import asyncio
+import hashlib
 from motor.motor_asyncio import AsyncIOMotorClient
 from .config import settings
 from gridfs import GridFS
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from .utils.logger import get_logger
-from app.utils.parse_mcqs import parse_mcqs
+from app.utils.parse_mcqs import parse_mcqs, is_mcq_answer_correct
+from app.utils.mcq_delivery_cache import notify_mcqs_saved
+from app.utils.org_tree_cache import invalidate_org_tree
+from app.utils import job_access_cache
+from app.utils import dashboard_counters, metric_rollups, job_search, omnibox_index
 import uuid
-from bson import Binary
-from typing import List, Dict
+from typing import List, Dict, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne, ReplaceOne
 from app.utils.password_handler import hash_password
 from app.utils.validate_password_strength import validate_password_strength
 from app.utils.coding_question_analyser import get_llm_coding_score
@@ -26,6 +32,10 @@ EMAIL_TEMPLATES_COLLECTION = "email_templates"
 JOB_DESCRIPTIONS_COLLECTION = "job_descriptions"
 JOB_POSTINGS_COLLECTION = "job_postings"
 CODING_QUESTIONS_COLLECTION = "coding_questions"
+CODING_QUESTION_BANK_COLLECTION = "coding_question_bank"
+COUNTERS_COLLECTION = "counters"
+# GridFS bucket holding candidate report PDFs
+REPORT_PDFS_BUCKET = "report_pdfs"
 OTP_COLLECTION = "otp_collection"
 CANDIDATES_REPORTS_COLLECTION = "candidates_reports"
 SCREENING_COLLECTION = "resume_screening"
@@ -33,6 +43,12 @@ ROLES_COLLECTION = "roles"
 PERMISSIONS_COLLECTION = "permissions"
 ROLE_PERMISSIONS_COLLECTION = "role_permissions"
 USERS_COLLECTION = "users"
+# Materialized dashboard counts, one document per scope (see utils/dashboard_counters.py)
+DASHBOARD_COUNTERS_COLLECTION = "dashboard_counters"
+# Hourly/daily trend buckets per scope (see utils/metric_rollups.py)
+METRIC_ROLLUPS_COLLECTION = "metric_rollups"
+# Global search entries, one per interview/screening/report/job (see utils/omnibox_index.py)
+SEARCH_INDEX_COLLECTION = "search_index"
 
 # ROLES_COLLECTION = "roles"
 # PERMISSIONS_COLLECTION = "permissions"
@@ -79,6 +95,7 @@ async def connect_to_mongo():
             JOB_DESCRIPTIONS_COLLECTION,
             JOB_POSTINGS_COLLECTION,
             CODING_QUESTIONS_COLLECTION,
+            CODING_QUESTION_BANK_COLLECTION,
             OTP_COLLECTION,
             CANDIDATES_REPORTS_COLLECTION,
             SCREENING_COLLECTION,
@@ -102,12 +119,153 @@ async def connect_to_mongo():
             unique=True
         )
 
+        # Question bank: sampled by difficulty/topic, ids and content are unique
+        await db[CODING_QUESTION_BANK_COLLECTION].create_index(
+            [("difficulty", 1), ("topic", 1)]
+        )
+
+        await db[CODING_QUESTION_BANK_COLLECTION].create_index(
+            [("question_id", 1)],
+            unique=True
+        )
+
+        await db[CODING_QUESTION_BANK_COLLECTION].create_index(
+            [("fingerprint", 1)],
+            unique=True
+        )
+
+        # Keyset pagination: each list is ordered by (sort key, _id)
+        await db[SCHEDULED_INTERVIEWS_COLLECTION].create_index(
+            [("created_by", 1), ("created_at", -1), ("_id", -1)]
+        )
+
+        await db[JOB_POSTINGS_COLLECTION].create_index(
+            [("created_at", -1), ("_id", -1)]
+        )
+
+        await db[JOB_POSTINGS_COLLECTION].create_index(
+            [("job_title", 1), ("_id", 1)]
+        )
+
+        await db[CANDIDATES_REPORTS_COLLECTION].create_index(
+            [("job_posting_id", 1), ("_id", -1)]
+        )
+
+        # Report pipeline: pending reports whose build claim expired
+        await db[CANDIDATES_REPORTS_COLLECTION].create_index(
+            [("report_status", 1), ("report_lease_expires_at", 1)]
+        )
+
+        await db[SCREENING_COLLECTION].create_index(
+            [("job_posting_id", 1), ("_id", 1)]
+        )
+
+        # Statistics pipelines: per-job interview counts ($lookup) and
+        # per-creator/job status breakdowns are answered from these indexes
+        await db[SCHEDULED_INTERVIEWS_COLLECTION].create_index(
+            [("job_posting_id", 1), ("status", 1)]
+        )
+
+        await db[SCHEDULED_INTERVIEWS_COLLECTION].create_index(
+            [("created_by", 1), ("job_posting_id", 1), ("status", 1)]
+        )
+
+        await db["job_assignments"].create_index(
+            [("user_id", 1), ("status", 1)]
+        )
+
+        # Trend charts read a contiguous bucket range for one scope;
+        # hourly buckets carry expires_at and are dropped by the TTL monitor
+        await db[METRIC_ROLLUPS_COLLECTION].create_index(
+            [("scope", 1), ("granularity", 1), ("bucket", 1)]
+        )
+
+        await db[METRIC_ROLLUPS_COLLECTION].create_index(
+            [("expires_at", 1)],
+            expireAfterSeconds=0
+        )
+
+        # Org tree: direct reports are paged by (reporting_manager, _id) and
+        # $graphLookup walks reporting_manager -> org_key (the string form of _id,
+        # since reporting_manager stores ids as strings)
+        await db[USERS_COLLECTION].create_index(
+            [("reporting_manager", 1), ("_id", 1)]
+        )
+        await backfill_user_org_keys()
+
+        # Job posting search: every query word is looked up in search_terms.t
+        await db[JOB_POSTINGS_COLLECTION].create_index(
+            [("search_terms.t", 1)]
+        )
+        await rebuild_job_search_terms()
+
+        # Omnibox: one index range per (kind, word), already in recency order
+        await db[SEARCH_INDEX_COLLECTION].create_index(
+            [("kind", 1), ("grams", 1), ("updated_at", -1)]
+        )
+
+        # Job access: visible_to holds the creator and every actively assigned
+        # user, so access-controlled job lists are one equality on a multikey index
+        await db[JOB_POSTINGS_COLLECTION].create_index(
+            [("visible_to", 1), ("created_at", -1), ("_id", -1)]
+        )
+        await db[JOB_POSTINGS_COLLECTION].create_index(
+            [("visible_to", 1), ("job_title", 1), ("_id", 1)]
+        )
+        await backfill_job_visibility()
+
 
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         logger.error("Please ensure MongoDB is running and accessible")
         raise
 
+def with_org_key(user_doc: dict) -> dict:
+    """Give a new user document its _id up front so org_key can be stored with the insert."""
+    user_doc.setdefault("_id", ObjectId())
+    user_doc["org_key"] = str(user_doc["_id"])
+    return user_doc
+
+
+async def backfill_user_org_keys() -> int:
+    """Set org_key on users created before the field existed. Returns the number updated."""
+    db = get_database()
+    result = await db[USERS_COLLECTION].update_many(
+        {"org_key": {"$exists": False}},
+        [{"$set": {"org_key": {"$toString": "$_id"}}}]
+    )
+    if result.modified_count:
+        logger.info(f"Backfilled org_key on {result.modified_count} users")
+        invalidate_org_tree()
+    return result.modified_count
+
+
+async def rebuild_job_search_terms(batch_size: int = 500) -> int:
+    """
+    Build search_terms for job postings that have none or were indexed with an
+    older SEARCH_TERMS_VERSION. Returns the number of postings updated.
+    """
+    db = get_database()
+    fields = {field: 1 for field in job_search.FIELD_WEIGHTS}
+    cursor = db[JOB_POSTINGS_COLLECTION].find(
+        {"search_terms_version": {"$ne": job_search.SEARCH_TERMS_VERSION}}, fields
+    )
+    updated = 0
+    operations = []
+    async for job in cursor:
+        operations.append(UpdateOne({"_id": job["_id"]}, {"$set": job_search.search_fields(job)}))
+        if len(operations) == batch_size:
+            await db[JOB_POSTINGS_COLLECTION].bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        await db[JOB_POSTINGS_COLLECTION].bulk_write(operations, ordered=False)
+        updated += len(operations)
+    if updated:
+        logger.info(f"Rebuilt search terms for {updated} job postings")
+    return updated
+
+
 async def close_mongo_connection():
     global client
     if client:
@@ -151,13 +309,17 @@ async def delete_user(user_id: str):
     try:
         db = get_database()
 
-        result = await db[USERS_COLLECTION].delete_one(
-            {"_id": ObjectId(user_id)}
+        deleted_user = await db[USERS_COLLECTION].find_one_and_delete(
+            {"_id": ObjectId(user_id)},
+            projection=dashboard_counters.COUNTER_FIELDS["user"]
         )
 
-        if result.deleted_count == 0:
+        if deleted_user is None:
             raise HTTPException(status_code=404, detail="User not found")
 
+        await apply_dashboard_counter_changes("user", deleted_user, None)
+        invalidate_org_tree()
+
         logger.info(f"User deleted successfully: {user_id}")
         return True
 
@@ -296,9 +458,12 @@ async def get_jd_from_db(candidate_email: str) -> bytes:
 
 
 
-def save_generated_mcqs(interview_id: str, candidate_email: str, mcqs_text: str) -> bool:
+async def save_generated_mcqs(interview_id: str, candidate_email: str, mcqs_text: str) -> bool:
     """
     Save MCQs with unique question_id for easier updates later.
+
+    Each save bumps the document's "version" (used as the candidate ETag) and
+    notifies long-poll requests waiting for this interview's questions.
     """
     try:
         logger.info(f"Saving MCQ's for interview ID: {interview_id}")
@@ -320,16 +485,20 @@ def save_generated_mcqs(interview_id: str, candidate_email: str, mcqs_text: str)
             })
 
         # Use update_one with upsert=True to override existing MCQs
-        db[MCQS_COLLECTION].update_one(
+        await db[MCQS_COLLECTION].update_one(
             {"interview_id": interview_id},
-            {"$set": {
-                "candidate_email": candidate_email,
-                "mcqs_text": structured_mcqs,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }},
+            {
+                "$set": {
+                    "candidate_email": candidate_email,
+                    "mcqs_text": structured_mcqs,
+                    "created_at": datetime.utcnow(),
+                    "updated_at": datetime.utcnow()
+                },
+                "$inc": {"version": 1}
+            },
             upsert=True
         )
+        notify_mcqs_saved(interview_id)
         return True
     except Exception as e:
         logger.error(f"Error saving generated MCQs: {e}")
@@ -368,6 +537,112 @@ async def save_candidate_answer(interview_id: str, question_id: int, candidate_a
         return False
 
 
+async def submit_candidate_mcq_answers(interview_id: str, answers: Dict[int, str]) -> Dict:
+    """
+    Score and persist all of a candidate's MCQ answers in a single write.
+
+    Steps:
+    1. Read the stored questions once (only question_id, answer and options).
+    2. Compute correctness server-side against the stored answer.
+    3. Write every answer with one update_one using arrayFilters, so the whole
+       submission is applied atomically on the mcqs document. The update only
+       matches while every answered question is still stored.
+    4. Only when every submitted answer was saved, move the interview to
+       mcq_completed with one conditional update (the status lives in another
+       collection, so this is a second write that follows the saved answers).
+
+    :param interview_id: The ID of the interview being submitted.
+    :param answers: Mapping of question_id -> selected answer text.
+    :return: Dict with saved/matched counts, score and whether the status changed.
+    """
+    try:
+        db = get_database()
+        record = await db[MCQS_COLLECTION].find_one(
+            {"interview_id": interview_id},
+            {"mcqs_text.question_id": 1, "mcqs_text.answer": 1, "mcqs_text.options": 1}
+        )
+        if not record:
+            logger.warning(f"No MCQs found for interview_id={interview_id}")
+            return {"saved": 0, "matched": 0, "total_score": 0, "max_score": 0, "status_updated": False}
+
+        stored_questions = {
+            mcq.get("question_id"): mcq for mcq in record.get("mcqs_text", [])
+        }
+        submitted_at = datetime.utcnow()
+
+        set_fields = {}
+        array_filters = []
+        total_score = 0
+        for idx, (question_id, selected_answer) in enumerate(answers.items()):
+            stored = stored_questions.get(question_id)
+            if stored is None:
+                logger.warning(f"Ignoring answer for unknown question_id={question_id} (interview_id={interview_id})")
+                continue
+
+            is_correct = is_mcq_answer_correct(selected_answer, stored.get("answer", ""), stored.get("options", []))
+            total_score += int(is_correct)
+
+            ident = f"q{idx}"
+            set_fields[f"mcqs_text.$[{ident}].candidate_answer"] = selected_answer
+            set_fields[f"mcqs_text.$[{ident}].is_correct"] = is_correct
+            set_fields[f"mcqs_text.$[{ident}].submitted_at"] = submitted_at
+            array_filters.append({f"{ident}.question_id": question_id})
+
+        max_score = len(stored_questions)
+        set_fields.update({
+            "total_score": total_score,
+            "max_score": max_score,
+            "submitted_at": submitted_at,
+            "updated_at": submitted_at
+        })
+
+        answered_ids = [list(array_filter.values())[0] for array_filter in array_filters]
+        answers_filter = {"interview_id": interview_id}
+        if answered_ids:
+            answers_filter["mcqs_text.question_id"] = {"$all": answered_ids}
+        update = await db[MCQS_COLLECTION].update_one(
+            answers_filter,
+            {"$set": set_fields},
+            array_filters=array_filters or None
+        )
+        saved = len(array_filters) if update.matched_count else 0
+
+        previous_interview = None
+        if update.matched_count and saved == len(answers):
+            # Only advance the status forward; never move a completed interview back
+            previous_interview = await db[SCHEDULED_INTERVIEWS_COLLECTION].find_one_and_update(
+                {"_id": ObjectId(interview_id), "status": {"$nin": ["mcq_completed", "completed"]}},
+                {"$set": {"status": "mcq_completed", "updated_at": datetime.now(timezone.utc)}},
+                projection=dashboard_counters.COUNTER_FIELDS["interview"],
+                return_document=ReturnDocument.BEFORE
+            )
+        else:
+            logger.warning(
+                f"Saved {saved} of {len(answers)} MCQ answers for interview_id={interview_id}; "
+                f"status left unchanged"
+            )
+        if previous_interview is not None:
+            await apply_dashboard_counter_changes(
+                "interview", previous_interview, {**previous_interview, "status": "mcq_completed"}
+            )
+
+        logger.info(
+            f"Saved {saved} MCQ answers for interview_id={interview_id} "
+            f"(score {total_score}/{max_score})"
+        )
+        return {
+            "saved": saved,
+            "matched": len(answers),
+            "total_score": total_score,
+            "max_score": max_score,
+            "status_updated": previous_interview is not None
+        }
+
+    except Exception as e:
+        logger.error(f"Error submitting candidate MCQ answers for interview_id={interview_id}: {e}")
+        raise RuntimeError(f"Error in submit_candidate_mcq_answers: {e}")
+
+
 # Voice Interview Session Functions
 
 async def create_voice_session(interview_id: str, candidate_id: str) -> dict:
@@ -573,6 +848,88 @@ async def save_coding_questions(questions, interview_id: str) -> str:
     logger.info(f"Saved coding questions for interview_id={interview_id}")
     return str(result.inserted_id)
 
+async def get_next_sequence(name: str, count: int = 1) -> int:
+    """
+    Atomically reserve `count` ids from a named counter and return the first one.
+    Used for integer ids that must never collide (e.g. coding question ids).
+    """
+    try:
+        db = get_database()
+        counter = await db[COUNTERS_COLLECTION].find_one_and_update(
+            {"_id": name},
+            {"$inc": {"value": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["value"] - count + 1
+    except Exception as e:
+        logger.error(f"Error reserving ids from counter {name}: {e}")
+        raise RuntimeError(f"Error in get_next_sequence: {e}")
+
+
+async def save_bank_question(question: Dict) -> int:
+    """
+    Insert a validated question into the coding question bank.
+
+    Returns:
+        The question_id assigned to it, or 0 if an identical question already exists
+    """
+    db = get_database()
+    if await db[CODING_QUESTION_BANK_COLLECTION].find_one({"fingerprint": question["fingerprint"]}, {"_id": 1}):
+        return 0
+
+    question_id = await get_next_sequence("coding_question_id")
+    document = {
+        **question,
+        "question_id": question_id,
+        "created_at": datetime.utcnow()
+    }
+    try:
+        await db[CODING_QUESTION_BANK_COLLECTION].insert_one(document)
+    except Exception as e:
+        # Lost a race with an identical question
+        if "duplicate key" in str(e):
+            return 0
+        raise RuntimeError(f"Error in save_bank_question: {e}")
+    return question_id
+
+
+async def sample_bank_questions(difficulty: str, count: int) -> List[Dict]:
+    """
+    Pick up to `count` bank questions of a difficulty, each from a different topic.
+    Reference solutions are never returned.
+    """
+    db = get_database()
+    # Oversample so distinct topics can be picked; $match uses the difficulty/topic index
+    cursor = db[CODING_QUESTION_BANK_COLLECTION].aggregate([
+        {"$match": {"difficulty": difficulty}},
+        {"$sample": {"size": count * 4}},
+        {"$project": {"_id": 0, "reference_solution": 0, "reference_language": 0, "fingerprint": 0}}
+    ])
+
+    questions, topics = [], set()
+    async for question in cursor:
+        if question.get("topic") in topics:
+            continue
+        topics.add(question.get("topic"))
+        questions.append(question)
+        if len(questions) == count:
+            break
+    return questions
+
+
+async def count_bank_questions() -> List[Dict]:
+    """Number of bank questions per (difficulty, topic)."""
+    db = get_database()
+    cursor = db[CODING_QUESTION_BANK_COLLECTION].aggregate([
+        {"$group": {"_id": {"difficulty": "$difficulty", "topic": "$topic"}, "count": {"$sum": 1}}}
+    ])
+    return [
+        {"difficulty": row["_id"]["difficulty"], "topic": row["_id"]["topic"], "count": row["count"]}
+        async for row in cursor
+    ]
+
+
 async def fetch_coding_questions(interview_id: str):
     """
     Fetch coding questions for a specific interview from the database.
@@ -667,8 +1024,15 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
         db = get_database()
         interview_obj_id = ObjectId(interview_id)
 
-        # Step 1: Fetch candidate info
-        interview_record = await db[SCHEDULED_INTERVIEWS_COLLECTION].find_one({"_id": interview_obj_id})
+        # Steps 1-4 read independent collections, so fetch them concurrently
+        interview_record, mcq_record, voice_record, coding_record = await asyncio.gather(
+            db[SCHEDULED_INTERVIEWS_COLLECTION].find_one({"_id": interview_obj_id}),
+            db[MCQS_COLLECTION].find_one({"interview_id": interview_id}),
+            db[VOICE_INTERVIEW_SESSIONS_COLLECTION].find_one({"interview_id": interview_id}),
+            db[CODING_QUESTIONS_COLLECTION].find_one({"interview_id": interview_id}),
+        )
+
+        # Step 1: Candidate info
         if not interview_record:
             logger.warning(f"No scheduled interview found for ID: {interview_id}")
             return False
@@ -681,9 +1045,8 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
         job_post_id = None
         job_post_id = interview_record.get("job_posting_id", "")
 
-        # Step 2: Fetch MCQ data
+        # Step 2: MCQ data
         mcq_data = []
-        mcq_record = await db[MCQS_COLLECTION].find_one({"interview_id": interview_id})
         if mcq_record and "mcqs_text" in mcq_record:
             for mcq in mcq_record["mcqs_text"]:
                 mcq_data.append({
@@ -693,8 +1056,7 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
                     "is_correct": mcq.get("is_correct", False)
                 })
 
-        # Step 3: Fetch Voice Interview data
-        voice_record = await db[VOICE_INTERVIEW_SESSIONS_COLLECTION].find_one({"interview_id": interview_id})
+        # Step 3: Voice Interview data
         voice_data = {}
         if voice_record:
             voice_data = {
@@ -706,9 +1068,9 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
                 "feedback": voice_record.get("feedback", "")
             }
 
-        # Step 4: Fetch Coding data
+        # Step 4: Coding data (LLM grading for all answers runs concurrently below)
         coding_data = []
-        coding_record = await db[CODING_QUESTIONS_COLLECTION].find_one({"interview_id": interview_id})
+        llm_scoring = []
         if coding_record and "questions" in coding_record:
             for q in coding_record["questions"]:
                 if "candidate_answer" in q:
@@ -727,7 +1089,7 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
                 elif passed_tests >= 8:
                     coding_marks = 4
                 elif passed_tests <= 3 and candidate_answer:
-                    coding_marks = await get_llm_coding_score(q.get("title", ""), candidate_answer)
+                    llm_scoring.append((len(coding_data), get_llm_coding_score(q.get("title", ""), candidate_answer)))
                 else:
                     coding_marks = 0
 
@@ -738,6 +1100,11 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
                     "coding_marks": coding_marks
                 })
 
+            if llm_scoring:
+                scores = await asyncio.gather(*(scoring for _, scoring in llm_scoring))
+                for (idx, _), score in zip(llm_scoring, scores):
+                    coding_data[idx]["coding_marks"] = score
+
 
         if job_post_id is not None:
             # Step 5: Combine report data
@@ -769,6 +1136,7 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
             {"$set": report_data},
             upsert=True
         )
+        await index_search_entries("report", [{**report_data, "created_by": interview_record.get("created_by")}])
         logger.info(f"Report saved successfully for interview ID: {interview_id}")
         return True
 
@@ -781,7 +1149,10 @@ async def get_and_save_interview_report_data(interview_id: str) -> bool:
 async def fetch_interview_report_data(interview_id: str):
     try:
         db = get_database()
-        report = await db[CANDIDATES_REPORTS_COLLECTION].find_one({"interview_id": interview_id})
+        report = await db[CANDIDATES_REPORTS_COLLECTION].find_one(
+            {"interview_id": interview_id},
+            {"report_pdf": 0}  # PDFs are served from GridFS, never with the report data
+        )
         if not report:
             logger.info(f"No report found for interview ID: {interview_id}")
             return None
@@ -795,27 +1166,50 @@ async def fetch_interview_report_data(interview_id: str):
 
 async def save_report_pdf_to_db(interview_id: str, pdf_data: bytes) -> bool:
     """
-    Save the generated candidate report PDF directly into candidates_reports collection.
-    
-    - Updates the existing report document (created earlier by get_and_save_interview_report_data)
-    - Adds/updates the 'pdf_file' field containing the binary PDF data.
+    Store the generated candidate report PDF in GridFS (REPORT_PDFS_BUCKET).
+
+    - The report document (created earlier by get_and_save_interview_report_data)
+      only keeps a reference: report_pdf_file_id, size and sha256 (used as the ETag)
+    - A previous PDF for the interview, in GridFS or embedded, is removed
     """
     try:
         db = get_database()
-        report = await db[CANDIDATES_REPORTS_COLLECTION].find_one({"interview_id": interview_id})
+        report = await db[CANDIDATES_REPORTS_COLLECTION].find_one(
+            {"interview_id": interview_id},
+            {"report_pdf_file_id": 1}
+        )
 
         if not report:
             logger.warning(f"No existing report found for interview_id={interview_id}.")
             return False
-        else:
-            await db[CANDIDATES_REPORTS_COLLECTION].update_one(
-                {"interview_id": interview_id},
-                {
-                    "$set": {
-                        "report_pdf": Binary(pdf_data)
-                    }
-                }
-            )
+
+        fs = AsyncIOMotorGridFSBucket(db, bucket_name=REPORT_PDFS_BUCKET)
+        sha256 = hashlib.sha256(pdf_data).hexdigest()
+        file_id = await fs.upload_from_stream(
+            f"Candidate_Assessment_Report_{interview_id}.pdf",
+            pdf_data,
+            metadata={"interview_id": interview_id, "sha256": sha256, "content_type": "application/pdf"}
+        )
+
+        await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {"interview_id": interview_id},
+            {
+                "$set": {
+                    "report_pdf_file_id": file_id,
+                    "report_pdf_size": len(pdf_data),
+                    "report_pdf_sha256": sha256,
+                    "report_pdf_updated_at": datetime.utcnow()
+                },
+                "$unset": {"report_pdf": ""}
+            }
+        )
+
+        previous_file_id = report.get("report_pdf_file_id")
+        if previous_file_id:
+            try:
+                await fs.delete(previous_file_id)
+            except Exception as e:
+                logger.warning(f"Could not delete previous report PDF {previous_file_id}: {e}")
 
         logger.info(f" Report PDF saved successfully for interview_id={interview_id}")
         return True
@@ -823,31 +1217,658 @@ async def save_report_pdf_to_db(interview_id: str, pdf_data: bytes) -> bool:
     except Exception as e:
         logger.error(f"Error while saving report PDF to DB: {e}")
         raise RuntimeError(f"Error in save_report_pdf_to_db: {e}")
-    
 
 
+async def get_report_pdf_info(interview_id: str) -> Optional[Dict]:
+    """
+    Fetch the PDF reference for a report without loading any PDF bytes.
+
+    Returns None if there is no report, otherwise a dict with report_status,
+    report_pdf_file_id, report_pdf_size, report_pdf_sha256 and has_embedded_pdf
+    (True for reports saved before PDFs moved to GridFS).
+    """
+    try:
+        db = get_database()
+        cursor = db[CANDIDATES_REPORTS_COLLECTION].aggregate([
+            {"$match": {"interview_id": interview_id}},
+            {"$limit": 1},
+            {"$project": {
+                "_id": 0,
+                "report_status": 1,
+                "report_pdf_file_id": 1,
+                "report_pdf_size": 1,
+                "report_pdf_sha256": 1,
+                "has_embedded_pdf": {"$ne": [{"$type": "$report_pdf"}, "missing"]}
+            }}
+        ])
+        reports = await cursor.to_list(length=1)
+        return reports[0] if reports else None
+    except Exception as e:
+        logger.error(f"Error fetching report PDF info for interview_id={interview_id}: {e}")
+        raise RuntimeError(f"Error in get_report_pdf_info: {e}")
+
+
+async def migrate_embedded_report_pdf(interview_id: str) -> bool:
+    """Move a PDF embedded in the report document (legacy format) into GridFS."""
+    db = get_database()
+    report = await db[CANDIDATES_REPORTS_COLLECTION].find_one(
+        {"interview_id": interview_id, "report_pdf": {"$exists": True}},
+        {"report_pdf": 1}
+    )
+    if not report:
+        return False
+    return await save_report_pdf_to_db(interview_id, bytes(report["report_pdf"]))
+
+
+async def open_report_pdf_stream(file_id):
+    """Open a GridFS download stream (supports seek/read in chunks) for a report PDF."""
+    db = get_database()
+    fs = AsyncIOMotorGridFSBucket(db, bucket_name=REPORT_PDFS_BUCKET)
+    return await fs.open_download_stream(file_id)
+
+
+_REPORT_CLAIM_FIELDS = {"report_claimed_by": "", "report_lease_expires_at": "", "report_rebuild_requested": ""}
+
+
+async def request_report_build(interview_id: str) -> bool:
+    """
+    Ask the report pipeline for a (re)build. Returns True when the report is
+    now "pending" and should be queued (creating the report document if the
+    pipeline hasn't written it yet). Returns False when a worker is building it
+    right now: the request is recorded on the claim instead, and that worker
+    re-queues the report once its build finishes.
+    """
+    try:
+        now = datetime.utcnow()
+        db = get_database()
+        flagged = await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {"interview_id": interview_id, "report_status": "pending", "report_lease_expires_at": {"$gt": now}},
+            {"$set": {"report_rebuild_requested": True}}
+        )
+        if flagged.matched_count:
+            return False
+        # Claim fields are left alone: only the worker owning a claim clears it
+        await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {"interview_id": interview_id},
+            {"$set": {"report_status": "pending", "report_error": None, "report_status_updated_at": now}},
+            upsert=True
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Error requesting report build for interview_id={interview_id}: {e}")
+        raise RuntimeError(f"Error in request_report_build: {e}")
+
+
+async def finish_report_build(interview_id: str, owner: str, status: str, error: str = None) -> Optional[str]:
+    """
+    Record the outcome ("ready" or "failed") of the build claimed by owner and
+    release the claim. If a rebuild was requested meanwhile, the report goes
+    back to "pending" instead. Returns the status written, or None when the
+    claim was lost (another worker took the report over after the lease ran out).
+    """
+    try:
+        db = get_database()
+        claim = {"interview_id": interview_id, "report_claimed_by": owner}
+        result = await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {**claim, "report_rebuild_requested": {"$ne": True}},
+            {
+                "$set": {
+                    "report_status": status,
+                    "report_error": error,
+                    "report_status_updated_at": datetime.utcnow()
+                },
+                "$unset": _REPORT_CLAIM_FIELDS
+            }
+        )
+        if result.matched_count:
+            return status
+        # The flag is only ever cleared by the claim's owner, so it is still set here
+        result = await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {**claim, "report_rebuild_requested": True},
+            {
+                "$set": {"report_status": "pending", "report_error": None, "report_status_updated_at": datetime.utcnow()},
+                "$unset": _REPORT_CLAIM_FIELDS
+            }
+        )
+        return "pending" if result.matched_count else None
+    except Exception as e:
+        logger.error(f"Error finishing report build for interview_id={interview_id}: {e}")
+        raise RuntimeError(f"Error in finish_report_build: {e}")
+
+
+def _unclaimed_pending_report_filter(now: datetime) -> dict:
+    # No claim, or the claiming worker stopped renewing it (missing/null/past all match)
+    return {"report_status": "pending", "report_lease_expires_at": {"$not": {"$gt": now}}}
+
+
+async def get_pending_report_ids() -> List[str]:
+    """
+    Interview ids whose report is pending and not being built by a live worker
+    (never claimed, or the claim expired because its server stopped).
+    """
+    db = get_database()
+    cursor = db[CANDIDATES_REPORTS_COLLECTION].find(
+        _unclaimed_pending_report_filter(datetime.utcnow()), {"interview_id": 1, "_id": 0}
+    )
+    return [doc["interview_id"] async for doc in cursor]
+
+
+async def claim_report_build(interview_id: str, owner: str, lease_seconds: int) -> bool:
+    """
+    Atomically claim a pending report for one pipeline worker, so API workers
+    sharing the database never build the same report at once.
+    """
+    now = datetime.utcnow()
+    db = get_database()
+    claimed = await db[CANDIDATES_REPORTS_COLLECTION].find_one_and_update(
+        {"interview_id": interview_id, **_unclaimed_pending_report_filter(now)},
+        {
+            "$set": {"report_claimed_by": owner, "report_lease_expires_at": now + timedelta(seconds=lease_seconds)},
+            # This build starts from the current data, so it covers any earlier rebuild request
+            "$unset": {"report_rebuild_requested": ""}
+        },
+        projection={"_id": 1}
+    )
+    return claimed is not None
+
+
+async def renew_report_claim(interview_id: str, owner: str, lease_seconds: int) -> bool:
+    """Extend the claim while the build runs; False if it was lost (it expired and another worker took over)."""
+    db = get_database()
+    result = await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+        {"interview_id": interview_id, "report_status": "pending", "report_claimed_by": owner},
+        {"$set": {"report_lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}}
+    )
+    return result.matched_count > 0
+
+
+# Interviews a candidate may still be taking (and so may be proctored)
+PROCTORABLE_INTERVIEW_STATUSES = ("scheduled", "in_progress", "mcq_completed")
+
+
+async def is_proctorable_interview(interview_id: str) -> bool:
+    """Whether the id is a scheduled interview that hasn't completed or been cancelled."""
+    if not ObjectId.is_valid(interview_id):
+        return False
+    db = get_database()
+    interview = await db[SCHEDULED_INTERVIEWS_COLLECTION].find_one(
+        {"_id": ObjectId(interview_id), "status": {"$in": list(PROCTORABLE_INTERVIEW_STATUSES)}},
+        {"_id": 1}
+    )
+    return interview is not None
+
+
+async def is_completed_interview(interview_id: str) -> bool:
+    """Whether the id is a scheduled interview the candidate has completed (so it has a report to build)."""
+    id_filter = {"_id": ObjectId(interview_id)} if ObjectId.is_valid(interview_id) else {"id": interview_id}
+    db = get_database()
+    interview = await db[SCHEDULED_INTERVIEWS_COLLECTION].find_one({**id_filter, "status": "completed"}, {"_id": 1})
+    return interview is not None
+
+
+async def apply_dashboard_counter_changes(kind: str, before: Optional[dict], after: Optional[dict]) -> None:
+    """
+    Move the dashboard counters from `before` to `after` for a job, interview,
+    user or role write (None for an insert's before / a delete's after).
+
+    Failures are logged rather than raised: the write itself already happened,
+    and the periodic reconciliation corrects any counter that drifted.
+    """
+    changes = dashboard_counters.diff(kind, before, after)
+    if not changes:
+        return
+    try:
+        db = get_database()
+        now = datetime.now(timezone.utc)
+        await db[DASHBOARD_COUNTERS_COLLECTION].bulk_write(
+            [
+                UpdateOne(
+                    {"_id": scope},
+                    {
+                        "$inc": {f"counts.{name}": amount for name, amount in counters.items()},
+                        "$set": {"updated_at": now}
+                    },
+                    upsert=True
+                )
+                for scope, counters in changes.items()
+            ],
+            ordered=False
+        )
+    except Exception as e:
+        logger.error(f"Error updating dashboard counters for {kind}: {e}")
+
+    if kind == "interview":
+        metrics = metric_rollups.interview_metrics(before, after)
+        if metrics:
+            await record_metric_rollups(metric_rollups.interview_scopes(after), metrics)
+
+
+async def get_dashboard_counters(scope: str) -> dict:
+    """Nested counts for one scope, e.g. {"jobs": {"total": 3, "status": {"active": 2}}}."""
+    try:
+        db = get_database()
+        doc = await db[DASHBOARD_COUNTERS_COLLECTION].find_one({"_id": scope}, {"counts": 1})
+        return (doc or {}).get("counts", {})
+    except Exception as e:
+        logger.error(f"Error fetching dashboard counters for scope={scope}: {e}")
+        raise RuntimeError(f"Error in get_dashboard_counters: {e}")
+
+
+def _nest_counters(counters: Dict[str, int]) -> dict:
+    nested = {}
+    for name, amount in counters.items():
+        node = nested
+        *parents, leaf = name.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = amount
+    return nested
+
+
+async def reconcile_dashboard_counters() -> int:
+    """
+    Recount every scope from the source collections and overwrite the counters.
+
+    Increments that land while the scan runs can be overwritten; the next run
+    picks them up. Returns the number of scopes written.
+    """
+    try:
+        db = get_database()
+        sources = [
+            ("job", JOB_POSTINGS_COLLECTION),
+            ("interview", SCHEDULED_INTERVIEWS_COLLECTION),
+            ("user", USERS_COLLECTION),
+            ("role", ROLES_COLLECTION),
+        ]
+        totals: Dict[str, Dict[str, int]] = {}
+        for kind, collection in sources:
+            async for doc in db[collection].find({}, dashboard_counters.COUNTER_FIELDS[kind]):
+                dashboard_counters.add_into(totals, kind, doc)
+
+        now = datetime.now(timezone.utc)
+        if totals:
+            await db[DASHBOARD_COUNTERS_COLLECTION].bulk_write(
+                [
+                    ReplaceOne(
+                        {"_id": scope},
+                        {"counts": _nest_counters(counters), "updated_at": now, "reconciled_at": now},
+                        upsert=True
+                    )
+                    for scope, counters in totals.items()
+                ],
+                ordered=False
+            )
+        await db[DASHBOARD_COUNTERS_COLLECTION].delete_many({"_id": {"$nin": list(totals)}})
+
+        logger.info(f"Reconciled dashboard counters for {len(totals)} scopes")
+        return len(totals)
+    except Exception as e:
+        logger.error(f"Error reconciling dashboard counters: {e}")
+        raise RuntimeError(f"Error in reconcile_dashboard_counters: {e}")
+
+
+async def record_metric_rollups(scopes: List[str], metrics: Dict[str, float], at: datetime = None) -> None:
+    """
+    Add `metrics` to the hourly and daily buckets containing `at` (default now)
+    for every scope, in one unordered bulk write.
+
+    Like the counters, failures are logged rather than raised.
+    """
+    at = at or datetime.now(timezone.utc)
+    increments = {f"metrics.{name}": amount for name, amount in metrics.items() if amount}
+    if not increments:
+        return
+    try:
+        db = get_database()
+        operations = []
+        for granularity in metric_rollups.GRANULARITIES:
+            bucket = metric_rollups.bucket_start(at, granularity)
+            on_insert = {"granularity": granularity, "bucket": bucket}
+            if granularity == "hour":
+                on_insert["expires_at"] = bucket + timedelta(days=settings.METRIC_ROLLUP_HOURLY_RETENTION_DAYS)
+            for scope in scopes:
+                operations.append(UpdateOne(
+                    {"_id": metric_rollups.rollup_id(granularity, scope, bucket)},
+                    {"$inc": increments, "$setOnInsert": {**on_insert, "scope": scope}},
+                    upsert=True
+                ))
+        await db[METRIC_ROLLUPS_COLLECTION].bulk_write(operations, ordered=False)
+    except Exception as e:
+        logger.error(f"Error recording metric rollups for {scopes}: {e}")
+
+
+async def get_metric_rollups(scope: str, granularity: str, start: datetime, end: datetime) -> List[dict]:
+    """Rollup documents for one scope with start <= bucket <= end, oldest first."""
+    try:
+        db = get_database()
+        cursor = db[METRIC_ROLLUPS_COLLECTION].find(
+            {"scope": scope, "granularity": granularity, "bucket": {"$gte": start, "$lte": end}},
+            {"bucket": 1, "metrics": 1, "_id": 0}
+        ).sort("bucket", 1)
+        return await cursor.to_list(length=None)
+    except Exception as e:
+        logger.error(f"Error fetching metric rollups for scope={scope}: {e}")
+        raise RuntimeError(f"Error in get_metric_rollups: {e}")
+
+
+def _rollup_backfill_pipeline(match: dict, timestamp, metric_fields: dict, scope_fields: Dict[str, str]) -> List[dict]:
+    """
+    Group source documents into (unit, scope key, bucket) sums with $dateTrunc.
+    `scope_fields` maps a scope prefix ("creator", "job") to the field holding its id;
+    the global scope uses a constant key.
+    """
+    units = list(metric_rollups.GRANULARITIES)
+    scopes = [{"prefix": "global", "key": None}] + [
+        {"prefix": prefix, "key": f"${field}"} for prefix, field in scope_fields.items()
+    ]
+    return [
+        {"$match": match},
+        {"$project": {"ts": timestamp, **{name: expr for name, expr in metric_fields.items()},
+                      "scopes": scopes, "units": units}},
+        {"$match": {"ts": {"$type": "date"}}},
+        {"$unwind": "$units"},
+        {"$unwind": "$scopes"},
+        {"$match": {"$expr": {"$or": [
+            {"$eq": ["$scopes.prefix", "global"]},
+            {"$gt": [{"$ifNull": ["$scopes.key", ""]}, ""]}
+        ]}}},
+        {"$group": {
+            "_id": {
+                "unit": "$units",
+                "prefix": "$scopes.prefix",
+                "key": {"$toString": "$scopes.key"},
+                "bucket": {"$dateTrunc": {"date": "$ts", "unit": "$units", "timezone": "UTC"}},
+            },
+            **{name: {"$sum": f"${name}"} for name in metric_fields},
+        }},
+    ]
+
+
+async def rebuild_metric_rollups() -> int:
+    """
+    Rebuild every rollup from the source collections (used once, when the
+    collection is empty, to backfill history written before rollups existed).
+
+    Scheduled interviews are bucketed by created_at, completions by their last
+    updated_at, and screenings by the time encoded in their ObjectId.
+    Returns the number of rollup documents written.
+    """
+    try:
+        db = get_database()
+        sums: Dict[tuple, Dict[str, float]] = {}
+        sources = [
+            (
+                SCHEDULED_INTERVIEWS_COLLECTION, {}, "$created_at",
+                {"interviews_scheduled": {"$literal": 1}},
+                {"creator": "created_by", "job": "job_posting_id"},
+            ),
+            (
+                SCHEDULED_INTERVIEWS_COLLECTION, {"status": "completed"},
+                {"$ifNull": ["$updated_at", "$created_at"]},
+                {"interviews_completed": {"$literal": 1}},
+                {"creator": "created_by", "job": "job_posting_id"},
+            ),
+            (
+                SCREENING_COLLECTION, {}, {"$ifNull": ["$screened_at", {"$toDate": "$_id"}]},
+                {
+                    "screenings": {"$literal": 1},
+                    "ats_score_sum": {"$cond": [{"$isNumber": "$ATS_Score"}, "$ATS_Score", 0]},
+                    "ats_score_count": {"$cond": [{"$isNumber": "$ATS_Score"}, 1, 0]},
+                },
+                {"job": "job_posting_id"},
+            ),
+        ]
+        for collection, match, timestamp, metric_fields, scope_fields in sources:
+            pipeline = _rollup_backfill_pipeline(match, timestamp, metric_fields, scope_fields)
+            async for row in db[collection].aggregate(pipeline, allowDiskUse=True):
+                key = row["_id"]
+                scope = "global" if key["prefix"] == "global" else f"{key['prefix']}:{key['key']}"
+                bucket = metric_rollups.bucket_start(key["bucket"], key["unit"])
+                metrics = sums.setdefault((key["unit"], scope, bucket), {})
+                for name in metric_fields:
+                    metrics[name] = metrics.get(name, 0) + row[name]
+
+        retention = timedelta(days=settings.METRIC_ROLLUP_HOURLY_RETENTION_DAYS)
+        now = datetime.now(timezone.utc)
+        operations = []
+        for (granularity, scope, bucket), metrics in sums.items():
+            doc = {"granularity": granularity, "scope": scope, "bucket": bucket, "metrics": metrics}
+            if granularity == "hour":
+                if bucket + retention < now:
+                    continue
+                doc["expires_at"] = bucket + retention
+            operations.append(ReplaceOne(
+                {"_id": metric_rollups.rollup_id(granularity, scope, bucket)}, doc, upsert=True
+            ))
+        if operations:
+            await db[METRIC_ROLLUPS_COLLECTION].bulk_write(operations, ordered=False)
+
+        logger.info(f"Rebuilt {len(operations)} metric rollups")
+        return len(operations)
+    except Exception as e:
+        logger.error(f"Error rebuilding metric rollups: {e}")
+        raise RuntimeError(f"Error in rebuild_metric_rollups: {e}")
+
+
+async def get_accessible_job_ids(user_id: str) -> List[str]:
+    """
+    Ids (as strings) of the job postings a user created or has an active
+    assignment to, from the per-user cache or the visible_to index.
+    """
+    job_ids = job_access_cache.get_cached_job_ids(user_id)
+    if job_ids is not None:
+        return job_ids
+    try:
+        version = job_access_cache.current_version(user_id)
+        db = get_database()
+        job_ids = [str(job_id) for job_id in await db[JOB_POSTINGS_COLLECTION].distinct(
+            "_id", {"visible_to": str(user_id)}
+        )]
+        job_access_cache.set_cached_job_ids(user_id, job_ids, version)
+        return job_ids
+    except Exception as e:
+        logger.error(f"Error fetching accessible jobs for user {user_id}: {e}")
+        raise RuntimeError(f"Error in get_accessible_job_ids: {e}")
+
+
+async def add_job_visibility(job_id: ObjectId, user_ids: List[str]) -> None:
+    """Give users access to a job (after they are assigned to it)."""
+    db = get_database()
+    await db[JOB_POSTINGS_COLLECTION].update_one(
+        {"_id": job_id},
+        {"$addToSet": {"visible_to": {"$each": [str(user_id) for user_id in user_ids]}}}
+    )
+    job_access_cache.invalidate_user_jobs(user_ids)
+
+
+async def remove_job_visibility(job_id: ObjectId, user_id: str) -> None:
+    """Take a job away from a user whose assignment was removed (creators keep access)."""
+    db = get_database()
+    await db[JOB_POSTINGS_COLLECTION].update_one(
+        {"_id": job_id, "created_by": {"$ne": str(user_id)}},
+        {"$pull": {"visible_to": str(user_id)}}
+    )
+    job_access_cache.invalidate_user_jobs([user_id])
+
+
+async def backfill_job_visibility() -> None:
+    """Compute visible_to for job postings created before the field existed (one $merge pipeline)."""
+    db = get_database()
+    await db[JOB_POSTINGS_COLLECTION].aggregate([
+        {"$match": {"visible_to": {"$exists": False}}},
+        {
+            "$lookup": {
+                "from": "job_assignments",
+                "localField": "_id",
+                "foreignField": "job_id",
+                "pipeline": [
+                    {"$match": {"status": "active"}},
+                    {"$project": {"_id": 0, "user_id": {"$toString": "$user_id"}}}
+                ],
+                "as": "assignments"
+            }
+        },
+        {
+            "$project": {
+                "visible_to": {
+                    "$filter": {
+                        "input": {"$setUnion": [[{"$toString": "$created_by"}], "$assignments.user_id"]},
+                        "cond": {"$ne": ["$$this", None]}
+                    }
+                }
+            }
+        },
+        {"$merge": {"into": JOB_POSTINGS_COLLECTION, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]).to_list(length=None)
+
+
+# Source collection of each omnibox entity kind
+SEARCH_SOURCES = {
+    "interview": SCHEDULED_INTERVIEWS_COLLECTION,
+    "screening": SCREENING_COLLECTION,
+    "report": CANDIDATES_REPORTS_COLLECTION,
+    "job": JOB_POSTINGS_COLLECTION,
+}
+
+
+def _search_source_pipeline(kind: str, match: dict) -> List[dict]:
+    """
+    Source documents for a kind's entries. Reports don't store who created
+    the interview, so they take created_by from their scheduled interview.
+    """
+    pipeline = [{"$match": match}, {"$project": omnibox_index.ENTITY_KINDS[kind]["fields"]}]
+    if kind == "report":
+        pipeline += [
+            {"$lookup": {
+                "from": SCHEDULED_INTERVIEWS_COLLECTION,
+                "let": {"interview_id": {"$convert": {
+                    "input": "$interview_id", "to": "objectId", "onError": None, "onNull": None
+                }}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$interview_id"]}}},
+                    {"$project": {"created_by": 1}},
+                ],
+                "as": "interview",
+            }},
+            {"$set": {"created_by": {"$arrayElemAt": ["$interview.created_by", 0]}}},
+            {"$unset": "interview"},
+        ]
+    return pipeline
+
+
+async def index_search_entries(kind: str, docs: List[dict]) -> None:
+    """
+    Upsert the omnibox entries for source documents (which must include the
+    kind's ENTITY_KINDS fields). Failures are logged rather than raised, like
+    the dashboard counters; rebuild_search_index repairs missed entries.
+    """
+    entries = [entry for entry in (omnibox_index.build_entry(kind, doc) for doc in docs) if entry]
+    if not entries:
+        return
+    try:
+        db = get_database()
+        await db[SEARCH_INDEX_COLLECTION].bulk_write(
+            [ReplaceOne({"_id": entry["_id"]}, entry, upsert=True) for entry in entries],
+            ordered=False
+        )
+    except Exception as e:
+        logger.error(f"Error indexing {kind} search entries: {e}")
+
+
+async def reindex_search_entry(kind: str, source_filter: dict) -> None:
+    """Re-read one source document after a partial update and refresh its entry."""
+    try:
+        db = get_database()
+        docs = await db[SEARCH_SOURCES[kind]].aggregate(_search_source_pipeline(kind, source_filter)).to_list(1)
+        doc = docs[0] if docs else None
+    except Exception as e:
+        logger.error(f"Error reading {kind} for search indexing: {e}")
+        return
+    if doc:
+        await index_search_entries(kind, [doc])
+
+
+async def remove_search_entry(kind: str, entity_id) -> None:
+    try:
+        db = get_database()
+        await db[SEARCH_INDEX_COLLECTION].delete_one({"_id": omnibox_index.entry_id(kind, entity_id)})
+    except Exception as e:
+        logger.error(f"Error removing {kind} search entry {entity_id}: {e}")
+
+
+async def rebuild_search_index(batch_size: int = 1000) -> int:
+    """Rebuild every omnibox entry from the source collections. Returns the number written."""
+    try:
+        db = get_database()
+        written = 0
+        for kind, collection in SEARCH_SOURCES.items():
+            batch = []
+            async for doc in db[collection].aggregate(_search_source_pipeline(kind, {}), allowDiskUse=True):
+                batch.append(doc)
+                if len(batch) == batch_size:
+                    await index_search_entries(kind, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                await index_search_entries(kind, batch)
+                written += len(batch)
+
+        logger.info(f"Rebuilt search index from {written} documents")
+        return written
+    except Exception as e:
+        logger.error(f"Error rebuilding search index: {e}")
+        raise RuntimeError(f"Error in rebuild_search_index: {e}")
+
 
 async def upsert_screening_results(data: dict, job_post_id: str= None):
     try:
         db = get_database()
         results = data.get("results", [])
+        screened_at = datetime.now(timezone.utc)
+        replaced = []
 
         for record in results:
             email = record.get("candidate_email")
-            await db[SCREENING_COLLECTION].update_one(
+            previous = await db[SCREENING_COLLECTION].find_one_and_update(
                 {"candidate_email": email},
                 {
                     "$set": {
                         **record,
-                        "job_posting_id": job_post_id
+                        "job_posting_id": job_post_id,
+                        "screened_at": screened_at
                     },
                 },
-                upsert=True
+                projection={"job_posting_id": 1, "ATS_Score": 1, "screened_at": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
             )
+            if previous is not None:
+                replaced.append(previous)
 
     except Exception as e:
         logger.error(f"Error upserting candidate results: {e}")
         raise RuntimeError("Failed to upsert candidate results")
+
+    # A re-screen overwrites the candidate's document, so take the old screening
+    # back out of its bucket; the rollups then match rebuild_metric_rollups,
+    # which counts each document once at its screened_at.
+    for previous in replaced:
+        await record_metric_rollups(
+            metric_rollups.screening_scopes(previous.get("job_posting_id")),
+            metric_rollups.screening_metrics([previous], sign=-1),
+            at=previous.get("screened_at") or previous["_id"].generation_time
+        )
+
+    if results:
+        await record_metric_rollups(
+            metric_rollups.screening_scopes(job_post_id),
+            metric_rollups.screening_metrics(results),
+            at=screened_at
+        )
+        await index_search_entries(
+            "screening",
+            [{**record, "job_posting_id": job_post_id, "screened_at": screened_at} for record in results]
+        )
     
 async def create_user_collection(
     first_name: str,
@@ -884,7 +1905,9 @@ async def create_user_collection(
             "updated_at": None
         }
  
-        await db[USERS_COLLECTION].insert_one(user_data)
+        await db[USERS_COLLECTION].insert_one(with_org_key(user_data))
+        await apply_dashboard_counter_changes("user", None, user_data)
+        invalidate_org_tree()
  
         logger.info(f"User created successfully: {email}")
         return True
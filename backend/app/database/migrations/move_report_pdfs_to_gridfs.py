@@ -0,0 +1,99 @@
+"""
+Database migration script to move candidate report PDFs into GridFS.
+Reports used to embed the PDF as a Binary `report_pdf` field; this uploads each
+one to the `report_pdfs` GridFS bucket, stores the reference fields and unsets
+the embedded copy. Safe to re-run.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+
+# Load environment variables
+load_dotenv()
+
+# MongoDB connection string
+MONGO_URI = os.getenv("MONGO_URI")
+DB_NAME = os.getenv("DB_NAME")
+
+# Collection / bucket names
+CANDIDATES_REPORTS_COLLECTION = "candidates_reports"
+REPORT_PDFS_BUCKET = "report_pdfs"
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+async def move_report_pdfs_to_gridfs():
+    """
+    Upload every embedded report PDF to GridFS and replace it with a reference
+    """
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[DB_NAME]
+    fs = AsyncIOMotorGridFSBucket(db, bucket_name=REPORT_PDFS_BUCKET)
+
+    moved = 0
+    # Only ids first, so at most one PDF is held in memory at a time
+    cursor = db[CANDIDATES_REPORTS_COLLECTION].find(
+        {"report_pdf": {"$exists": True}},
+        {"interview_id": 1}
+    )
+    async for report in cursor:
+        document = await db[CANDIDATES_REPORTS_COLLECTION].find_one(
+            {"_id": report["_id"]},
+            {"report_pdf": 1, "interview_id": 1}
+        )
+        if not document or "report_pdf" not in document:
+            continue
+
+        interview_id = document.get("interview_id")
+        pdf_data = bytes(document["report_pdf"])
+        sha256 = hashlib.sha256(pdf_data).hexdigest()
+        file_id = await fs.upload_from_stream(
+            f"Candidate_Assessment_Report_{interview_id}.pdf",
+            pdf_data,
+            metadata={"interview_id": interview_id, "sha256": sha256, "content_type": "application/pdf"}
+        )
+        await db[CANDIDATES_REPORTS_COLLECTION].update_one(
+            {"_id": document["_id"]},
+            {
+                "$set": {
+                    "report_pdf_file_id": file_id,
+                    "report_pdf_size": len(pdf_data),
+                    "report_pdf_sha256": sha256,
+                    "report_pdf_updated_at": datetime.utcnow()
+                },
+                "$unset": {"report_pdf": ""}
+            }
+        )
+        moved += 1
+        logger.info(f"Moved report PDF for interview {interview_id} ({len(pdf_data)} bytes)")
+
+    logger.info(f"Moved {moved} report PDFs to GridFS bucket {REPORT_PDFS_BUCKET}")
+
+    # Close the connection
+    client.close()
+    logger.info("Connection closed")
+
+async def main():
+    """
+    Main function to run the migration
+    """
+    logger.info("Starting migration to move report PDFs to GridFS")
+
+    try:
+        await move_report_pdfs_to_gridfs()
+        logger.info("Migration completed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    asyncio.run(main())
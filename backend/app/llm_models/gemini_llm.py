@@ -1,5 +1,4 @@
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
 from app.config import settings  # Use the loaded settings instance
 import logging
 
@@ -7,6 +6,9 @@ logger = logging.getLogger(__name__)
 
 def get_gemini_llm():
     try:
+        # Imported here: langchain_google_genai is slow to import and only needed once an LLM is used
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         api_key = settings.GOOGLE_API_KEY or os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("Google API key not found. Please set GOOGLE_API_KEY in .env or config.py")
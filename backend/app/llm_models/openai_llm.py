@@ -1,7 +1,5 @@
 import os
 from typing import Optional
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
 from app.config import settings
 import logging
 
@@ -13,6 +11,9 @@ def get_openai_llm(
     temperature: float = 0.3,
 ):
     try:
+        # Imported here: langchain_openai is slow to import and only needed once an LLM is used
+        from langchain_openai import ChatOpenAI
+
         key = api_key or settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
         if not key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in .env or config.py")
@@ -46,6 +47,8 @@ class OpenAILLM:
             The LLM response as a string
         """
         try:
+            from langchain_core.messages import HumanMessage
+
             message = HumanMessage(content=prompt)
             response = self.llm.invoke([message])
             return response.content
@@ -25,6 +25,12 @@ from app.database import (
 )
 from app.utils.logger import get_logger
 from app.utils.websocket_manager import set_event_loop
+from app.services.judge0_client import judge0_client
+from app.services.local_executor import local_executor
+from app.services.report_pipeline_service import report_pipeline_service
+from app.services.dashboard_counter_service import dashboard_counter_service
+from app.services.search_service import search_service
+from app.services.proctoring_service import proctoring_engine
 from app.services.auth_service import verify_token_from_query_or_header, get_token_from_request
 
 # Import all route modules
@@ -56,7 +62,8 @@ from app.routes import (
     jobwise_statistics_route,
     dashboard_stats_route,
     job_mapping_route,
-    proctoring_ws_route
+    proctoring_ws_route,
+    search_route
 )
 
 # Initialize logger
@@ -86,6 +93,21 @@ async def lifespan(app: FastAPI):
             logger.warning("Database verification failed. Some features may not work.")
 
         await init_rbac()
+
+        # Start report workers (re-queues reports left pending by a restart)
+        await report_pipeline_service.start()
+
+        # Build missing dashboard counters and start periodic reconciliation
+        await dashboard_counter_service.start()
+
+        # Backfill the global search index in the background if it is empty
+        await search_service.start()
+
+        # Shared worker pool for frames uploaded over the proctoring socket
+        await proctoring_engine.start()
+
+        # Sandbox probe for the local code executor (CODE_EXECUTOR_PROVIDER="local")
+        await local_executor.start()
     except Exception as e:
         logger.exception(f"Error during startup: {e}")
 
@@ -93,8 +115,14 @@ async def lifespan(app: FastAPI):
 
     # Shutdown tasks
     logger.info("Shutting down AI Interview Assistant Backend...")
+    await report_pipeline_service.stop()
+    await dashboard_counter_service.stop()
+    await search_service.stop()
+    await proctoring_engine.stop()
     await close_mongo_connection()
     logger.info("MongoDB connection closed.")
+    await judge0_client.aclose()
+    await local_executor.aclose()
 
 
 # ------------------------------------------------------------------------------
@@ -117,8 +145,8 @@ app.add_middleware(
     allow_origins=[FRONTEND_URL],  # Restrict to specific origins
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],  # Explicit methods
-    allow_headers=["Authorization", "Content-Type", "Accept"],  # Explicit headers
-    expose_headers=["Authorization"],  # Only expose necessary headers
+    allow_headers=["Authorization", "Content-Type", "Accept", "If-None-Match", "Range", "If-Range"],  # Explicit headers
+    expose_headers=["Authorization", "ETag", "Content-Length", "Content-Range", "Accept-Ranges", "Content-Disposition"],  # Only expose necessary headers
     max_age=600,
 )
 
@@ -186,6 +214,7 @@ app.include_router(jobwise_statistics_route.router, prefix="/api")
 app.include_router(dashboard_stats_route.router, prefix="/api/dashboard-stats")
 app.include_router(job_mapping_route.router, prefix="/api")
 app.include_router(proctoring_ws_route.router, prefix="/api/ws")
+app.include_router(search_route.router, prefix="/api/search")
 
 logger.info("All routes registered successfully.")
 
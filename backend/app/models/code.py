@@ -8,6 +8,7 @@ class CodeExecutionRequest(BaseModel):
     language: str = Field(..., description="Programming language")
     version: Optional[str] = Field(None, description="Language version")
     files: List[CodeFile] = Field(..., description="List of code files to execute")
+    interview_id: Optional[str] = Field(None, description="Interview the execution belongs to (used for per-candidate limits)")
 
 class CodeExecutionResponse(BaseModel):
     run: Dict[str, Any] = Field(..., description="Execution result")
@@ -30,6 +31,7 @@ class CodeEvaluationRequest(BaseModel):
     testCases: List[TestCase] = Field(..., description="Test cases to evaluate")
     language: str = Field(..., description="Programming language")
     functionSignature: str = Field(..., description="Function signature")
+    interview_id: Optional[str] = Field(None, description="Interview the evaluation belongs to (used for per-candidate limits and result caching)")
 
 class CodeEvaluationResponse(BaseModel):
     results: List[TestResult] = Field(..., description="Test results")
\ No newline at end of file
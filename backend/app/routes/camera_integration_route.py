@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query, Body
 from fastapi import FastAPI
 from fastapi.responses import StreamingResponse
-from ..services.camera_service import gen_frames, start_camera, stop_camera, set_detection_enabled
 from ..utils.logger import get_logger
 from pydantic import BaseModel
 from typing import Optional
@@ -10,6 +9,9 @@ from app.schemas.camera_schema import CameraConfig
 logger = get_logger(__name__)
 router = APIRouter(tags=["Camera"])
 
+# camera_service is imported inside the handlers: it pulls in OpenCV, which
+# the API shouldn't pay for at startup when nobody uses the server camera.
+
 
 @router.get("/camera-integration")
 def camera_integration():
@@ -17,6 +19,8 @@ def camera_integration():
     Stream camera feed with proctoring capabilities
     """
     try:
+        from ..services.camera_service import gen_frames
+
         return StreamingResponse(gen_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
     except Exception as e:
         logger.error(f"Error in camera_integration: {str(e)}")
@@ -28,6 +32,8 @@ def start_camera_endpoint(config: CameraConfig):
     Start the camera with specified resolution and detection setting
     """
     try:
+        from ..services.camera_service import start_camera
+
         result = start_camera(config.width, config.height, config.enable_detection)
         detection_status = "enabled" if config.enable_detection else "disabled"
         if result:
@@ -44,6 +50,8 @@ def stop_camera_endpoint():
     Stop the camera
     """
     try:
+        from ..services.camera_service import stop_camera
+
         result = stop_camera()
         if result:
             return {"status": "success", "message": "Camera stopped"}
@@ -58,6 +66,8 @@ def toggle_detection(enable: bool = Body(..., embed=True)):
     Enable or disable cheating detection
     """
     try:
+        from ..services.camera_service import set_detection_enabled
+
         # Use the function to set the detection flag
         detection_enabled = set_detection_enabled(enable)
         
@@ -72,15 +82,10 @@ def camera_status():
     """
     Get camera status and cheating statistics
     """
-    from ..services.camera_service import camera_active, detection_enabled, face_missing_counter, multiple_faces_counter, iris_cheating_counter, phone_cheating_counter
-    
+    from ..services import camera_service
+
     return {
-        "active": camera_active,
-        "detection_enabled": detection_enabled,
-        "statistics": {
-            "face_missing_detections": face_missing_counter,
-            "multiple_faces_detections": multiple_faces_counter,
-            "looking_away_detections": iris_cheating_counter,
-            "phone_detections": phone_cheating_counter
-        }
+        "active": camera_service.camera_active,
+        "detection_enabled": camera_service.detection_enabled,
+        "statistics": camera_service.legacy_state.statistics()
     }
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response, Query
+from fastapi.responses import JSONResponse
 from ..services.interview_service import InterviewService
 from ..services.mcq_generation_service import generate_mcqs
 from ..utils.extract_jd_text import extract_text_from_jd
@@ -9,12 +10,12 @@ from typing import Dict, Any, List, Set
 from pydantic import BaseModel
 import time
 import re
-from app.database import get_and_save_interview_report_data
-from app.database import fetch_interview_report_data
-from app.database import save_report_pdf_to_db
-from app.utils.report_pdf_generation import  build_candidate_report_pdf
+from bson import ObjectId
+from app.services.report_pipeline_service import report_pipeline_service, REPORT_STATUS_PENDING
 from app.services.email_service import EmailService
 from app.schemas.candidate_side_schemas import MCQSubmission, MCQResponse
+from app.utils.mcq_delivery_cache import build_etag, get_cached_payload, set_cached_payload, wait_for_mcqs
+from app.utils import code_result_cache
 logger = get_logger(__name__)
 router = APIRouter(tags=["Candidate"])
 
@@ -23,6 +24,9 @@ router = APIRouter(tags=["Candidate"])
 in_progress_mcq_generations: Dict[str, float] = {}
 # Timeout for in-progress tracking (seconds)
 IN_PROGRESS_TIMEOUT = 60
+# Long-poll limits for the structured MCQ endpoint (seconds)
+MAX_MCQ_WAIT_SECONDS = 30
+MCQ_WAIT_RECHECK_SECONDS = 3
 
 @router.get("/interview/{interview_id}")
 async def get_candidate_interview(interview_id: str) -> Dict[str, Any]:
@@ -181,7 +185,7 @@ async def generate_candidate_mcqs(interview_id: str) -> str:
             if len(jd_text.strip()) < 10 and len(resume_text.strip()) < 10:
                 logger.warning("Both JD and resume texts are too short. Using default MCQs.")
                 default_mcqs = generate_default_mcqs()
-                save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
+                await save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
                 # Remove from in-progress tracking
                 in_progress_mcq_generations.pop(interview_id, None)
                 return default_mcqs
@@ -191,13 +195,13 @@ async def generate_candidate_mcqs(interview_id: str) -> str:
             if not response or len(response.strip()) < 20:
                 logger.warning(f"Generated MCQs are too short or empty. Using default MCQs.")
                 default_mcqs = generate_default_mcqs()
-                save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
+                await save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
                 # Remove from in-progress tracking
                 in_progress_mcq_generations.pop(interview_id, None)
                 return default_mcqs
             
             # Save the generated MCQs
-            save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=response)
+            await save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=response)
             
             # Remove from in-progress tracking
             in_progress_mcq_generations.pop(interview_id, None)
@@ -229,7 +233,7 @@ async def generate_candidate_mcqs(interview_id: str) -> str:
             # Return default MCQs instead of failing
             logger.info("Returning default MCQs due to error")
             default_mcqs = generate_default_mcqs()
-            save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
+            await save_generated_mcqs(interview_id=interview_id, candidate_email=candidate_email, mcqs_text=default_mcqs)
             
             # Remove from in-progress tracking
             in_progress_mcq_generations.pop(interview_id, None)
@@ -379,70 +383,138 @@ async def get_candidate_mcqs(interview_id: str) -> str:
         logger.exception("Full exception details:")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def build_candidate_mcq_payload(interview_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the structured MCQ payload sent to candidates.
+    Correct answers and any previous candidate answers are never included.
+    """
+    questions = []
+    for mcq in record.get("mcqs_text", []):
+        question_text = mcq.get("question")
+        # Filter out any invalid MCQs (like introductions or section headers)
+        if not question_text or question_text.startswith("Here are"):
+            continue
+        questions.append({
+            "question_id": mcq.get("question_id"),
+            "question": question_text,
+            "options": [
+                re.sub(r'^[a-dA-D][\)\.]\s*', '', option).strip()
+                for option in mcq.get("options", [])
+            ]
+        })
+
+    return {
+        "interview_id": interview_id,
+        "status": "ready",
+        "version": record.get("version", 0),
+        "questions": questions
+    }
+
+
+@router.get("/mcqs/{interview_id}")
+async def get_candidate_mcq_questions(
+    interview_id: str,
+    request: Request,
+    wait: int = Query(0, ge=0, le=MAX_MCQ_WAIT_SECONDS, description="Seconds to long-poll while MCQs are generating")
+):
+    """
+    Structured MCQ delivery for candidates (no answers included).
+    This endpoint does not require authentication
+
+    - Responses carry a version ETag; a matching If-None-Match returns 304.
+    - While generation is pending, `wait` long-polls until the MCQs are saved
+      (or the wait elapses) instead of the client polling in a tight loop.
+    """
+    if_none_match = request.headers.get("if-none-match")
+
+    cached = get_cached_payload(interview_id)
+    if cached:
+        if if_none_match == cached["etag"]:
+            return Response(status_code=304, headers={"ETag": cached["etag"]})
+        return JSONResponse(content=cached["payload"], headers={"ETag": cached["etag"]})
+
+    try:
+        from ..database import get_database, MCQS_COLLECTION
+        db = get_database()
+        projection = {"mcqs_text.question_id": 1, "mcqs_text.question": 1, "mcqs_text.options": 1, "version": 1}
+
+        record = await db[MCQS_COLLECTION].find_one({"interview_id": interview_id}, projection)
+
+        # Long-poll: wait for the in-process notification, re-checking the database
+        # periodically in case generation is running in another worker
+        deadline = time.monotonic() + wait
+        while not record and time.monotonic() < deadline:
+            remaining = deadline - time.monotonic()
+            await wait_for_mcqs(interview_id, timeout=min(MCQ_WAIT_RECHECK_SECONDS, remaining))
+            record = await db[MCQS_COLLECTION].find_one({"interview_id": interview_id}, projection)
+
+        if not record:
+            logger.info(f"No MCQs found for interview {interview_id} yet (still generating)")
+            return JSONResponse(
+                content={"interview_id": interview_id, "status": "generating", "version": 0, "questions": []},
+                headers={"Cache-Control": "no-store"}
+            )
+
+        payload = build_candidate_mcq_payload(interview_id, record)
+        etag = build_etag(interview_id, payload["version"])
+        set_cached_payload(interview_id, etag, payload)
+
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return JSONResponse(content=payload, headers={"ETag": etag})
+
+    except Exception as e:
+        logger.error(f"Error getting structured MCQs: {e}")
+        logger.exception("Full exception details:")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/submit-answers/{interview_id}")
 async def submit_candidate_answers(interview_id: str, submission: MCQSubmission):
     """
     Submit candidate answers for an interview
     This endpoint does not require authentication
+
+    All answers are scored against the stored answers and persisted in a single
+    write; the client-supplied correctness and scores are ignored.
     """
     logger.info(f"Candidate submitting answers for interview ID: {interview_id}")
-    
+
+    if not ObjectId.is_valid(interview_id):
+        logger.warning(f"Invalid interview ID format: {interview_id}")
+        raise HTTPException(status_code=400, detail="Invalid interview ID format")
+
     try:
-        # Verify database connection
-        from ..database import verify_database_connection, save_candidate_answer
-        db_ok = await verify_database_connection()
-        if not db_ok:
-            logger.error("Database connection verification failed in submit_candidate_answers")
-            raise HTTPException(status_code=503, detail="Database service unavailable")
-        
-        # Verify interview exists
-        interview_service = InterviewService()
-        interview = await interview_service.get_interview(interview_id)
-        
+        from ..database import get_database, submit_candidate_mcq_answers, SCHEDULED_INTERVIEWS_COLLECTION
+        db = get_database()
+
+        # Verify interview exists (only the field we need)
+        interview = await db[SCHEDULED_INTERVIEWS_COLLECTION].find_one(
+            {"_id": ObjectId(interview_id)},
+            {"candidate_email": 1}
+        )
+
         if not interview:
             logger.warning(f"Interview not found when submitting answers: {interview_id}")
             raise HTTPException(status_code=404, detail="Interview not found")
-        
+
         # Verify candidate email matches
         if interview["candidate_email"] != submission.candidate_email:
             logger.warning(f"Candidate email mismatch: {submission.candidate_email} vs {interview['candidate_email']}")
             raise HTTPException(status_code=400, detail="Candidate email does not match interview")
-        
-        # Save each answer
-        success = True
 
-        for response in submission.responses:
-            # Use question_id from the response
-            question_id = response.question_id
-            is_correct = response.is_correct
-            
-            logger.info(f"Saving answer for question_id={question_id}, question={response.question[:30]}...")
-            
-            result = await save_candidate_answer(
-                interview_id=interview_id,
-                question_id=question_id,
-                candidate_answer=response.selected_answer,
-                is_correct=is_correct
-            )
-            if not result:
-                success = False
-                logger.error(f"Failed to save answer for question_id={question_id}, question={response.question[:30]}...")
-        
-        # Update interview status to mcq_completed instead of completed
-        # This allows the system to know MCQs are done but voice interview should start next
-        if success:
-            logger.info(f"Updating interview status to mcq_completed for interview ID: {interview_id}")
-            status_updated = await interview_service.update_interview_status(interview_id, "mcq_completed")
-            if status_updated:
-                logger.info(f"Successfully updated interview status for interview ID: {interview_id}")
-            else:
-                logger.warning(f"Failed to update interview status for interview ID: {interview_id}")
-        
+        answers = {response.question_id: response.selected_answer for response in submission.responses}
+        result = await submit_candidate_mcq_answers(interview_id, answers)
+
+        success = result["saved"] == len(answers) and result["max_score"] > 0
+        if not success:
+            logger.error(f"Saved {result['saved']} of {len(answers)} answers for interview ID: {interview_id}")
+
         return {
             "message": "Answers submitted successfully",
             "interview_id": interview_id,
-            "total_score": submission.total_score,
-            "max_score": submission.max_score,
+            "total_score": result["total_score"],
+            "max_score": result["max_score"],
             "status": "success" if success else "partial_success"
         }
     except HTTPException:
@@ -471,22 +543,25 @@ async def complete_interview(interview_id: str):
         # Initialize interview service
         interview_service = InterviewService()
         
-        # Update interview status to completed
-        status_updated = await interview_service.update_interview_status(interview_id, "completed")
-        
-        ## gather data for report generation
-        await get_and_save_interview_report_data(interview_id)
-        data = await fetch_interview_report_data(interview_id)
-        pdf_data = build_candidate_report_pdf(data)
-        await save_report_pdf_to_db(interview_id, pdf_data)
-
-        if status_updated:
-            logger.info(f"Successfully updated interview status to completed for interview ID: {interview_id}")
-            return {"message": "Interview completed successfully"}
-        else:
-            logger.warning(f"Failed to update interview status to completed for interview ID: {interview_id}")
-            raise HTTPException(status_code=500, detail="Failed to update interview status")
-    
+        # Update interview status to completed (a repeated submit finds it completed already)
+        status_updated = await interview_service.update_interview_status(
+            interview_id, "completed", unless_status=["completed"]
+        )
+        if not status_updated:
+            logger.warning(f"Interview not found or already completed for interview ID: {interview_id}")
+            raise HTTPException(status_code=404, detail="Interview not found or already completed")
+
+        logger.info(f"Successfully updated interview status to completed for interview ID: {interview_id}")
+
+        # Code results are only reused while the interview is in progress
+        code_result_cache.purge_interview(interview_id)
+
+        # Report data, LLM grading and the PDF are built in the background
+        await report_pipeline_service.enqueue(interview_id)
+        return {"message": "Interview completed successfully", "report_status": REPORT_STATUS_PENDING}
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error completing interview: {e}")
         logger.exception("Full exception details:")
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from typing import List
 
 from app.models.code import (
@@ -12,8 +14,15 @@ from app.services.coding_service import coding_service
 
 router = APIRouter()
 
+def get_candidate_key(request, http_request: Request) -> str:
+    """Key used for per-candidate Judge0 concurrency limits (interview id, else client address)."""
+    if request.interview_id:
+        return request.interview_id
+    return http_request.client.host if http_request.client else "anonymous"
+
+
 @router.post("/execute", response_model=CodeExecutionResponse)
-async def execute_code(request: CodeExecutionRequest):
+async def execute_code(request: CodeExecutionRequest, http_request: Request):
     """
     Execute code in the specified language
     """
@@ -22,14 +31,18 @@ async def execute_code(request: CodeExecutionRequest):
         source_code = request.files[0].content
         
         # Execute the code
-        result = await coding_service.execute_code(request.language, source_code)
+        result = await coding_service.execute_code(
+            request.language,
+            source_code,
+            candidate_key=get_candidate_key(request, http_request)
+        )
         
         return {"run": result["run"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/evaluate", response_model=CodeEvaluationResponse)
-async def evaluate_code(request: CodeEvaluationRequest):
+async def evaluate_code(request: CodeEvaluationRequest, http_request: Request):
     """
     Evaluate code against test cases
     """
@@ -39,9 +52,49 @@ async def evaluate_code(request: CodeEvaluationRequest):
             request.code,
             request.testCases,
             request.language,
-            request.functionSignature
+            request.functionSignature,
+            candidate_key=get_candidate_key(request, http_request),
+            interview_id=request.interview_id
         )
         
         return {"results": results}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/evaluate/stream")
+async def evaluate_code_stream(request: CodeEvaluationRequest, http_request: Request):
+    """
+    Evaluate code against test cases, streaming results as Server-Sent Events.
+
+    Emits one `result` event per test case as soon as it finishes
+    ({"index", "result"}), then a final `summary` event ({"total", "passed", "all_passed"}).
+    """
+    async def events():
+        passed = 0
+        try:
+            async for idx, result in coding_service.stream_test_cases(
+                request.code,
+                request.testCases,
+                request.language,
+                request.functionSignature,
+                candidate_key=get_candidate_key(request, http_request),
+                interview_id=request.interview_id
+            ):
+                passed += int(result.passed)
+                yield format_sse("result", {"index": idx, "result": result.dict()})
+        except Exception as e:
+            yield format_sse("error", {"detail": str(e)})
+
+        total = len(request.testCases)
+        yield format_sse("summary", {"total": total, "passed": passed, "all_passed": total > 0 and passed == total})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so each event reaches the browser immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,7 +1,13 @@
+from datetime import datetime, timezone
+from typing import Optional
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException
-from app.database import get_database, JOB_POSTINGS_COLLECTION, USERS_COLLECTION, ROLES_COLLECTION, SCHEDULED_INTERVIEWS_COLLECTION
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.database import (
+    get_database, get_dashboard_counters, get_metric_rollups, get_accessible_job_ids, ROLES_COLLECTION
+)
 from app.utils.auth_dependency import get_current_user,require_permission
+from app.utils.dashboard_counters import GLOBAL_SCOPE, creator_scope, job_scope
+from app.utils import metric_rollups
 from app.utils.logger import get_logger
 import logging
 router = APIRouter(tags=["Dashboard Statistics"])
@@ -11,6 +17,23 @@ logger = get_logger(__name__)
 from bson import ObjectId
 
 
+# Every statistic below is read from the materialized dashboard_counters
+# collection (one document per scope), kept current on each write and
+# reconciled periodically, so a page view is a single key lookup.
+async def is_super_admin(current_user: dict) -> bool:
+    role_name = current_user.get("role_name")
+    if role_name is None:
+        db = get_database()
+        role_doc = await db[ROLES_COLLECTION].find_one(
+            {"_id": ObjectId(current_user.get("role_id"))},
+            {"role_name": 1}
+        )
+        if not role_doc:
+            raise HTTPException(status_code=403, detail="Invalid role")
+        role_name = role_doc.get("role_name")
+    return role_name == "SUPER_ADMIN"
+
+
 @router.get("/get-job-statistics")
 async def get_job_statistics(
     current_user: dict = Depends(require_permission("JOB_VIEW"))
@@ -22,60 +45,30 @@ async def get_job_statistics(
     Others → jobs created by logged-in user
     """
     try:
-        db = get_database()
-
-        # Fetch role
-        role_doc = await db[ROLES_COLLECTION].find_one(
-            {"_id": ObjectId(current_user.get("role_id"))},
-            {"role_name": 1}
-        )
-
-        if not role_doc:
-            raise HTTPException(status_code=403, detail="Invalid role")
-
-        # Build match query
-        if role_doc.get("role_name") == "SUPER_ADMIN":
-            match_query = {}
+        # SUPER_ADMIN → all jobs, others → jobs they created
+        if await is_super_admin(current_user):
+            scope = GLOBAL_SCOPE
         else:
-            match_query = {
-                "created_by": str(current_user.get("_id"))
-            }
-
-        pipeline = [
-            {"$match": match_query},
-            {
-                "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }
-            }
-        ]
+            scope = creator_scope(str(current_user.get("_id")))
 
-        results = await db[JOB_POSTINGS_COLLECTION].aggregate(pipeline).to_list(None)
+        counts = (await get_dashboard_counters(scope)).get("jobs", {})
+        status_counts = counts.get("status", {})
 
         # Initialize stats
         stats = {
-            "total": 0,
+            "total": counts.get("total", 0),
             "active": 0,
             "draft": 0,
             "closed": 0,
             "archived": 0
         }
-        for item in results:
-            raw_status = item["_id"]
-            count = item["count"]
-
-            # Always update total
-            stats["total"] += count
-
-            # Normalize status
-            if raw_status:
-                status = raw_status.lower()
-                if status in stats:
-                    stats[status] = count
+        for status in ("active", "draft", "closed", "archived"):
+            stats[status] = status_counts.get(status, 0)
 
         return stats
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching job statistics: {str(e)}")
         raise HTTPException(
@@ -93,64 +86,24 @@ async def get_user_role_statistics(
     """
     try:
         db = get_database()
-
-        # Total users
-        total_users = await db[USERS_COLLECTION].count_documents({})
-
-        # Total roles
-        total_roles = await db[ROLES_COLLECTION].count_documents({})
-
-        # Role-wise user count (dynamic)
-        pipeline = [
-            {
-                "$addFields": {
-                    "role_obj_id": {
-                        "$cond": {
-                            "if": {"$eq": [{"$type": "$role_id"}, "string"]},
-                            "then": {"$toObjectId": "$role_id"},
-                            "else": "$role_id"
-                        }
-                    }
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$role_obj_id",
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$lookup": {
-                    "from": ROLES_COLLECTION,
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "role"
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$role",
-                    "preserveNullAndEmptyArrays": True
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "role_id": {"$toString": "$_id"},
-                    "role_name": {
-                        "$ifNull": ["$role.name", "$role.role_name"]
-                    },
-                    "count": 1
-                }
-            }
+        counts = await get_dashboard_counters(GLOBAL_SCOPE)
+        users = counts.get("users", {})
+
+        # Role-wise user count (names come from the roles themselves)
+        role_counts = {role_id: count for role_id, count in users.get("role", {}).items() if count}
+        role_ids = [ObjectId(role_id) for role_id in role_counts if ObjectId.is_valid(role_id)]
+        role_names = {}
+        async for role in db[ROLES_COLLECTION].find({"_id": {"$in": role_ids}}, {"name": 1, "role_name": 1}):
+            role_names[str(role["_id"])] = role.get("name") or role.get("role_name")
+
+        role_wise_users = [
+            {"role_id": role_id, "role_name": role_names.get(role_id), "count": count}
+            for role_id, count in role_counts.items()
         ]
 
-        cursor = db[USERS_COLLECTION].aggregate(pipeline)
-        role_wise_users = await cursor.to_list(length=None)
-
         return {
-            "total_users": total_users,
-            "total_roles": total_roles,
+            "total_users": users.get("total", 0),
+            "total_roles": counts.get("roles", {}).get("total", 0),
             "role_wise_users": role_wise_users
         }
 
@@ -169,56 +122,36 @@ async def get_roles_statistics(
     - role-wise count
     """
     try:
-        db = get_database()
-
-        # Fetch logged-in user's role
-        role_doc = await db[ROLES_COLLECTION].find_one(
-            {"_id": ObjectId(current_user.get("role_id"))}
-        )
-
-        if not role_doc:
-            raise HTTPException(status_code=403, detail="Invalid role")
-
-        # SUPER_ADMIN can view all roles
-        if role_doc.get("role_name") == "SUPER_ADMIN":
-            match_query = {}
+        # SUPER_ADMIN can view all roles, others the roles they created
+        if await is_super_admin(current_user):
+            scope = GLOBAL_SCOPE
         else:
-            match_query = {
-                "created_by": current_user.get("email")
-            }
-
-        # ✅ FIXED aggregation pipeline
-        pipeline = [
-            {"$match": match_query},
-            {
-                "$group": {
-                    "_id": "$role_name",   # 🔥 FIX HERE
-                    "count": {"$sum": 1}
-                }
-            }
-        ]
+            scope = creator_scope(current_user.get("email"))
 
-        roles = []
-        total_roles = 0
+        counts = (await get_dashboard_counters(scope)).get("roles", {})
 
-        async for r in db[ROLES_COLLECTION].aggregate(pipeline):
+        roles = []
+        for role_name, count in counts.get("name", {}).items():
+            if not count:
+                continue
             normalized_role = (
-                r["_id"]
+                role_name
                 .replace("_", " ")
                 .upper()
                 .strip()
             )
             roles.append({
                 "role": normalized_role,
-                "count": r["count"]
+                "count": count
             })
-            total_roles += r["count"]
 
         return {
-            "total_roles": total_roles,
+            "total_roles": counts.get("total", 0),
             "roles": roles
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching role statistics: {str(e)}")
         raise HTTPException(
@@ -240,57 +173,24 @@ async def get_users_statistics(
     - inactive_users
     """
     try:
-        db = get_database()
-
-        # Fetch logged-in user's role
-        role_doc = await db[ROLES_COLLECTION].find_one(
-            {"_id": ObjectId(current_user.get("role_id"))},
-            {"role_name": 1}
-        )
-
-        if not role_doc:
-            raise HTTPException(status_code=403, detail="Invalid role")
-
-        # SUPER_ADMIN → all users
-        if role_doc.get("role_name") == "SUPER_ADMIN":
-            match_query = {}
+        # SUPER_ADMIN → all users, others → users they created
+        if await is_super_admin(current_user):
+            scope = GLOBAL_SCOPE
         else:
-            match_query = {
-                "created_by": current_user.get("email")
-            }
-
-        # Aggregation pipeline
-        pipeline = [
-            {"$match": match_query},
-            {
-                "$group": {
-                    "_id": "$is_active",
-                    "count": {"$sum": 1}
-                }
-            }
-        ]
-
-        total_users = 0
-        active_users = 0
-        inactive_users = 0
-
-        async for r in db[USERS_COLLECTION].aggregate(pipeline):
-            total_users += r["count"]
-
-            if r["_id"] is True:
-                active_users = r["count"]
-            elif r["_id"] is False:
-                inactive_users = r["count"]
+            scope = creator_scope(current_user.get("email"))
 
+        counts = (await get_dashboard_counters(scope)).get("users", {})
 
         data = {
-            "total_users": total_users,
-            "active_users": active_users,
-            "inactive_users": inactive_users
+            "total_users": counts.get("total", 0),
+            "active_users": counts.get("active", 0),
+            "inactive_users": counts.get("inactive", 0)
         }
 
         return data
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching user statistics: {str(e)}")
         raise HTTPException(
@@ -315,74 +215,26 @@ async def get_interviews_statistics(
     Others → interviews created by logged-in user
     """
     try:
-        db = get_database()
-
-        # Fetch logged-in user's role
-        role_doc = await db[ROLES_COLLECTION].find_one(
-            {"_id": ObjectId(current_user.get("role_id"))},
-            {"role_name": 1}
-        )
-
-        if not role_doc:
-            raise HTTPException(status_code=403, detail="Invalid role")
-
-        # Build match query
-        if role_doc.get("role_name") == "SUPER_ADMIN":
-            match_query = {}
+        # SUPER_ADMIN → all interviews, others → interviews they created
+        if await is_super_admin(current_user):
+            scope = GLOBAL_SCOPE
         else:
-            match_query = {
-                "created_by": str(current_user.get("_id"))
-            }
-
-        # Aggregation pipeline
-        pipeline = [
-            {"$match": match_query},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_interviews": {"$sum": 1},
-                    "scheduled_count": {
-                        "$sum": {
-                            "$cond": [{"$eq": ["$status", "scheduled"]}, 1, 0]
-                        }
-                    },
-                    "completed_count": {
-                        "$sum": {
-                            "$cond": [{"$eq": ["$status", "completed"]}, 1, 0]
-                        }
-                    },
-                    "draft_count": {
-                        "$sum": {
-                            "$cond": [{"$eq": ["$status", "draft"]}, 1, 0]
-                        }
-                    },
-                    "in_progress_count": {
-                        "$sum": {
-                            "$cond": [{"$eq": ["$status", "in_progress"]}, 1, 0]
-                        }
-                    }
-                }
-            }
-        ]
+            scope = creator_scope(str(current_user.get("_id")))
+
+        counts = (await get_dashboard_counters(scope)).get("interviews", {})
+        status_counts = counts.get("status", {})
 
         result = {
-            "total_interviews": 0,
-            "scheduled_count": 0,
-            "in_progress_count": 0,
-            "completed_count": 0,
-            "draft_count": 0
+            "total_interviews": counts.get("total", 0),
+            "scheduled_count": status_counts.get("scheduled", 0),
+            "in_progress_count": status_counts.get("in_progress", 0),
+            "completed_count": status_counts.get("completed", 0),
+            "draft_count": status_counts.get("draft", 0)
         }
-
-        async for r in db[SCHEDULED_INTERVIEWS_COLLECTION].aggregate(pipeline):
-            result = {
-                "total_interviews": r.get("total_interviews", 0),
-                "scheduled_count": r.get("scheduled_count", 0),
-                "in_progress_count": r.get("in_progress_count", 0),
-                "completed_count": r.get("completed_count", 0),
-                "draft_count": r.get("draft_count", 0)
-            }
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching interview statistics: {str(e)}")
         raise HTTPException(
@@ -392,4 +244,64 @@ async def get_interviews_statistics(
 
 
 
- 
\ No newline at end of file
+ 
+
+
+# Longest range each granularity may request (hourly buckets expire after
+# METRIC_ROLLUP_HOURLY_RETENTION_DAYS anyway)
+MAX_TREND_DAYS = {"day": 366, "hour": 14}
+
+
+@router.get("/metric-trends")
+async def get_metric_trends(
+    days: int = Query(90, ge=1),
+    granularity: str = Query("day", pattern="^(day|hour)$"),
+    job_posting_id: Optional[str] = Query(None),
+    current_user: dict = Depends(require_permission("INTERVIEW_VIEW"))
+):
+    """
+    Interviews scheduled/completed, screening volume and average ATS score
+    per hour or day, read from the precomputed rollups (one document per bucket).
+
+    job_posting_id → that job's trend (non-super-admins: jobs they created or are assigned to)
+    SUPER_ADMIN → all interviews
+    Others → interviews created by logged-in user
+    """
+    try:
+        if days > MAX_TREND_DAYS[granularity]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"days must be at most {MAX_TREND_DAYS[granularity]} for granularity={granularity}"
+            )
+
+        super_admin = await is_super_admin(current_user)
+        if job_posting_id:
+            if not super_admin and job_posting_id not in await get_accessible_job_ids(str(current_user.get("_id"))):
+                raise HTTPException(status_code=404, detail="Job posting not found")
+            scope = job_scope(job_posting_id)
+        elif super_admin:
+            scope = GLOBAL_SCOPE
+        else:
+            scope = creator_scope(str(current_user.get("_id")))
+
+        end = metric_rollups.bucket_start(datetime.now(timezone.utc), granularity)
+        start = end - metric_rollups.GRANULARITIES[granularity] * (
+            days * 24 - 1 if granularity == "hour" else days - 1
+        )
+        rollups = await get_metric_rollups(scope, granularity, start, end)
+
+        return {
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "points": metric_rollups.series(rollups, granularity, start, end)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching metric trends: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch metric trends"
+        )
@@ -92,8 +92,10 @@ async def get_interview(
 @router.get("/list-interviews", response_model=InterviewListResponse)
 async def list_interviews(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(none|estimated|exact)$", description="How to compute total"),
     current_user: dict = Depends(require_permission("INTERVIEW_VIEW"))
 ):
     """List interviews created by the current user"""
@@ -103,19 +105,26 @@ async def list_interviews(
         user_id = str(current_user["_id"])  # Convert ObjectId to string
         logger.info(f"Fetching interviews for user ID: {user_id}")
         interview_service = InterviewService()
-        result = await interview_service.get_interviews_by_creator(
-            user_id,
-            page,
-            page_size
-        )
+        try:
+            result = await interview_service.get_interviews_by_creator(
+                user_id,
+                page,
+                page_size,
+                cursor=cursor,
+                count=count
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         logger.info(f"Successfully retrieved {len(result['interviews'])} interviews")
         
         return InterviewListResponse(
             interviews=result["interviews"],
             total=result["total"],
+            total_is_estimate=result["total_is_estimate"],
             page=result["page"],
-            page_size=result["page_size"]
+            page_size=result["page_size"],
+            next_cursor=result["next_cursor"]
         )
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -7,7 +7,7 @@ import tempfile
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
 from ..utils.logger import get_logger
-from ..database import get_database, SCHEDULED_INTERVIEWS_COLLECTION, CANDIDATE_DOCUMENTS_COLLECTION, save_candidate_data
+from ..database import get_database, SCHEDULED_INTERVIEWS_COLLECTION, CANDIDATE_DOCUMENTS_COLLECTION, save_candidate_data, apply_dashboard_counter_changes, index_search_entries
 from ..utils.auth_dependency import  get_current_user,require_permission
 from ..services.email_service import EmailService
 from fastapi import Depends
@@ -268,6 +268,9 @@ async def schedule_interviews_bulk(
             if not result.acknowledged:
                 logger.error("Insert operation was not acknowledged by MongoDB")
                 raise RuntimeError("Insert operation failed: not acknowledged")
+
+            await apply_dashboard_counter_changes("interview", None, interview_data)
+            await index_search_entries("interview", [interview_data])
                 
             # Get the MongoDB ObjectId and convert to string
             interview_id = str(result.inserted_id)
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from bson import ObjectId
 import pymongo
 
-from app.database import get_database
+from app.database import get_database, add_job_visibility, remove_job_visibility
 from app.utils.auth_dependency import require_permission
 from app.schemas.job_mapping_schema import AssignJobRequest, RemoveAssignedUserRequest
 router = APIRouter()
@@ -57,6 +57,9 @@ async def assign_job_to_users(
     except Exception as e:
         raise HTTPException(status_code=500, detail="Assignment failed")
 
+    # Assigned users see the job through visible_to (duplicates are no-ops)
+    await add_job_visibility(job_id, [str(doc["user_id"]) for doc in documents])
+
     return {
         "message": "Job assigned successfully",
     }
@@ -135,6 +138,8 @@ async def remove_assigned_user_from_job(
             detail="Failed to remove assigned user"
         )
 
+    await remove_job_visibility(job_object_id, payload.user_id)
+
     return {
         "message": "User removed from job successfully",
         "job_id": payload.job_id,
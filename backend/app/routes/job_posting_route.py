@@ -2,11 +2,16 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.params import Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from app.database import get_database, JOB_POSTINGS_COLLECTION, USERS_COLLECTION, ROLES_COLLECTION
+from app.database import get_database, apply_dashboard_counter_changes, index_search_entries, remove_search_entry, JOB_POSTINGS_COLLECTION, USERS_COLLECTION, ROLES_COLLECTION
 from app.services.generate_jd_service import generate_jd
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime, timezone
 from app.utils.logger import get_logger
+from app.utils.pagination import fetch_keyset_page, count_for_page, keyset_query, keyset_sort, encode_cursor
+from app.utils import job_search
+from app.utils.dashboard_counters import COUNTER_FIELDS
+from app.utils.job_access_cache import invalidate_user_jobs
 from app.utils.auth_dependency import get_current_user,require_permission
 from app.schemas.job_posting_schema import (JobPostingCreate, JobPostingUpdate, JobDescriptionGenerate, JobPostingStatusUpdate)
 
@@ -14,6 +19,24 @@ logger = get_logger(__name__)
 
 router = APIRouter( tags=["Job Postings"])
 
+# Fields returned by the job posting list (descriptions stay out of list pages)
+JOB_POSTING_LIST_PROJECTION = {
+    "job_title": 1,
+    "company": 1,
+    "status": 1,
+    "created_by": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "applicants_count": 1,
+    "experience_level": 1,
+    "required_skills": 1,
+    "location": 1,
+    "job_type": 1,
+}
+
+# Search index fields stay out of every job posting response
+SEARCH_FIELDS_EXCLUDED = {"search_terms": 0, "search_terms_version": 0}
+
 def job_posting_dict(job_posting: JobPostingCreate) -> Dict[str, Any]:
     """Convert JobPostingBase to dictionary for database storage"""
     now = datetime.now(timezone.utc)
@@ -42,9 +65,14 @@ async def create_job_posting(
         job_doc = job_posting_dict(job_posting)
 
         job_doc["created_by"] = str(current_user["_id"])
+        job_doc["visible_to"] = [job_doc["created_by"]]
+        job_doc.update(job_search.search_fields(job_doc))
 
         # Insert into database
         result = await db[JOB_POSTINGS_COLLECTION].insert_one(job_doc)
+        await apply_dashboard_counter_changes("job", None, job_doc)
+        await index_search_entries("job", [job_doc])
+        invalidate_user_jobs([job_doc["created_by"]])
         
         # Return the created job posting with ID
         response_data = {
@@ -74,13 +102,41 @@ async def create_job_posting(
         logger.error(f"Error creating job posting: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def fetch_relevance_page(db, query, terms, limit, cursor=None, skip=0):
+    """
+    One page of search results ordered by relevance (then _id), with a keyset
+    cursor over (relevance, _id) like the other sort orders.
+    """
+    pipeline = [
+        {"$match": query},
+        {"$addFields": {"relevance": job_search.relevance_expression(terms)}},
+        {"$match": keyset_query({}, "relevance", -1, cursor)},
+        {"$sort": dict(keyset_sort("relevance", -1))},
+    ]
+    if skip and not cursor:
+        pipeline.append({"$skip": skip})
+    pipeline += [
+        {"$limit": limit + 1},
+        {"$project": {**JOB_POSTING_LIST_PROJECTION, "relevance": 1}},
+    ]
+    jobs = await db[JOB_POSTINGS_COLLECTION].aggregate(pipeline).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_cursor(jobs[-1]["relevance"], jobs[-1]["_id"])
+    return jobs, next_cursor
+
+
 @router.get("/get_job_postings")
 async def get_job_postings(
     status: Optional[str] = None,
     search: Optional[str] = None,
     sort: Optional[str] = "newest",
     limit: int = Query(20, ge=1, le=100),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Legacy offset, ignored when cursor is given"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(none|estimated|exact)$", description="How to compute total"),
     current_user: dict = Depends(require_permission("JOB_VIEW"))
 ):
     try:
@@ -103,23 +159,9 @@ async def get_job_postings(
         # -------------------------
         # ACCESS CONTROL
         # -------------------------
+        # visible_to = creator + actively assigned users (kept by job_mapping_route)
         if role_doc["role_name"] != "SUPER_ADMIN":
-            assignments = await db["job_assignments"].find(
-                {
-                    "user_id": user_id,
-                    "status": "active"
-                },
-                {"job_id": 1}
-            ).to_list(length=None)
-
-            assigned_job_ids = [a["job_id"] for a in assignments]
-
-            filters.append({
-                "$or": [
-                    {"created_by": str(user_id)},
-                    {"_id": {"$in": assigned_job_ids}}
-                ]
-            })
+            filters.append({"visible_to": str(user_id)})
 
         # -------------------------
         # STATUS FILTER
@@ -130,17 +172,11 @@ async def get_job_postings(
         # -------------------------
         # SEARCH FILTER
         # -------------------------
-        if search:
-            filters.append({
-                "$or": [
-                    {"job_title": {"$regex": search, "$options": "i"}},
-                    {"company": {"$regex": search, "$options": "i"}},
-                    {"location": {"$regex": search, "$options": "i"}},
-                    {"job_description": {"$regex": search, "$options": "i"}},
-                    {"required_skills": {"$regex": search, "$options": "i"}},
-                    {"job_type": {"$regex": search, "$options": "i"}}
-                ]
-            })
+        # Every word must match a whole word or (in short fields) a word prefix,
+        # looked up in the search_terms index (see utils/job_search.py)
+        terms = job_search.query_terms(search) if search else []
+        if terms:
+            filters.append(job_search.search_filter(terms))
 
         # -------------------------
         # FINAL QUERY
@@ -150,27 +186,39 @@ async def get_job_postings(
         # -------------------------
         # SORTING
         # -------------------------
+        # (field, direction); _id is appended as the keyset tie-breaker
         sort_options = {
-            "newest": [("created_at", -1)],
-            "oldest": [("created_at", 1)],
-            "title_asc": [("job_title", 1)],
-            "title_desc": [("job_title", -1)]
+            "newest": ("created_at", -1),
+            "oldest": ("created_at", 1),
+            "title_asc": ("job_title", 1),
+            "title_desc": ("job_title", -1),
+            "relevance": ("relevance", -1)
         }
-        sort_order = sort_options.get(sort, sort_options["newest"])
+        if sort == "relevance" and not terms:
+            sort = "newest"
+        sort_field, sort_direction = sort_options.get(sort, sort_options["newest"])
 
         # -------------------------
         # FETCH DATA
         # -------------------------
-        cursor = (
-            db[JOB_POSTINGS_COLLECTION]
-            .find(query)
-            .sort(sort_order)
-            .skip(skip)
-            .limit(limit)
-        )
-
-        jobs = await cursor.to_list(length=limit)
-        total = await db[JOB_POSTINGS_COLLECTION].count_documents(query)
+        try:
+            if sort == "relevance":
+                jobs, next_cursor = await fetch_relevance_page(db, query, terms, limit, cursor, skip)
+            else:
+                jobs, next_cursor = await fetch_keyset_page(
+                    db[JOB_POSTINGS_COLLECTION],
+                    query,
+                    sort_field,
+                    sort_direction,
+                    limit,
+                    cursor=cursor,
+                    projection=JOB_POSTING_LIST_PROJECTION,
+                    skip=skip
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        counts = await count_for_page(db[JOB_POSTINGS_COLLECTION], query, count)
 
         # -------------------------
         # RESPONSE
@@ -189,17 +237,22 @@ async def get_job_postings(
                 "skills": job.get("required_skills"),
                 "work_location": job.get("location"),
                 "job_type": job.get("job_type"),
+                **({"relevance": job["relevance"]} if "relevance" in job else {}),
             }
             for job in jobs
         ]
 
         return {
             "job_postings": result,
-            "total": total,
+            "total": counts["total"],
+            "total_is_estimate": counts["total_is_estimate"],
             "limit": limit,
-            "skip": skip
+            "skip": skip,
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing job postings: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -214,7 +267,7 @@ async def get_job_posting(job_id: str, current_user: dict = Depends(require_perm
         db = get_database()
         
         # Fetch job posting
-        job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)}, SEARCH_FIELDS_EXCLUDED)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail="Invalid job ID")
@@ -270,14 +323,20 @@ async def update_job_posting(
             "updated_at": now,
             "ai_generated": job_posting.use_ai_generation
         }
+        update_data.update(job_search.search_fields({**existing_job, **update_data}))
         
-        await db[JOB_POSTINGS_COLLECTION].update_one(
+        previous_job = await db[JOB_POSTINGS_COLLECTION].find_one_and_update(
             {"_id": ObjectId(job_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection=COUNTER_FIELDS["job"],
+            return_document=ReturnDocument.BEFORE
         )
+        if previous_job is not None:
+            await apply_dashboard_counter_changes("job", previous_job, {**previous_job, **update_data})
+            await index_search_entries("job", [{**existing_job, **update_data}])
         
         # Return updated job posting
-        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)}, SEARCH_FIELDS_EXCLUDED)
         
         return {
             "id": str(updated_job["_id"]),
@@ -303,10 +362,17 @@ async def delete_job_posting(job_id: str, current_user: dict = Depends(require_p
             raise HTTPException(status_code=404, detail="Job posting not found")
         
         # Delete job posting
-        result = await db[JOB_POSTINGS_COLLECTION].delete_one({"_id": ObjectId(job_id)})
+        deleted_job = await db[JOB_POSTINGS_COLLECTION].find_one_and_delete(
+            {"_id": ObjectId(job_id)},
+            projection={**COUNTER_FIELDS["job"], "visible_to": 1}
+        )
         
-        if result.deleted_count == 0:
+        if deleted_job is None:
             raise HTTPException(status_code=404, detail="Job posting not found")
+
+        await apply_dashboard_counter_changes("job", deleted_job, None)
+        await remove_search_entry("job", job_id)
+        invalidate_user_jobs(deleted_job.get("visible_to", []))
         
         return {"message": "Job posting deleted successfully"}
     except Exception as e:
@@ -337,13 +403,17 @@ async def update_job_posting_status(
         
         # Update status
         now = datetime.now(timezone.utc)
-        await db[JOB_POSTINGS_COLLECTION].update_one(
+        previous_job = await db[JOB_POSTINGS_COLLECTION].find_one_and_update(
             {"_id": ObjectId(job_id)},
-            {"$set": {"status": status_update.status, "updated_at": now}}
+            {"$set": {"status": status_update.status, "updated_at": now}},
+            projection=COUNTER_FIELDS["job"],
+            return_document=ReturnDocument.BEFORE
         )
+        if previous_job is not None:
+            await apply_dashboard_counter_changes("job", previous_job, {**previous_job, "status": status_update.status})
         
         # Return updated job posting
-        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)}, SEARCH_FIELDS_EXCLUDED)
         
         return {
             "id": str(updated_job["_id"]),
@@ -390,18 +460,25 @@ async def update_job_description(
         new_jd = data["job_description"]
 
         # Update only the job_description
-        await db[JOB_POSTINGS_COLLECTION].update_one(
+        job = await db[JOB_POSTINGS_COLLECTION].find_one_and_update(
             {"_id": ObjectId(job_id)},
             {
                 "$set": {
                     "job_description": new_jd,
                     "updated_at": datetime.now(timezone.utc)
                 }
-            }
+            },
+            projection={field: 1 for field in job_search.FIELD_WEIGHTS},
+            return_document=ReturnDocument.AFTER
         )
+        if job is not None:
+            await db[JOB_POSTINGS_COLLECTION].update_one(
+                {"_id": job["_id"]},
+                {"$set": job_search.search_fields(job)}
+            )
 
         # Fetch updated job posting
-        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        updated_job = await db[JOB_POSTINGS_COLLECTION].find_one({"_id": ObjectId(job_id)}, SEARCH_FIELDS_EXCLUDED)
 
         return {
             "id": str(updated_job["_id"]),
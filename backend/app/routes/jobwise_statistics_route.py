@@ -15,6 +15,42 @@ from app.schemas.jobwise_statistics_schema import JobTitleResponse
 
 router = APIRouter()
 
+
+def build_jobwise_statistics_pipeline(query: Dict) -> List[Dict]:
+    """
+    Jobs matching `query` with their completed-interview count, in one pipeline.
+
+    The $lookup joins on scheduled_interviews.job_posting_id (a string id) and
+    is served by the (job_posting_id, status) index, so every job costs an
+    index range count on the server instead of a round trip.
+    """
+    return [
+        {"$match": query},
+        {
+            "$project": {
+                "job_title": 1,
+                "created_at": 1,
+                "number_of_applications": 1,
+                "status": 1,
+                "job_id": {"$toString": "$_id"}
+            }
+        },
+        {
+            "$lookup": {
+                "from": SCHEDULED_INTERVIEWS_COLLECTION,
+                "localField": "job_id",
+                "foreignField": "job_posting_id",
+                "pipeline": [
+                    {"$match": {"status": "completed"}},
+                    {"$count": "count"}
+                ],
+                "as": "interviewed"
+            }
+        },
+        {"$addFields": {"interviewed": {"$ifNull": [{"$first": "$interviewed.count"}, 0]}}}
+    ]
+
+
 @router.get("/jobwise-statistics", response_model=List[JobTitleResponse])
 async def jobwise_statistics(
     current_user: dict = Depends(get_current_user)
@@ -41,36 +77,13 @@ async def jobwise_statistics(
         if role_doc["role_name"] == "SUPER_ADMIN":
             query = {}
         else:
-            assignments = await db["job_assignments"].find(
-                {
-                    "user_id": user_id,
-                    "status": "active"
-                },
-                {"job_id": 1}
-            ).to_list(length=None)
-
-            assigned_job_ids = [a["job_id"] for a in assignments]
-
-            query = {
-                "$or": [
-                    {"created_by": str(user_id)},
-                    {"_id": {"$in": assigned_job_ids}}
-                ]
-            }
+            # visible_to = creator + actively assigned users
+            query = {"visible_to": str(user_id)}
 
         # -------------------------
-        # FETCH JOBS
+        # FETCH JOBS + INTERVIEW COUNTS
         # -------------------------
-        cursor = db[JOB_POSTINGS_COLLECTION].find(
-            query,
-            {
-                "_id": 1,
-                "job_title": 1,
-                "created_at": 1,
-                "number_of_applications": 1,
-                "status": 1
-            }
-        )
+        cursor = db[JOB_POSTINGS_COLLECTION].aggregate(build_jobwise_statistics_pipeline(query))
 
         results = []
 
@@ -85,23 +98,12 @@ async def jobwise_statistics(
 
                 posted_days_ago = (now.date() - created_at.date()).days
 
-            # Applications count
-            applications_count = doc.get("number_of_applications", 0)
-
-            # Interviewed count
-            interviewed_count = await db[SCHEDULED_INTERVIEWS_COLLECTION].count_documents(
-                {
-                    "job_posting_id": str(doc["_id"]),
-                    "status": "completed"
-                }
-            )
-
             results.append({
                 "job_title": doc.get("job_title"),
                 "posted_days_ago": posted_days_ago,
-                "number_of_applications": applications_count,
+                "number_of_applications": doc.get("number_of_applications", 0),
                 "shortlisted": 0,  # placeholder
-                "interviewed": interviewed_count,
+                "interviewed": doc["interviewed"],
                 "status": doc.get("status")
             })
 
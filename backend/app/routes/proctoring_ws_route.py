@@ -1,5 +1,7 @@
 import json
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from ..database import is_proctorable_interview
+from ..services.proctoring_service import proctoring_engine
 from ..utils.websocket_manager import manager
 from ..utils.logger import get_logger
 
@@ -9,16 +11,45 @@ router = APIRouter(tags=["Proctoring"])
 
 @router.websocket("/proctoring/{session_id}")
 async def proctoring_ws(websocket: WebSocket, session_id: str):
+    """
+    Proctoring channel for one interview session.
+
+    Text messages are client-detected events (JSON) relayed to everyone on the
+    session. Binary messages are downscaled JPEG frames from the candidate's
+    camera; they are analyzed server-side and any warnings they raise are
+    broadcast as PROCTOR_EVENTs with source "server".
+
+    The session id is the interview id; only interviews still in progress are
+    accepted, so frames for arbitrary ids never reach the detectors.
+    """
+    try:
+        allowed = await is_proctorable_interview(session_id)
+    except Exception as e:
+        logger.error(f" Proctoring WS could not verify interview {session_id}: {e}")
+        allowed = False
+    if not allowed:
+        logger.warning(f" Proctoring WS rejected: {session_id} is not an active interview")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
     # MUST accept here (NOT inside manager)
     await websocket.accept()
     await manager.connect(websocket, session_id)
+    proctoring_engine.open_session(session_id)
 
     logger.info(f" Proctoring WS connected: {session_id}")
 
     try:
         while True:
-            msg = await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                await handle_frame(websocket, session_id, message["bytes"])
+                continue
 
+            msg = message.get("text") or ""
             try:
                 event = json.loads(msg)
             except Exception:
@@ -33,8 +64,39 @@ async def proctoring_ws(websocket: WebSocket, session_id: str):
 
     except WebSocketDisconnect:
         logger.warning(f" Proctoring WS disconnected: {session_id}")
-        await manager.disconnect(websocket)
 
     except Exception as e:
         logger.exception(f" Proctoring WS error: {str(e)}")
+
+    finally:
+        proctoring_engine.close_session(session_id)
         await manager.disconnect(websocket)
+
+
+async def handle_frame(websocket: WebSocket, session_id: str, data: bytes):
+    try:
+        result = await proctoring_engine.submit_frame(session_id, data)
+    except ValueError as e:
+        await websocket.send_text(json.dumps({"type": "PROCTOR_ERROR", "detail": str(e)}))
+        return
+    except Exception as e:
+        # Worker unreachable, model failed to load, ...: report it but keep the
+        # socket (and the relay of client events) open for the next frame
+        logger.error(f" Proctoring frame analysis failed for {session_id}: {e}")
+        await websocket.send_text(json.dumps({"type": "PROCTOR_ERROR", "detail": "Frame analysis is unavailable"}))
+        return
+
+    if result is None:
+        # Over the session's frame-rate cap
+        return
+
+    for warning in result["warnings"]:
+        logger.info(f" Proctor warning for {session_id}: {warning}")
+        await manager.broadcast(
+            {
+                "type": "PROCTOR_EVENT",
+                "session_id": session_id,
+                "event": {"type": warning, "source": "server", "statistics": result["statistics"]},
+            },
+            session_id=session_id,
+        )
@@ -1,72 +1,140 @@
-from fastapi import APIRouter, HTTPException, Response, Query
-from bson import Binary, ObjectId
-from app.database import fetch_interview_report_data, get_database, CANDIDATES_REPORTS_COLLECTION
+from fastapi import APIRouter, HTTPException, Response, Query, Request
+from fastapi.responses import StreamingResponse
+from bson import ObjectId
+from app.database import (
+    get_database,
+    get_report_pdf_info,
+    migrate_embedded_report_pdf,
+    open_report_pdf_stream,
+    is_completed_interview,
+    CANDIDATES_REPORTS_COLLECTION,
+)
 from typing import List, Optional
-import base64
 from app.utils.logger import get_logger
+from app.utils.pagination import fetch_keyset_page, count_for_page
+from app.services.export_service import export_candidate_reports, parquet_available, EXPORT_FORMATS
 from fastapi import Depends
 from app.utils.auth_dependency import get_current_user, require_permission
+from app.services.report_pipeline_service import report_pipeline_service, REPORT_STATUS_PENDING, REPORT_STATUS_READY, REPORT_STATUS_FAILED
 logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Size of each chunk read from GridFS while streaming a download
+PDF_STREAM_CHUNK_SIZE = 256 * 1024
+
+# List pages only need the scores; the PDF, transcripts and code stay behind
+REPORT_LIST_PROJECTION = {
+    "report_pdf": 0,
+    "Voice_data.transcript_texts": 0,
+    "Coding_data.candidate_answer": 0,
+}
+
+
+def parse_byte_range(range_header: Optional[str], size: int):
+    """
+    Parse a single "bytes=start-end" range into inclusive (start, end).
+
+    Returns None when the header is absent or not a single byte range (the whole
+    file is sent), and raises ValueError when the range can't be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError("Empty suffix range")
+            return max(size - length, 0), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        raise ValueError(f"Invalid range: {range_header}")
+
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    return start, min(end, size - 1)
+
+
 @router.get("/download-report-pdf")
 async def download_report_pdf(
     interview_id: str,
+    request: Request,
     current_user: dict = Depends(require_permission("REPORT_VIEW"))
 ):
     """
-    Fetch the stored PDF from MongoDB and return it as a downloadable file.
+    Stream the stored report PDF from GridFS as a downloadable file.
+
+    Supports ETag / If-None-Match and single HTTP byte ranges (Range / If-Range).
     """
     try:
-        logger.info(f"Fetching report data for interview ID: {interview_id}")
-        data = await fetch_interview_report_data(interview_id)
-        if not data:
+        logger.info(f"Fetching report PDF for interview ID: {interview_id}")
+        info = await get_report_pdf_info(interview_id)
+        if not info:
             logger.warning(f"No report data found for interview ID: {interview_id}")
             raise HTTPException(status_code=404, detail="Report data not found")
 
-        # Check if report_pdf field exists
-        if "report_pdf" not in data:
-            logger.warning(f"No report_pdf field in report data for interview ID: {interview_id}")
+        # Report still being built (or the build failed)
+        if info.get("report_status") in (REPORT_STATUS_PENDING, REPORT_STATUS_FAILED):
+            raise HTTPException(status_code=409, detail=f"Report PDF is not available yet (status: {info['report_status']})")
+
+        # Reports saved before PDFs moved to GridFS are migrated on first download
+        if not info.get("report_pdf_file_id") and info.get("has_embedded_pdf"):
+            logger.info(f"Moving embedded report PDF to GridFS for interview ID: {interview_id}")
+            await migrate_embedded_report_pdf(interview_id)
+            info = await get_report_pdf_info(interview_id)
+
+        if not info or not info.get("report_pdf_file_id"):
+            logger.warning(f"No report PDF stored for interview ID: {interview_id}")
             raise HTTPException(status_code=404, detail="Report PDF not found. The PDF may not have been generated yet.")
-        
-        logger.info(f"Found report_pdf field with type: {type(data['report_pdf'])}")
 
-        pdf_binary = data["report_pdf"]
+        etag = f'"{info["report_pdf_sha256"]}"'
+        headers = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": f"attachment; filename=Candidate_Assessment_Report_{interview_id}.pdf",
+        }
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        grid_out = await open_report_pdf_stream(info["report_pdf_file_id"])
+        size = grid_out.length
+
+        # If-Range: only honour the range if the client still has this version
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if if_range and if_range != etag:
+            range_header = None
 
-        # Handle different possible formats (Binary, bytes, or base64 dict)
         try:
-            if isinstance(pdf_binary, Binary):
-                pdf_bytes = bytes(pdf_binary)
-            elif isinstance(pdf_binary, bytes):
-                # Already in bytes format, use directly
-                pdf_bytes = pdf_binary
-            elif isinstance(pdf_binary, dict) and "$binary" in pdf_binary:
-                base64_data = pdf_binary["$binary"]["base64"]
-                pdf_bytes = base64.b64decode(base64_data)
-            else:
-                logger.error(f"Invalid PDF format: {type(pdf_binary)}")
-                raise HTTPException(status_code=400, detail=f"Invalid PDF format in database: {type(pdf_binary)}")
-
-            # Log success and PDF size
-            logger.info(f"Successfully processed PDF data, size: {len(pdf_bytes)} bytes")
-            
-            # Return PDF as downloadable response
-            return Response(
-                content=pdf_bytes,
-                media_type="application/pdf",
-                headers={"Content-Disposition": f"attachment; filename=Candidate_Assessment_Report_{interview_id}.pdf"},
-            )
-        except Exception as e:
-            logger.error(f"Error processing PDF binary: {e}, type: {type(pdf_binary)}")
-            # Include more details in the error message
-            if isinstance(pdf_binary, bytes):
-                logger.error(f"PDF bytes length: {len(pdf_binary)}")
-            elif isinstance(pdf_binary, Binary):
-                logger.error(f"Binary object type: {type(pdf_binary)}")
-            elif isinstance(pdf_binary, dict):
-                logger.error(f"Dictionary keys: {pdf_binary.keys()}")
-            raise HTTPException(status_code=500, detail=f"Error processing PDF data: {e}")
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        start, end = byte_range if byte_range else (0, size - 1)
+        status_code = 206 if byte_range else 200
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+
+        async def stream_pdf():
+            if start:
+                grid_out.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await grid_out.read(min(PDF_STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        return StreamingResponse(stream_pdf(), status_code=status_code, media_type="application/pdf", headers=headers)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -77,10 +145,74 @@ async def download_report_pdf(
 
 
 
+def build_report_filter(
+    candidate_name: Optional[str],
+    candidate_email: Optional[str],
+    job_role: Optional[str],
+    interview_id: Optional[str],
+) -> dict:
+    filter_query = {}
+    if candidate_name:
+        filter_query["candidate_name"] = {"$regex": candidate_name, "$options": "i"}
+    if candidate_email:
+        filter_query["candidate_email"] = {"$regex": candidate_email, "$options": "i"}
+    if job_role:
+        filter_query["job_role"] = {"$regex": job_role, "$options": "i"}
+    if interview_id:
+        filter_query["interview_id"] = interview_id
+    return filter_query
+
+
+async def fetch_report_page(filter_query: dict, page: int, page_size: int, cursor: Optional[str], count: str) -> dict:
+    """
+    One page of reports, newest first, keyed on _id.
+
+    page is only used when no cursor is given (offset for legacy callers).
+    """
+    db = get_database()
+    collection = db[CANDIDATES_REPORTS_COLLECTION]
+
+    try:
+        reports, next_cursor = await fetch_keyset_page(
+            collection,
+            filter_query,
+            "_id",
+            -1,
+            page_size,
+            cursor=cursor,
+            projection=REPORT_LIST_PROJECTION,
+            skip=(page - 1) * page_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Convert ObjectId to string for JSON serialization
+    for report in reports:
+        if "_id" in report:
+            report["_id"] = str(report["_id"])
+
+    counts = await count_for_page(collection, filter_query, count)
+    total = counts["total"]
+
+    return {
+        "reports": reports,
+        "pagination": {
+            "total": total,
+            "total_is_estimate": counts["total_is_estimate"],
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+            "next_cursor": next_cursor
+        }
+    }
+
+
 @router.get("/candidate_reports")
 async def list_candidate_reports(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(none|estimated|exact)$", description="How to compute total"),
     candidate_name: Optional[str] = None,
     candidate_email: Optional[str] = None,
     job_role: Optional[str] = None,
@@ -89,58 +221,17 @@ async def list_candidate_reports(
 ):
     """
     Fetch all candidate reports with pagination and filtering options.
-    Returns a list of reports without the PDF binary data.
+    Returns a list of reports without the PDF, transcripts or submitted code.
     """
     try:
-        db = get_database()
-        
-        # Build the filter query
-        filter_query = {}
-        if candidate_name:
-            filter_query["candidate_name"] = {"$regex": candidate_name, "$options": "i"}
-        if candidate_email:
-            filter_query["candidate_email"] = {"$regex": candidate_email, "$options": "i"}
-        if job_role:
-            filter_query["job_role"] = {"$regex": job_role, "$options": "i"}
-        if interview_id:
-            filter_query["interview_id"] = interview_id
-            
-        # Calculate skip value for pagination
-        skip = (page - 1) * page_size
-        
-        # Get total count for pagination
-        total_count = await db["candidates_reports"].count_documents(filter_query)
-        
-        # Fetch reports with pagination
-        cursor = db["candidates_reports"].find(
-            filter_query,
-            # Exclude the PDF binary data to reduce response size
-            {"report_pdf": 0}
-        ).skip(skip).limit(page_size)
-        
-        # Convert cursor to list
-        reports = await cursor.to_list(length=page_size)
-        
-        # Convert ObjectId to string for JSON serialization
-        for report in reports:
-            if "_id" in report:
-                report["_id"] = str(report["_id"])
-        
-        # Calculate total pages
-        total_pages = (total_count + page_size - 1) // page_size
-        
-        logger.info(f"Fetched {len(reports)} candidate reports (page {page}/{total_pages})")
-        
-        return {
-            "reports": reports,
-            "pagination": {
-                "total": total_count,
-                "page": page,
-                "page_size": page_size,
-                "total_pages": total_pages
-            }
-        }
-        
+        filter_query = build_report_filter(candidate_name, candidate_email, job_role, interview_id)
+        result = await fetch_report_page(filter_query, page, page_size, cursor, count)
+
+        logger.info(f"Fetched {len(result['reports'])} candidate reports (page {page})")
+        return result
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching candidate reports: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching candidate reports: {e}")
@@ -150,8 +241,10 @@ async def list_candidate_reports(
 @router.get("/job_posting_candidate_reports")
 async def job_posting_candidate_reports(
     job_posting_id: str,
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(none|estimated|exact)$", description="How to compute total"),
     candidate_name: Optional[str] = None,
     candidate_email: Optional[str] = None,
     job_role: Optional[str] = None,
@@ -159,43 +252,53 @@ async def job_posting_candidate_reports(
     current_user: dict = Depends(require_permission("REPORT_VIEW"))
 ):
     """
-    Fetch all candidate reports with pagination and filtering options.
-    Returns a list of reports without the PDF binary data.
+    Fetch candidate reports for one job posting with pagination and filtering options.
+    Returns a list of reports without the PDF, transcripts or submitted code.
     """
     try:
-        db = get_database()
-        
-        
-        # Fetch reports with pagination
-        cursor = db["candidates_reports"].find(
-            {"job_posting_id": str(job_posting_id)},
-            # Exclude the PDF binary data to reduce response size
-            {"report_pdf": 0}
-        )
-        
-        # Convert cursor to list
-        reports = await cursor.to_list(length=page_size)
-        
-        # Convert ObjectId to string for JSON serialization
-        for report in reports:
-            if "_id" in report:
-                report["_id"] = str(report["_id"])
-        
-        
-        return {
-            "reports": reports,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-            }
-        }
-        
+        filter_query = build_report_filter(candidate_name, candidate_email, job_role, interview_id)
+        filter_query["job_posting_id"] = str(job_posting_id)
+        return await fetch_report_page(filter_query, page, page_size, cursor, count)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in job_posting_candidate_reports: {e}")
         raise HTTPException(status_code=500, detail=f"Error in job_posting_candidate_reports: {e}")
 
 
 
+@router.get("/export_candidate_reports")
+async def export_candidate_reports_route(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="csv, ndjson or parquet"),
+    job_posting_id: Optional[str] = None,
+    candidate_name: Optional[str] = None,
+    candidate_email: Optional[str] = None,
+    job_role: Optional[str] = None,
+    interview_id: Optional[str] = None,
+    current_user: dict = Depends(require_permission("REPORT_VIEW"))
+):
+    """
+    Stream report scores (one flat row per candidate) as CSV, NDJSON or Parquet.
+    Rows are read and written one Mongo batch at a time.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    filter_query = build_report_filter(candidate_name, candidate_email, job_role, interview_id)
+    if job_posting_id:
+        filter_query["job_posting_id"] = str(job_posting_id)
+
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"candidate_reports_{job_posting_id}" if job_posting_id else "candidate_reports"
+    return StreamingResponse(
+        export_candidate_reports(filter_query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
+
 ##single candidate report
 @router.get("/candidate_report/{interview_id}")
 async def candidate_report(
@@ -222,3 +325,56 @@ async def candidate_report(
     except Exception as e:
         logger.error(f"Error fetching candidate reports: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching candidate reports: {e}")
+
+
+
+@router.get("/report_status/{interview_id}")
+async def report_status(
+    interview_id: str,
+    current_user: dict = Depends(require_permission("REPORT_VIEW"))
+):
+    """
+    Return the report pipeline status for an interview: pending, ready or failed.
+    Reports created before the pipeline existed have no status and are treated as ready.
+    """
+    try:
+        db = get_database()
+        report = await db[CANDIDATES_REPORTS_COLLECTION].find_one(
+            {"interview_id": str(interview_id)},
+            {"report_status": 1, "report_error": 1, "report_status_updated_at": 1, "_id": 0}
+        )
+        if report is None:
+            raise HTTPException(status_code=404, detail="Report not found")
+
+        return {
+            "interview_id": interview_id,
+            "report_status": report.get("report_status", REPORT_STATUS_READY),
+            "report_error": report.get("report_error"),
+            "updated_at": report.get("report_status_updated_at"),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching report status: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching report status: {e}")
+
+
+@router.post("/regenerate/{interview_id}")
+async def regenerate_report(
+    interview_id: str,
+    current_user: dict = Depends(require_permission("REPORT_REGENERATE"))
+):
+    """
+    Queue the report for a completed interview to be rebuilt (e.g. after it failed).
+    """
+    try:
+        if not await is_completed_interview(interview_id):
+            raise HTTPException(status_code=404, detail="Completed interview not found")
+        await report_pipeline_service.enqueue(interview_id)
+        return {"interview_id": interview_id, "report_status": REPORT_STATUS_PENDING}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error queueing report regeneration: {e}")
+        raise HTTPException(status_code=500, detail=f"Error queueing report regeneration: {e}")
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 import tempfile
 import shutil
 import asyncio
 from app.services.resume_screening_service import process_resume_screening
 from app.database import upsert_screening_results,get_database, SCREENING_COLLECTION
 from app.utils.auth_dependency import get_current_user, require_permission
+from app.utils.pagination import fetch_keyset_page
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+from app.services.export_service import export_screening_results, parquet_available, EXPORT_FORMATS
 
 
 router = APIRouter()
@@ -56,9 +59,16 @@ async def resume_screening_endpoint(
 
 
 @router.get("/get-resume-screening/results")
-async def get_resume_screening_results(job_posting_id: str, min_ats_score: float | None = None,current_user: dict = Depends(require_permission("RESUME_SCREENING_RESULTS"))):
+async def get_resume_screening_results(
+    job_posting_id: str,
+    min_ats_score: float | None = None,
+    limit: int = Query(1000, ge=1, le=1000, description="Page size"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    current_user: dict = Depends(require_permission("RESUME_SCREENING_RESULTS"))
+):
     """
-    Fetch all saved resume screening results (up to 1000 records).
+    Fetch saved resume screening results for a job posting, one page at a time
+    (ordered by _id; pass next_cursor back to continue).
     """
     db = get_database()
     query = {"job_posting_id": job_posting_id}
@@ -66,8 +76,17 @@ async def get_resume_screening_results(job_posting_id: str, min_ats_score: float
     if min_ats_score is not None:
         query["ATS_Score"] = {"$gte": min_ats_score}
 
-    cursor = db[SCREENING_COLLECTION].find(query)
-    results = await cursor.to_list(length=1000)
+    try:
+        results, next_cursor = await fetch_keyset_page(
+            db[SCREENING_COLLECTION],
+            query,
+            "_id",
+            1,
+            limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert any ObjectId to string for JSON serialization
     for doc in results:
@@ -77,4 +96,30 @@ async def get_resume_screening_results(job_posting_id: str, min_ats_score: float
             except Exception:
                 pass
 
-    return {"results": results}
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@router.get("/get-resume-screening/export")
+async def export_resume_screening_results(
+    job_posting_id: str,
+    min_ats_score: float | None = None,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="csv, ndjson or parquet"),
+    current_user: dict = Depends(require_permission("RESUME_SCREENING_RESULTS"))
+):
+    """
+    Stream every screening result for a job posting as CSV, NDJSON or Parquet.
+    Rows are read and written one Mongo batch at a time.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    query = {"job_posting_id": job_posting_id}
+    if min_ats_score is not None:
+        query["ATS_Score"] = {"$gte": min_ats_score}
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_screening_results(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="screening_results_{job_posting_id}.{extension}"'}
+    )
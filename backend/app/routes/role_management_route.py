@@ -4,7 +4,9 @@ from app.utils.auth_dependency import get_current_user, require_permission
 from fastapi.params import Depends
 from app.RBAC.role_creation import create_role, update_role
 from pydantic import BaseModel
-from app.database import ROLES_COLLECTION, get_database, PERMISSIONS_COLLECTION
+from app.database import ROLES_COLLECTION, get_database, PERMISSIONS_COLLECTION, apply_dashboard_counter_changes
+from app.utils.dashboard_counters import COUNTER_FIELDS
+from app.utils.org_tree_cache import invalidate_org_tree
 from typing import List
 from app.schemas.role_management_schema import CreateRoleRequest, UpdateRoleRequest, GetPermissionsResponse
 import logging
@@ -283,13 +285,19 @@ async def delete_role_endpoint(
             )
         
         # Delete the role
-        result = await db[ROLES_COLLECTION].delete_one({"_id": role_obj_id})
+        deleted_role = await db[ROLES_COLLECTION].find_one_and_delete(
+            {"_id": role_obj_id},
+            projection=COUNTER_FIELDS["role"]
+        )
         
-        if result.deleted_count == 0:
+        if deleted_role is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete role"
             )
+
+        await apply_dashboard_counter_changes("role", deleted_role, None)
+        invalidate_org_tree()
         
         return {
             "message": "Role deleted successfully",
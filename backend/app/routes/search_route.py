@@ -0,0 +1,62 @@
+from typing import Optional
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.database import get_database, ROLES_COLLECTION
+from app.services.search_service import search_service, KIND_ORDER
+from app.utils.auth_dependency import get_current_user
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get("")
+async def global_search(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, email or job title (prefixes match)"),
+    kinds: Optional[str] = Query(None, description="Comma-separated subset of interview,report,screening,job"),
+    limit: int = Query(5, ge=1, le=20, description="Results per kind"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Omnibox search across interviews, candidate reports, screening results and
+    job postings.
+
+    Each kind needs its view permission; users other than SUPER_ADMIN only see
+    entities they created or that belong to a job they created or are assigned to.
+    """
+    try:
+        requested = None
+        if kinds:
+            requested = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+            unknown = set(requested) - set(KIND_ORDER)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+        role_id = current_user.get("role_id")
+        role_id = role_id["_id"] if isinstance(role_id, dict) else role_id
+        if not role_id:
+            raise HTTPException(status_code=403, detail="Role not assigned")
+
+        db = get_database()
+        role = await db[ROLES_COLLECTION].find_one(
+            {"_id": ObjectId(role_id)},
+            {"role_name": 1, "permissions": 1}
+        )
+        if not role:
+            raise HTTPException(status_code=403, detail="Role not found")
+
+        results = await search_service.search(
+            q,
+            str(current_user["_id"]),
+            search_service.allowed_kinds(role, requested),
+            is_super_admin=role.get("role_name") == "SUPER_ADMIN",
+            limit=limit
+        )
+        return {"query": q, "results": results}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running global search: {e}")
+        raise HTTPException(status_code=500, detail="Search failed")
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime, timezone
 import re
 from app.services.user_management_service import UserService
 from app.utils.logger import get_logger
+from app.utils.pagination import fetch_keyset_page, count_for_page
 from app.utils.auth_dependency import get_current_user, require_permission
 from bson import ObjectId
-from app.utils.build_user_tree import build_user_tree
-from app.database import get_database, USERS_COLLECTION, ROLES_COLLECTION
+from app.services.org_tree_service import org_tree_service
+from app.database import USERS_COLLECTION
 from app.schemas.user_management_schema import UserCreate, UserUpdate
 
 logger = get_logger(__name__)
@@ -17,6 +18,9 @@ router = APIRouter(
     tags=["Users"]
 )
 
+# Credentials never leave the users collection
+USER_LIST_PROJECTION = {"password": 0, "hashed_password": 0}
+
 @router.post("/create")
 async def create_user(
     payload: UserCreate,
@@ -129,29 +133,55 @@ async def delete_user(
 
 @router.get("/get-all-users")
 async def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the full list"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(none|estimated|exact)$", description="How to compute total"),
     current_user: dict = Depends(require_permission("USER_VIEW"))
 ):
     """
-    Fetch all users
+    Fetch all users.
+
+    Without limit/cursor the full list is returned (existing callers); with them
+    the response is one page ordered by _id plus next_cursor for the following page.
     """
     try:
         user_service = UserService()
         db = user_service.db
-        created_by = current_user.get("email")
-        users = []
-        cursor = db["users"].find(
-            {},
-            {
-                "password": 0  # never expose password
-            }
-        )
 
-        async for user in cursor:
+        if limit is None and cursor is None:
+            users = []
+            users_cursor = db[USERS_COLLECTION].find({}, USER_LIST_PROJECTION)
+            async for user in users_cursor:
+                user["_id"] = str(user["_id"])  # ObjectId → string
+                users.append(user)
+            return users
+
+        try:
+            users, next_cursor = await fetch_keyset_page(
+                db[USERS_COLLECTION],
+                {},
+                "_id",
+                1,
+                limit or 50,
+                cursor=cursor,
+                projection=USER_LIST_PROJECTION
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        for user in users:
             user["_id"] = str(user["_id"])  # ObjectId → string
-            users.append(user)
+        counts = await count_for_page(db[USERS_COLLECTION], {}, count)
 
-        return users
+        return {
+            "users": users,
+            "total": counts["total"],
+            "total_is_estimate": counts["total_is_estimate"],
+            "next_cursor": next_cursor
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching users: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch users")
@@ -192,44 +222,64 @@ async def get_user_hierarchy(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get hierarchical user data showing who created whom
+    Get hierarchical user data showing who reports to whom.
+    Served from the cached org tree; user and role writes invalidate it.
     """
     try:
-        db = get_database()
-        
-        # Get all users
-        users = await db[USERS_COLLECTION].find(
-            {},
-            {"_id": 1, "first_name": 1, "last_name": 1, "email": 1, "role_id": 1,"reporting_manager": 1}
-        ).to_list(length=None)
-        
-        # Ensure users is a list
-        if users is None:
-            users = []
-        
-        # Convert ObjectIds to strings for JSON serialization
-        for user in users:
-            user["_id"] = str(user["_id"])
-            user["role_id"] = str(user["role_id"]) if user.get("role_id") else None
-            user["reporting_manager"] = (
-                str(user["reporting_manager"])
-                if user.get("reporting_manager")
-                else None
-            )
+        return await org_tree_service.get_tree()
 
-        
-        # Get role information for each user
-        for user in users:
-            if "role_id" in user and user["role_id"]:
-                role = await db[ROLES_COLLECTION].find_one({"_id": ObjectId(user["role_id"])})
-                if role:
-                    user["role_name"] = role.get("role_name")
-        print(users)
-        print("-----")
-        hierarchy = build_user_tree(users)
-
-        return hierarchy
-    
     except Exception as e:
         logger.error(f"Error fetching user hierarchy: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch user hierarchy")
+
+
+@router.get("/user-hierarchy/{user_id}/subtree")
+async def get_user_subtree(
+    user_id: str,
+    max_depth: int = Query(2, ge=1, le=10, description="Levels below the user to include"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Everyone under a manager, up to max_depth levels down, as a nested tree.
+    Nodes on the last level carry has_more_children; expand them with /children.
+    """
+    try:
+        subtree = await org_tree_service.get_subtree(user_id, max_depth)
+        if subtree is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return subtree
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching subtree for user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch user subtree")
+
+
+@router.get("/user-hierarchy/{user_id}/children")
+async def get_user_children(
+    user_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    One page of a manager's direct reports, each with has_children, so the
+    org chart can be expanded a level at a time.
+    """
+    try:
+        try:
+            children, next_cursor = await org_tree_service.get_direct_reports(user_id, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "children": children,
+            "next_cursor": next_cursor
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching direct reports for user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch direct reports")
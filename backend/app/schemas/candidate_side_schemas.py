@@ -5,15 +5,16 @@ class MCQResponse(BaseModel):
     question: str
     question_id: int  # Add question_id field
     selected_answer: str
-    correct_answer: str
-    is_correct: bool
+    # Correctness is computed server-side; these are accepted for backward compatibility only
+    correct_answer: Optional[str] = None
+    is_correct: Optional[bool] = None
 
 class MCQSubmission(BaseModel):
     interview_id: str
     candidate_email: str
     responses: List[MCQResponse]
-    total_score: int
-    max_score: int
+    total_score: Optional[int] = None
+    max_score: Optional[int] = None
 
 class MCQGenerationRequest(BaseModel):
     candidate_email: str
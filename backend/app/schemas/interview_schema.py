@@ -94,6 +94,8 @@ class InterviewResponse(BaseModel):
 
 class InterviewListResponse(BaseModel):
     interviews: List[InterviewResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
@@ -1,4 +1,5 @@
-from ..database import get_database, USERS_COLLECTION,ROLES_COLLECTION
+from ..database import get_database, apply_dashboard_counter_changes, with_org_key, USERS_COLLECTION,ROLES_COLLECTION
+from ..utils.org_tree_cache import invalidate_org_tree
 from ..models.user_model import admin_dict
 from ..utils.password_handler import hash_password, verify_password
 from ..utils.token import (
@@ -59,7 +60,9 @@ async def create_super_admin_account(
             role_id
         )
 
-        result = await db[USERS_COLLECTION].insert_one(admin_data)
+        result = await db[USERS_COLLECTION].insert_one(with_org_key(admin_data))
+        await apply_dashboard_counter_changes("user", None, admin_data)
+        invalidate_org_tree()
         logger.info(f"Super admin account created for email: {email}")
         return str(result.inserted_id)
     except Exception as e:
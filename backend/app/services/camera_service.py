@@ -3,78 +3,88 @@ import time
 import threading
 import numpy as np
 import logging
-import os
-import urllib.request
 from queue import Queue
 
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-
-from ultralytics import YOLO
+from app.services.object_detector import PHONE_CLASS_ID
+from app.services.proctoring_models import ensure_face_landmark_model
+from app.services.proctoring_state import ProctoringState
 
 logger = logging.getLogger(__name__)
 
 # =====================================================
-# YOLO MODEL
-# =====================================================
-yolo_model = YOLO("yolov8n.pt")
-
-# =====================================================
-# MEDIAPIPE FACE LANDMARKER (TASKS API)
+# MODELS (LOADED ON FIRST USE OR BY warm_up)
 # =====================================================
-FACE_LANDMARK_MODEL = "face_landmarker.task"
-FACE_LANDMARK_URL = (
-    "https://storage.googleapis.com/mediapipe-models/"
-    "face_landmarker/face_landmarker/float16/1/"
-    "face_landmarker.task"
-)
-
-def _download_face_model():
-    if not os.path.exists(FACE_LANDMARK_MODEL):
-        urllib.request.urlretrieve(FACE_LANDMARK_URL, FACE_LANDMARK_MODEL)
-
-_download_face_model()
-
-base_options = python.BaseOptions(model_asset_path=FACE_LANDMARK_MODEL)
-options = vision.FaceLandmarkerOptions(
-    base_options=base_options,
-    output_face_blendshapes=False,
-    output_facial_transformation_matrixes=False,
-    num_faces=3,
-    running_mode=vision.RunningMode.IMAGE
-)
-
-face_landmarker = vision.FaceLandmarker.create_from_options(options)
+# MediaPipe and the YOLO runtime take seconds to import and load, so importing
+# this module loads neither; the API starts serving at once and warm_up()
+# loads them in the background.
+_models_lock = threading.RLock()
+_phone_detector = None
+_face_landmarker_options = None
+
+face_landmarker = None
 face_landmarker_lock = threading.Lock()
 
-# =====================================================
-# COUNTERS (UNCHANGED)
-# =====================================================
-face_missing_counter = 0
-multiple_faces_counter = 0
-iris_cheating_counter = 0
-phone_cheating_counter = 0
+# Batched inference threads each get their own landmarker instead of sharing the lock above
+_thread_local = threading.local()
 
-# =====================================================
-# COOLDOWNS & FRAME LOGIC (UNCHANGED)
-# =====================================================
-last_face_warning = 0
-last_iris_warning = 0
-last_phone_warning = 0
 
-COOLDOWN = 15
-PHONE_COOLDOWN = 8
+def get_phone_detector():
+    """YOLO phone detector for the configured backend (see object_detector.py)."""
+    global _phone_detector
+    if _phone_detector is None:
+        with _models_lock:
+            if _phone_detector is None:
+                from app.services.object_detector import create_detector
+
+                _phone_detector = create_detector()
+    return _phone_detector
+
+
+def _create_face_landmarker():
+    global _face_landmarker_options
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
+    with _models_lock:
+        if _face_landmarker_options is None:
+            _face_landmarker_options = vision.FaceLandmarkerOptions(
+                base_options=python.BaseOptions(model_asset_path=ensure_face_landmark_model()),
+                output_face_blendshapes=False,
+                output_facial_transformation_matrixes=False,
+                num_faces=3,
+                running_mode=vision.RunningMode.IMAGE
+            )
+    return vision.FaceLandmarker.create_from_options(_face_landmarker_options)
 
-consecutive_iris_deviations = 0
-consecutive_face_missing = 0
-consecutive_multiple_faces = 0
-consecutive_phone_detections = 0
 
-REQUIRED_CONSECUTIVE_FRAMES = 8
-REQUIRED_FACE_MISSING_FRAMES = 2
-REQUIRED_MULTIPLE_FACES_FRAMES = 2
-REQUIRED_PHONE_FRAMES = 2
+def get_face_landmarker():
+    """Landmarker shared by the server camera (callers hold face_landmarker_lock)."""
+    global face_landmarker
+    if face_landmarker is None:
+        with _models_lock:
+            if face_landmarker is None:
+                face_landmarker = _create_face_landmarker()
+    return face_landmarker
+
+
+def get_thread_face_landmarker():
+    landmarker = getattr(_thread_local, "face_landmarker", None)
+    if landmarker is None:
+        landmarker = _create_face_landmarker()
+        _thread_local.face_landmarker = landmarker
+    return landmarker
+
+
+def warm_up():
+    """Load the models ahead of the first frame; cheap once they are loaded."""
+    start = time.perf_counter()
+    get_face_landmarker()
+    get_phone_detector()
+    logger.info(f"Proctoring models ready in {time.perf_counter() - start:.1f}s")
+
+
+# State of the server-side camera (start_camera / camera_status)
+legacy_state = ProctoringState()
 
 # =====================================================
 # CAMERA STATE (UNCHANGED)
@@ -89,46 +99,40 @@ DEFAULT_WIDTH = 640
 DEFAULT_HEIGHT = 480
 
 # =====================================================
-# IRIS GAZE DETECTION (UNCHANGED LOGIC)
+# IRIS GAZE DETECTION (UNCHANGED LOGIC, VECTORIZED)
 # =====================================================
-def detect_iris_gaze(face_landmarks, img_w, img_h):
-    LEFT_EYE = [33, 133]
-    RIGHT_EYE = [362, 263]
-    LEFT_IRIS = [468, 469, 470, 471]
-    RIGHT_IRIS = [473, 474, 475, 476]
+# Eye corners (left eye, right eye) then the four iris points of each eye
+GAZE_LANDMARKS = np.array([33, 133, 362, 263, 468, 469, 470, 471, 473, 474, 475, 476])
+GAZE_H_MIN, GAZE_H_MAX = 0.10, 0.90
 
-    def get_point(idx):
-        lm = face_landmarks[idx]
-        return int(lm.x * img_w), int(lm.y * img_h)
 
-    left_eye_left = get_point(LEFT_EYE[0])
-    left_eye_right = get_point(LEFT_EYE[1])
-    right_eye_left = get_point(RIGHT_EYE[0])
-    right_eye_right = get_point(RIGHT_EYE[1])
+def landmark_points(face_landmarks):
+    """(N, 2) array of the normalized x, y of MediaPipe landmarks."""
+    return np.array([(lm.x, lm.y) for lm in face_landmarks], dtype=np.float64)
 
-    left_iris = [get_point(i) for i in LEFT_IRIS]
-    right_iris = [get_point(i) for i in RIGHT_IRIS]
 
-    left_center = (sum(p[0] for p in left_iris) // 4,
-                   sum(p[1] for p in left_iris) // 4)
-    right_center = (sum(p[0] for p in right_iris) // 4,
-                    sum(p[1] for p in right_iris) // 4)
+def detect_iris_gaze(face_landmarks, img_w, img_h):
+    """
+    Gaze deviation level 0-3 from where each iris sits between its eye corners.
 
-    left_width = abs(left_eye_right[0] - left_eye_left[0])
-    right_width = abs(right_eye_right[0] - right_eye_left[0])
+    Accepts MediaPipe landmarks or their landmark_points() array.
+    """
+    if isinstance(face_landmarks, np.ndarray):
+        points = face_landmarks[GAZE_LANDMARKS]
+    else:
+        points = landmark_points([face_landmarks[i] for i in GAZE_LANDMARKS])
 
-    if left_width == 0 or right_width == 0:
-        return 0
+    # Same pixel rounding as before: truncate, then floor-average the iris points
+    x = (points[:, 0] * img_w).astype(np.int64)
+    eye_left, eye_right = x[[0, 2]], x[[1, 3]]
+    iris_centers = x[4:].reshape(2, 4).sum(axis=1) // 4
 
-    left_ratio = (left_center[0] - left_eye_left[0]) / left_width
-    right_ratio = (right_center[0] - right_eye_left[0]) / right_width
+    widths = np.abs(eye_right - eye_left)
+    if not widths.all():
+        return 0
 
-    h_min, h_max = 0.10, 0.90
-    h_dev = max(0,
-                h_min - left_ratio if left_ratio < h_min else 0,
-                left_ratio - h_max if left_ratio > h_max else 0,
-                h_min - right_ratio if right_ratio < h_min else 0,
-                right_ratio - h_max if right_ratio > h_max else 0)
+    ratios = (iris_centers - eye_left) / widths
+    h_dev = max(0.0, float(np.max(np.maximum(GAZE_H_MIN - ratios, ratios - GAZE_H_MAX))))
 
     if h_dev == 0:
         return 0
@@ -140,76 +144,199 @@ def detect_iris_gaze(face_landmarks, img_w, img_h):
         return 3
 
 # =====================================================
-# FRAME PROCESSING (UPDATED MEDIAPIPE ONLY)
+# ADAPTIVE CADENCE & REGION OF INTEREST
 # =====================================================
-def process_frame_for_cheating(frame):
-    global face_missing_counter, multiple_faces_counter
-    global iris_cheating_counter, phone_cheating_counter
-    global consecutive_iris_deviations, consecutive_face_missing
-    global consecutive_multiple_faces, consecutive_phone_detections
-    global last_face_warning, last_iris_warning, last_phone_warning
-
-    if not detection_enabled:
-        return
+YOLO_EVERY_N_FRAMES = 5
+# Mean absolute change (0-255) of a small grayscale thumbnail that counts as motion
+MOTION_THRESHOLD = 12.0
+MOTION_THUMBNAIL_SIZE = (32, 24)
+
+# Phone search area around the face box, in face widths/heights: sides, above, below (hands)
+ROI_SIDE_SCALE = 1.5
+ROI_UP_SCALE = 0.5
+ROI_DOWN_SCALE = 2.5
+# Regions covering more of the frame than this just use the whole frame
+ROI_FULL_FRAME_RATIO = 0.6
+
+YOLO_MIN_IMGSZ = 160
+
+
+class DetectionCadence:
+    """
+    Decides per frame whether a session needs the phone detector.
+
+    Phones and extra people change slowly, so YOLO runs every Nth frame and
+    additionally whenever the face count changes, the picture moves, or the
+    last run saw a phone. That last rule keeps REQUIRED_PHONE_FRAMES meaning
+    consecutive real detections: a phone is never carried over a skipped frame.
+    """
+
+    def __init__(self, every_n=YOLO_EVERY_N_FRAMES, motion_threshold=MOTION_THRESHOLD):
+        self.every_n = max(1, every_n)
+        self.motion_threshold = motion_threshold
+        self.frames_since_detection = None
+        self.last_face_count = None
+        self.last_phone = False
+        self.thumbnail = None
+        self.frames = 0
+        self.detections = 0
+
+    def _motion(self, frame):
+        thumbnail = cv2.resize(
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA
+        ).astype(np.int16)
+        previous, self.thumbnail = self.thumbnail, thumbnail
+        if previous is None:
+            return float("inf")
+        return float(np.abs(thumbnail - previous).mean())
+
+    def observe(self, frame, face_count):
+        """Record the frame; True if the phone detector should run on it."""
+        self.frames += 1
+        motion = self._motion(frame)
+        face_changed = face_count != self.last_face_count
+        self.last_face_count = face_count
+
+        due = self.frames_since_detection is None or self.frames_since_detection + 1 >= self.every_n
+        return due or face_changed or self.last_phone or motion > self.motion_threshold
+
+    def record(self, phone_detected=None):
+        """Result of this frame's detection, or None when it was skipped."""
+        if phone_detected is None:
+            if self.frames_since_detection is not None:
+                self.frames_since_detection += 1
+            return
+        self.frames_since_detection = 0
+        self.last_phone = phone_detected
+        self.detections += 1
+
+
+def phone_roi(frame, points):
+    """Crop of the frame around the face and where the hands usually are."""
+    h, w = frame.shape[:2]
+    (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+    face_w, face_h = x1 - x0, y1 - y0
+
+    x0, x1 = max(0.0, x0 - ROI_SIDE_SCALE * face_w), min(1.0, x1 + ROI_SIDE_SCALE * face_w)
+    y0, y1 = max(0.0, y0 - ROI_UP_SCALE * face_h), min(1.0, y1 + ROI_DOWN_SCALE * face_h)
+    if (x1 - x0) * (y1 - y0) >= ROI_FULL_FRAME_RATIO:
+        return frame
+
+    return frame[int(y0 * h):int(np.ceil(y1 * h)), int(x0 * w):int(np.ceil(x1 * w))]
+
+
+def yolo_input_size(crops):
+    """Smallest stride-aligned YOLO input that fits every crop, capped at the detector's input size."""
+    longest = max(max(crop.shape[:2]) for crop in crops)
+    size = -(-longest // 32) * 32
+    return int(min(get_phone_detector().imgsz, max(YOLO_MIN_IMGSZ, size)))
 
-    now = time.time()
-    h, w, _ = frame.shape
+# =====================================================
+# FRAME PROCESSING (UPDATED MEDIAPIPE ONLY)
+# =====================================================
+def detect_faces(frame, landmarker=None):
+    """Face landmarks for every face in a BGR frame (shared landmarker unless one is given)."""
+    import mediapipe as mp
 
     mp_image = mp.Image(
         image_format=mp.ImageFormat.SRGB,
         data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     )
 
+    if landmarker is not None:
+        return landmarker.detect(mp_image).face_landmarks
+
+    shared = get_face_landmarker()
     with face_landmarker_lock:
-        result = face_landmarker.detect(mp_image)
-
-    faces = result.face_landmarks
-
-    # ---------------- Face checks ----------------
-    if not faces:
-        consecutive_face_missing += 1
-        if consecutive_face_missing >= REQUIRED_FACE_MISSING_FRAMES and now - last_face_warning > COOLDOWN:
-            face_missing_counter += 1
-            last_face_warning = now
-        return
-
-    if len(faces) > 1:
-        consecutive_multiple_faces += 1
-        if consecutive_multiple_faces >= REQUIRED_MULTIPLE_FACES_FRAMES and now - last_face_warning > COOLDOWN:
-            multiple_faces_counter += 1
-            last_face_warning = now
-        return
-
-    # ---------------- Iris gaze ----------------
-    face_landmarks = faces[0]
-    gaze = detect_iris_gaze(face_landmarks, w, h)
-
-    if gaze >= 2:
-        consecutive_iris_deviations += 1
-    else:
-        consecutive_iris_deviations = 0
-
-    if consecutive_iris_deviations >= REQUIRED_CONSECUTIVE_FRAMES and now - last_iris_warning > COOLDOWN:
-        iris_cheating_counter += 1
-        last_iris_warning = now
-
-    # ---------------- Phone detection ----------------
-    phone_detected = False
-    yolo_results = yolo_model(frame, verbose=False)
-
-    for r in yolo_results:
-        for cls in r.boxes.cls:
-            if int(cls) == 67:  # cell phone
-                phone_detected = True
-                break
-
-    if phone_detected:
-        consecutive_phone_detections += 1
-        if consecutive_phone_detections >= REQUIRED_PHONE_FRAMES and now - last_phone_warning > PHONE_COOLDOWN:
-            phone_cheating_counter += 1
-            last_phone_warning = now
-    else:
-        consecutive_phone_detections = 0
+        result = shared.detect(mp_image)
+
+    return result.face_landmarks
+
+
+def _has_phone(detections):
+    return bool((detections[:, 5] == PHONE_CLASS_ID).any())
+
+
+def detect_phone(frame):
+    return detect_phones([frame])[0]
+
+
+def detect_phones(frames, imgsz=None):
+    """Phone detection for several frames in one YOLO call."""
+    if not frames:
+        return []
+    return [_has_phone(detections) for detections in get_phone_detector().detect(frames, imgsz=imgsz)]
+
+
+def analyze_frame(frame):
+    """
+    Run the detectors on one BGR frame.
+
+    Returns (face_count, gaze, phone_detected). Gaze and phone detection only
+    run when exactly one face is visible, as before.
+    """
+    h, w, _ = frame.shape
+    faces = detect_faces(frame)
+
+    if len(faces) != 1:
+        return len(faces), 0, False
+
+    gaze = detect_iris_gaze(faces[0], w, h)
+    return 1, gaze, detect_phone(frame)
+
+
+def analyze_frames(frames, cadences=None):
+    """
+    analyze_frame for a micro-batch of frames (from any mix of sessions).
+
+    Landmarks run on every frame, on this thread's own landmarker. With a
+    DetectionCadence per frame, only the single-face frames it asks for go to
+    the phone detector, cropped to phone_roi; the rest report no phone. The
+    selected frames share a single batched YOLO call.
+    """
+    landmarker = get_thread_face_landmarker()
+    results = []
+    crops = []
+    needs_phone = []
+
+    for index, frame in enumerate(frames):
+        h, w, _ = frame.shape
+        cadence = cadences[index] if cadences else None
+        faces = detect_faces(frame, landmarker)
+        run_yolo = cadence.observe(frame, len(faces)) if cadence else True
+
+        if len(faces) != 1:
+            results.append((len(faces), 0, False))
+            if cadence:
+                cadence.record(None)
+            continue
+
+        points = landmark_points(faces[0])
+        results.append((1, detect_iris_gaze(points, w, h), False))
+        if not run_yolo:
+            cadence.record(None)
+            continue
+        crops.append(phone_roi(frame, points) if cadence else frame)
+        needs_phone.append(index)
+
+    phones = detect_phones(crops, imgsz=yolo_input_size(crops)) if crops else []
+    for index, phone_detected in zip(needs_phone, phones):
+        face_count, gaze, _ = results[index]
+        results[index] = (face_count, gaze, phone_detected)
+        if cadences:
+            cadences[index].record(phone_detected)
+    return results
+
+
+def process_frame_for_cheating(frame, state=None):
+    """Analyze a frame and update `state` (the server camera's by default)."""
+    if state is None:
+        if not detection_enabled:
+            return []
+        state = legacy_state
+
+    face_count, gaze, phone_detected = analyze_frame(frame)
+    return state.update(face_count, gaze, phone_detected)
 
 # =====================================================
 # CAMERA THREAD (UNCHANGED)
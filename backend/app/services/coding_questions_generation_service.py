@@ -1,12 +1,19 @@
 import json
 import random
 import asyncio
+import hashlib
 import logging
 from datetime import datetime
-from typing import List
-from langchain_core.messages import HumanMessage
+from typing import List, Dict, Optional
 from app.models.question import Question, TestCase
-from app.database import save_coding_questions
+from app.models.code import TestCase as CodeTestCase
+from app.database import (
+    save_coding_questions,
+    get_next_sequence,
+    save_bank_question,
+    sample_bank_questions,
+)
+from app.services.coding_service import coding_service
 from app.llm_models.openai_llm import get_openai_llm
 
 logger = logging.getLogger(__name__)
@@ -21,11 +28,30 @@ QUESTION_TOPICS = [
 
 DIFFICULTY_LEVELS = ["easy", "medium", "hard"]
 
+# Bank questions keep only test cases whose expected output matches the
+# reference solution, and are rejected with fewer than this many left
+MIN_VALIDATED_TEST_CASES = 3
+
+# Reference solutions are written against functionSignature, which is JavaScript
+REFERENCE_LANGUAGE = "javascript"
+
 
 class CodingQuestionsGenerationService:
     def __init__(self):
+        self._llm = None
+
+    @property
+    def llm(self):
+        # Built on first use so importing the service (at app startup) doesn't load langchain_openai.
         # Make sure your get_openai_llm() returns a model supporting async calls (like gpt-4o, gpt-3.5-turbo)
-        self.llm = get_openai_llm()
+        if self._llm is None:
+            self._llm = get_openai_llm()
+        return self._llm
+
+    async def _ask(self, prompt: str):
+        from langchain_core.messages import HumanMessage
+
+        return await self.llm.ainvoke([HumanMessage(content=prompt)])
 
     # 🧩 Single Question Generator (prompt unchanged)
     async def _generate_single_question_async(self, difficulty: str, topic: str):
@@ -70,16 +96,18 @@ Rules:
 
         try:
             # Async call for parallel execution
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._ask(prompt)
             return json.loads(response.content)
         except Exception as e:
             logger.error(f"Error generating question for topic '{topic}': {e}")
             raise
 
     # 🧠 Parallelized generation of multiple questions
-    async def generate_coding_questions(self, count=3, difficulty="medium") -> List[Question]:
+    async def generate_coding_questions(self, count=3, difficulty="medium",
+                                        exclude_topics: Optional[List[str]] = None) -> List[Question]:
         valid_difficulty = difficulty.lower() if difficulty.lower() in DIFFICULTY_LEVELS else "easy"
-        selected_topics = random.sample(QUESTION_TOPICS, k=min(count, len(QUESTION_TOPICS)))
+        topics = [topic for topic in QUESTION_TOPICS if topic not in (exclude_topics or [])]
+        selected_topics = random.sample(topics, k=min(count, len(topics)))
 
         # Launch all async calls together (parallel)
         tasks = [self._generate_single_question_async(valid_difficulty, topic) for topic in selected_topics]
@@ -102,7 +130,7 @@ Rules:
                 ]
 
                 question = Question(
-                    id=int(datetime.now().timestamp()),
+                    id=None,
                     title=data["title"],
                     difficulty=data["difficulty"],
                     description=data["description"],
@@ -117,11 +145,144 @@ Rules:
             except Exception as e:
                 logger.error(f"Error building question object for topic '{topic}': {e}")
 
+        # Ids come from a shared counter so they never collide (timestamps did)
+        if questions:
+            first_id = await get_next_sequence("coding_question_id", len(questions))
+            for offset, question in enumerate(questions):
+                question.id = first_id + offset
+
         return questions
 
-    # 💾 Generate and save in parallel
+    # 📚 Bank candidate: same shape plus a reference solution used for validation
+    async def _generate_bank_question_async(self, difficulty: str, topic: str) -> Dict:
+        random_seed = random.randint(0, 9999)
+
+        prompt = f"""
+Generate a {difficulty} programming question about {topic}.
+Respond ONLY with a valid JSON object, STRICTLY following this format:
+
+{{
+  "title": "string",
+  "difficulty": "easy|medium|hard",
+  "description": "string",
+  "testCases": [
+    {{
+      "input": "string",
+      "expectedOutput": "string",
+      "explanation": "string"
+    }},
+    ...
+  ],
+  "functionSignature": "string",
+  "solutionTemplate": "string",
+  "solutionTemplates": {{
+    "javascript": "string",
+    "python": "string",
+    "java": "string"
+  }},
+  "referenceSolution": "string"
+}}
+
+Rules:
+1. Do NOT include extra text, markdown, or explanations.
+2. Ensure all keys are exactly as above.
+3. Include exactly 6 test cases.
+4. Keep all strings properly quoted.
+5. Use random seed: {random_seed}.
+6. functionSignature is a JavaScript signature, e.g. "function twoSum(nums, target)".
+7. Each test case input is the JavaScript argument list for that function, e.g. "[2, 7, 11, 15], 9".
+8. Each expectedOutput is the JSON encoding of the return value, e.g. "[0, 1]".
+9. solutionTemplate and solutionTemplates are empty function skeletons WITHOUT any implementation.
+10. referenceSolution is a complete, correct JavaScript implementation of functionSignature.
+11. CRITICAL: Ensure proper line breaks using \\n.
+"""
+
+        response = await self._ask(prompt)
+        return json.loads(response.content)
+
+    # ✅ Run the reference solution and keep only test cases it agrees with
+    async def validate_bank_question(self, data: Dict, topic: str) -> Optional[Dict]:
+        reference_solution = data.get("referenceSolution")
+        if not reference_solution or not data.get("functionSignature"):
+            return None
+
+        test_cases = [
+            CodeTestCase(
+                input=tc["input"],
+                expectedOutput=tc["expectedOutput"],
+                explanation=tc.get("explanation")
+            )
+            for tc in data.get("testCases", [])
+        ]
+        if not test_cases:
+            return None
+
+        results = await coding_service.execute_test_cases(
+            reference_solution, test_cases, REFERENCE_LANGUAGE, data["functionSignature"]
+        )
+        validated = [
+            {"input": tc.input, "expectedOutput": tc.expectedOutput, "explanation": tc.explanation}
+            for tc, result in zip(test_cases, results)
+            if result.passed
+        ]
+        if len(validated) < MIN_VALIDATED_TEST_CASES:
+            logger.warning(
+                f"Rejected bank question '{data.get('title')}': "
+                f"{len(validated)}/{len(test_cases)} test cases matched the reference solution"
+            )
+            return None
+
+        fingerprint_source = f"{data['title']}\n{data['description']}".lower()
+        return {
+            "title": data["title"],
+            "difficulty": data["difficulty"].lower(),
+            "description": data["description"],
+            "testCases": validated,
+            "functionSignature": data["functionSignature"],
+            "solutionTemplate": data.get("solutionTemplate"),
+            "solutionTemplates": data.get("solutionTemplates", {}),
+            "topic": topic,
+            "reference_solution": reference_solution,
+            "reference_language": REFERENCE_LANGUAGE,
+            "fingerprint": hashlib.sha256(" ".join(fingerprint_source.split()).encode("utf-8")).hexdigest(),
+            "validated_at": datetime.utcnow()
+        }
+
+    # 🏦 Offline: fill the bank for every topic and difficulty
+    async def fill_question_bank(self, per_topic: int = 2, difficulties: Optional[List[str]] = None) -> int:
+        added = 0
+        for difficulty in difficulties or DIFFICULTY_LEVELS:
+            for topic in QUESTION_TOPICS:
+                tasks = [self._generate_bank_question_async(difficulty, topic) for _ in range(per_topic)]
+                for data in await asyncio.gather(*tasks, return_exceptions=True):
+                    if isinstance(data, Exception):
+                        logger.warning(f"Skipping bank question for '{topic}' ({difficulty}): {data}")
+                        continue
+                    try:
+                        question = await self.validate_bank_question(data, topic)
+                        if question and await save_bank_question(question):
+                            added += 1
+                    except Exception as e:
+                        logger.error(f"Error validating bank question for topic '{topic}': {e}")
+        logger.info(f"Added {added} validated questions to the coding question bank")
+        return added
+
+    # 💾 Sample from the bank, generating only what the bank can't supply
     async def generate_and_save_coding_questions(self, interview_id: str, count=3, difficulty="medium") -> str:
-        questions = await self.generate_coding_questions(count, difficulty)
+        valid_difficulty = difficulty.lower() if difficulty.lower() in DIFFICULTY_LEVELS else "easy"
+
+        questions = [
+            Question(id=q["question_id"], **{k: v for k, v in q.items() if k in Question.__fields__ and k != "id"})
+            for q in await sample_bank_questions(valid_difficulty, count)
+        ]
+        if len(questions) < count:
+            logger.warning(
+                f"Question bank has only {len(questions)}/{count} {valid_difficulty} questions; generating the rest"
+            )
+            questions += await self.generate_coding_questions(
+                count - len(questions), valid_difficulty, exclude_topics=[q.topic for q in questions]
+            )
+
         if not questions:
             raise ValueError("No questions were generated successfully.")
         logger.info(f"Saving {len(questions)} questions for interview ID: {interview_id}")
@@ -130,3 +291,21 @@ Rules:
 
 # Singleton instance
 coding_questions_service = CodingQuestionsGenerationService()
+
+
+if __name__ == "__main__":
+    # Offline bank fill: python -m app.services.coding_questions_generation_service [per_topic]
+    import sys
+    from app.database import connect_to_mongo, close_mongo_connection, count_bank_questions
+
+    async def main():
+        await connect_to_mongo()
+        try:
+            per_topic = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+            await coding_questions_service.fill_question_bank(per_topic)
+            for row in await count_bank_questions():
+                print(f"{row['difficulty']:<7} {row['topic']:<25} {row['count']}")
+        finally:
+            await close_mongo_connection()
+
+    asyncio.run(main())
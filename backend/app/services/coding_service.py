@@ -1,17 +1,19 @@
 import json
 import asyncio
-import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 
+from app.config import settings
 from app.models.code import TestCase, TestResult
+from app.utils import code_result_cache
+from app.utils.code_harness import HARNESS_LANGUAGES, build_test_harness, parse_harness_output
+from app.services.judge0_client import judge0_client
+from app.services.local_executor import local_executor
 
 
 # ==============================
 # Judge0 Configuration
 # ==============================
 
-JUDGE0_URL = "https://ce.judge0.com"
-
 # Judge0 Language IDs
 JUDGE0_LANGUAGE_IDS = {
     "python": 71,
@@ -23,57 +25,64 @@ JUDGE0_LANGUAGE_IDS = {
 
 SUPPORTED_LANGUAGES = list(JUDGE0_LANGUAGE_IDS.keys())
 
+# Judge0 statuses decided by the code alone: accepted, wrong answer, compilation
+# error and the runtime errors (7-12). Time limits (5), internal errors (13) and
+# exec format errors (14) depend on the executor, so those results are never cached.
+CACHEABLE_STATUS_IDS = {3, 4, 6, 7, 8, 9, 10, 11, 12}
+TIME_LIMIT_STATUS_ID = 5
+
 
 # ==============================
 # Coding Service
 # ==============================
 
 class CodingService:
-    """Service for executing and evaluating code using Judge0"""
+    """Service for executing and evaluating code using Judge0 or the local executor"""
+
+    @staticmethod
+    def use_local_executor(language: str) -> bool:
+        """settings.CODE_EXECUTOR_PROVIDER == "local" and the language can run on this host."""
+        return settings.CODE_EXECUTOR_PROVIDER.lower() == "local" and local_executor.supports(language)
 
     # ----------------------------------------------------
-    # Execute Code Using Judge0 Public API
+    # Execute Code (Judge0 at settings.JUDGE0_API_URL, or locally)
     # ----------------------------------------------------
-    async def execute_code(self, language: str, source_code: str) -> Dict[str, Any]:
+    async def execute_code(self, language: str, source_code: str,
+                           candidate_key: Optional[str] = None) -> Dict[str, Any]:
 
         language = language.lower()
 
         if language not in SUPPORTED_LANGUAGES:
             raise ValueError(f"Language '{language}' is not supported")
 
-        language_id = JUDGE0_LANGUAGE_IDS[language]
+        if self.use_local_executor(language):
+            return await local_executor.run(language, source_code)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        return await judge0_client.run(
+            JUDGE0_LANGUAGE_IDS[language],
+            source_code,
+            candidate_key=candidate_key
+        )
 
-            # Step 1: Create submission
-            submission_response = await client.post(
-                f"{JUDGE0_URL}/submissions?base64_encoded=false&wait=false",
-                json={
-                    "source_code": source_code,
-                    "language_id": language_id,
-                    "stdin": ""
-                }
-            )
-
-            submission_response.raise_for_status()
-            token = submission_response.json()["token"]
-
-            # Step 2: Poll for result
-            while True:
-                result_response = await client.get(
-                    f"{JUDGE0_URL}/submissions/{token}?base64_encoded=false"
-                )
+    # ----------------------------------------------------
+    # Execute Several Programs (One Judge0 Batch, Or Locally)
+    # ----------------------------------------------------
+    async def execute_batch(self, language: str, source_codes: List[str],
+                            candidate_key: Optional[str] = None) -> List[Dict[str, Any]]:
 
-                result_response.raise_for_status()
-                result_data = result_response.json()
+        language = language.lower()
 
-                status_id = result_data["status"]["id"]
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Language '{language}' is not supported")
 
-                # If status > 2 → finished
-                if status_id > 2:
-                    return result_data
+        if self.use_local_executor(language):
+            return await local_executor.run_batch(language, source_codes)
 
-                await asyncio.sleep(0.5)
+        language_id = JUDGE0_LANGUAGE_IDS[language]
+        return await judge0_client.run_batch(
+            [{"source_code": code, "language_id": language_id, "stdin": ""} for code in source_codes],
+            candidate_key=candidate_key
+        )
 
     # ----------------------------------------------------
     # Create Test Runner Code
@@ -155,6 +164,47 @@ int main() {{
 
         return user_code
 
+    # ----------------------------------------------------
+    # Convert A Judge0 Result Into A TestResult
+    # ----------------------------------------------------
+    def build_test_result(self, test_case: TestCase, response: Dict[str, Any]) -> TestResult:
+
+        stdout = response.get("stdout")
+        stderr = response.get("stderr") or response.get("compile_output")
+        status_desc = response["status"]["description"]
+
+        if stderr:
+            return TestResult(
+                input=test_case.input,
+                expectedOutput=test_case.expectedOutput,
+                actualOutput=None,
+                passed=False,
+                explanation=test_case.explanation,
+                error=stderr
+            )
+
+        if not stdout:
+            return TestResult(
+                input=test_case.input,
+                expectedOutput=test_case.expectedOutput,
+                actualOutput=None,
+                passed=False,
+                explanation=test_case.explanation,
+                error=f"Execution failed: {status_desc}"
+            )
+
+        output = self.normalize_output(stdout)
+        passed = output == self.normalize_output(test_case.expectedOutput)
+
+        return TestResult(
+            input=test_case.input,
+            expectedOutput=test_case.expectedOutput,
+            actualOutput=output,
+            passed=passed,
+            explanation=test_case.explanation,
+            error=None
+        )
+
     # ----------------------------------------------------
     # Evaluate Code Against Test Case
     # ----------------------------------------------------
@@ -163,20 +213,14 @@ int main() {{
         code: str,
         test_case: TestCase,
         language: str,
-        function_signature: str
+        function_signature: str,
+        candidate_key: Optional[str] = None
     ) -> TestResult:
 
         language = language.lower()
 
         if language not in SUPPORTED_LANGUAGES:
-            return TestResult(
-                input=test_case.input,
-                expectedOutput=test_case.expectedOutput,
-                actualOutput=None,
-                passed=False,
-                explanation=test_case.explanation,
-                error=f"Language '{language}' not supported"
-            )
+            return self.failed_results([test_case], f"Language '{language}' not supported")[0]
 
         try:
             test_runner_code = self.create_test_runner_code(
@@ -186,68 +230,182 @@ int main() {{
                 function_signature
             )
 
-            response = await self.execute_code(language, test_runner_code)
+            response = await self.execute_code(language, test_runner_code, candidate_key=candidate_key)
+            return self.build_test_result(test_case, response)
 
-            stdout = response.get("stdout")
-            stderr = response.get("stderr")
-            status_desc = response["status"]["description"]
-
-            if stderr:
-                return TestResult(
-                    input=test_case.input,
-                    expectedOutput=test_case.expectedOutput,
-                    actualOutput=None,
-                    passed=False,
-                    explanation=test_case.explanation,
-                    error=stderr
-                )
+        except Exception as e:
+            return self.failed_results([test_case], str(e))[0]
 
-            if not stdout:
-                return TestResult(
-                    input=test_case.input,
-                    expectedOutput=test_case.expectedOutput,
-                    actualOutput=None,
-                    passed=False,
-                    explanation=test_case.explanation,
-                    error=f"Execution failed: {status_desc}"
-                )
+    # ----------------------------------------------------
+    # Failed Results For Cases That Could Not Run
+    # ----------------------------------------------------
+    @staticmethod
+    def failed_results(test_cases: List[TestCase], error: str) -> List[TestResult]:
+        return [
+            TestResult(
+                input=test_case.input,
+                expectedOutput=test_case.expectedOutput,
+                actualOutput=None,
+                passed=False,
+                explanation=test_case.explanation,
+                error=error
+            )
+            for test_case in test_cases
+        ]
 
-            output = stdout.strip()
+    # ----------------------------------------------------
+    # Normalize Output For Comparison
+    # ----------------------------------------------------
+    @staticmethod
+    def normalize_output(output: str) -> str:
+        """Strip and re-serialize JSON output so formatting differences don't fail a test."""
+        output = output.strip()
+        try:
+            return json.dumps(json.loads(output))
+        except json.JSONDecodeError:
+            return output
 
-            # Try JSON parsing
-            try:
-                output_json = json.loads(output)
-                output = json.dumps(output_json)
-            except json.JSONDecodeError:
-                pass
+    # ----------------------------------------------------
+    # Evaluate All Test Cases In One Submission
+    # ----------------------------------------------------
+    async def evaluate_with_harness(
+        self,
+        code: str,
+        test_cases: List[TestCase],
+        language: str,
+        function_signature: str,
+        candidate_key: Optional[str] = None
+    ) -> List[Tuple[TestResult, int]]:
+        """
+        Compile and run the user's code once, with every test case embedded in a
+        generated harness, and map the delimited per-case results back to TestResults
+        (each paired with the Judge0 status id of the run, or the time limit status
+        for a case stopped by the harness's per-case timeout).
+        """
+        harness_code = build_test_harness(language, code, test_cases, function_signature)
+        response = await self.execute_code(language, harness_code, candidate_key=candidate_key)
+        status_id = response["status"]["id"]
+
+        case_results = parse_harness_output(response.get("stdout"))
+        # Used for cases that never reported (compile error, crash, overall time limit)
+        failure_reason = (
+            response.get("compile_output")
+            or response.get("stderr")
+            or f"Execution failed: {response['status']['description']}"
+        )
 
-            try:
-                expected_json = json.loads(test_case.expectedOutput)
-                expected_output = json.dumps(expected_json)
-            except json.JSONDecodeError:
-                expected_output = test_case.expectedOutput
+        results = []
+        for idx, test_case in enumerate(test_cases):
+            case = case_results.get(idx)
 
-            passed = output == expected_output
+            if case is None or case.get("error") or case.get("output") is None:
+                error = case.get("error") if case and case.get("error") else failure_reason
+                case_status_id = TIME_LIMIT_STATUS_ID if case and case.get("timed_out") else status_id
+                results.append((self.failed_results([test_case], error)[0], case_status_id))
+                continue
 
-            return TestResult(
+            output = self.normalize_output(case["output"])
+            results.append((TestResult(
                 input=test_case.input,
                 expectedOutput=test_case.expectedOutput,
                 actualOutput=output,
-                passed=passed,
+                passed=output == self.normalize_output(test_case.expectedOutput),
                 explanation=test_case.explanation,
                 error=None
-            )
+            ), status_id))
 
-        except Exception as e:
-            return TestResult(
-                input=test_case.input,
-                expectedOutput=test_case.expectedOutput,
-                actualOutput=None,
-                passed=False,
-                explanation=test_case.explanation,
-                error=str(e)
+        return results
+
+    # ----------------------------------------------------
+    # Execute Test Cases (No Caching)
+    # ----------------------------------------------------
+    async def execute_test_cases(
+        self,
+        code: str,
+        test_cases: List[TestCase],
+        language: str,
+        function_signature: str,
+        candidate_key: Optional[str] = None
+    ) -> List[TestResult]:
+        outcomes = await self.execute_test_outcomes(
+            code, test_cases, language, function_signature, candidate_key=candidate_key
+        )
+        return [result for result, _ in outcomes]
+
+    async def execute_test_outcomes(
+        self,
+        code: str,
+        test_cases: List[TestCase],
+        language: str,
+        function_signature: str,
+        candidate_key: Optional[str] = None
+    ) -> List[Tuple[TestResult, int]]:
+        """(TestResult, Judge0 status id of the execution behind it) per test case."""
+
+        # One submission for all test cases when a harness exists for the language
+        if language in HARNESS_LANGUAGES:
+            return await self.evaluate_with_harness(
+                code, test_cases, language, function_signature, candidate_key=candidate_key
             )
 
+        # Otherwise one program per test case, sent as a single batch
+        runner_codes = [
+            self.create_test_runner_code(language, code, test_case, function_signature)
+            for test_case in test_cases
+        ]
+        responses = await self.execute_batch(language, runner_codes, candidate_key=candidate_key)
+        return [
+            (self.build_test_result(test_case, response), response["status"]["id"])
+            for test_case, response in zip(test_cases, responses)
+        ]
+
+    # ----------------------------------------------------
+    # Cached Results
+    # ----------------------------------------------------
+    @staticmethod
+    def is_cacheable(status_id: int) -> bool:
+        """Results of the code itself are cacheable; time limits and executor failures are not."""
+        return status_id in CACHEABLE_STATUS_IDS
+
+    def result_from_outcome(self, test_case: TestCase, outcome: Dict[str, Any]) -> TestResult:
+        output = outcome.get("actualOutput")
+        return TestResult(
+            input=test_case.input,
+            expectedOutput=test_case.expectedOutput,
+            actualOutput=output,
+            passed=output is not None and not outcome.get("error")
+                and output == self.normalize_output(test_case.expectedOutput),
+            explanation=test_case.explanation,
+            error=outcome.get("error")
+        )
+
+    def lookup_cached_results(
+        self,
+        code: str,
+        test_cases: List[TestCase],
+        language: str,
+        function_signature: str,
+        interview_id: Optional[str]
+    ) -> Tuple[list, List[Optional[TestResult]]]:
+        """Return (cache keys, cached TestResult or None per case); no keys without an interview_id."""
+        if not interview_id:
+            return [], [None] * len(test_cases)
+
+        code_hash = code_result_cache.source_hash(code)
+        keys = [
+            code_result_cache.build_key(interview_id, language, code_hash, function_signature, test_case.input)
+            for test_case in test_cases
+        ]
+        results = []
+        for key, test_case in zip(keys, test_cases):
+            outcome = code_result_cache.get_outcome(key)
+            results.append(self.result_from_outcome(test_case, outcome) if outcome is not None else None)
+        return keys, results
+
+    def store_cached_result(self, key, result: TestResult, status_id: int) -> None:
+        if self.is_cacheable(status_id):
+            code_result_cache.set_outcome(key, {"actualOutput": result.actualOutput, "error": result.error})
+
     # ----------------------------------------------------
     # Run Multiple Test Cases
     # ----------------------------------------------------
@@ -256,22 +414,96 @@ int main() {{
         code: str,
         test_cases: List[TestCase],
         language: str,
-        function_signature: str
+        function_signature: str,
+        candidate_key: Optional[str] = None,
+        interview_id: Optional[str] = None
     ) -> List[TestResult]:
+        """
+        Evaluate code against test cases. With an interview_id, results are
+        cached in this process per (language, source hash, signature, input)
+        until the interview completes, and only uncached cases are executed.
+        """
+        language = language.lower()
 
-        results = []
+        if not test_cases:
+            return []
 
-        for test_case in test_cases:
-            result = await self.evaluate_code(
-                code,
-                test_case,
-                language,
-                function_signature
+        if language not in SUPPORTED_LANGUAGES:
+            return self.failed_results(test_cases, f"Language '{language}' not supported")
+
+        keys, results = self.lookup_cached_results(code, test_cases, language, function_signature, interview_id)
+
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        try:
+            executed = await self.execute_test_outcomes(
+                code, [test_cases[idx] for idx in pending], language, function_signature,
+                candidate_key=candidate_key
             )
-            results.append(result)
+        except Exception as e:
+            for idx, result in zip(pending, self.failed_results([test_cases[idx] for idx in pending], str(e))):
+                results[idx] = result
+            return results
+
+        for idx, (result, status_id) in zip(pending, executed):
+            results[idx] = result
+            if keys:
+                self.store_cached_result(keys[idx], result, status_id)
 
         return results
 
+    # ----------------------------------------------------
+    # Stream Test Case Results As They Finish
+    # ----------------------------------------------------
+    async def stream_test_cases(
+        self,
+        code: str,
+        test_cases: List[TestCase],
+        language: str,
+        function_signature: str,
+        candidate_key: Optional[str] = None,
+        interview_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[int, TestResult]]:
+        """
+        Yield (test case index, TestResult) as each case finishes: cached cases
+        first, then every uncached case run as its own execution, in completion order.
+        """
+        language = language.lower()
+
+        if language not in SUPPORTED_LANGUAGES:
+            for idx, result in enumerate(self.failed_results(test_cases, f"Language '{language}' not supported")):
+                yield idx, result
+            return
+
+        keys, results = self.lookup_cached_results(code, test_cases, language, function_signature, interview_id)
+        for idx, result in enumerate(results):
+            if result is not None:
+                yield idx, result
+
+        async def run_one(idx: int):
+            try:
+                executed = await self.execute_test_outcomes(
+                    code, [test_cases[idx]], language, function_signature, candidate_key=candidate_key
+                )
+                return idx, executed[0][0], executed[0][1]
+            except Exception as e:
+                # Never cached
+                return idx, self.failed_results([test_cases[idx]], str(e))[0], None
+
+        tasks = [asyncio.create_task(run_one(idx)) for idx, result in enumerate(results) if result is None]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, result, status_id = await next_done
+                if keys and status_id is not None:
+                    self.store_cached_result(keys[idx], result, status_id)
+                yield idx, result
+        finally:
+            # Client went away: don't keep executing cases nobody will see
+            for task in tasks:
+                task.cancel()
+
 
 # Singleton instance
 coding_service = CodingService()
\ No newline at end of file
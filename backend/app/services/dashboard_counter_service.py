@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+from app.config import settings
+from app.database import (
+    get_database,
+    reconcile_dashboard_counters,
+    rebuild_metric_rollups,
+    DASHBOARD_COUNTERS_COLLECTION,
+    METRIC_ROLLUPS_COLLECTION,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DashboardCounterService:
+    """
+    Keeps the materialized dashboard counters honest.
+
+    Writes update the counters incrementally (apply_dashboard_counter_changes);
+    this service rebuilds them from the source collections on startup when they
+    are missing and then periodically, correcting any drift from failed
+    increments or writes made outside the API. The trend rollups are
+    backfilled once, the first time the service starts without any.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        try:
+            db = get_database()
+            if await db[DASHBOARD_COUNTERS_COLLECTION].estimated_document_count() == 0:
+                await reconcile_dashboard_counters()
+        except Exception as e:
+            logger.error(f"Initial dashboard counter build failed: {e}")
+        try:
+            db = get_database()
+            if await db[METRIC_ROLLUPS_COLLECTION].estimated_document_count() == 0:
+                await rebuild_metric_rollups()
+        except Exception as e:
+            logger.error(f"Initial metric rollup backfill failed: {e}")
+        self._task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _reconcile_loop(self):
+        while True:
+            await asyncio.sleep(settings.DASHBOARD_COUNTERS_RECONCILE_SECONDS)
+            try:
+                await reconcile_dashboard_counters()
+            except Exception as e:
+                logger.error(f"Dashboard counter reconciliation failed: {e}")
+
+
+# Singleton instance
+dashboard_counter_service = DashboardCounterService()
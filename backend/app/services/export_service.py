@@ -0,0 +1,272 @@
+import io
+import csv
+import json
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import get_database, SCREENING_COLLECTION, CANDIDATES_REPORTS_COLLECTION
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# (column name, arrow type name) — every export has a fixed, flat schema so
+# rows can be written batch by batch without looking at the whole result
+ExportColumns = List[Tuple[str, str]]
+
+SCREENING_EXPORT_COLUMNS: ExportColumns = [
+    ("id", "string"),
+    ("job_posting_id", "string"),
+    ("resume", "string"),
+    ("candidate_email", "string"),
+    ("experience_years", "float64"),
+    ("ATS_Score", "float64"),
+    ("Strengths", "string"),
+    ("Weaknesses", "string"),
+]
+
+REPORT_EXPORT_COLUMNS: ExportColumns = [
+    ("interview_id", "string"),
+    ("job_posting_id", "string"),
+    ("candidate_name", "string"),
+    ("candidate_email", "string"),
+    ("job_role", "string"),
+    ("report_status", "string"),
+    ("mcq_correct", "int64"),
+    ("mcq_total", "int64"),
+    ("voice_overall_score", "float64"),
+    ("voice_communication_score", "float64"),
+    ("voice_technical_score", "float64"),
+    ("voice_confidence_score", "float64"),
+    ("coding_marks", "int64"),
+    ("coding_questions", "int64"),
+    ("coding_tests_passed", "int64"),
+    ("coding_tests_total", "int64"),
+]
+
+# Only the fields the flatteners read (reports never load PDFs or transcripts)
+SCREENING_EXPORT_PROJECTION = {
+    "job_posting_id": 1, "resume": 1, "candidate_email": 1, "experience_years": 1,
+    "ATS_Score": 1, "Strengths": 1, "Weaknesses": 1,
+}
+REPORT_EXPORT_PROJECTION = {
+    "interview_id": 1, "job_posting_id": 1, "candidate_name": 1, "candidate_email": 1,
+    "job_role": 1, "report_status": 1,
+    "MCQ_data.is_correct": 1,
+    "Voice_data.overall_score": 1, "Voice_data.communication_score": 1,
+    "Voice_data.technical_score": 1, "Voice_data.confidence_score": 1,
+    "Coding_data.coding_marks": 1, "Coding_data.candidate_test_cases.passed": 1,
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pandas  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# ----------------------------------------------------
+# Row flattening
+# ----------------------------------------------------
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _joined(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value)
+    return str(value)
+
+
+def screening_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "job_posting_id": doc.get("job_posting_id"),
+        "resume": doc.get("resume"),
+        "candidate_email": doc.get("candidate_email"),
+        "experience_years": _number(doc.get("experience_years")),
+        "ATS_Score": _number(doc.get("ATS_Score")),
+        "Strengths": _joined(doc.get("Strengths")),
+        "Weaknesses": _joined(doc.get("Weaknesses")),
+    }
+
+
+def report_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    mcq_data = doc.get("MCQ_data") or []
+    voice_data = doc.get("Voice_data") or {}
+    coding_data = doc.get("Coding_data") or []
+    test_cases = [tc for question in coding_data for tc in question.get("candidate_test_cases", [])]
+
+    return {
+        "interview_id": doc.get("interview_id"),
+        "job_posting_id": doc.get("job_posting_id"),
+        "candidate_name": doc.get("candidate_name"),
+        "candidate_email": doc.get("candidate_email"),
+        "job_role": doc.get("job_role"),
+        # Reports built before the background pipeline have no status
+        "report_status": doc.get("report_status", "ready"),
+        "mcq_correct": sum(1 for mcq in mcq_data if mcq.get("is_correct")),
+        "mcq_total": len(mcq_data),
+        "voice_overall_score": _number(voice_data.get("overall_score")),
+        "voice_communication_score": _number(voice_data.get("communication_score")),
+        "voice_technical_score": _number(voice_data.get("technical_score")),
+        "voice_confidence_score": _number(voice_data.get("confidence_score")),
+        "coding_marks": sum(int(question.get("coding_marks") or 0) for question in coding_data),
+        "coding_questions": len(coding_data),
+        "coding_tests_passed": sum(1 for tc in test_cases if tc.get("passed")),
+        "coding_tests_total": len(test_cases),
+    }
+
+
+# ----------------------------------------------------
+# Batched reads
+# ----------------------------------------------------
+async def iter_row_batches(
+    collection_name: str,
+    query: Dict[str, Any],
+    projection: Dict[str, Any],
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield flattened rows in _id order, one Mongo batch at a time."""
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    db = get_database()
+    cursor = db[collection_name].find(query, projection).sort("_id", 1).batch_size(batch_size)
+    try:
+        while True:
+            docs = await cursor.to_list(length=batch_size)
+            if not docs:
+                break
+            yield [to_row(doc) for doc in docs]
+    finally:
+        await cursor.close()
+
+
+# ----------------------------------------------------
+# Encoders
+# ----------------------------------------------------
+async def encode_csv(batches: AsyncIterator[List[Dict[str, Any]]], columns: ExportColumns) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[name for name, _ in columns], extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def encode_ndjson(batches: AsyncIterator[List[Dict[str, Any]]], columns: ExportColumns) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object the Parquet writer appends to; drained after each row group."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def encode_parquet(batches: AsyncIterator[List[Dict[str, Any]]], columns: ExportColumns) -> AsyncIterator[bytes]:
+    """
+    Write each batch as one Parquet row group and hand its bytes over right away,
+    so only a single batch is ever held in memory (the footer comes last).
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = [name for name, _ in columns]
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def write_batch(rows):
+        frame = pd.DataFrame.from_records(rows, columns=names)
+        writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        return sink.drain()
+
+    try:
+        async for rows in batches:
+            # Conversion is CPU-bound; keep it off the event loop
+            yield await asyncio.to_thread(write_batch, rows)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet,
+}
+
+
+# ----------------------------------------------------
+# Exports
+# ----------------------------------------------------
+def stream_export(
+    export_format: str,
+    collection_name: str,
+    query: Dict[str, Any],
+    projection: Dict[str, Any],
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+    columns: ExportColumns,
+) -> AsyncIterator[bytes]:
+    batches = iter_row_batches(collection_name, query, projection, to_row)
+    return ENCODERS[export_format](batches, columns)
+
+
+def export_screening_results(query: Dict[str, Any], export_format: str) -> AsyncIterator[bytes]:
+    return stream_export(
+        export_format, SCREENING_COLLECTION, query,
+        SCREENING_EXPORT_PROJECTION, screening_row, SCREENING_EXPORT_COLUMNS
+    )
+
+
+def export_candidate_reports(query: Dict[str, Any], export_format: str) -> AsyncIterator[bytes]:
+    return stream_export(
+        export_format, CANDIDATES_REPORTS_COLLECTION, query,
+        REPORT_EXPORT_PROJECTION, report_row, REPORT_EXPORT_COLUMNS
+    )
@@ -1,9 +1,9 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
 import os
 from app.llm_models import openai_llm
 
 def generate_jd(requirements: dict) -> str:
+    from langchain_core.prompts import PromptTemplate
+
     print(requirements.get("experience_level", ""))
     # Format experience data if raw data is available
     experience_text = requirements.get("experience_level", "")
@@ -0,0 +1,139 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InferenceScheduler:
+    """
+    Micro-batching front for a batch inference function.
+
+    Callers submit one item at a time and await its result. A dispatcher
+    groups pending items into batches of up to `max_batch_size`, waiting at
+    most `max_wait_ms` after the first item for more to arrive, and runs
+    `run_batch(items) -> results` on a thread pool with `workers` batches in
+    flight. While every worker is busy new items keep queueing, so batches
+    grow with load and the per-call model overhead is paid once per batch
+    instead of once per frame.
+
+    `run_batch` returns one result per item, in order; an Exception in a
+    result slot fails only that item's caller.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        workers: int,
+        name: str = "inference",
+    ):
+        self._run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.workers = max(1, workers)
+        self.name = name
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        # Items the dispatcher has taken off the queue but not yet handed to a worker
+        self._assembling: List[Tuple[Any, asyncio.Future]] = []
+
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def started(self) -> bool:
+        return self._dispatcher is not None
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    async def start(self):
+        if self._dispatcher is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, *self._running, return_exceptions=True)
+        self._dispatcher = None
+
+        # Fail the batch being assembled and whatever was still waiting for one
+        waiting = self._assembling
+        self._assembling = []
+        while not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for _, future in waiting:
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} scheduler stopped"))
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def submit(self, item: Any) -> Any:
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    # ----------------------------------------------------
+    # Dispatch
+    # ----------------------------------------------------
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._assembling = [await self._queue.get()]
+            # Wait for a free worker first; items arriving meanwhile join this batch
+            await self._slots.acquire()
+
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            self._assembling = []
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self._run_batch, items)
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+            results = [e] * len(items)
+        finally:
+            self._slots.release()
+
+        self.batches += 1
+        self.items += len(items)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
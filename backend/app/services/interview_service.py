@@ -1,10 +1,13 @@
-from ..database import get_database, SCHEDULED_INTERVIEWS_COLLECTION
+from ..database import get_database, apply_dashboard_counter_changes, index_search_entries, reindex_search_entry, remove_search_entry, SCHEDULED_INTERVIEWS_COLLECTION
+from ..utils.dashboard_counters import COUNTER_FIELDS
+from pymongo import ReturnDocument
 from ..models.interview_model import interview_dict
 from ..schemas.interview_schema import InterviewCreate, InterviewUpdate, InterviewStatus
 from bson import ObjectId
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from ..utils.logger import get_logger
+from ..utils.pagination import fetch_keyset_page, count_for_page
 
 logger = get_logger(__name__)
 
@@ -66,6 +69,9 @@ class InterviewService:
             if not result.acknowledged:
                 logger.error("Insert operation was not acknowledged by MongoDB")
                 raise RuntimeError("Insert operation failed: not acknowledged")
+
+            await apply_dashboard_counter_changes("interview", None, interview_doc)
+            await index_search_entries("interview", [interview_doc])
                 
             interview_id = str(result.inserted_id)
             logger.info(f"Interview created with ID: {interview_id}")
@@ -164,29 +170,47 @@ class InterviewService:
             logger.exception("Full exception details:")
             raise
     
-    async def get_interviews_by_creator(self, created_by: str, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
-        """Get interviews created by a specific user with pagination"""
+    async def get_interviews_by_creator(
+        self,
+        created_by: str,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        count: str = "estimated",
+    ) -> Dict[str, Any]:
+        """
+        Get interviews created by a specific user, newest first.
+
+        Pages are keyed on (created_at, _id): pass the returned next_cursor to get
+        the following page. page is still honoured when no cursor is given.
+        """
         try:
-            skip = (page - 1) * page_size
-            
-            # Get total count
-            total = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].count_documents({"created_by": created_by})
-            
-            # Get interviews with pagination
-            cursor = self.db[SCHEDULED_INTERVIEWS_COLLECTION].find({"created_by": created_by})
-            cursor = cursor.sort("created_at", -1).skip(skip).limit(page_size)
-            
-            interviews = []
-            async for interview in cursor:
+            query = {"created_by": created_by}
+            collection = self.db[SCHEDULED_INTERVIEWS_COLLECTION]
+
+            interviews, next_cursor = await fetch_keyset_page(
+                collection,
+                query,
+                "created_at",
+                -1,
+                page_size,
+                cursor=cursor,
+                skip=(page - 1) * page_size,
+            )
+            for interview in interviews:
                 interview["id"] = str(interview["_id"])
-                interviews.append(interview)
-            
+
+            counts = await count_for_page(collection, query, count)
+            total = counts["total"]
+
             return {
                 "interviews": interviews,
                 "total": total,
+                "total_is_estimate": counts["total_is_estimate"],
                 "page": page,
                 "page_size": page_size,
-                "total_pages": (total + page_size - 1) // page_size
+                "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+                "next_cursor": next_cursor,
             }
         except Exception as e:
             logger.error(f"Error getting interviews for {created_by}: {e}")
@@ -248,12 +272,19 @@ class InterviewService:
             update_fields["updated_at"] = datetime.now(timezone.utc)
             
             # Update database
-            result = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].update_one(
+            previous_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one_and_update(
                 {"_id": ObjectId(interview_id)},
-                {"$set": update_fields}
+                {"$set": update_fields},
+                projection=COUNTER_FIELDS["interview"],
+                return_document=ReturnDocument.BEFORE
             )
             
-            if result.modified_count > 0:
+            if previous_interview is not None:
+                await apply_dashboard_counter_changes(
+                    "interview", previous_interview, {**previous_interview, **update_fields}
+                )
+                if {"candidate_name", "candidate_email", "job_role"} & update_fields.keys():
+                    await reindex_search_entry("interview", {"_id": ObjectId(interview_id)})
                 logger.info(f"Interview {interview_id} updated successfully by {updated_by}")
                 return True
             return False
@@ -279,9 +310,14 @@ class InterviewService:
             
             # Allow deletion of interviews in any status
             
-            result = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].delete_one({"_id": ObjectId(interview_id)})
+            deleted_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one_and_delete(
+                {"_id": ObjectId(interview_id)},
+                projection=COUNTER_FIELDS["interview"]
+            )
             
-            if result.deleted_count > 0:
+            if deleted_interview is not None:
+                await apply_dashboard_counter_changes("interview", deleted_interview, None)
+                await remove_search_entry("interview", interview_id)
                 logger.info(f"Interview {interview_id} deleted successfully by {deleted_by}")
                 return True
             return False
@@ -323,61 +359,60 @@ class InterviewService:
             logger.error(f"Error getting interview statistics for {created_by}: {e}")
             raise
     
-    async def update_interview_status(self, interview_id: str, status: str) -> bool:
-        """Update interview status without permission check (for candidate use) - supports both ObjectId and custom string IDs"""
+    async def update_interview_status(
+        self, interview_id: str, status: str, unless_status: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Update interview status without permission check (for candidate use) - supports both ObjectId and custom string IDs.
+        With unless_status, interviews currently in one of those statuses are left alone (and False is returned).
+        """
         logger.info(f"Attempting to update interview status: ID={interview_id}, new status={status}")
+        status_filter = {"status": {"$nin": unless_status}} if unless_status else {}
         try:
             # Try to update by ObjectId first
             if ObjectId.is_valid(interview_id):
                 
-                # Get current interview status for logging
-                current_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one(
-                    {"_id": ObjectId(interview_id)},
-                    {"status": 1}
+                # Update and get the previous status (for logging and the dashboard counters)
+                current_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one_and_update(
+                    {"_id": ObjectId(interview_id), **status_filter},
+                    {"$set": {
+                        "status": status,
+                        "updated_at": datetime.now(timezone.utc)
+                    }},
+                    projection=COUNTER_FIELDS["interview"],
+                    return_document=ReturnDocument.BEFORE
                 )
                 
                 if current_interview:
                     current_status = current_interview.get("status", "unknown")
-                    logger.info(f"Current interview status: {current_status}, changing to: {status}")
-                    
-                    # Update database
-                    result = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].update_one(
-                        {"_id": ObjectId(interview_id)},
-                        {"$set": {
-                            "status": status,
-                            "updated_at": datetime.now(timezone.utc)
-                        }}
+                    await apply_dashboard_counter_changes(
+                        "interview", current_interview, {**current_interview, "status": status}
                     )
-                    
-                    if result.modified_count > 0:
-                        logger.info(f"Interview {interview_id} status successfully updated from {current_status} to {status}")
-                        return True
+                    logger.info(f"Interview {interview_id} status successfully updated from {current_status} to {status}")
+                    return True
             
             # Try to update by custom "id" field in scheduled_interviews collection
-            current_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one(
-                {"id": interview_id},
-                {"status": 1}
+            current_interview = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].find_one_and_update(
+                {"id": interview_id, **status_filter},
+                {"$set": {
+                    "status": status,
+                    "updated_at": datetime.now(timezone.utc)
+                }},
+                projection=COUNTER_FIELDS["interview"],
+                return_document=ReturnDocument.BEFORE
             )
             
             if current_interview:
                 current_status = current_interview.get("status", "unknown")
-                logger.info(f"Current interview status: {current_status}, changing to: {status}")
-                
-                result = await self.db[SCHEDULED_INTERVIEWS_COLLECTION].update_one(
-                    {"id": interview_id},
-                    {"$set": {
-                        "status": status,
-                        "updated_at": datetime.now(timezone.utc)
-                    }}
+                await apply_dashboard_counter_changes(
+                    "interview", current_interview, {**current_interview, "status": status}
                 )
-                
-                if result.modified_count > 0:
-                    logger.info(f"Interview {interview_id} status successfully updated from {current_status} to {status}")
-                    return True
+                logger.info(f"Interview {interview_id} status successfully updated from {current_status} to {status}")
+                return True
             
             # Try to update in interviews collection
             current_interview = await self.db.interviews.find_one(
-                {"id": interview_id},
+                {"id": interview_id, **status_filter},
                 {"status": 1}
             )
             
@@ -386,7 +421,7 @@ class InterviewService:
                 logger.info(f"Current interview status: {current_status}, changing to: {status}")
                 
                 result = await self.db.interviews.update_one(
-                    {"id": interview_id},
+                    {"id": interview_id, **status_filter},
                     {"$set": {
                         "status": status,
                         "updated_at": datetime.now(timezone.utc)
@@ -397,7 +432,7 @@ class InterviewService:
                     logger.info(f"Interview {interview_id} status successfully updated from {current_status} to {status}")
                     return True
             
-            logger.warning(f"Interview not found when updating status: {interview_id}")
+            logger.warning(f"Interview not found (or already {', '.join(unless_status or [status])}) when updating status: {interview_id}")
             return False
             
         except Exception as e:
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pydantic import BaseModel
 from ..database import get_database, SCHEDULED_INTERVIEWS_COLLECTION
 from ..models.interview_model import interview_dict
@@ -6,29 +6,33 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def build_interview_status_pipeline(created_by: str, job_posting_id: str) -> List[Dict[str, Any]]:
+    """Interview counts per status for one creator and job posting."""
+    return [
+        {
+            "$match": {
+                "created_by": str(created_by),
+                "job_posting_id": str(job_posting_id)
+            }
+        },
+        {"$group": {"_id": {"$ifNull": ["$status", "unknown"]}, "count": {"$sum": 1}}}
+    ]
+
 async def get_interview_statistics(created_by: str, job_posting_id: str) -> Dict[str, Any]:
     """Get interview statistics for a specific job posting created by a user"""
     try:
         db = get_database()
-       
-        # 1️⃣ Fetch all interviews matching admin + job posting (MUST convert cursor to list)
-        cursor = db[SCHEDULED_INTERVIEWS_COLLECTION].find(
-            {
-                "created_by": str(created_by),
-                "job_posting_id": str(job_posting_id)
-            }
-        )
 
-        interviews = await cursor.to_list(length=None)
+        # 1️⃣ Count each status on the server (served by the created_by/job_posting_id/status index)
+        cursor = db[SCHEDULED_INTERVIEWS_COLLECTION].aggregate(
+            build_interview_status_pipeline(created_by, job_posting_id)
+        )
 
-        # 2️⃣ Count each status manually
-        status_breakdown = {}
-        for interview in interviews:
-            status = interview.get("status", "unknown")
-            status_breakdown[status] = status_breakdown.get(status, 0) + 1
+        # 2️⃣ Status breakdown
+        status_breakdown = {row["_id"]: row["count"] async for row in cursor}
 
         # 3️⃣ Total number of interviews
-        total_interviews = len(interviews)
+        total_interviews = sum(status_breakdown.values())
 
         # 4️⃣ Extract specific status counts
         scheduled_count = status_breakdown.get("scheduled", 0)
@@ -0,0 +1,199 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Judge0 status ids 1 (In Queue) and 2 (Processing) mean "not finished yet"
+PENDING_STATUS_IDS = (1, 2)
+
+# Fields requested from Judge0 (everything CodingService reads)
+RESULT_FIELDS = "token,stdout,stderr,compile_output,message,status,time,memory"
+
+
+class Judge0Client:
+    """
+    Long-lived, pooled Judge0 transport.
+
+    - One shared httpx.AsyncClient with keep-alive connection pooling
+    - Batch submission / batch status endpoints for multiple programs
+    - Adaptive polling (exponential backoff) bounded by a deadline
+    - Concurrency caps per candidate and globally
+    - wait=true for short single programs to skip polling entirely
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (base_url or settings.JUDGE0_API_URL).rstrip("/")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_semaphore = asyncio.Semaphore(settings.JUDGE0_GLOBAL_CONCURRENCY)
+        # candidate key -> [semaphore, number of requests using it]
+        self._candidate_slots: Dict[str, list] = {}
+
+    # ----------------------------------------------------
+    # Client lifecycle
+    # ----------------------------------------------------
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(settings.JUDGE0_REQUEST_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.JUDGE0_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.JUDGE0_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client (called on application shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Judge0 HTTP client closed")
+        self._client = None
+
+    # ----------------------------------------------------
+    # Concurrency limits
+    # ----------------------------------------------------
+    @asynccontextmanager
+    async def _slot(self, candidate_key: Optional[str]):
+        """Acquire a per-candidate slot first, then a global one."""
+        key = candidate_key or "anonymous"
+        slot = self._candidate_slots.setdefault(
+            key, [asyncio.Semaphore(settings.JUDGE0_PER_CANDIDATE_CONCURRENCY), 0]
+        )
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                async with self._global_semaphore:
+                    yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._candidate_slots.pop(key, None)
+
+    # ----------------------------------------------------
+    # Polling
+    # ----------------------------------------------------
+    async def _poll_until_done(self, tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Poll the batch status endpoint until every token has finished.
+        The interval grows from JUDGE0_POLL_INITIAL_SECONDS up to
+        JUDGE0_POLL_MAX_SECONDS; gives up after JUDGE0_POLL_DEADLINE_SECONDS.
+        """
+        client = self._get_client()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.JUDGE0_POLL_DEADLINE_SECONDS
+        interval = settings.JUDGE0_POLL_INITIAL_SECONDS
+
+        finished: Dict[str, Dict[str, Any]] = {}
+        pending = list(tokens)
+
+        while pending:
+            await asyncio.sleep(interval)
+
+            for start in range(0, len(pending), settings.JUDGE0_BATCH_SIZE):
+                chunk = pending[start:start + settings.JUDGE0_BATCH_SIZE]
+                response = await client.get(
+                    "/submissions/batch",
+                    params={"tokens": ",".join(chunk), "base64_encoded": "false", "fields": RESULT_FIELDS}
+                )
+                response.raise_for_status()
+                for result in response.json().get("submissions", []):
+                    if result and result.get("status", {}).get("id") not in PENDING_STATUS_IDS:
+                        finished[result["token"]] = result
+
+            pending = [token for token in pending if token not in finished]
+            if not pending:
+                break
+
+            if loop.time() + interval > deadline:
+                raise TimeoutError(
+                    f"Judge0 did not finish {len(pending)} submission(s) within "
+                    f"{settings.JUDGE0_POLL_DEADLINE_SECONDS} seconds"
+                )
+            interval = min(interval * settings.JUDGE0_POLL_BACKOFF, settings.JUDGE0_POLL_MAX_SECONDS)
+
+        return finished
+
+    # ----------------------------------------------------
+    # Public API
+    # ----------------------------------------------------
+    async def run(self, language_id: int, source_code: str, stdin: str = "",
+                  candidate_key: Optional[str] = None) -> Dict[str, Any]:
+        """Run a single program and return the Judge0 result dict."""
+        client = self._get_client()
+        submission = {"source_code": source_code, "language_id": language_id, "stdin": stdin}
+
+        async with self._slot(candidate_key):
+            # Short programs: let Judge0 hold the request open instead of polling
+            if len(source_code) <= settings.JUDGE0_WAIT_SOURCE_LIMIT:
+                response = await client.post(
+                    "/submissions",
+                    params={"base64_encoded": "false", "wait": "true", "fields": RESULT_FIELDS},
+                    json=submission
+                )
+                response.raise_for_status()
+                result = response.json()
+                if "status" in result and result["status"].get("id") not in PENDING_STATUS_IDS:
+                    return result
+                # wait=true disabled on the server (or still running): fall back to polling
+                token = result["token"]
+            else:
+                response = await client.post(
+                    "/submissions",
+                    params={"base64_encoded": "false", "wait": "false"},
+                    json=submission
+                )
+                response.raise_for_status()
+                token = response.json()["token"]
+
+            finished = await self._poll_until_done([token])
+            return finished[token]
+
+    async def run_batch(self, submissions: List[Dict[str, Any]],
+                        candidate_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Run several programs using the batch endpoints.
+
+        :param submissions: list of {"source_code", "language_id", "stdin"} dicts
+        :return: Judge0 result dicts in the same order as submissions
+        """
+        if not submissions:
+            return []
+
+        client = self._get_client()
+        async with self._slot(candidate_key):
+            tokens: List[Optional[str]] = []
+            for start in range(0, len(submissions), settings.JUDGE0_BATCH_SIZE):
+                chunk = submissions[start:start + settings.JUDGE0_BATCH_SIZE]
+                response = await client.post(
+                    "/submissions/batch",
+                    params={"base64_encoded": "false"},
+                    json={"submissions": chunk}
+                )
+                response.raise_for_status()
+                tokens.extend(item.get("token") for item in response.json())
+
+            finished = await self._poll_until_done([token for token in tokens if token])
+
+        results = []
+        for token in tokens:
+            if token and token in finished:
+                results.append(finished[token])
+            else:
+                results.append({
+                    "stdout": None,
+                    "stderr": None,
+                    "compile_output": None,
+                    "status": {"id": 0, "description": "Submission rejected by Judge0"}
+                })
+        return results
+
+
+# Singleton instance
+judge0_client = Judge0Client()
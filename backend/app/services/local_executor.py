@@ -0,0 +1,470 @@
+import os
+import sys
+import time
+import shutil
+import asyncio
+import hashlib
+import tempfile
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, time limits still apply
+    resource = None
+
+
+# Judge0-compatible statuses, so CodingService treats both providers the same
+STATUS_ACCEPTED = {"id": 3, "description": "Accepted"}
+STATUS_TIME_LIMIT = {"id": 5, "description": "Time Limit Exceeded"}
+STATUS_COMPILE_ERROR = {"id": 6, "description": "Compilation Error"}
+STATUS_RUNTIME_ERROR = {"id": 11, "description": "Runtime Error (NZEC)"}
+STATUS_INTERNAL_ERROR = {"id": 13, "description": "Internal Error"}
+
+# Interpreted languages are served from pre-spawned warm processes that are
+# already past interpreter start-up and only wait for the source on stdin
+# (first line: source length, then the source, then the program's stdin;
+# Node programs get no stdin, so it simply takes everything after the header).
+_PYTHON_BOOTSTRAP = (
+    "import sys\n"
+    "_n = int(sys.stdin.readline())\n"
+    "_src = sys.stdin.read(_n)\n"
+    "del _n\n"
+    "exec(compile(_src, '<main>', 'exec'), {'__name__': '__main__'})\n"
+)
+
+_NODE_BOOTSTRAP = (
+    "let d = '';"
+    "process.stdin.setEncoding('utf8');"
+    "process.stdin.on('data', c => { d += c; });"
+    "process.stdin.on('end', () => {"
+    "  const i = d.indexOf('\\n');"
+    "  const src = d.slice(i + 1);"
+    "  const Module = require('module');"
+    "  const m = new Module('main.js');"
+    "  m.filename = require('path').join(process.cwd(), 'main.js');"
+    "  m.paths = [];"
+    "  m._compile(src, m.filename);"
+    "});"
+)
+
+# Compiler diagnostics returned to the candidate are cut off here
+COMPILE_OUTPUT_LIMIT_BYTES = 16 * 1024
+# Largest file the compiler may write (the binary / class files)
+COMPILE_FILE_LIMIT_BYTES = 64 * 1024 * 1024
+
+WARM_LANGUAGES = ["python", "javascript"]
+COMPILED_LANGUAGES = ["java", "cpp"]
+LOCAL_LANGUAGES = WARM_LANGUAGES + COMPILED_LANGUAGES
+
+
+class LocalExecutor:
+    """
+    Runs submissions on this host instead of Judge0.
+
+    - Every program (and every g++ / javac build) runs in its own process with
+      rlimits (CPU, address space, file size), a scrubbed environment and,
+      where unprivileged user namespaces work, without network (``unshare -rn``)
+    - Python and Node programs start in pre-spawned warm processes
+    - Java and C++ builds are cached by source hash
+    - Results use the Judge0 result shape, so TestResults are built the same way
+    """
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._warm_pools: Dict[str, asyncio.Queue] = {}
+        # Pool refills in flight (kept referenced so they aren't garbage-collected mid-run)
+        self._replenishing: Set[asyncio.Task] = set()
+        self._sandbox_prefix: Optional[List[str]] = None
+        self._sandbox_probe: Optional[asyncio.Future] = None
+        # source hash -> artifact directory (LRU order)
+        self._artifacts: "OrderedDict[str, str]" = OrderedDict()
+        # artifact directory -> runs currently executing it (never evicted while > 0)
+        self._artifact_pins: Dict[str, int] = {}
+        self._compile_locks: Dict[str, asyncio.Lock] = {}
+        self.work_dir = settings.LOCAL_EXECUTOR_WORK_DIR or os.path.join(
+            tempfile.gettempdir(), "aia-local-executor"
+        )
+
+    @staticmethod
+    def supports(language: str) -> bool:
+        return language in LOCAL_LANGUAGES
+
+    # ----------------------------------------------------
+    # Sandbox
+    # ----------------------------------------------------
+    async def _probe_sandbox(self) -> List[str]:
+        unshare = shutil.which("unshare")
+        if unshare:
+            try:
+                probe = await asyncio.create_subprocess_exec(
+                    unshare, "-rn", "true",
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+                )
+                try:
+                    if await asyncio.wait_for(probe.wait(), 5) == 0:
+                        return [unshare, "-rn"]
+                except asyncio.TimeoutError:
+                    probe.kill()
+                    await probe.wait()
+            except OSError:
+                pass
+        logger.warning("unshare unavailable: local executor runs without network isolation")
+        return []
+
+    async def _get_sandbox_prefix(self) -> List[str]:
+        """``unshare -rn`` (no network) when the kernel allows it, otherwise nothing."""
+        if self._sandbox_prefix is None:
+            # Concurrent first callers share one probe
+            if self._sandbox_probe is None:
+                self._sandbox_probe = asyncio.ensure_future(self._probe_sandbox())
+            self._sandbox_prefix = await self._sandbox_probe
+        return self._sandbox_prefix
+
+    @staticmethod
+    def _limit_resources(cpu_seconds: int, memory_mb: Optional[int], file_bytes: int):
+        def apply():
+            if resource is None:
+                return
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_FSIZE, (file_bytes, file_bytes))
+            resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+            if memory_mb:
+                memory = memory_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        return apply
+
+    def _env(self, home: str) -> Dict[str, str]:
+        return {
+            "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+            "HOME": home,
+            "LANG": "C.UTF-8",
+            "PYTHONIOENCODING": "utf-8",
+            "PYTHONDONTWRITEBYTECODE": "1",
+        }
+
+    async def _spawn(
+        self, command: List[str], cwd: str, limit_memory: bool = True, compiling: bool = False
+    ) -> asyncio.subprocess.Process:
+        if compiling:
+            cpu = settings.LOCAL_EXECUTOR_COMPILE_TIMEOUT_SECONDS + 1
+            memory_mb = settings.LOCAL_EXECUTOR_COMPILE_MEMORY_LIMIT_MB
+            file_bytes = COMPILE_FILE_LIMIT_BYTES
+        else:
+            cpu = settings.LOCAL_EXECUTOR_TIME_LIMIT_SECONDS + 1
+            memory_mb = settings.LOCAL_EXECUTOR_MEMORY_LIMIT_MB
+            file_bytes = settings.LOCAL_EXECUTOR_OUTPUT_LIMIT_BYTES
+        limits = self._limit_resources(cpu, memory_mb if limit_memory else None, file_bytes)
+        return await asyncio.create_subprocess_exec(
+            *await self._get_sandbox_prefix(), *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=self._env(cwd),
+            start_new_session=True,
+            preexec_fn=limits if resource is not None else None,
+        )
+
+    @staticmethod
+    def _kill_group(proc: asyncio.subprocess.Process):
+        """Kill the process and its children (compiler passes, threads started by the program)."""
+        try:
+            os.killpg(proc.pid, 9)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+
+    # ----------------------------------------------------
+    # Warm interpreter pools
+    # ----------------------------------------------------
+    def _warm_command(self, language: str) -> List[str]:
+        if language == "python":
+            return [sys.executable, "-I", "-S", "-c", _PYTHON_BOOTSTRAP]
+        # V8 reserves far more address space than it uses, so cap the heap instead of RLIMIT_AS
+        return ["node", f"--max-old-space-size={settings.LOCAL_EXECUTOR_MEMORY_LIMIT_MB}", "-e", _NODE_BOOTSTRAP]
+
+    async def _spawn_warm(self, language: str):
+        scratch = tempfile.mkdtemp(prefix=f"{language}-", dir=self._scratch_root())
+        try:
+            proc = await self._spawn(self._warm_command(language), scratch, limit_memory=(language == "python"))
+        except Exception:
+            shutil.rmtree(scratch, ignore_errors=True)
+            raise
+        return proc, scratch
+
+    async def _replenish(self, language: str):
+        try:
+            await self._warm_pools[language].put(await self._spawn_warm(language))
+        except Exception as e:
+            logger.error(f"Failed to pre-spawn {language} worker: {e}")
+
+    def _schedule_replenish(self, language: str):
+        task = asyncio.create_task(self._replenish(language))
+        self._replenishing.add(task)
+        task.add_done_callback(self._replenishing.discard)
+
+    async def _take_warm(self, language: str):
+        pool = self._warm_pools.get(language)
+        if pool is None:
+            pool = self._warm_pools[language] = asyncio.Queue()
+            for _ in range(settings.LOCAL_EXECUTOR_WARM_WORKERS):
+                self._schedule_replenish(language)
+
+        while not pool.empty():
+            proc, scratch = pool.get_nowait()
+            self._schedule_replenish(language)
+            if proc.returncode is None:
+                return proc, scratch
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        # Pool drained under load: start one cold rather than wait for a refill
+        return await self._spawn_warm(language)
+
+    def _scratch_root(self) -> str:
+        path = os.path.join(self.work_dir, "scratch")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # ----------------------------------------------------
+    # Compiled artifacts (cached by source hash)
+    # ----------------------------------------------------
+    def _pin_artifact(self, artifact_dir: str) -> str:
+        self._artifact_pins[artifact_dir] = self._artifact_pins.get(artifact_dir, 0) + 1
+        return artifact_dir
+
+    def _unpin_artifact(self, artifact_dir: str):
+        remaining = self._artifact_pins.get(artifact_dir, 0) - 1
+        if remaining > 0:
+            self._artifact_pins[artifact_dir] = remaining
+        else:
+            self._artifact_pins.pop(artifact_dir, None)
+            self._evict_artifacts()
+
+    def _evict_artifacts(self):
+        """Drop the least recently used builds over the cache size, skipping any still running."""
+        excess = len(self._artifacts) - settings.LOCAL_EXECUTOR_ARTIFACT_CACHE_SIZE
+        for digest, artifact_dir in list(self._artifacts.items()):
+            if excess <= 0:
+                break
+            if artifact_dir in self._artifact_pins:
+                continue
+            del self._artifacts[digest]
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            excess -= 1
+
+    async def _get_artifact(self, language: str, source_code: str):
+        """
+        Return (artifact_dir, compile_error); builds at most once per source hash.
+        A returned artifact is pinned until the caller passes it to _unpin_artifact.
+        """
+        digest = hashlib.sha256(f"{language}\0{source_code}".encode("utf-8")).hexdigest()
+        if digest in self._artifacts:
+            self._artifacts.move_to_end(digest)
+            return self._pin_artifact(self._artifacts[digest]), None
+
+        lock = self._compile_locks.setdefault(digest, asyncio.Lock())
+        async with lock:
+            if digest in self._artifacts:
+                return self._pin_artifact(self._artifacts[digest]), None
+
+            artifact_dir = os.path.join(self.work_dir, "artifacts", digest)
+            os.makedirs(artifact_dir, exist_ok=True)
+            if language == "cpp":
+                source_path = os.path.join(artifact_dir, "main.cpp")
+                command = ["g++", "-O2", "-std=c++17", "-o", "main", "main.cpp"]
+            else:
+                source_path = os.path.join(artifact_dir, "Main.java")
+                # javac is a JVM, so (as when running Java) it is bounded by -Xmx rather than RLIMIT_AS
+                command = [
+                    "javac", f"-J-Xmx{settings.LOCAL_EXECUTOR_COMPILE_MEMORY_LIMIT_MB}m",
+                    "-encoding", "UTF-8", "-d", ".", "Main.java",
+                ]
+            with open(source_path, "w", encoding="utf-8") as f:
+                f.write(source_code)
+
+            try:
+                proc = await self._spawn(command, artifact_dir, limit_memory=(language == "cpp"), compiling=True)
+                proc.stdin.close()
+                output = asyncio.gather(
+                    self._read_capped(proc.stdout, COMPILE_OUTPUT_LIMIT_BYTES, proc),
+                    self._read_capped(proc.stderr, COMPILE_OUTPUT_LIMIT_BYTES, proc),
+                    proc.wait(),
+                )
+                try:
+                    stdout, stderr, _ = await asyncio.wait_for(
+                        output, settings.LOCAL_EXECUTOR_COMPILE_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    self._kill_group(proc)
+                    await proc.wait()
+                    stdout, stderr = b"", b"Compilation timed out"
+            finally:
+                self._compile_locks.pop(digest, None)
+
+            if proc.returncode != 0:
+                shutil.rmtree(artifact_dir, ignore_errors=True)
+                diagnostics = (stdout + stderr)[:COMPILE_OUTPUT_LIMIT_BYTES].decode("utf-8", errors="replace")
+                if len(stdout) + len(stderr) >= COMPILE_OUTPUT_LIMIT_BYTES:
+                    diagnostics += "\n... (compiler output truncated)"
+                return None, diagnostics or f"Compiler exited with status {proc.returncode}"
+
+            self._artifacts[digest] = self._pin_artifact(artifact_dir)
+            self._evict_artifacts()
+            return artifact_dir, None
+
+    # ----------------------------------------------------
+    # Process I/O
+    # ----------------------------------------------------
+    @staticmethod
+    async def _read_capped(stream: asyncio.StreamReader, limit: int, proc: asyncio.subprocess.Process) -> bytes:
+        chunks, size = [], 0
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            if size < limit:
+                chunks.append(chunk[:limit - size])
+            size += len(chunk)
+            if size > limit and proc.returncode is None:
+                # Output flood: stop the program rather than buffering it
+                proc.kill()
+        return b"".join(chunks)
+
+    async def _communicate(self, proc: asyncio.subprocess.Process, stdin: bytes) -> Dict[str, Any]:
+        limit = settings.LOCAL_EXECUTOR_OUTPUT_LIMIT_BYTES
+        start = time.perf_counter()
+        timed_out = False
+
+        async def feed():
+            try:
+                proc.stdin.write(stdin)
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                proc.stdin.close()
+
+        io = asyncio.gather(
+            feed(),
+            self._read_capped(proc.stdout, limit, proc),
+            self._read_capped(proc.stderr, limit, proc),
+            proc.wait(),
+        )
+        try:
+            _, stdout, stderr, _ = await asyncio.wait_for(io, settings.LOCAL_EXECUTOR_TIME_LIMIT_SECONDS)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._kill_group(proc)
+            await proc.wait()
+            stdout, stderr = b"", b""
+
+        elapsed = time.perf_counter() - start
+        if timed_out:
+            status = STATUS_TIME_LIMIT
+        elif proc.returncode == 0:
+            status = STATUS_ACCEPTED
+        else:
+            status = STATUS_RUNTIME_ERROR
+
+        return {
+            "stdout": stdout.decode("utf-8", errors="replace") or None,
+            "stderr": stderr.decode("utf-8", errors="replace") or None,
+            "compile_output": None,
+            "message": None,
+            "status": status,
+            "time": f"{elapsed:.3f}",
+            "memory": None,
+        }
+
+    # ----------------------------------------------------
+    # Public API
+    # ----------------------------------------------------
+    async def run(self, language: str, source_code: str, stdin: str = "") -> Dict[str, Any]:
+        """Run a single program and return a Judge0-shaped result dict."""
+        if not self.supports(language):
+            raise ValueError(f"Language '{language}' is not supported by the local executor")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.LOCAL_EXECUTOR_CONCURRENCY or os.cpu_count() or 1)
+
+        try:
+            if language in WARM_LANGUAGES:
+                async with self._semaphore:
+                    proc, scratch = await self._take_warm(language)
+                    try:
+                        payload = f"{len(source_code)}\n{source_code}{stdin}".encode("utf-8")
+                        return await self._communicate(proc, payload)
+                    finally:
+                        shutil.rmtree(scratch, ignore_errors=True)
+
+            artifact_dir, compile_error = await self._get_artifact(language, source_code)
+            if compile_error is not None:
+                return {
+                    "stdout": None,
+                    "stderr": None,
+                    "compile_output": compile_error,
+                    "message": None,
+                    "status": STATUS_COMPILE_ERROR,
+                    "time": None,
+                    "memory": None,
+                }
+
+            if language == "cpp":
+                command = [os.path.join(artifact_dir, "main")]
+            else:
+                command = ["java", f"-Xmx{settings.LOCAL_EXECUTOR_MEMORY_LIMIT_MB}m", "-cp", artifact_dir, "Main"]
+
+            try:
+                async with self._semaphore:
+                    scratch = tempfile.mkdtemp(prefix=f"{language}-", dir=self._scratch_root())
+                    try:
+                        # The JVM reserves address space up front, so it is bounded by -Xmx instead
+                        proc = await self._spawn(command, scratch, limit_memory=(language == "cpp"))
+                        return await self._communicate(proc, stdin.encode("utf-8"))
+                    finally:
+                        shutil.rmtree(scratch, ignore_errors=True)
+            finally:
+                self._unpin_artifact(artifact_dir)
+
+        except Exception as e:
+            logger.error(f"Local execution failed ({language}): {e}")
+            return {
+                "stdout": None,
+                "stderr": str(e),
+                "compile_output": None,
+                "message": None,
+                "status": STATUS_INTERNAL_ERROR,
+                "time": None,
+                "memory": None,
+            }
+
+    async def run_batch(self, language: str, source_codes: List[str]) -> List[Dict[str, Any]]:
+        """Run several programs concurrently (bounded by the executor's concurrency limit)."""
+        return list(await asyncio.gather(*(self.run(language, code) for code in source_codes)))
+
+    async def start(self):
+        """Probe the sandbox at startup, so the first submission doesn't wait for it."""
+        if settings.CODE_EXECUTOR_PROVIDER.lower() == "local":
+            await self._get_sandbox_prefix()
+
+    async def aclose(self):
+        """Kill idle warm workers (called on application shutdown)."""
+        # Let in-flight refills land in their pools first, so they are killed too
+        await asyncio.gather(*self._replenishing, return_exceptions=True)
+        for pool in self._warm_pools.values():
+            while not pool.empty():
+                proc, scratch = pool.get_nowait()
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                shutil.rmtree(scratch, ignore_errors=True)
+        self._warm_pools.clear()
+
+
+# Singleton instance
+local_executor = LocalExecutor()
@@ -1,7 +1,5 @@
 from ..llm_models.openai_llm import get_openai_llm
 from ..llm_models.gemini_llm import get_gemini_llm
-from langchain_core.prompts import PromptTemplate
-from langchain_core.messages import HumanMessage
 import logging
 from ..config import settings
 import os
@@ -24,6 +22,9 @@ async def generate_mcqs(jd_text: str, resume_text: str) -> str:
     - Timeout protection to prevent hanging requests
     - Improved error handling
     """
+    from langchain_core.messages import HumanMessage
+    from langchain_core.prompts import PromptTemplate
+
     try:
         # Escape braces inside JSON example
         template = """
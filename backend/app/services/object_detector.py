@@ -0,0 +1,254 @@
+"""
+Object detector used by proctoring (phones, optionally people).
+
+PROCTORING_DETECTOR_BACKEND picks how the YOLO model runs on CPU:
+
+    ultralytics  - the .pt weights through PyTorch (default, and the fallback)
+    onnxruntime  - the model exported to ONNX, optionally INT8 (dynamic quantization)
+    openvino     - the same ONNX export compiled by OpenVINO for the CPU
+
+Weights live in the proctoring models directory (see proctoring_models.py).
+The ONNX export is created next to the .pt file on first use (Ultralytics is
+needed once for that). onnxruntime and openvino are optional packages; if a
+backend can't be loaded the Ultralytics detector is used instead.
+
+Every backend returns, per frame, an (N, 6) float32 array of
+x1, y1, x2, y2, confidence, class in frame pixels, restricted to
+PROCTORING_DETECTOR_CLASSES.
+"""
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.config import settings
+from app.services.proctoring_models import model_path, require_model
+
+logger = logging.getLogger(__name__)
+
+# COCO class ids
+PERSON_CLASS_ID = 0
+PHONE_CLASS_ID = 67
+
+BACKENDS = ("ultralytics", "onnxruntime", "openvino")
+
+LETTERBOX_FILL = 114
+NMS_IOU_THRESHOLD = 0.45
+# Boxes of different classes are shifted this far apart so one NMS pass never merges them
+NMS_CLASS_OFFSET = 4096
+
+EMPTY_DETECTIONS = np.zeros((0, 6), dtype=np.float32)
+
+
+def parse_classes(value: str) -> List[int]:
+    return [int(part) for part in str(value).split(",") if part.strip()]
+
+
+def onnx_model_path(model_path: str, int8: bool = False) -> str:
+    base = os.path.splitext(model_path)[0]
+    return f"{base}-int8.onnx" if int8 else f"{base}.onnx"
+
+
+def export_onnx(model_path: str, imgsz: int, int8: bool = False) -> str:
+    """ONNX export of a YOLO .pt model (dynamic batch and size), created once and reused."""
+    target = onnx_model_path(model_path, int8)
+    if os.path.exists(target):
+        return target
+
+    fp32_path = onnx_model_path(model_path)
+    if not os.path.exists(fp32_path):
+        from ultralytics import YOLO
+
+        logger.info(f"Exporting {model_path} to ONNX")
+        exported = YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+        if os.path.abspath(exported) != os.path.abspath(fp32_path):
+            os.replace(exported, fp32_path)
+
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {fp32_path} to INT8")
+        quantize_dynamic(fp32_path, target, weight_type=QuantType.QUInt8)
+    return target
+
+
+# ----------------------------------------------------
+# Ultralytics (PyTorch)
+# ----------------------------------------------------
+
+class UltralyticsDetector:
+    name = "ultralytics"
+
+    def __init__(self, model_path: str, imgsz: int, classes: Sequence[int], confidence: float):
+        from ultralytics import YOLO
+
+        self.model = YOLO(model_path)
+        self.imgsz = imgsz
+        self.classes = list(classes)
+        self.confidence = confidence
+        # The Ultralytics predictor is not safe to call from several threads at once
+        self._lock = threading.Lock()
+
+    def detect(self, frames: Sequence[np.ndarray], imgsz: Optional[int] = None) -> List[np.ndarray]:
+        if not frames:
+            return []
+        with self._lock:
+            results = self.model(
+                list(frames), imgsz=imgsz or self.imgsz, classes=self.classes,
+                conf=self.confidence, verbose=False,
+            )
+        return [r.boxes.data.cpu().numpy().astype(np.float32) for r in results]
+
+
+# ----------------------------------------------------
+# ONNX (ONNX Runtime / OpenVINO)
+# ----------------------------------------------------
+
+def letterbox_batch(frames: Sequence[np.ndarray], size: int) -> Tuple[np.ndarray, List[Tuple[float, float, float]]]:
+    """Resize each frame into a size x size canvas keeping its aspect ratio; NCHW RGB float blob."""
+    canvases = []
+    transforms = []
+    for frame in frames:
+        h, w = frame.shape[:2]
+        scale = min(size / h, size / w)
+        new_w, new_h = round(w * scale), round(h * scale)
+        pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+
+        canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+        top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+        canvas[top:top + new_h, left:left + new_w] = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        canvases.append(canvas)
+        transforms.append((scale, left, top))
+
+    blob = cv2.dnn.blobFromImages(canvases, scalefactor=1 / 255.0, swapRB=True)
+    return blob, transforms
+
+
+class OnnxDetector:
+    """YOLOv8 ONNX model: letterbox, run, decode the (batch, 4 + classes, anchors) output, NMS."""
+
+    name = "onnx"
+
+    def __init__(self, imgsz: int, classes: Sequence[int], confidence: float, fixed_size: Optional[int] = None):
+        self.imgsz = fixed_size or imgsz
+        self.fixed_size = fixed_size
+        self.classes = np.array(list(classes), dtype=np.int64)
+        self.confidence = confidence
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def detect(self, frames: Sequence[np.ndarray], imgsz: Optional[int] = None) -> List[np.ndarray]:
+        if not frames:
+            return []
+        size = self.fixed_size or imgsz or self.imgsz
+        batch, transforms = letterbox_batch(frames, size)
+        outputs = self._infer(batch)
+        return [
+            self._decode(output, transform, frame.shape[:2])
+            for output, transform, frame in zip(outputs, transforms, frames)
+        ]
+
+    def _decode(self, output: np.ndarray, transform, frame_shape) -> np.ndarray:
+        predictions = output.T
+        scores = predictions[:, 4 + self.classes]
+        best = scores.argmax(axis=1)
+        confidence = scores[np.arange(len(scores)), best]
+        keep = confidence >= self.confidence
+        if not keep.any():
+            return EMPTY_DETECTIONS
+
+        cx, cy, bw, bh = predictions[keep, :4].T
+        confidence, class_ids = confidence[keep], self.classes[best[keep]]
+
+        scale, left, top = transform
+        h, w = frame_shape
+        x1 = np.clip((cx - bw / 2 - left) / scale, 0, w)
+        y1 = np.clip((cy - bh / 2 - top) / scale, 0, h)
+        x2 = np.clip((cx + bw / 2 - left) / scale, 0, w)
+        y2 = np.clip((cy + bh / 2 - top) / scale, 0, h)
+
+        offset = class_ids * NMS_CLASS_OFFSET
+        boxes = np.stack([x1 + offset, y1 + offset, x2 - x1, y2 - y1], axis=1)
+        indices = cv2.dnn.NMSBoxes(boxes.tolist(), confidence.tolist(), self.confidence, NMS_IOU_THRESHOLD)
+        indices = np.array(indices, dtype=np.int64).reshape(-1)
+
+        return np.stack(
+            [x1[indices], y1[indices], x2[indices], y2[indices], confidence[indices], class_ids[indices]], axis=1
+        ).astype(np.float32)
+
+
+class OnnxRuntimeDetector(OnnxDetector):
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path: str, imgsz: int, classes: Sequence[int], confidence: float, threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        fixed_size = model_input.shape[2] if isinstance(model_input.shape[2], int) else None
+        super().__init__(imgsz, classes, confidence, fixed_size)
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVinoDetector(OnnxDetector):
+    name = "openvino"
+
+    def __init__(self, onnx_path: str, imgsz: int, classes: Sequence[int], confidence: float, threads: int = 0):
+        import openvino as ov
+
+        core = ov.Core()
+        config = {"INFERENCE_NUM_THREADS": threads} if threads else {}
+        model = core.read_model(onnx_path)
+        self.compiled = core.compile_model(model, "CPU", config)
+        self.output = self.compiled.output(0)
+        shape = model.input(0).get_partial_shape()
+        fixed_size = shape[2].get_length() if shape[2].is_static else None
+        super().__init__(imgsz, classes, confidence, fixed_size)
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        # One infer request per call keeps concurrent batches independent
+        return self.compiled.create_infer_request().infer({0: batch})[self.output]
+
+
+def create_detector(backend: Optional[str] = None, int8: Optional[bool] = None):
+    """Detector for the configured backend, falling back to Ultralytics if it can't be loaded."""
+    backend = backend or settings.PROCTORING_DETECTOR_BACKEND
+    int8 = settings.PROCTORING_DETECTOR_INT8 if int8 is None else int8
+    weights = require_model(model_path(settings.PROCTORING_DETECTOR_MODEL))
+    options = {
+        "imgsz": settings.PROCTORING_DETECTOR_IMGSZ,
+        "classes": parse_classes(settings.PROCTORING_DETECTOR_CLASSES),
+        "confidence": settings.PROCTORING_DETECTOR_CONFIDENCE,
+    }
+
+    if backend in ("onnxruntime", "openvino"):
+        try:
+            if backend == "onnxruntime":
+                onnx_path = export_onnx(weights, options["imgsz"], int8)
+                detector = OnnxRuntimeDetector(onnx_path, threads=settings.PROCTORING_DETECTOR_THREADS, **options)
+            else:
+                if int8:
+                    logger.warning("INT8 applies to onnxruntime only; OpenVINO runs the FP32 export")
+                onnx_path = export_onnx(weights, options["imgsz"])
+                detector = OpenVinoDetector(onnx_path, threads=settings.PROCTORING_DETECTOR_THREADS, **options)
+            logger.info(f"Proctoring detector: {backend} ({onnx_path}, imgsz={detector.imgsz})")
+            return detector
+        except Exception as e:
+            logger.warning(f"{backend} detector unavailable ({e}); falling back to Ultralytics")
+    elif backend != "ultralytics":
+        logger.warning(f"Unknown detector backend {backend!r}; using Ultralytics")
+
+    detector = UltralyticsDetector(weights, **options)
+    logger.info(f"Proctoring detector: ultralytics ({weights}, imgsz={detector.imgsz})")
+    return detector
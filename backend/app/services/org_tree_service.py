@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.database import get_database, USERS_COLLECTION, ROLES_COLLECTION
+from app.utils.build_user_tree import build_user_tree
+from app.utils.org_tree_cache import current_generation, get_cached_tree, set_cached_tree
+from app.utils.pagination import fetch_keyset_page
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Fields shown for each person in the org chart
+ORG_NODE_PROJECTION = {
+    "first_name": 1,
+    "last_name": 1,
+    "email": 1,
+    "role_id": 1,
+    "reporting_manager": 1,
+}
+
+# Role name joined onto each user (role_id is stored as a string)
+ROLE_NAME_STAGES = [
+    {
+        "$addFields": {
+            "role_obj_id": {
+                "$convert": {"input": "$role_id", "to": "objectId", "onError": None, "onNull": None}
+            }
+        }
+    },
+    {
+        "$lookup": {
+            "from": ROLES_COLLECTION,
+            "localField": "role_obj_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"_id": 0, "role_name": 1}}],
+            "as": "role"
+        }
+    },
+    {"$addFields": {"role_name": {"$first": "$role.role_name"}}},
+    {"$project": {"role": 0, "role_obj_id": 0}}
+]
+
+# Users joined with their role name
+USER_HIERARCHY_PIPELINE = [{"$project": ORG_NODE_PROJECTION}] + ROLE_NAME_STAGES
+
+
+def build_subtree_pipeline(user_id: str, max_depth: int) -> List[Dict[str, Any]]:
+    """
+    The user plus everyone reporting to them up to `max_depth` levels down,
+    one document per person with `depth` (0 = direct report, root has none).
+
+    reporting_manager holds manager ids as strings, so the walk goes from each
+    user's org_key (the string form of _id) to reporting_manager.
+    """
+    return [
+        {"$match": {"org_key": user_id}},
+        {
+            "$graphLookup": {
+                "from": USERS_COLLECTION,
+                "startWith": "$org_key",
+                "connectFromField": "org_key",
+                "connectToField": "reporting_manager",
+                "as": "descendants",
+                "maxDepth": max_depth - 1,
+                "depthField": "depth",
+            }
+        },
+        {"$project": {"members": {"$concatArrays": [[{"$mergeObjects": ["$$ROOT", {"descendants": None}]}], "$descendants"]}}},
+        {"$unwind": "$members"},
+        {"$replaceRoot": {"newRoot": "$members"}},
+        {"$project": {**ORG_NODE_PROJECTION, "org_key": 1, "depth": 1}},
+    ] + ROLE_NAME_STAGES
+
+
+def serialize_org_node(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert ids to strings for JSON and drop empty role names."""
+    user["_id"] = str(user["_id"])
+    user["role_id"] = str(user["role_id"]) if user.get("role_id") else None
+    user["reporting_manager"] = str(user["reporting_manager"]) if user.get("reporting_manager") else None
+    user.pop("org_key", None)
+    if user.get("role_name") is None:
+        user.pop("role_name", None)
+    return user
+
+
+class OrgTreeService:
+    """
+    Organization chart reads.
+
+    The full tree is built with one aggregation and cached in-process until a
+    user or role write invalidates it (see utils/org_tree_cache.py). Subtrees
+    and direct reports are read straight from Mongo, so large org charts can be
+    expanded lazily instead of shipping every user at once.
+    """
+
+    def __init__(self):
+        self._build_lock = asyncio.Lock()
+
+    async def get_tree(self) -> List[Dict[str, Any]]:
+        tree = get_cached_tree()
+        if tree is not None:
+            return tree
+
+        # Concurrent cache misses wait for a single rebuild
+        async with self._build_lock:
+            tree = get_cached_tree()
+            if tree is not None:
+                return tree
+
+            generation = current_generation()
+            db = get_database()
+            users = await db[USERS_COLLECTION].aggregate(USER_HIERARCHY_PIPELINE).to_list(length=None)
+            tree = build_user_tree([serialize_org_node(user) for user in users])
+            set_cached_tree(tree, generation)
+            logger.info(f"Built org tree for {len(users)} users")
+            return tree
+
+    async def get_subtree(self, user_id: str, max_depth: int) -> Optional[Dict[str, Any]]:
+        """
+        Nested tree under `user_id`, `max_depth` levels deep. Nodes on the last
+        level get has_more_children so the client knows to load them lazily.
+        Returns None if the user doesn't exist.
+        """
+        db = get_database()
+        members = await db[USERS_COLLECTION].aggregate(
+            build_subtree_pipeline(user_id, max_depth), allowDiskUse=True
+        ).to_list(length=None)
+        if not members:
+            return None
+
+        boundary = [member["org_key"] for member in members if member.get("depth") == max_depth - 1]
+        with_children = set()
+        if boundary:
+            with_children = set(await db[USERS_COLLECTION].distinct(
+                "reporting_manager", {"reporting_manager": {"$in": boundary}}
+            ))
+
+        nodes = []
+        for member in members:
+            if member.get("depth") == max_depth - 1:
+                member["has_more_children"] = member["org_key"] in with_children
+            nodes.append(serialize_org_node(member))
+
+        # The root's manager is outside the member set, so it is the only root
+        return build_user_tree(nodes)[0]
+
+    async def get_direct_reports(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of direct reports in _id order, each with has_children."""
+        db = get_database()
+        reports, next_cursor = await fetch_keyset_page(
+            db[USERS_COLLECTION],
+            {"reporting_manager": user_id},
+            "_id",
+            1,
+            limit,
+            cursor=cursor,
+            projection={**ORG_NODE_PROJECTION, "org_key": 1},
+        )
+        if not reports:
+            return [], next_cursor
+
+        role_ids = {report["role_id"] for report in reports if ObjectId.is_valid(report.get("role_id") or "")}
+        role_names = {
+            str(role["_id"]): role.get("role_name")
+            async for role in db[ROLES_COLLECTION].find(
+                {"_id": {"$in": [ObjectId(role_id) for role_id in role_ids]}}, {"role_name": 1}
+            )
+        }
+        keys = [report.get("org_key") or str(report["_id"]) for report in reports]
+        managers = set(await db[USERS_COLLECTION].distinct(
+            "reporting_manager", {"reporting_manager": {"$in": keys}}
+        ))
+
+        for report, key in zip(reports, keys):
+            report["role_name"] = role_names.get(str(report.get("role_id")))
+            report["has_children"] = key in managers
+            serialize_org_node(report)
+        return reports, next_cursor
+
+
+# Singleton instance
+org_tree_service = OrgTreeService()
@@ -0,0 +1,82 @@
+"""
+Model files used by proctoring.
+
+The models are expected to be bundled under PROCTORING_MODELS_DIR (relative
+paths resolve against the backend directory), so neither startup nor the
+first proctored frame waits on a download. Fetch them at build time with:
+
+    python -m app.services.proctoring_models
+
+That downloads the MediaPipe face landmarker and the YOLO weights, and
+creates the ONNX export when an ONNX detector backend is configured. A file
+still missing at runtime is downloaded on first use, unless
+PROCTORING_ALLOW_MODEL_DOWNLOAD is off.
+"""
+import logging
+import os
+import urllib.request
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FACE_LANDMARK_MODEL = "face_landmarker.task"
+FACE_LANDMARK_URL = (
+    "https://storage.googleapis.com/mediapipe-models/"
+    "face_landmarker/face_landmarker/float16/1/"
+    "face_landmarker.task"
+)
+
+
+def models_dir() -> str:
+    return os.path.join(BACKEND_DIR, settings.PROCTORING_MODELS_DIR)
+
+
+def model_path(name: str) -> str:
+    """Absolute path of a model file; bare or relative names live in the models directory."""
+    return name if os.path.isabs(name) else os.path.join(models_dir(), name)
+
+
+def require_model(path: str) -> str:
+    """The path, if the file exists or may be downloaded on first use."""
+    if not os.path.exists(path) and not settings.PROCTORING_ALLOW_MODEL_DOWNLOAD:
+        raise FileNotFoundError(
+            f"Model file {path} is missing; bundle it with `python -m app.services.proctoring_models`"
+        )
+    return path
+
+
+def ensure_face_landmark_model() -> str:
+    path = require_model(model_path(FACE_LANDMARK_MODEL))
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger.info(f"Downloading {FACE_LANDMARK_URL}")
+        # Download next to the target and rename, so a half-written file is never loaded
+        urllib.request.urlretrieve(FACE_LANDMARK_URL, f"{path}.part")
+        os.replace(f"{path}.part", path)
+    return path
+
+
+def bundle_models() -> None:
+    """Fetch (and export) every model file the configured proctoring setup uses."""
+    from ultralytics import YOLO
+
+    from app.services.object_detector import export_onnx
+
+    os.makedirs(models_dir(), exist_ok=True)
+    print(ensure_face_landmark_model())
+
+    detector_path = model_path(settings.PROCTORING_DETECTOR_MODEL)
+    # Ultralytics downloads its released weights to the given path when missing
+    YOLO(detector_path)
+    print(detector_path)
+
+    if settings.PROCTORING_DETECTOR_BACKEND in ("onnxruntime", "openvino"):
+        int8 = settings.PROCTORING_DETECTOR_INT8 and settings.PROCTORING_DETECTOR_BACKEND == "onnxruntime"
+        print(export_onnx(detector_path, settings.PROCTORING_DETECTOR_IMGSZ, int8))
+
+
+if __name__ == "__main__":
+    bundle_models()
@@ -0,0 +1,224 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.inference_scheduler import InferenceScheduler
+from app.services.proctoring_state import ProctoringState
+from app.services.proctoring_worker import ProctoringWorkerClient, socket_paths
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _vision():
+    """camera_service (OpenCV and the detectors), imported on first use so app startup doesn't pay for it."""
+    from app.services import camera_service
+
+    return camera_service
+
+
+def _warm_up_models():
+    _vision().warm_up()
+
+
+def new_cadence():
+    """Phone-detection cadence for one session (lives wherever its frames are analyzed)."""
+    return _vision().DetectionCadence(
+        every_n=settings.PROCTORING_YOLO_EVERY_N_FRAMES,
+        motion_threshold=settings.PROCTORING_MOTION_THRESHOLD,
+    )
+
+
+class ProctoringSession:
+    """Detector state and frame-rate bookkeeping for one proctored interview."""
+
+    def __init__(self, session_id: str, max_fps: float, cadence=None):
+        self.session_id = session_id
+        self.state = ProctoringState()
+        # None when a proctoring worker analyzes the frames; it keeps the cadence itself
+        self.cadence = cadence
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.connections = 0
+        self.in_flight = False
+        self.last_frame_at = 0.0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+    def accept_frame(self, now: float) -> bool:
+        """One frame at a time per session, no faster than the fps cap."""
+        if self.in_flight or now - self.last_frame_at < self.min_interval:
+            self.frames_dropped += 1
+            return False
+        self.in_flight = True
+        self.last_frame_at = now
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "statistics": self.state.statistics(),
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+        }
+
+
+def decode_frame(data: bytes):
+    import cv2
+    import numpy as np
+
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Frame is not a valid JPEG/PNG image")
+    return frame
+
+
+def analyze_encoded_frames(frames: List[Tuple[bytes, Any]]) -> List[Any]:
+    """Batch function for the scheduler: decode, then analyze the decodable frames together."""
+    results: List[Any] = []
+    decoded = []
+    cadences = []
+    for data, cadence in frames:
+        try:
+            decoded.append(decode_frame(data))
+            cadences.append(cadence)
+            results.append(None)
+        except ValueError as e:
+            results.append(e)
+
+    analyses = iter(_vision().analyze_frames(decoded, cadences))
+    return [next(analyses) if result is None else result for result in results]
+
+
+class ProctoringEngine:
+    """
+    Session-scoped proctoring of frames uploaded by candidates.
+
+    Each session (interview) gets its own ProctoringState, so counters and
+    cooldowns never leak between candidates. A session has at most one frame
+    in flight and is capped at PROCTORING_MAX_FPS, so a fast uploader can't
+    starve the others; frames arriving over the cap are dropped rather than
+    queued, keeping warnings close to real time.
+
+    Accepted frames from all sessions go through one InferenceScheduler, which
+    runs them in micro-batches (PROCTORING_BATCH_SIZE / PROCTORING_BATCH_WAIT_MS)
+    and fans the per-frame detections back to each session's state. Face
+    landmarks run on every frame; each session's DetectionCadence decides
+    which frames also need the phone detector.
+
+    The models load on the first frame, or earlier in the background when
+    PROCTORING_WARMUP is on.
+
+    With PROCTORING_WORKER_SOCKET set, inference runs in the proctoring worker
+    process(es) instead (see proctoring_worker.py): this process only keeps
+    each session's ProctoringState and never imports OpenCV or the models.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, ProctoringSession] = {}
+        self._warmup: Optional[asyncio.Task] = None
+        self.scheduler = InferenceScheduler(
+            analyze_encoded_frames,
+            max_batch_size=settings.PROCTORING_BATCH_SIZE,
+            max_wait_ms=settings.PROCTORING_BATCH_WAIT_MS,
+            workers=settings.PROCTORING_WORKERS,
+            name="proctoring",
+        )
+        paths = socket_paths()
+        self.worker: Optional[ProctoringWorkerClient] = (
+            ProctoringWorkerClient(paths, settings.PROCTORING_WORKER_TIMEOUT_SECONDS) if paths else None
+        )
+
+    async def start(self):
+        if self.worker is not None:
+            logger.info(f"Proctoring inference runs in worker process(es): {', '.join(self.worker.paths)}")
+            return
+        await self.scheduler.start()
+        if settings.PROCTORING_WARMUP and self._warmup is None:
+            self._warmup = asyncio.create_task(self._warm_up())
+
+    async def stop(self):
+        if self._warmup is not None:
+            # A load already running in its thread finishes on its own
+            self._warmup.cancel()
+            self._warmup = None
+        await self.scheduler.stop()
+        if self.worker is not None:
+            await self.worker.close()
+        self._sessions.clear()
+
+    async def _warm_up(self):
+        try:
+            await asyncio.to_thread(_warm_up_models)
+        except Exception as e:
+            logger.error(f"Proctoring model warm-up failed (models will load on first frame): {e}")
+
+    # ----------------------------------------------------
+    # Sessions
+    # ----------------------------------------------------
+
+    def open_session(self, session_id: str) -> ProctoringSession:
+        """Attach a connection to the session (candidate and observers share it)."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            cadence = None if self.worker is not None else new_cadence()
+            session = ProctoringSession(session_id, settings.PROCTORING_MAX_FPS, cadence)
+            self._sessions[session_id] = session
+            logger.info(f"Proctoring session opened: {session_id}")
+        session.connections += 1
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        session.connections -= 1
+        if session.connections <= 0:
+            del self._sessions[session_id]
+            if self.worker is not None:
+                self.worker.release_session(session_id)
+            logger.info(
+                f"Proctoring session closed: {session_id} "
+                f"({session.frames_processed} frames analyzed, {session.frames_dropped} dropped)"
+            )
+
+    def get_session(self, session_id: str) -> Optional[ProctoringSession]:
+        return self._sessions.get(session_id)
+
+    # ----------------------------------------------------
+    # Frames
+    # ----------------------------------------------------
+
+    async def submit_frame(self, session_id: str, data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Analyze one encoded frame for the session.
+
+        Returns the warnings it raised plus the session's statistics, or None
+        when the frame was dropped by the rate cap. Raises ValueError for
+        oversized or undecodable frames. Any other exception means the frame
+        couldn't be analyzed (ConnectionError when the proctoring worker can't
+        be reached, RuntimeError for a worker-side failure, or whatever a model
+        load or inference raised in-process); the session stays usable.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"No open proctoring session: {session_id}")
+        if len(data) > settings.PROCTORING_MAX_FRAME_BYTES:
+            raise ValueError(f"Frame exceeds {settings.PROCTORING_MAX_FRAME_BYTES} bytes")
+        if not session.accept_frame(time.monotonic()):
+            return None
+
+        try:
+            if self.worker is not None:
+                face_count, gaze, phone_detected = await self.worker.analyze(session_id, data)
+            else:
+                face_count, gaze, phone_detected = await self.scheduler.submit((data, session.cadence))
+        finally:
+            session.in_flight = False
+
+        session.frames_processed += 1
+        warnings = session.state.update(face_count, gaze, phone_detected)
+        return {"warnings": warnings, **session.snapshot()}
+
+
+# Singleton instance
+proctoring_engine = ProctoringEngine()
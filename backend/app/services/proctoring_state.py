@@ -0,0 +1,108 @@
+"""
+Warning rules for proctoring: turns per-frame detections into warnings.
+
+Pure Python, with no OpenCV or model imports, so API processes that hand
+frames to a proctoring worker (see proctoring_worker.py) can keep per-session
+state without loading the vision stack.
+"""
+import time
+
+# =====================================================
+# COOLDOWNS & FRAME LOGIC
+# =====================================================
+COOLDOWN = 15
+PHONE_COOLDOWN = 8
+
+REQUIRED_CONSECUTIVE_FRAMES = 8
+REQUIRED_FACE_MISSING_FRAMES = 2
+REQUIRED_MULTIPLE_FACES_FRAMES = 2
+REQUIRED_PHONE_FRAMES = 2
+
+# Warning types raised by ProctoringState.update
+FACE_MISSING = "FACE_MISSING"
+MULTIPLE_FACES = "MULTIPLE_FACES"
+LOOKING_AWAY = "LOOKING_AWAY"
+PHONE_DETECTED = "PHONE_DETECTED"
+
+
+class ProctoringState:
+    """
+    Counters, consecutive-frame runs and cooldowns for one proctored candidate.
+
+    The detectors only report what is in a frame; this turns that into
+    warnings, so each session (or the legacy server camera) keeps its own.
+    """
+
+    def __init__(self):
+        self.face_missing_counter = 0
+        self.multiple_faces_counter = 0
+        self.iris_cheating_counter = 0
+        self.phone_cheating_counter = 0
+
+        self.last_face_warning = 0
+        self.last_iris_warning = 0
+        self.last_phone_warning = 0
+
+        self.consecutive_iris_deviations = 0
+        self.consecutive_face_missing = 0
+        self.consecutive_multiple_faces = 0
+        self.consecutive_phone_detections = 0
+
+    def update(self, face_count, gaze, phone_detected, now=None):
+        """Apply one frame's detections; returns the warning types it raised."""
+        now = time.time() if now is None else now
+        warnings = []
+
+        # ---------------- Face checks ----------------
+        if face_count == 0:
+            self.consecutive_face_missing += 1
+            if (self.consecutive_face_missing >= REQUIRED_FACE_MISSING_FRAMES
+                    and now - self.last_face_warning > COOLDOWN):
+                self.face_missing_counter += 1
+                self.last_face_warning = now
+                warnings.append(FACE_MISSING)
+            return warnings
+        self.consecutive_face_missing = 0
+
+        if face_count > 1:
+            self.consecutive_multiple_faces += 1
+            if (self.consecutive_multiple_faces >= REQUIRED_MULTIPLE_FACES_FRAMES
+                    and now - self.last_face_warning > COOLDOWN):
+                self.multiple_faces_counter += 1
+                self.last_face_warning = now
+                warnings.append(MULTIPLE_FACES)
+            return warnings
+        self.consecutive_multiple_faces = 0
+
+        # ---------------- Iris gaze ----------------
+        if gaze >= 2:
+            self.consecutive_iris_deviations += 1
+        else:
+            self.consecutive_iris_deviations = 0
+
+        if (self.consecutive_iris_deviations >= REQUIRED_CONSECUTIVE_FRAMES
+                and now - self.last_iris_warning > COOLDOWN):
+            self.iris_cheating_counter += 1
+            self.last_iris_warning = now
+            warnings.append(LOOKING_AWAY)
+
+        # ---------------- Phone detection ----------------
+        if phone_detected:
+            self.consecutive_phone_detections += 1
+            if (self.consecutive_phone_detections >= REQUIRED_PHONE_FRAMES
+                    and now - self.last_phone_warning > PHONE_COOLDOWN):
+                self.phone_cheating_counter += 1
+                self.last_phone_warning = now
+                warnings.append(PHONE_DETECTED)
+        else:
+            self.consecutive_phone_detections = 0
+
+        return warnings
+
+    def statistics(self):
+        return {
+            "face_missing_detections": self.face_missing_counter,
+            "multiple_faces_detections": self.multiple_faces_counter,
+            "looking_away_detections": self.iris_cheating_counter,
+            "phone_detections": self.phone_cheating_counter,
+        }
@@ -0,0 +1,343 @@
+"""
+Dedicated proctoring model worker.
+
+Loads the face landmarker and phone detector once per node and analyzes the
+frames of every API process, so uvicorn workers neither carry the models nor
+run inference next to request handling. API processes hand it encoded frames
+over a Unix socket when PROCTORING_WORKER_SOCKET is set. From the backend
+directory:
+
+    python -m app.services.proctoring_worker
+    python -m app.services.proctoring_worker --socket /run/proctoring/worker-1.sock
+
+For a pool, start one worker per socket and list every socket in
+PROCTORING_WORKER_SOCKET. Sessions are spread over the workers by id, so a
+session's frames always reach the worker holding its detection cadence.
+
+Each API process keeps one connection per worker; requests are pipelined and
+answered as their batch finishes, matched by request id:
+
+    request   op:u8 request_id:u32 session_len:u16 frame_len:u32, session_id, frame
+    response  request_id:u32 status:u8 body_len:u32, body
+
+OP_ANALYZE is answered with face_count:u8 gaze:u8 phone:u8, or with an error
+message (STATUS_INVALID for a frame that can't be decoded). OP_CLOSE drops
+the session's cadence and is not answered.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.inference_scheduler import InferenceScheduler
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SOCKET = "/tmp/proctoring-worker.sock"
+
+OP_ANALYZE = 1
+OP_CLOSE = 2
+
+STATUS_OK = 0
+STATUS_INVALID = 1
+STATUS_ERROR = 2
+
+REQUEST_HEADER = struct.Struct("!BIHI")
+RESPONSE_HEADER = struct.Struct("!IBI")
+RESULT = struct.Struct("!BBB")
+
+MAX_ERROR_BYTES = 1024
+
+
+def socket_paths(value: Optional[str] = None) -> List[str]:
+    value = settings.PROCTORING_WORKER_SOCKET if value is None else value
+    return [path.strip() for path in value.split(",") if path.strip()]
+
+
+def encode_request(op: int, request_id: int, session_id: str, frame: bytes = b"") -> bytes:
+    session = session_id.encode()
+    return REQUEST_HEADER.pack(op, request_id, len(session), len(frame)) + session + frame
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[int, int, str, bytes]:
+    op, request_id, session_len, frame_len = REQUEST_HEADER.unpack(await reader.readexactly(REQUEST_HEADER.size))
+    if frame_len > settings.PROCTORING_MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {frame_len} bytes exceeds {settings.PROCTORING_MAX_FRAME_BYTES}")
+    session_id = (await reader.readexactly(session_len)).decode()
+    frame = await reader.readexactly(frame_len)
+    return op, request_id, session_id, frame
+
+
+def encode_response(request_id: int, status: int, body: bytes) -> bytes:
+    return RESPONSE_HEADER.pack(request_id, status, len(body)) + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, int, bytes]:
+    request_id, status, body_len = RESPONSE_HEADER.unpack(await reader.readexactly(RESPONSE_HEADER.size))
+    return request_id, status, await reader.readexactly(body_len)
+
+
+# ----------------------------------------------------
+# Worker process
+# ----------------------------------------------------
+
+class ProctoringWorker:
+    """
+    Socket server owning the models: frames from every connected API process
+    go through one InferenceScheduler, so they batch together exactly as they
+    would inside a single process.
+    """
+
+    def __init__(self, socket_path: str):
+        from app.services.proctoring_service import analyze_encoded_frames
+
+        self.socket_path = socket_path
+        self.scheduler = InferenceScheduler(
+            analyze_encoded_frames,
+            max_batch_size=settings.PROCTORING_BATCH_SIZE,
+            max_wait_ms=settings.PROCTORING_BATCH_WAIT_MS,
+            workers=settings.PROCTORING_WORKERS,
+            name="proctoring-worker",
+        )
+        self._cadences: Dict[str, object] = {}
+        self._last_seen: Dict[str, float] = {}
+
+    async def serve(self):
+        from app.services.camera_service import warm_up
+
+        await self.scheduler.start()
+        # Load before listening, so API processes never queue frames behind a cold start
+        await asyncio.to_thread(warm_up)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # left behind by a worker that didn't exit cleanly
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Proctoring worker listening on {self.socket_path}")
+
+        # SIGTERM (e.g. from systemd or docker stop) cancels serving, so the socket is removed
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        sweeper = asyncio.create_task(self._evict_idle_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            await self.scheduler.stop()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def _cadence(self, session_id: str):
+        from app.services.proctoring_service import new_cadence
+
+        cadence = self._cadences.get(session_id)
+        if cadence is None:
+            cadence = self._cadences[session_id] = new_cadence()
+        self._last_seen[session_id] = time.monotonic()
+        return cadence
+
+    def _forget(self, session_id: str) -> None:
+        self._cadences.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+
+    async def _evict_idle_sessions(self):
+        # Sessions whose API process died never send OP_CLOSE
+        idle = settings.PROCTORING_WORKER_SESSION_IDLE_SECONDS
+        while True:
+            await asyncio.sleep(max(1, idle // 4))
+            cutoff = time.monotonic() - idle
+            for session_id in [sid for sid, seen in self._last_seen.items() if seen < cutoff]:
+                self._forget(session_id)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        analyses: Set[asyncio.Task] = set()
+        try:
+            while True:
+                op, request_id, session_id, frame = await read_request(reader)
+                if op == OP_CLOSE:
+                    self._forget(session_id)
+                    continue
+                task = asyncio.create_task(self._analyze(writer, write_lock, request_id, session_id, frame))
+                analyses.add(task)
+                task.add_done_callback(analyses.discard)
+        except asyncio.IncompleteReadError:
+            pass  # API process closed the connection
+        except asyncio.CancelledError:
+            pass  # worker shutting down
+        except (ConnectionError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Dropping proctoring worker connection: {e}")
+        finally:
+            for task in analyses:
+                task.cancel()
+            writer.close()
+
+    async def _analyze(self, writer, write_lock, request_id: int, session_id: str, frame: bytes):
+        try:
+            face_count, gaze, phone_detected = await self.scheduler.submit((frame, self._cadence(session_id)))
+            status, body = STATUS_OK, RESULT.pack(min(face_count, 255), gaze, int(bool(phone_detected)))
+        except ValueError as e:
+            status, body = STATUS_INVALID, str(e).encode()[:MAX_ERROR_BYTES]
+        except Exception as e:
+            logger.error(f"Proctoring analysis failed for {session_id}: {e}")
+            status, body = STATUS_ERROR, str(e).encode()[:MAX_ERROR_BYTES]
+
+        try:
+            async with write_lock:
+                writer.write(encode_response(request_id, status, body))
+                await writer.drain()
+        except ConnectionError:
+            pass  # API process went away; the read loop closes the connection
+
+
+# ----------------------------------------------------
+# API process side
+# ----------------------------------------------------
+
+class _Channel:
+    """One open connection to a worker, with the requests awaiting an answer on it."""
+
+    def __init__(self, path: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.path = path
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read_responses(reader))
+
+    @property
+    def closed(self) -> bool:
+        return self._writer.is_closing()
+
+    async def send(self, op: int, session_id: str, frame: bytes = b"") -> Optional[asyncio.Future]:
+        """Write one request; for OP_ANALYZE returns the future its answer resolves."""
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = None
+        if op == OP_ANALYZE:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+        try:
+            async with self._write_lock:
+                self._writer.write(encode_request(op, request_id, session_id, frame))
+                await self._writer.drain()
+        except OSError as e:
+            self._pending.pop(request_id, None)
+            self.close()
+            raise ConnectionError(f"Lost connection to proctoring worker at {self.path}: {e}") from e
+        if future is not None:
+            future.add_done_callback(lambda _: self._pending.pop(request_id, None))
+        return future
+
+    async def _read_responses(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                request_id, status, body = await read_response(reader)
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue  # the caller already timed out
+                if status == STATUS_OK:
+                    face_count, gaze, phone_detected = RESULT.unpack(body)
+                    future.set_result((face_count, gaze, bool(phone_detected)))
+                elif status == STATUS_INVALID:
+                    future.set_exception(ValueError(body.decode(errors="replace")))
+                else:
+                    future.set_exception(RuntimeError(f"Proctoring worker error: {body.decode(errors='replace')}"))
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            self.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Lost connection to proctoring worker at {self.path}"))
+            self._pending.clear()
+
+    def close(self) -> None:
+        if not self._writer.is_closing():
+            self._writer.close()
+
+
+class ProctoringWorkerClient:
+    """
+    Hands frames from this API process to the proctoring worker(s).
+
+    Connects on first use and reconnects after a worker restart. While no
+    worker is reachable, analyze() raises ConnectionError instead of loading
+    the models here.
+    """
+
+    def __init__(self, paths: List[str], timeout: float):
+        self.paths = paths
+        self.timeout = timeout
+        self._channels: Dict[str, _Channel] = {}
+        self._connect_locks = {path: asyncio.Lock() for path in paths}
+        self._closing: Set[asyncio.Task] = set()
+
+    def _path_for(self, session_id: str) -> str:
+        # Stable across API processes, so every process sends a session to the same worker
+        return self.paths[zlib.crc32(session_id.encode()) % len(self.paths)]
+
+    async def _channel(self, path: str) -> _Channel:
+        async with self._connect_locks[path]:
+            channel = self._channels.get(path)
+            if channel is None or channel.closed:
+                try:
+                    reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), self.timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise ConnectionError(f"Proctoring worker unavailable at {path}: {e}") from e
+                channel = self._channels[path] = _Channel(path, reader, writer)
+            return channel
+
+    async def analyze(self, session_id: str, frame: bytes) -> Tuple[int, int, bool]:
+        """(face_count, gaze, phone_detected) for one encoded frame."""
+        path = self._path_for(session_id)
+        future = await (await self._channel(path)).send(OP_ANALYZE, session_id, frame)
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"Proctoring worker at {path} did not answer within {self.timeout}s")
+
+    def release_session(self, session_id: str) -> None:
+        """Tell the worker to drop the session's state (best effort; it also evicts idle sessions)."""
+        task = asyncio.create_task(self._release(session_id))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _release(self, session_id: str):
+        channel = self._channels.get(self._path_for(session_id))
+        if channel is None or channel.closed:
+            return
+        try:
+            await channel.send(OP_CLOSE, session_id)
+        except ConnectionError:
+            pass
+
+    async def close(self):
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        for channel in self._channels.values():
+            channel.close()
+        self._channels.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proctoring model worker")
+    parser.add_argument(
+        "--socket", default=(socket_paths() or [DEFAULT_SOCKET])[0],
+        help="Unix socket to listen on (default: the first PROCTORING_WORKER_SOCKET)",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(ProctoringWorker(args.socket).serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
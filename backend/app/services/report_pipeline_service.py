@@ -0,0 +1,190 @@
+import asyncio
+import os
+import socket
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List
+
+from app.config import settings
+from app.database import (
+    get_and_save_interview_report_data,
+    fetch_interview_report_data,
+    save_report_pdf_to_db,
+    get_pending_report_ids,
+    request_report_build,
+    claim_report_build,
+    renew_report_claim,
+    finish_report_build,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_STATUS_PENDING = "pending"
+REPORT_STATUS_READY = "ready"
+REPORT_STATUS_FAILED = "failed"
+
+
+def render_report_pdf(report_data) -> bytes:
+    """Runs in the PDF process pool, so only the pool workers ever import reportlab."""
+    from app.utils.report_pdf_generation import build_candidate_report_pdf
+
+    return build_candidate_report_pdf(report_data)
+
+
+class ReportPipelineService:
+    """
+    Builds candidate reports after an interview completes, off the request path.
+
+    complete_interview only marks the report "pending" and queues the interview;
+    background workers gather the report data (LLM grading runs concurrently),
+    render the PDF in a process pool, and mark the report "ready" or "failed".
+
+    Every API worker runs a pipeline against the same database, so a report is
+    claimed atomically (with a lease renewed while it builds) before building;
+    a pending report whose claim expired, because its worker died, is picked up
+    again by whichever pipeline sweeps it first. Only the claiming worker
+    releases a claim; a report re-queued while it builds is flagged, and that
+    worker queues it again when its build finishes.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._pdf_pool: Optional[ProcessPoolExecutor] = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    # ----------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------
+    def _ensure_started(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        # reportlab rendering is CPU-bound, so it runs in separate processes
+        self._pdf_pool = ProcessPoolExecutor(max_workers=settings.REPORT_PDF_PROCESSES)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(settings.REPORT_PIPELINE_WORKERS)
+        ]
+        logger.info(f"Report pipeline started with {len(self._workers)} workers")
+
+    async def start(self):
+        """Start the workers and re-queue unclaimed pending reports, now and every lease period."""
+        self._ensure_started()
+        await self._requeue_unclaimed()
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _requeue_unclaimed(self):
+        try:
+            pending = await get_pending_report_ids()
+        except Exception as e:
+            logger.error(f"Could not load pending reports: {e}")
+            return
+        for interview_id in pending:
+            self._queue.put_nowait(interview_id)
+        if pending:
+            logger.info(f"Re-queued {len(pending)} pending reports")
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(settings.REPORT_BUILD_LEASE_SECONDS)
+            await self._requeue_unclaimed()
+
+    async def stop(self):
+        tasks = self._workers + ([self._sweeper] if self._sweeper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._sweeper = None
+        self._queue = None
+        if self._pdf_pool is not None:
+            self._pdf_pool.shutdown(wait=False, cancel_futures=True)
+            self._pdf_pool = None
+        logger.info("Report pipeline stopped")
+
+    # ----------------------------------------------------
+    # Queueing
+    # ----------------------------------------------------
+    async def enqueue(self, interview_id: str):
+        """Mark the report pending and queue it (or flag the build running now for a redo); returns immediately."""
+        self._ensure_started()
+        if not await request_report_build(interview_id):
+            logger.info(f"Report for interview ID {interview_id} is being built; rebuild requested")
+            return
+        self._queue.put_nowait(interview_id)
+        logger.info(f"Queued report generation for interview ID: {interview_id}")
+
+    async def _worker(self, worker_id: int):
+        while True:
+            interview_id = await self._queue.get()
+            try:
+                await self.build_claimed_report(interview_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Report worker {worker_id} failed for interview ID {interview_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    # ----------------------------------------------------
+    # Report building
+    # ----------------------------------------------------
+    async def build_claimed_report(self, interview_id: str):
+        """Build the report if this pipeline wins the claim; otherwise another worker has it."""
+        lease = settings.REPORT_BUILD_LEASE_SECONDS
+        if not await claim_report_build(interview_id, self.owner, lease):
+            logger.info(f"Report for interview ID {interview_id} is built elsewhere or no longer pending")
+            return
+        renewer = asyncio.create_task(self._renew_claim(interview_id, lease))
+        try:
+            await self.build_report(interview_id)
+        except asyncio.CancelledError:
+            # Shutdown: the claim expires and another pipeline picks the report up
+            raise
+        except Exception as e:
+            await self._finish(interview_id, REPORT_STATUS_FAILED, str(e))
+            raise
+        else:
+            await self._finish(interview_id, REPORT_STATUS_READY)
+        finally:
+            renewer.cancel()
+
+    async def _finish(self, interview_id: str, status: str, error: Optional[str] = None):
+        outcome = await finish_report_build(interview_id, self.owner, status, error)
+        if outcome == REPORT_STATUS_PENDING and self._queue is not None:
+            self._queue.put_nowait(interview_id)
+            logger.info(f"Re-queued report for interview ID {interview_id}: rebuild requested during build")
+        elif outcome is None:
+            logger.warning(f"Lost the report claim for interview ID {interview_id} before the build finished")
+
+    async def _renew_claim(self, interview_id: str, lease: int):
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                if not await renew_report_claim(interview_id, self.owner, lease):
+                    return
+            except Exception as e:
+                logger.error(f"Could not renew report claim for interview ID {interview_id}: {e}")
+
+    async def build_report(self, interview_id: str):
+        """Gather the report data and render the PDF; the claiming caller records the outcome."""
+        try:
+            await get_and_save_interview_report_data(interview_id)
+            data = await fetch_interview_report_data(interview_id)
+            if not data:
+                raise ValueError("Report data not found")
+
+            loop = asyncio.get_running_loop()
+            pdf_data = await loop.run_in_executor(self._pdf_pool, render_report_pdf, data)
+            await save_report_pdf_to_db(interview_id, pdf_data)
+            logger.info(f"Report ready for interview ID: {interview_id}")
+        except Exception as e:
+            logger.error(f"Report generation failed for interview ID {interview_id}: {e}")
+            raise
+
+
+# Singleton instance
+report_pipeline_service = ReportPipelineService()
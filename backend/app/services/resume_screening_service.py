@@ -1,8 +1,6 @@
 import zipfile
 import os
 import tempfile
-import fitz  # PyMuPDF
-import pandas as pd
 import numpy as np
 import json
 import re
@@ -11,7 +9,6 @@ from datetime import datetime
 from dateutil import parser as date_parser
 from app.config import settings
 from concurrent.futures import ThreadPoolExecutor
-from sklearn.metrics.pairwise import cosine_similarity
 from openai import OpenAI
 from dotenv import load_dotenv
 from app.utils.logger import get_logger
@@ -73,8 +70,16 @@ def track_openai_embeddings(response, input_texts, model, service):
 # ---------------------------------
 # Utility Functions
 # ---------------------------------
+def cosine_similarities(vector, matrix):
+    """Cosine similarity of `vector` with each row of `matrix` (0 for zero-length rows)."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    dots = np.asarray(matrix, dtype=float) @ np.asarray(vector, dtype=float)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+
 def extract_text_from_pdf(pdf_path):
     """Extract text from PDF with error handling and retries"""
+    import fitz  # PyMuPDF
+
     for attempt in range(MAX_RETRIES):
         try:
             text = ""
@@ -236,7 +241,7 @@ def semantic_search(jd_text, resume_files, resume_texts, top_k=10):
     
     logger.info("Calculating cosine similarities between JD and resume chunks")
     try:
-        similarities = cosine_similarity([jd_embedding], chunk_embeddings)[0]
+        similarities = cosine_similarities(jd_embedding, chunk_embeddings)
     except Exception as e:
         logger.error(f"Error calculating cosine similarity: {str(e)}")
         return {file: 0.0 for file in resume_files}
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.database import (
+    get_database,
+    get_accessible_job_ids,
+    rebuild_search_index,
+    SEARCH_INDEX_COLLECTION,
+)
+from app.utils import omnibox_index
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Order of the kinds in mixed results (same recency rank → candidates' interviews first)
+KIND_ORDER = ["interview", "report", "screening", "job"]
+
+
+class SearchService:
+    """
+    Global search over interviews, reports, screening results and job postings.
+
+    Each kind is one bounded query on the (kind, grams, updated_at) index of
+    the search_index collection; entries are kept current by the write paths
+    (index_search_entries) and backfilled in the background on first start.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        try:
+            db = get_database()
+            if await db[SEARCH_INDEX_COLLECTION].estimated_document_count() == 0:
+                # Large collections take a while; serve requests meanwhile
+                self._task = asyncio.create_task(self._backfill())
+        except Exception as e:
+            logger.error(f"Search index backfill check failed: {e}")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _backfill(self):
+        try:
+            await rebuild_search_index()
+        except Exception as e:
+            logger.error(f"Search index backfill failed: {e}")
+
+    def allowed_kinds(self, role: Dict[str, Any], kinds: Optional[List[str]] = None) -> List[str]:
+        """Kinds the role may see (SUPER_ADMIN sees everything), limited to `kinds` if given."""
+        requested = kinds or KIND_ORDER
+        if role.get("role_name") == "SUPER_ADMIN":
+            return [kind for kind in KIND_ORDER if kind in requested]
+        permissions = set(role.get("permissions", []))
+        return [
+            kind for kind in KIND_ORDER
+            if kind in requested and omnibox_index.ENTITY_KINDS[kind]["permission"] in permissions
+        ]
+
+    async def search(
+        self,
+        query: str,
+        user_id: str,
+        kinds: List[str],
+        is_super_admin: bool,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Up to `limit` matches per kind, best title matches first, then most recent."""
+        grams = omnibox_index.query_grams(query)
+        if not grams or not kinds:
+            return []
+
+        access = None
+        if not is_super_admin:
+            job_ids = await get_accessible_job_ids(user_id)
+            access = {"$or": [{"created_by": str(user_id)}, {"job_posting_id": {"$in": job_ids}}]}
+
+        db = get_database()
+
+        async def search_kind(kind: str) -> List[Dict[str, Any]]:
+            query_filter = {"kind": kind, "grams": grams[0] if len(grams) == 1 else {"$all": grams}}
+            if access:
+                query_filter.update(access)
+            cursor = db[SEARCH_INDEX_COLLECTION].find(query_filter, {"grams": 0, "_id": 0})
+            return await cursor.sort("updated_at", -1).limit(limit).to_list(length=limit)
+
+        per_kind = await asyncio.gather(*(search_kind(kind) for kind in kinds))
+
+        words = omnibox_index.words(query)
+        results = []
+        for rank, entries in enumerate(per_kind):
+            for position, entry in enumerate(entries):
+                title_words = omnibox_index.words(entry.get("title"))
+                title_match = all(any(tw.startswith(w) for tw in title_words) for w in words)
+                results.append((0 if title_match else 1, position, rank, entry))
+
+        results.sort(key=lambda item: item[:3])
+        return [
+            {
+                "kind": entry["kind"],
+                "id": entry["entity_id"],
+                "title": entry.get("title"),
+                "subtitle": entry.get("subtitle"),
+                "job_posting_id": entry.get("job_posting_id"),
+            }
+            for *_, entry in results
+        ]
+
+
+# Singleton instance
+search_service = SearchService()
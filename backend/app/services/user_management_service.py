@@ -3,7 +3,10 @@ from typing import Optional, Dict, Any
 import uuid
 from bson import ObjectId
 from fastapi import HTTPException
-from ..database import get_database, USERS_COLLECTION
+from ..database import get_database, apply_dashboard_counter_changes, with_org_key, USERS_COLLECTION
+from ..utils.dashboard_counters import COUNTER_FIELDS
+from ..utils.org_tree_cache import invalidate_org_tree
+from pymongo import ReturnDocument
 from ..utils.logger import get_logger
 from ..utils.password_handler import hash_password
 from app.services.email_service import EmailService
@@ -66,13 +69,16 @@ class UserService:
                 "updated_at": None
             }
 
-            result = await self.db[USERS_COLLECTION].insert_one(user_doc)
+            result = await self.db[USERS_COLLECTION].insert_one(with_org_key(user_doc))
             user_id = str(result.inserted_id)
 
             if not result.acknowledged:
                 logger.error("MongoDB insert not acknowledged")
                 raise RuntimeError("User creation failed")
 
+            await apply_dashboard_counter_changes("user", None, user_doc)
+            invalidate_org_tree()
+
             logger.info(f"User created successfully: {user_id}")
 
             await EmailService().send_user_credentials_email(\
@@ -188,14 +194,19 @@ class UserService:
 
             update_fields["updated_at"] = datetime.now(timezone.utc)
 
-            result = await self.db[USERS_COLLECTION].update_one(
+            previous_user = await self.db[USERS_COLLECTION].find_one_and_update(
                 {"_id": ObjectId(user_id)},
-                {"$set": update_fields}
+                {"$set": update_fields},
+                projection=COUNTER_FIELDS["user"],
+                return_document=ReturnDocument.BEFORE
             )
 
-            if result.matched_count == 0:
+            if previous_user is None:
                 raise HTTPException(status_code=404, detail="User not found")
 
+            await apply_dashboard_counter_changes("user", previous_user, {**previous_user, **update_fields})
+            invalidate_org_tree()
+
             logger.info(f"User updated successfully: {user_id}")
             return True
 
@@ -241,14 +252,18 @@ class UserService:
         logger.info(f"Deleting user: {user_id}")
 
         try:
-            result = await self.db[USERS_COLLECTION].delete_one(
-                {"_id": ObjectId(user_id)}
+            deleted_user = await self.db[USERS_COLLECTION].find_one_and_delete(
+                {"_id": ObjectId(user_id)},
+                projection=COUNTER_FIELDS["user"]
             )
 
-            if result.deleted_count == 0:
+            if deleted_user is None:
                 logger.warning(f"User not found for deletion: {user_id}")
                 raise HTTPException(status_code=404, detail="User not found")
 
+            await apply_dashboard_counter_changes("user", deleted_user, None)
+            invalidate_org_tree()
+
             logger.info(f"User deleted successfully: {user_id}")
             return True
 
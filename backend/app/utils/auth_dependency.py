@@ -82,6 +82,9 @@ def require_permission(permission: str) -> Callable:
         if not role:
             raise HTTPException(status_code=403, detail="Role not found")
 
+        # Routes that branch on the role can use this instead of fetching it again
+        current_user["role_name"] = role.get("role_name")
+
         # SUPER_ADMIN → FULL ACCESS
         if role.get("role_name") == "SUPER_ADMIN":
             return current_user
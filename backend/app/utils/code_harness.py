@@ -0,0 +1,343 @@
+import json
+from typing import List, Dict, Any, Optional
+
+from app.models.code import TestCase
+
+# Every per-case result is printed on its own line, prefixed with this marker,
+# so anything the candidate's code prints itself is ignored when parsing.
+RESULT_MARKER = "__AIA_CASE_RESULT__"
+
+# Per-test-case time limit inside the harness (seconds). C++ cannot interrupt a
+# running call, so it relies on the overall submission time limit instead.
+CASE_TIMEOUT_SECONDS = 2
+
+HARNESS_LANGUAGES = ["python", "javascript", "java", "csharp", "cpp"]
+
+
+def get_function_name(language: str, function_signature: str) -> str:
+    """Extract the function name from a signature, the same way the single-case runners do."""
+    if language == "python":
+        if function_signature.startswith("def "):
+            return function_signature.split('(')[0].replace("def ", "").strip()
+        return function_signature.split(' ')[1].split('(')[0]
+    if language == "javascript":
+        return function_signature.split(' ')[1].split('(')[0]
+    if language in ("java", "csharp"):
+        # Last token before "(" so "public static int[] twoSum(...)" also works
+        return function_signature.split('(')[0].split()[-1]
+    return "solution"
+
+
+# ----------------------------------------------------
+# Harness generators (one program runs every test case)
+# ----------------------------------------------------
+def _python_harness(user_code: str, function_name: str, test_cases: List[TestCase]) -> str:
+    inputs = [tc.input for tc in test_cases]
+    return f"""
+{user_code}
+
+import json as _aia_json
+import signal as _aia_signal
+
+
+class _AiaCaseTimeout(TimeoutError):
+    pass
+
+
+def _aia_on_timeout(signum, frame):
+    raise _AiaCaseTimeout("Time limit exceeded")
+
+
+_aia_signal.signal(_aia_signal.SIGALRM, _aia_on_timeout)
+
+for _aia_index, _aia_input in enumerate({inputs!r}):
+    _aia_output, _aia_error, _aia_timed_out = None, None, False
+    try:
+        _aia_signal.setitimer(_aia_signal.ITIMER_REAL, {CASE_TIMEOUT_SECONDS})
+        try:
+            _aia_result = eval("{function_name}(" + _aia_input + ")")
+        finally:
+            _aia_signal.setitimer(_aia_signal.ITIMER_REAL, 0)
+        try:
+            _aia_output = _aia_json.dumps(_aia_result)
+        except (TypeError, ValueError):
+            _aia_output = str(_aia_result)
+    except _AiaCaseTimeout as e:
+        _aia_error, _aia_timed_out = "TimeoutError: " + str(e), True
+    except Exception as e:
+        _aia_error = type(e).__name__ + ": " + str(e)
+    print("\\n{RESULT_MARKER}" + _aia_json.dumps({{"index": _aia_index, "output": _aia_output, "error": _aia_error, "timed_out": _aia_timed_out}}), flush=True)
+"""
+
+
+def _javascript_harness(user_code: str, function_name: str, test_cases: List[TestCase]) -> str:
+    inputs = json.dumps([tc.input for tc in test_cases])
+    timeout_ms = CASE_TIMEOUT_SECONDS * 1000
+    return f"""
+{user_code}
+
+const __aiaVm = require('vm');
+globalThis.__aiaFn = {function_name};
+
+{inputs}.forEach((input, index) => {{
+  let output = null;
+  let error = null;
+  let timed_out = false;
+  try {{
+    const result = __aiaVm.runInThisContext('__aiaFn(' + input + ')', {{ timeout: {timeout_ms} }});
+    output = JSON.stringify(result);
+    if (output === undefined) output = String(result);
+  }} catch (e) {{
+    error = e && e.message ? e.message : String(e);
+    timed_out = !!e && e.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT';
+  }}
+  console.log('\\n{RESULT_MARKER}' + JSON.stringify({{ index, output, error, timed_out }}));
+}});
+"""
+
+
+def _java_harness(user_code: str, function_name: str, test_cases: List[TestCase]) -> str:
+    timeout_ms = CASE_TIMEOUT_SECONDS * 1000
+    calls = "\n".join(
+        f"        __run({idx}, () -> (Object) solution.{function_name}({tc.input}));"
+        for idx, tc in enumerate(test_cases)
+    )
+    return f"""
+{user_code}
+
+public class Main {{
+    static final java.util.concurrent.ExecutorService __executor =
+        java.util.concurrent.Executors.newCachedThreadPool(r -> {{
+            Thread t = new Thread(r);
+            t.setDaemon(true);
+            return t;
+        }});
+
+    static String __toStr(Object o) {{
+        if (o == null) return "null";
+        if (o instanceof Object[]) return java.util.Arrays.deepToString((Object[]) o);
+        if (o instanceof int[]) return java.util.Arrays.toString((int[]) o);
+        if (o instanceof long[]) return java.util.Arrays.toString((long[]) o);
+        if (o instanceof double[]) return java.util.Arrays.toString((double[]) o);
+        if (o instanceof boolean[]) return java.util.Arrays.toString((boolean[]) o);
+        if (o instanceof char[]) return java.util.Arrays.toString((char[]) o);
+        return String.valueOf(o);
+    }}
+
+    static String __json(String s) {{
+        if (s == null) return "null";
+        StringBuilder sb = new StringBuilder("\\"");
+        for (char c : s.toCharArray()) {{
+            if (c == '"' || c == '\\\\') sb.append('\\\\').append(c);
+            else if (c == '\\n') sb.append("\\\\n");
+            else if (c == '\\r') sb.append("\\\\r");
+            else if (c == '\\t') sb.append("\\\\t");
+            else if (c < 0x20) sb.append(String.format("\\\\u%04x", (int) c));
+            else sb.append(c);
+        }}
+        return sb.append('"').toString();
+    }}
+
+    static void __run(int index, java.util.concurrent.Callable<Object> call) {{
+        String output = null;
+        String error = null;
+        boolean timedOut = false;
+        java.util.concurrent.Future<Object> future = __executor.submit(call);
+        try {{
+            output = __toStr(future.get({timeout_ms}, java.util.concurrent.TimeUnit.MILLISECONDS));
+        }} catch (java.util.concurrent.TimeoutException e) {{
+            future.cancel(true);
+            error = "Time limit exceeded";
+            timedOut = true;
+        }} catch (java.util.concurrent.ExecutionException e) {{
+            error = String.valueOf(e.getCause());
+        }} catch (Exception e) {{
+            error = String.valueOf(e);
+        }}
+        System.out.println("\\n{RESULT_MARKER}{{\\"index\\":" + index + ",\\"output\\":" + __json(output) + ",\\"error\\":" + __json(error) + ",\\"timed_out\\":" + timedOut + "}}");
+    }}
+
+    public static void main(String[] args) {{
+        Solution solution = new Solution();
+{calls}
+        System.out.flush();
+        System.exit(0);
+    }}
+}}
+"""
+
+
+def _csharp_harness(user_code: str, function_name: str, test_cases: List[TestCase]) -> str:
+    timeout_ms = CASE_TIMEOUT_SECONDS * 1000
+    calls = "\n".join(
+        f"        __Run({idx}, () => Solution.{function_name}({tc.input}));"
+        for idx, tc in enumerate(test_cases)
+    )
+    return f"""
+{user_code}
+
+class Program {{
+    static string __ToStr(object o) {{
+        if (o == null) return "null";
+        if (o is bool b) return b ? "true" : "false";
+        if (o is string s) return s;
+        if (o is System.Collections.IEnumerable items) {{
+            var parts = new System.Collections.Generic.List<string>();
+            foreach (var item in items) parts.Add(__ToStr(item));
+            return "[" + string.Join(",", parts) + "]";
+        }}
+        return System.Convert.ToString(o, System.Globalization.CultureInfo.InvariantCulture);
+    }}
+
+    static string __Json(string s) {{
+        if (s == null) return "null";
+        var sb = new System.Text.StringBuilder("\\"");
+        foreach (char c in s) {{
+            if (c == '"' || c == '\\\\') sb.Append('\\\\').Append(c);
+            else if (c == '\\n') sb.Append("\\\\n");
+            else if (c == '\\r') sb.Append("\\\\r");
+            else if (c == '\\t') sb.Append("\\\\t");
+            else if (c < 0x20) sb.Append("\\\\u" + ((int)c).ToString("x4"));
+            else sb.Append(c);
+        }}
+        return sb.Append('"').ToString();
+    }}
+
+    static void __Run(int index, System.Func<object> call) {{
+        string output = null;
+        string error = null;
+        bool timedOut = false;
+        try {{
+            var task = System.Threading.Tasks.Task.Run(call);
+            if (task.Wait({timeout_ms})) output = __ToStr(task.Result);
+            else {{ error = "Time limit exceeded"; timedOut = true; }}
+        }} catch (System.AggregateException e) {{
+            error = (e.InnerException ?? e).Message;
+        }} catch (System.Exception e) {{
+            error = e.Message;
+        }}
+        System.Console.WriteLine("\\n{RESULT_MARKER}{{\\"index\\":" + index + ",\\"output\\":" + __Json(output) + ",\\"error\\":" + __Json(error) + ",\\"timed_out\\":" + (timedOut ? "true" : "false") + "}}");
+    }}
+
+    static void Main() {{
+{calls}
+        System.Console.Out.Flush();
+        System.Environment.Exit(0);
+    }}
+}}
+"""
+
+
+def _cpp_harness(user_code: str, function_name: str, test_cases: List[TestCase]) -> str:
+    calls = "\n".join(
+        f"    __aia_run({idx}, [&]() {{ return solution({tc.input}); }});"
+        for idx, tc in enumerate(test_cases)
+    )
+    return f"""
+{user_code}
+
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <exception>
+#include <cstdio>
+
+static std::string __aia_json(const std::string& s) {{
+    std::string out = "\\"";
+    for (char c : s) {{
+        if (c == '"' || c == '\\\\') {{ out += '\\\\'; out += c; }}
+        else if (c == '\\n') out += "\\\\n";
+        else if (c == '\\r') out += "\\\\r";
+        else if (c == '\\t') out += "\\\\t";
+        else if (static_cast<unsigned char>(c) < 0x20) {{
+            char buf[8];
+            std::snprintf(buf, sizeof(buf), "\\\\u%04x", c);
+            out += buf;
+        }}
+        else out += c;
+    }}
+    return out + "\\"";
+}}
+
+template <typename F>
+static void __aia_run(int index, F call) {{
+    std::ostringstream output;
+    std::string error;
+    bool ok = true;
+    try {{
+        output << call();
+    }} catch (const std::exception& e) {{
+        ok = false;
+        error = e.what();
+    }} catch (...) {{
+        ok = false;
+        error = "Unknown exception";
+    }}
+    std::cout << "\\n{RESULT_MARKER}{{\\"index\\":" << index
+              << ",\\"output\\":" << (ok ? __aia_json(output.str()) : std::string("null"))
+              << ",\\"error\\":" << (ok ? std::string("null") : __aia_json(error)) << "}}" << std::endl;
+}}
+
+int main() {{
+{calls}
+    return 0;
+}}
+"""
+
+
+_HARNESS_BUILDERS = {
+    "python": _python_harness,
+    "javascript": _javascript_harness,
+    "java": _java_harness,
+    "csharp": _csharp_harness,
+    "cpp": _cpp_harness,
+}
+
+
+def build_test_harness(
+    language: str,
+    user_code: str,
+    test_cases: List[TestCase],
+    function_signature: str
+) -> str:
+    """
+    Build a single program that runs every test case against the user's code.
+
+    Each case runs in isolation (exceptions and, where the language allows it,
+    timeouts are caught per case) and prints one RESULT_MARKER line with a JSON
+    object: {"index": int, "output": str | null, "error": str | null,
+    "timed_out": bool} (timed_out is true when the per-case limit stopped the case;
+    the C++ harness omits it).
+    """
+    builder = _HARNESS_BUILDERS.get(language)
+    if builder is None:
+        raise ValueError(f"No test harness available for language '{language}'")
+    return builder(user_code, get_function_name(language, function_signature), test_cases)
+
+
+def parse_harness_output(stdout: Optional[str]) -> Dict[int, Dict[str, Any]]:
+    """
+    Extract per-case results from the harness stdout.
+
+    Returns a mapping of test case index -> {"output": ..., "error": ..., "timed_out": bool}.
+    Lines that are not result lines (e.g. the candidate's own prints) are ignored.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    if not stdout:
+        return results
+
+    for line in stdout.splitlines():
+        line = line.strip()
+        if not line.startswith(RESULT_MARKER):
+            continue
+        try:
+            payload = json.loads(line[len(RESULT_MARKER):])
+            results[int(payload["index"])] = {
+                "output": payload.get("output"),
+                "error": payload.get("error"),
+                "timed_out": bool(payload.get("timed_out"))
+            }
+        except (ValueError, KeyError, TypeError):
+            continue
+
+    return results
@@ -0,0 +1,90 @@
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bounds for the whole process (least recently used entries are evicted first)
+MAX_ENTRIES = 20000
+MAX_BYTES = 64 * 1024 * 1024
+
+# (interview_id, language, source hash, function signature, test input) -> outcome
+# The outcome is {"actualOutput": str | None, "error": str | None}; "passed" is
+# recomputed against the current expected output when a TestResult is built.
+_CacheKey = Tuple[str, str, str, str, str]
+_entries: "OrderedDict[_CacheKey, Dict[str, Any]]" = OrderedDict()
+# interview_id -> keys belonging to it, so completion can purge them
+_interview_keys: Dict[str, set] = {}
+_total_bytes = 0
+
+
+def normalize_source(code: str) -> str:
+    """Normalize whitespace that cannot change behaviour (line endings, trailing spaces, blank tail)."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def source_hash(code: str) -> str:
+    return hashlib.sha256(normalize_source(code).encode("utf-8")).hexdigest()
+
+
+def build_key(interview_id: Optional[str], language: str, code_hash: str,
+              function_signature: str, test_input: str) -> _CacheKey:
+    return (interview_id or "", language.lower(), code_hash, function_signature.strip(), test_input.strip())
+
+
+def _entry_size(key: _CacheKey, outcome: Dict[str, Any]) -> int:
+    return sum(len(part) for part in key) + len(json.dumps(outcome))
+
+
+def get_outcome(key: _CacheKey) -> Optional[Dict[str, Any]]:
+    """Return the cached execution outcome for a test case, if any."""
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    _entries.move_to_end(key)
+    return entry["outcome"]
+
+
+def set_outcome(key: _CacheKey, outcome: Dict[str, Any]) -> None:
+    """Cache an execution outcome, evicting least recently used entries past the bounds."""
+    global _total_bytes
+
+    size = _entry_size(key, outcome)
+    if size > MAX_BYTES:
+        return
+
+    _discard(key)
+    _entries[key] = {"outcome": outcome, "size": size}
+    _interview_keys.setdefault(key[0], set()).add(key)
+    _total_bytes += size
+
+    while _entries and (len(_entries) > MAX_ENTRIES or _total_bytes > MAX_BYTES):
+        _discard(next(iter(_entries)))
+
+
+def _discard(key: _CacheKey) -> None:
+    global _total_bytes
+
+    entry = _entries.pop(key, None)
+    if entry is None:
+        return
+    _total_bytes -= entry["size"]
+    keys = _interview_keys.get(key[0])
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            _interview_keys.pop(key[0], None)
+
+
+def purge_interview(interview_id: str) -> int:
+    """Drop every cached result for an interview (called when it completes)."""
+    keys = list(_interview_keys.get(interview_id, ()))
+    for key in keys:
+        _discard(key)
+    if keys:
+        logger.info(f"Purged {len(keys)} cached code results for interview {interview_id}")
+    return len(keys)
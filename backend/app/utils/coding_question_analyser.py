@@ -1,10 +1,11 @@
-from langchain_core.messages import HumanMessage
 from .logger import get_logger
 from app.llm_models.openai_llm import get_openai_llm
 
 logger = get_logger(__name__)
 
 async def get_llm_coding_score(question_title: str, candidate_code: str) -> int:
+    from langchain_core.messages import HumanMessage
+
     if not candidate_code or candidate_code is None:
         return 0
     
@@ -22,7 +23,8 @@ Give a score from 0 to 10 based on:
 Return only the numeric score (0–10). No explanation."""
     try:
         llm = get_openai_llm()
-        response = llm.invoke([HumanMessage(content=prompt)])
+        # Async call so grading never blocks the event loop and answers can be graded concurrently
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
         score = int(response.content.strip())
         return max(0, min(score, 10))  # Ensure score is between
     
@@ -0,0 +1,122 @@
+"""
+Dashboard counter bookkeeping.
+
+Every job posting, interview, user and role document contributes +1 to a few
+counters in one or more scopes:
+
+    global                  everything
+    creator:<created_by>    documents created by one user (jobs/interviews store
+                            the user id, users/roles store the creator's email)
+    job:<job_posting_id>    interviews for one job posting
+
+A write turns into the difference between the contributions of the document
+before and after it, which is applied with a single atomic $inc per scope.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+GLOBAL_SCOPE = "global"
+
+# Fields each kind of document needs for its contributions
+COUNTER_FIELDS = {
+    "job": {"status": 1, "created_by": 1},
+    "interview": {"status": 1, "created_by": 1, "job_posting_id": 1},
+    "user": {"is_active": 1, "role_id": 1, "created_by": 1},
+    "role": {"role_name": 1, "created_by": 1},
+}
+
+Contributions = Dict[str, Dict[str, int]]
+
+
+def creator_scope(created_by: Any) -> str:
+    return f"creator:{created_by}"
+
+
+def job_scope(job_posting_id: Any) -> str:
+    return f"job:{job_posting_id}"
+
+
+def _key(value: Any) -> str:
+    """Counter names are field paths, so '.' and a leading '$' can't appear in them."""
+    text = str(value).replace(".", "_")
+    return "_" + text[1:] if text.startswith("$") else text
+
+
+def _role_id(role_id: Any) -> Optional[str]:
+    if isinstance(role_id, dict):
+        role_id = role_id.get("_id")
+    return str(role_id) if role_id else None
+
+
+def _counters(kind: str, doc: Dict[str, Any]) -> Dict[str, int]:
+    """Counters a document adds in every scope it belongs to."""
+    if kind in ("job", "interview"):
+        prefix = "jobs" if kind == "job" else "interviews"
+        counters = {f"{prefix}.total": 1}
+        status = doc.get("status")
+        if status:
+            counters[f"{prefix}.status.{_key(str(status).lower())}"] = 1
+        return counters
+
+    if kind == "user":
+        counters = {"users.total": 1}
+        # Users without is_active were never counted as active or inactive
+        if doc.get("is_active") is True:
+            counters["users.active"] = 1
+        elif doc.get("is_active") is False:
+            counters["users.inactive"] = 1
+        return counters
+
+    if kind == "role":
+        counters = {"roles.total": 1}
+        if doc.get("role_name"):
+            counters[f"roles.name.{_key(doc['role_name'])}"] = 1
+        return counters
+
+    raise ValueError(f"Unknown counter kind: {kind}")
+
+
+def contributions(kind: str, doc: Optional[Dict[str, Any]]) -> Contributions:
+    """scope -> {counter: +1} for one document (empty when the document doesn't exist)."""
+    if not doc:
+        return {}
+
+    counters = _counters(kind, doc)
+    result: Contributions = {GLOBAL_SCOPE: dict(counters)}
+
+    if doc.get("created_by"):
+        result[creator_scope(doc["created_by"])] = dict(counters)
+
+    if kind == "interview" and doc.get("job_posting_id"):
+        result[job_scope(doc["job_posting_id"])] = dict(counters)
+
+    if kind == "user":
+        # Role-wise user counts are only kept globally
+        role_id = _role_id(doc.get("role_id"))
+        if role_id:
+            result[GLOBAL_SCOPE][f"users.role.{_key(role_id)}"] = 1
+
+    return result
+
+
+def diff(kind: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Contributions:
+    """$inc amounts per scope that turn the counters for `before` into those for `after`."""
+    changes: Contributions = defaultdict(dict)
+    for sign, doc in ((-1, before), (1, after)):
+        for scope, counters in contributions(kind, doc).items():
+            for name, amount in counters.items():
+                changes[scope][name] = changes[scope].get(name, 0) + sign * amount
+
+    return {
+        scope: {name: amount for name, amount in counters.items() if amount}
+        for scope, counters in changes.items()
+        if any(counters.values())
+    }
+
+
+def add_into(totals: Contributions, kind: str, doc: Dict[str, Any]) -> None:
+    """Accumulate a document's contributions (used when recounting from scratch)."""
+    for scope, counters in contributions(kind, doc).items():
+        scope_totals = totals.setdefault(scope, {})
+        for name, amount in counters.items():
+            scope_totals[name] = scope_totals.get(name, 0) + amount
@@ -1,7 +1,6 @@
 from PyPDF2 import PdfReader
 import io
 import logging
-import fitz  # PyMuPDF
 from app.database import get_jd_from_db
 
 logger = logging.getLogger(__name__)
@@ -53,6 +52,7 @@ async def extract_text_from_jd(candidate_email):
         # ---------------------------------------------------------
         try:
             logger.info("Attempting to extract text using PyMuPDF...")
+            import fitz  # PyMuPDF
             text = ""
 
             with fitz.open(stream=jd, filetype="pdf") as doc:
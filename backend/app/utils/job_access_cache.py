@@ -0,0 +1,48 @@
+import time
+from typing import Dict, List, Optional, Any
+
+from app.config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# user_id -> {"job_ids": [...], "version": int, "timestamp": float}
+_job_ids_cache: Dict[str, Dict[str, Any]] = {}
+# user_id -> version, bumped whenever the user's accessible jobs change in this process
+_versions: Dict[str, int] = {}
+
+
+def current_version(user_id: str) -> int:
+    return _versions.get(str(user_id), 0)
+
+
+def get_cached_job_ids(user_id: str) -> Optional[List[str]]:
+    """
+    Return the cached accessible job ids for a user if still current. Entries also
+    expire after JOB_ACCESS_CACHE_SECONDS so assignments changed by another worker
+    are picked up.
+    """
+    entry = _job_ids_cache.get(str(user_id))
+    if not entry or entry["version"] != current_version(user_id):
+        return None
+    if time.time() - entry["timestamp"] > settings.JOB_ACCESS_CACHE_SECONDS:
+        _job_ids_cache.pop(str(user_id), None)
+        return None
+    return entry["job_ids"]
+
+
+def set_cached_job_ids(user_id: str, job_ids: List[str], version: int) -> None:
+    """Cache job ids read at `version` (dropped if the user's access changed since)."""
+    if version != current_version(user_id):
+        return
+    _job_ids_cache[str(user_id)] = {"job_ids": job_ids, "version": version, "timestamp": time.time()}
+
+
+def invalidate_user_jobs(user_ids) -> None:
+    """Drop the cached job ids of users whose assignments or jobs changed."""
+    for user_id in user_ids:
+        if not user_id:
+            continue
+        user_id = str(user_id)
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        _job_ids_cache.pop(user_id, None)
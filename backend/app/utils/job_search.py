@@ -0,0 +1,119 @@
+"""
+Weighted term index for job posting search.
+
+Each job posting stores `search_terms`, a list of {"t": term, "w": weight}
+built from its searchable fields. A multikey index on search_terms.t answers
+"every query word matches" with index lookups instead of a regex scan:
+
+    - whole words from every field (the description contributes whole words only)
+    - prefixes of words in the short fields, so "pyth" finds "python" while typing
+
+A term's weight is its field weight (halved for a prefix), keeping the best
+field when a term appears in several. Prefixes stop at MAX_PREFIX characters,
+so a longer query word also matches its own MAX_PREFIX-character prefix (a
+word typed past that length keeps finding the posting until it is complete).
+Relevance is the sum over query words of the best matched term weight.
+"""
+import re
+from typing import Any, Dict, Iterable, List
+
+# Bump when tokenization or weights change so stored terms are rebuilt
+SEARCH_TERMS_VERSION = 1
+
+FIELD_WEIGHTS = {
+    "job_title": 10,
+    "required_skills": 6,
+    "company": 4,
+    "job_type": 2,
+    "location": 2,
+    "job_description": 1,
+}
+
+# Fields small enough to index every word prefix of
+PREFIX_FIELDS = ("job_title", "required_skills", "company", "job_type", "location")
+MIN_PREFIX = 2
+MAX_PREFIX = 12
+
+# Long descriptions contribute at most this many distinct words
+MAX_DESCRIPTION_TERMS = 400
+MAX_QUERY_TERMS = 8
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "to", "was", "we", "will", "with", "you", "your",
+}
+
+# Keeps skills like "c++", "c#", "node.js" and ".net" whole
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]*[a-z0-9+#]")
+
+
+def tokenize(text: Any) -> List[str]:
+    if text is None:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(item) for item in text)
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def build_search_terms(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """search_terms for a job posting document (or update payload with all fields)."""
+    weights: Dict[str, float] = {}
+
+    def add(term: str, weight: float) -> None:
+        if weight > weights.get(term, 0):
+            weights[term] = weight
+
+    for field, field_weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(job.get(field))
+        if field == "job_description":
+            tokens = [token for token in dict.fromkeys(tokens) if token not in STOP_WORDS][:MAX_DESCRIPTION_TERMS]
+        for token in tokens:
+            add(token, field_weight)
+            if field in PREFIX_FIELDS:
+                for length in range(MIN_PREFIX, min(len(token), MAX_PREFIX + 1)):
+                    add(token[:length], field_weight / 2)
+
+    return [{"t": term, "w": weight} for term, weight in weights.items()]
+
+
+def search_fields(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields to $set alongside a job posting write."""
+    return {"search_terms": build_search_terms(job), "search_terms_version": SEARCH_TERMS_VERSION}
+
+
+def query_terms(search: str) -> List[str]:
+    """Distinct query words, longest first (the rarest usually narrows the index scan most)."""
+    terms = [term for term in dict.fromkeys(tokenize(search)) if term not in STOP_WORDS]
+    terms = terms or list(dict.fromkeys(tokenize(search)))
+    return sorted(terms, key=len, reverse=True)[:MAX_QUERY_TERMS]
+
+
+def term_forms(term: str) -> List[str]:
+    """Stored terms a query word matches: the word itself and, past MAX_PREFIX, its longest stored prefix."""
+    return [term, term[:MAX_PREFIX]] if len(term) > MAX_PREFIX else [term]
+
+
+def search_filter(terms: Iterable[str]) -> Dict[str, Any]:
+    return {"$and": [{"search_terms.t": {"$in": term_forms(term)}} for term in terms]}
+
+
+def relevance_expression(terms: Iterable[str]) -> Dict[str, Any]:
+    """Aggregation expression: sum of the best stored weight for each query word."""
+    return {
+        "$sum": [
+            {
+                "$max": {
+                    "$map": {
+                        "input": {
+                            "$filter": {
+                                "input": {"$ifNull": ["$search_terms", []]},
+                                "cond": {"$in": ["$$this.t", term_forms(term)]},
+                            }
+                        },
+                        "in": "$$this.w",
+                    }
+                }
+            }
+            for term in terms
+        ]
+    }
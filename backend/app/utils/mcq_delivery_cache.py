@@ -0,0 +1,81 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# interview_id -> {"etag": str, "payload": dict, "timestamp": float}, oldest first
+mcq_payload_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# Rendered payloads are re-validated against the database after this many seconds,
+# so a regeneration handled by another worker is picked up eventually
+CACHE_EXPIRY = 60
+# Bound for the whole process (the oldest entries are evicted first)
+MAX_ENTRIES = 2000
+
+# interview_id -> event set when MCQs for that interview are saved
+_ready_events: Dict[str, asyncio.Event] = {}
+
+
+def build_etag(interview_id: str, version: int) -> str:
+    """Build the (strong) ETag for a given MCQ document version."""
+    return f'"mcqs-{interview_id}-v{version}"'
+
+
+def get_cached_payload(interview_id: str) -> Optional[Dict[str, Any]]:
+    """Return the cached {"etag", "payload"} entry for an interview if still fresh."""
+    entry = mcq_payload_cache.get(interview_id)
+    if not entry:
+        return None
+    if time.time() - entry["timestamp"] > CACHE_EXPIRY:
+        mcq_payload_cache.pop(interview_id, None)
+        return None
+    return entry
+
+
+def set_cached_payload(interview_id: str, etag: str, payload: Dict[str, Any]) -> None:
+    """Cache the rendered candidate payload for an interview, dropping expired and excess entries."""
+    now = time.time()
+    mcq_payload_cache.pop(interview_id, None)
+    mcq_payload_cache[interview_id] = {
+        "etag": etag,
+        "payload": payload,
+        "timestamp": now
+    }
+    # Entries are kept in write order, so expired ones are always at the front
+    while mcq_payload_cache:
+        oldest = next(iter(mcq_payload_cache.values()))
+        if len(mcq_payload_cache) <= MAX_ENTRIES and now - oldest["timestamp"] <= CACHE_EXPIRY:
+            break
+        mcq_payload_cache.popitem(last=False)
+
+
+def notify_mcqs_saved(interview_id: str) -> None:
+    """
+    Drop the cached payload and wake up any long-poll requests waiting on
+    this interview. Must be called from the event loop thread.
+    """
+    mcq_payload_cache.pop(interview_id, None)
+    event = _ready_events.pop(interview_id, None)
+    if event:
+        logger.info(f"Notifying waiters that MCQs are ready for interview {interview_id}")
+        event.set()
+
+
+async def wait_for_mcqs(interview_id: str, timeout: float) -> bool:
+    """
+    Wait until MCQs for the interview are saved in this process or the timeout
+    elapses. Returns True if a notification was received.
+    """
+    event = _ready_events.setdefault(interview_id, asyncio.Event())
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        # Don't keep events around for interviews nobody is generating for;
+        # waiters still holding this event fall back to re-reading the database
+        if _ready_events.get(interview_id) is event:
+            _ready_events.pop(interview_id, None)
+        return False
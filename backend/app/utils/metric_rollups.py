@@ -0,0 +1,90 @@
+"""
+Time-bucketed metric rollups for the dashboard trend charts.
+
+Each rollup document holds the metric sums for one (granularity, scope, bucket):
+
+    {"_id": "day:job:<id>:2024-05-01T00", "granularity": "day", "scope": "job:<id>",
+     "bucket": <bucket start>, "metrics": {"interviews_scheduled": 4, ...}}
+
+Scopes are the same as the dashboard counters (global, creator:<id>, job:<id>).
+A 90-day daily chart therefore reads at most 90 small documents.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.utils.dashboard_counters import GLOBAL_SCOPE, creator_scope, job_scope
+
+GRANULARITIES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    """Start of the UTC hour/day containing `at`."""
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    at = at.astimezone(timezone.utc)
+    if granularity == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_id(granularity: str, scope: str, bucket: datetime) -> str:
+    return f"{granularity}:{scope}:{bucket.strftime('%Y-%m-%dT%H')}"
+
+
+def interview_scopes(doc: Dict[str, Any]) -> List[str]:
+    scopes = [GLOBAL_SCOPE]
+    if doc.get("created_by"):
+        scopes.append(creator_scope(doc["created_by"]))
+    if doc.get("job_posting_id"):
+        scopes.append(job_scope(doc["job_posting_id"]))
+    return scopes
+
+
+def screening_scopes(job_posting_id: Optional[str]) -> List[str]:
+    scopes = [GLOBAL_SCOPE]
+    if job_posting_id:
+        scopes.append(job_scope(job_posting_id))
+    return scopes
+
+
+def interview_metrics(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Metric increments for an interview write: scheduled on insert, completed on the transition."""
+    metrics = {}
+    if before is None and after is not None:
+        metrics["interviews_scheduled"] = 1
+    if after is not None and after.get("status") == "completed" and (before or {}).get("status") != "completed":
+        metrics["interviews_completed"] = 1
+    return metrics
+
+
+def screening_metrics(records: List[Dict[str, Any]], sign: int = 1) -> Dict[str, float]:
+    """Metric increments for screening records (sign=-1 takes replaced records back out)."""
+    scores = [record["ATS_Score"] for record in records if isinstance(record.get("ATS_Score"), (int, float))]
+    return {
+        "screenings": sign * len(records),
+        "ats_score_sum": sign * float(sum(scores)),
+        "ats_score_count": sign * len(scores),
+    }
+
+
+def series(rollups: List[Dict[str, Any]], granularity: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Zero-filled points from `start` to `end` (bucket starts), with the average ATS score derived."""
+    by_bucket = {bucket_start(doc["bucket"], granularity): doc.get("metrics", {}) for doc in rollups}
+    step = GRANULARITIES[granularity]
+
+    points = []
+    bucket = bucket_start(start, granularity)
+    while bucket <= end:
+        metrics = by_bucket.get(bucket, {})
+        count = metrics.get("ats_score_count", 0)
+        points.append({
+            "bucket": bucket.isoformat(),
+            "interviews_scheduled": metrics.get("interviews_scheduled", 0),
+            "interviews_completed": metrics.get("interviews_completed", 0),
+            "screenings": metrics.get("screenings", 0),
+            "average_ats_score": round(metrics.get("ats_score_sum", 0) / count, 2) if count else None,
+        })
+        bucket += step
+    return points
@@ -0,0 +1,122 @@
+"""
+Global search ("omnibox") index entries.
+
+Interviews, screening results, candidate reports and job postings each get one
+small entry in the search_index collection:
+
+    {"_id": "interview:<id>", "kind": "interview", "entity_id": "<id>",
+     "title": "Jane Doe", "subtitle": "jane@x.com · Backend Engineer",
+     "grams": ["ja", "jan", "jane", "do", "doe", ...],
+     "created_by": "<user id>", "job_posting_id": "<job id>", "updated_at": ...}
+
+`grams` holds the edge n-grams (word prefixes) of names, emails and job
+titles, so a type-ahead query is an equality lookup per word on a multikey
+index instead of a regex over four collections.
+"""
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+MIN_GRAM = 2
+MAX_GRAM = 15
+MAX_QUERY_WORDS = 6
+
+# kind -> permission needed to see it, source fields its entry is built from
+ENTITY_KINDS = {
+    "interview": {
+        "permission": "INTERVIEW_VIEW",
+        "fields": {
+            "candidate_name": 1, "candidate_email": 1, "job_role": 1,
+            "created_by": 1, "job_posting_id": 1, "updated_at": 1,
+        },
+    },
+    "screening": {
+        "permission": "RESUME_SCREENING_RESULTS",
+        "fields": {"candidate_email": 1, "resume": 1, "job_posting_id": 1, "screened_at": 1},
+    },
+    "report": {
+        "permission": "REPORT_VIEW",
+        "fields": {"interview_id": 1, "candidate_name": 1, "candidate_email": 1, "job_role": 1, "job_posting_id": 1},
+    },
+    "job": {
+        "permission": "JOB_VIEW",
+        "fields": {"job_title": 1, "company": 1, "created_by": 1, "updated_at": 1},
+    },
+}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def words(text: Any) -> List[str]:
+    return _WORD_RE.findall(str(text).lower()) if text else []
+
+
+def edge_grams(texts: List[Any]) -> List[str]:
+    """Every word prefix of MIN_GRAM..MAX_GRAM characters (single characters are skipped)."""
+    grams = set()
+    for text in texts:
+        for word in words(text):
+            if len(word) < MIN_GRAM:
+                continue
+            for length in range(MIN_GRAM, min(len(word), MAX_GRAM) + 1):
+                grams.add(word[:length])
+    return sorted(grams)
+
+
+def query_grams(query: str) -> List[str]:
+    """Grams to look up for a query: one per word, cut to MAX_GRAM, longest first."""
+    grams = {word[:MAX_GRAM] for word in words(query) if len(word) >= MIN_GRAM}
+    return sorted(grams, key=len, reverse=True)[:MAX_QUERY_WORDS]
+
+
+def entry_id(kind: str, entity_id: Any) -> str:
+    return f"{kind}:{entity_id}"
+
+
+def source_entity_id(kind: str, doc: Dict[str, Any]) -> Optional[str]:
+    """Id the client uses to open the entity (reports are addressed by interview, screenings by email)."""
+    if kind == "report":
+        return doc.get("interview_id")
+    if kind == "screening":
+        return doc.get("candidate_email")
+    return str(doc["_id"]) if doc.get("_id") is not None else None
+
+
+def _subtitle(*parts: Any) -> str:
+    return " · ".join(str(part) for part in parts if part)
+
+
+def build_entry(kind: str, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Search index entry for a source document (None when it has nothing to identify it by)."""
+    entity_id = source_entity_id(kind, doc)
+    if not entity_id:
+        return None
+
+    if kind == "job":
+        title = doc.get("job_title")
+        subtitle = _subtitle(doc.get("company"))
+        texts = [doc.get("job_title"), doc.get("company")]
+        job_posting_id = entity_id
+    elif kind == "screening":
+        title = doc.get("candidate_email")
+        subtitle = _subtitle(doc.get("resume"))
+        texts = [doc.get("candidate_email"), doc.get("resume")]
+        job_posting_id = doc.get("job_posting_id")
+    else:
+        title = doc.get("candidate_name") or doc.get("candidate_email")
+        subtitle = _subtitle(doc.get("candidate_email"), doc.get("job_role"))
+        texts = [doc.get("candidate_name"), doc.get("candidate_email"), doc.get("job_role")]
+        job_posting_id = doc.get("job_posting_id")
+
+    return {
+        "_id": entry_id(kind, entity_id),
+        "kind": kind,
+        "entity_id": entity_id,
+        "title": title,
+        "subtitle": subtitle,
+        "grams": edge_grams(texts),
+        "created_by": str(doc["created_by"]) if doc.get("created_by") else None,
+        "job_posting_id": str(job_posting_id) if job_posting_id else None,
+        # Newest first among equally good matches
+        "updated_at": doc.get("updated_at") or doc.get("screened_at") or datetime.now(timezone.utc),
+    }
@@ -0,0 +1,44 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# {"tree": [...], "generation": int, "timestamp": float} for the full org tree
+_tree_cache: Dict[str, Any] = {}
+# Bumped on every user/role write; a tree built before the bump is never stored
+_generation = 0
+
+
+def current_generation() -> int:
+    return _generation
+
+
+def get_cached_tree() -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the cached org tree if it is still fresh. Entries also expire after
+    ORG_TREE_CACHE_SECONDS so writes handled by another worker are picked up.
+    """
+    if not _tree_cache or _tree_cache["generation"] != _generation:
+        return None
+    if time.time() - _tree_cache["timestamp"] > settings.ORG_TREE_CACHE_SECONDS:
+        _tree_cache.clear()
+        return None
+    return _tree_cache["tree"]
+
+
+def set_cached_tree(tree: List[Dict[str, Any]], generation: int) -> None:
+    """Cache a tree built when the generation was `generation` (dropped if a write happened since)."""
+    if generation != _generation:
+        return
+    _tree_cache.update({"tree": tree, "generation": generation, "timestamp": time.time()})
+
+
+def invalidate_org_tree() -> None:
+    """Drop the cached tree after a user is created, updated or deleted (or a role renamed)."""
+    global _generation
+    _generation += 1
+    _tree_cache.clear()
+    logger.debug("Org tree cache invalidated")
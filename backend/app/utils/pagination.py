@@ -0,0 +1,138 @@
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+# Filtered counts stop at this many documents ("estimated" mode), so a count
+# never costs more than scanning this many index entries
+COUNT_CAP = 10000
+
+COUNT_MODES = ("none", "estimated", "exact")
+
+
+# ----------------------------------------------------
+# Cursor tokens
+# ----------------------------------------------------
+def _encode_value(value: Any) -> Dict[str, Any]:
+    if value is None:
+        return {"t": "null"}
+    if isinstance(value, ObjectId):
+        return {"t": "oid", "v": str(value)}
+    if isinstance(value, datetime):
+        return {"t": "dt", "v": value.isoformat()}
+    return {"t": "raw", "v": value}
+
+
+def _decode_value(data: Dict[str, Any]) -> Any:
+    kind = data.get("t")
+    if kind == "null":
+        return None
+    if kind == "oid":
+        return ObjectId(data["v"])
+    if kind == "dt":
+        return datetime.fromisoformat(data["v"])
+    return data.get("v")
+
+
+def encode_cursor(sort_value: Any, doc_id: Any) -> str:
+    """Build an opaque cursor token for the position after (sort_value, _id)."""
+    payload = json.dumps({"s": _encode_value(sort_value), "i": _encode_value(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, Any]:
+    """Decode a cursor token into (sort_value, _id). Raises ValueError for invalid tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return _decode_value(payload["s"]), _decode_value(payload["i"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+# ----------------------------------------------------
+# Keyset queries
+# ----------------------------------------------------
+def keyset_sort(sort_field: str, direction: int) -> List[Tuple[str, int]]:
+    """Sort on the page key with _id as the tie-breaker (same direction)."""
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def keyset_query(query: Dict[str, Any], sort_field: str, direction: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Add the range condition that starts the page right after the cursor position."""
+    if not cursor:
+        return query
+
+    sort_value, last_id = decode_cursor(cursor)
+    op = "$lt" if direction < 0 else "$gt"
+
+    if sort_field == "_id":
+        after = {"_id": {op: last_id}}
+    elif sort_value is None:
+        # null sorts lowest: descending pages only have other nulls left,
+        # ascending pages continue with the remaining nulls, then every real value
+        after = {sort_field: None, "_id": {op: last_id}}
+        if direction > 0:
+            after = {"$or": [after, {sort_field: {"$exists": True, "$ne": None}}]}
+    else:
+        after = {"$or": [
+            {sort_field: {op: sort_value}},
+            {sort_field: sort_value, "_id": {op: last_id}},
+        ]}
+
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_keyset_page(
+    collection,
+    query: Dict[str, Any],
+    sort_field: str,
+    direction: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    skip: int = 0,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page ordered by (sort_field, _id) using an indexed range query.
+
+    skip is only for legacy page-number callers that have no cursor yet; it is
+    ignored once a cursor is given. Returns (documents, next_cursor);
+    next_cursor is None on the last page.
+    """
+    find_cursor = collection.find(keyset_query(query, sort_field, direction, cursor), projection)
+    find_cursor = find_cursor.sort(keyset_sort(sort_field, direction))
+    if skip and not cursor:
+        find_cursor = find_cursor.skip(skip)
+    docs = await find_cursor.limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get(sort_field) if sort_field != "_id" else last["_id"], last["_id"])
+    return docs, next_cursor
+
+
+async def count_for_page(collection, query: Dict[str, Any], mode: str = "estimated") -> Dict[str, Any]:
+    """
+    Count documents for a list response.
+
+    - "none": no count
+    - "estimated": collection metadata for unfiltered lists, otherwise an exact
+      count capped at COUNT_CAP (total_is_estimate tells the client)
+    - "exact": full count_documents
+    """
+    if mode == "none":
+        return {"total": None, "total_is_estimate": False}
+    if mode == "exact":
+        return {"total": await collection.count_documents(query), "total_is_estimate": False}
+
+    if not query:
+        return {"total": await collection.estimated_document_count(), "total_is_estimate": True}
+    total = await collection.count_documents(query, limit=COUNT_CAP)
+    return {"total": total, "total_is_estimate": total >= COUNT_CAP}
@@ -64,3 +64,42 @@ def parse_mcqs(response: str):
     logger.info(f"Parsed {len(mcq_list)} MCQs from response")
     
     return mcq_list
+
+
+def normalize_mcq_option(text: str) -> str:
+    """
+    Normalize an option or answer string for comparison.
+
+    Strips markdown bold markers, a leading option letter such as "b)" or "b.",
+    surrounding whitespace and case, so "**b) Git**" and "git" compare equal.
+    """
+    if not text:
+        return ""
+    cleaned = text.replace("**", "").strip()
+    cleaned = re.sub(r'^[a-dA-D][\)\.]\s*', '', cleaned)
+    return re.sub(r'\s+', ' ', cleaned).strip().lower()
+
+
+def is_mcq_answer_correct(selected_answer: str, correct_answer: str, options=None) -> bool:
+    """
+    Check a candidate's selected answer against the stored correct answer.
+
+    The stored answer may be the full option ("b) Git") or just its letter ("b"),
+    in which case the letter is resolved against the stored options.
+    """
+    if not selected_answer or not correct_answer:
+        return False
+
+    selected = normalize_mcq_option(selected_answer)
+    expected = normalize_mcq_option(correct_answer)
+
+    # Answer given only as a letter -> resolve it against the options list
+    letter_match = re.match(r'^\**\s*([a-dA-D])\s*[\)\.]?\s*\**$', correct_answer.strip())
+    if letter_match and options:
+        letter = letter_match.group(1).lower()
+        for option in options:
+            if option.strip().lower().startswith(f"{letter})") or option.strip().lower().startswith(f"{letter}."):
+                expected = normalize_mcq_option(option)
+                break
+
+    return selected == expected
@@ -1,5 +1,4 @@
 from app.llm_models import openai_llm
-from langchain_core.messages import HumanMessage
 import json
 from ..utils.logger import get_logger
 
@@ -15,6 +14,8 @@ def suggest_skills(job_role) -> list:
     Returns:
         A list of 10 skill strings, or an empty list if an error occurs.
     """
+    from langchain_core.messages import HumanMessage
+
     try:
         # 1. Format the full prompt
         prompt_template =""" You are an expert career analyst and HR domain specialist.
@@ -0,0 +1,182 @@
+"""
+Detector backend comparison: latency, accuracy and memory.
+
+Loads each backend in its own process (so resident memory is measured
+cleanly), runs it over a folder of frames and reports:
+
+    load       - seconds to load (and export/quantize on first run)
+    rss        - resident memory added by loading the model
+    p50 / p95  - latency of one frame, and of a batch of --batch frames
+    precision / recall against the Ultralytics FP32 detections (IoU >= 0.5, same class)
+    phone_agree - frames where "phone present" matches the reference
+
+From the backend directory (opencv and ultralytics installed; onnxruntime /
+openvino for those backends):
+    python -m benchmarks.detector_backends --images ./frames
+    python -m benchmarks.detector_backends --images ./frames --backends ultralytics,onnxruntime-int8 --imgsz 320
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import statistics
+import multiprocessing
+from queue import Empty
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True, help="Folder of JPEG/PNG frames (webcam-like shots)")
+    parser.add_argument(
+        "--backends", default="ultralytics,onnxruntime,onnxruntime-int8,openvino",
+        help="Comma-separated backends; the first is the accuracy reference",
+    )
+    parser.add_argument("--imgsz", type=int, default=None, help="Override PROCTORING_DETECTOR_IMGSZ")
+    parser.add_argument("--model", default=None, help="Override PROCTORING_DETECTOR_MODEL")
+    parser.add_argument("--batch", type=int, default=8, help="Frames per batch for the batched latency")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the images per measurement")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so apply the overrides before importing the app
+if args.imgsz:
+    os.environ["PROCTORING_DETECTOR_IMGSZ"] = str(args.imgsz)
+if args.model:
+    os.environ["PROCTORING_DETECTOR_MODEL"] = args.model
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IOU_MATCH = 0.5
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def percentile(values, fraction):
+    return sorted(values)[max(0, int(len(values) * fraction) - 1)] * 1000
+
+
+def run_backend(spec, paths, queue):
+    """Child process: load one backend and time it."""
+    import cv2
+    from app.services.object_detector import create_detector
+
+    backend, _, variant = spec.partition("-")
+    frames = [frame for frame in (cv2.imread(path) for path in paths) if frame is not None]
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    detector = create_detector(backend, int8=variant == "int8")
+    load_seconds = time.perf_counter() - start
+    detector.detect(frames[:1])  # warm-up
+
+    single = []
+    for _ in range(args.rounds):
+        for frame in frames:
+            start = time.perf_counter()
+            detector.detect([frame])
+            single.append(time.perf_counter() - start)
+
+    batched = []
+    for _ in range(args.rounds):
+        for offset in range(0, len(frames), args.batch):
+            chunk = frames[offset:offset + args.batch]
+            start = time.perf_counter()
+            detector.detect(chunk)
+            batched.append((time.perf_counter() - start) / len(chunk))
+
+    queue.put({
+        "backend": spec,
+        "loaded": detector.name,
+        "load": load_seconds,
+        "rss": rss_mb() - rss_before,
+        "single": single,
+        "batched": batched,
+        "detections": [detections.tolist() for detections in detector.detect(frames)],
+    })
+
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def compare(reference, candidate, phone_class):
+    matched = total_ref = total_cand = phone_agree = 0
+    for ref_frame, cand_frame in zip(reference, candidate):
+        total_ref += len(ref_frame)
+        total_cand += len(cand_frame)
+        unused = list(cand_frame)
+        for ref in ref_frame:
+            best = max(
+                (box for box in unused if box[5] == ref[5]),
+                key=lambda box: iou(ref, box), default=None,
+            )
+            if best is not None and iou(ref, best) >= IOU_MATCH:
+                matched += 1
+                unused.remove(best)
+        ref_phone = any(box[5] == phone_class for box in ref_frame)
+        cand_phone = any(box[5] == phone_class for box in cand_frame)
+        phone_agree += ref_phone == cand_phone
+    precision = matched / total_cand if total_cand else 1.0
+    recall = matched / total_ref if total_ref else 1.0
+    return precision, recall, phone_agree / len(reference) if reference else 1.0
+
+
+def main():
+    paths = sorted(
+        path for pattern in ("*.jpg", "*.jpeg", "*.png")
+        for path in glob.glob(os.path.join(args.images, pattern))
+    )
+    if not paths:
+        sys.exit(f"No images in {args.images}")
+
+    from app.config import settings
+    from app.services.object_detector import PHONE_CLASS_ID
+
+    print(
+        f"images={len(paths)} model={settings.PROCTORING_DETECTOR_MODEL} "
+        f"imgsz={settings.PROCTORING_DETECTOR_IMGSZ} classes={settings.PROCTORING_DETECTOR_CLASSES} batch={args.batch}"
+    )
+
+    context = multiprocessing.get_context("spawn")
+    reference = None
+    for spec in args.backends.split(","):
+        queue = context.Queue()
+        process = context.Process(target=run_backend, args=(spec, paths, queue))
+        process.start()
+        result = None
+        # Poll so a crashed child (e.g. a missing runtime) doesn't hang the run
+        while result is None and (process.is_alive() or not queue.empty()):
+            try:
+                result = queue.get(timeout=1)
+            except Empty:
+                pass
+        process.join()
+        if result is None:
+            print(f"{spec:<17} failed (exit code {process.exitcode})")
+            continue
+
+        if reference is None:
+            reference = result["detections"]
+        precision, recall, phone_agree = compare(reference, result["detections"], PHONE_CLASS_ID)
+        fallback = "" if result["loaded"] == spec.partition("-")[0] else f" (fell back to {result['loaded']})"
+        print(
+            f"{spec:<17} load={result['load']:5.1f}s rss={result['rss']:6.0f}MB "
+            f"p50={percentile(result['single'], 0.5):6.1f}ms p95={percentile(result['single'], 0.95):6.1f}ms "
+            f"batched_p50={statistics.median(result['batched']) * 1000:6.1f}ms/frame "
+            f"precision={precision:.3f} recall={recall:.3f} phone_agree={phone_agree:.1%}{fallback}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Minimal local stand-in for the Judge0 API, for benchmarking the transport
+without hitting the public service.
+
+Implements the endpoints CodingService uses:
+    POST /submissions            (wait=true|false)
+    GET  /submissions/{token}
+    POST /submissions/batch
+    GET  /submissions/batch?tokens=a,b,c
+
+Every submission "finishes" after STUB_LATENCY_MS milliseconds. With
+STUB_EXECUTE=1, Python submissions (language_id 71) are actually run with the
+local interpreter so harness output can be checked end to end.
+
+Run:
+    STUB_LATENCY_MS=150 uvicorn benchmarks.judge0_stub_server:app --port 2358
+"""
+import os
+import sys
+import time
+import uuid
+import asyncio
+import subprocess
+from typing import Dict, Any
+
+from fastapi import FastAPI, Request, HTTPException
+
+LATENCY_SECONDS = int(os.getenv("STUB_LATENCY_MS", "150")) / 1000
+EXECUTE_PYTHON = os.getenv("STUB_EXECUTE", "0") == "1"
+PYTHON_LANGUAGE_ID = 71
+
+app = FastAPI(title="Judge0 stub")
+
+# token -> {"created": float, "submission": dict, "result": dict | None}
+submissions: Dict[str, Dict[str, Any]] = {}
+stats = {"submissions": 0, "status_requests": 0}
+
+
+def _run_python(source_code: str, stdin: str) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-c", source_code],
+        input=stdin or "",
+        capture_output=True,
+        text=True,
+        timeout=10
+    )
+    return {
+        "stdout": proc.stdout,
+        "stderr": proc.stderr or None,
+        "status": {"id": 3 if proc.returncode == 0 else 11,
+                   "description": "Accepted" if proc.returncode == 0 else "Runtime Error (NZEC)"}
+    }
+
+
+def _result_for(token: str) -> Dict[str, Any]:
+    entry = submissions[token]
+    if time.monotonic() - entry["created"] < LATENCY_SECONDS:
+        return {"token": token, "status": {"id": 2, "description": "Processing"}}
+
+    if entry["result"] is None:
+        submission = entry["submission"]
+        if EXECUTE_PYTHON and submission.get("language_id") == PYTHON_LANGUAGE_ID:
+            entry["result"] = _run_python(submission.get("source_code", ""), submission.get("stdin", ""))
+        else:
+            entry["result"] = {
+                "stdout": "null\n",
+                "stderr": None,
+                "status": {"id": 3, "description": "Accepted"}
+            }
+        entry["result"].update({"token": token, "compile_output": None, "message": None,
+                                "time": f"{LATENCY_SECONDS:.3f}", "memory": 0})
+    return entry["result"]
+
+
+def _create(submission: Dict[str, Any]) -> str:
+    token = str(uuid.uuid4())
+    submissions[token] = {"created": time.monotonic(), "submission": submission, "result": None}
+    stats["submissions"] += 1
+    return token
+
+
+@app.post("/submissions")
+async def create_submission(request: Request, wait: bool = False):
+    token = _create(await request.json())
+    if wait:
+        await asyncio.sleep(LATENCY_SECONDS)
+        return _result_for(token)
+    return {"token": token}
+
+
+@app.post("/submissions/batch")
+async def create_batch(request: Request):
+    body = await request.json()
+    return [{"token": _create(item)} for item in body.get("submissions", [])]
+
+
+@app.get("/submissions/batch")
+async def get_batch(tokens: str):
+    stats["status_requests"] += 1
+    return {"submissions": [_result_for(token) if token in submissions else None
+                            for token in tokens.split(",")]}
+
+
+@app.get("/submissions/{token}")
+async def get_submission(token: str):
+    stats["status_requests"] += 1
+    if token not in submissions:
+        raise HTTPException(status_code=404, detail="Not found")
+    return _result_for(token)
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
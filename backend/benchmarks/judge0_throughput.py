@@ -0,0 +1,97 @@
+"""
+Throughput benchmark for the Judge0 transport.
+
+Compares the legacy transport (new httpx client per submission, one submission
+per test case, fixed 0.5 s polling) with the pooled CodingService path
+(one harness submission, shared client, adaptive polling / wait=true).
+
+Start the stub first (from the backend directory):
+    STUB_LATENCY_MS=150 STUB_EXECUTE=1 uvicorn benchmarks.judge0_stub_server:app --port 2358
+
+Then:
+    python -m benchmarks.judge0_throughput --url http://localhost:2358 --candidates 20 --cases 5
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:2358", help="Judge0 (or stub) base URL")
+    parser.add_argument("--candidates", type=int, default=20, help="Concurrent candidates pressing Run")
+    parser.add_argument("--cases", type=int, default=5, help="Test cases per evaluation")
+    parser.add_argument("--rounds", type=int, default=3, help="Evaluations per candidate")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so point them at the target before importing the app
+os.environ["JUDGE0_API_URL"] = args.url
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from app.models.code import TestCase  # noqa: E402
+from app.services.coding_service import coding_service, JUDGE0_LANGUAGE_IDS  # noqa: E402
+from app.services.judge0_client import judge0_client  # noqa: E402
+
+USER_CODE = "def add(a, b):\n    return a + b\n"
+SIGNATURE = "def add(a, b):"
+
+
+async def legacy_evaluate(test_cases):
+    """The pre-pooling behaviour: one fresh client and one submission per case, 0.5 s polls."""
+    for test_case in test_cases:
+        source = coding_service.create_test_runner_code("python", USER_CODE, test_case, SIGNATURE)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(
+                f"{args.url}/submissions?base64_encoded=false&wait=false",
+                json={"source_code": source, "language_id": JUDGE0_LANGUAGE_IDS["python"], "stdin": ""}
+            )
+            token = response.json()["token"]
+            while True:
+                result = (await client.get(f"{args.url}/submissions/{token}?base64_encoded=false")).json()
+                if result["status"]["id"] > 2:
+                    break
+                await asyncio.sleep(0.5)
+
+
+async def pooled_evaluate(test_cases, candidate):
+    await coding_service.run_test_cases(USER_CODE, test_cases, "python", SIGNATURE, candidate_key=candidate)
+
+
+async def measure(name, evaluate):
+    test_cases = [TestCase(input=f"{i}, {i}", expectedOutput=str(2 * i)) for i in range(args.cases)]
+    latencies = []
+
+    async def candidate(idx):
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            await evaluate(test_cases, f"candidate-{idx}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(candidate(i) for i in range(args.candidates)))
+    elapsed = time.perf_counter() - start
+
+    evaluations = args.candidates * args.rounds
+    print(
+        f"{name:<8} evaluations={evaluations} wall={elapsed:.2f}s "
+        f"throughput={evaluations / elapsed:.1f}/s "
+        f"p50={statistics.median(latencies) * 1000:.0f}ms "
+        f"p95={sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms"
+    )
+
+
+async def main():
+    print(f"target={args.url} candidates={args.candidates} cases={args.cases} rounds={args.rounds}")
+    await measure("legacy", lambda cases, _candidate: legacy_evaluate(cases))
+    await measure("pooled", pooled_evaluate)
+    await judge0_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
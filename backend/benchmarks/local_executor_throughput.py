@@ -0,0 +1,88 @@
+"""
+Throughput benchmark: local executor vs Judge0.
+
+Runs the same evaluation workload through CodingService.run_test_cases with
+CODE_EXECUTOR_PROVIDER="judge0" and then "local".
+
+From the backend directory (Judge0 or benchmarks/judge0_stub_server.py running):
+    python -m benchmarks.local_executor_throughput --url http://localhost:2358 --language python
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:2358", help="Judge0 (or stub) base URL")
+    parser.add_argument("--language", default="python", choices=["python", "javascript", "cpp"])
+    parser.add_argument("--candidates", type=int, default=20, help="Concurrent candidates pressing Run")
+    parser.add_argument("--cases", type=int, default=5, help="Test cases per evaluation")
+    parser.add_argument("--rounds", type=int, default=3, help="Evaluations per candidate")
+    parser.add_argument("--skip-judge0", action="store_true", help="Only measure the local executor")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so point them at the target before importing the app
+os.environ["JUDGE0_API_URL"] = args.url
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.models.code import TestCase  # noqa: E402
+from app.services.coding_service import coding_service  # noqa: E402
+from app.services.judge0_client import judge0_client  # noqa: E402
+from app.services.local_executor import local_executor  # noqa: E402
+
+PROGRAMS = {
+    "python": ("def add(a, b):\n    return a + b\n", "def add(a, b):"),
+    "javascript": ("function add(a, b) {\n  return a + b;\n}\n", "function add(a, b)"),
+    "cpp": ("int solution(int a, int b) {\n    return a + b;\n}\n", "int solution(int a, int b)"),
+}
+
+
+async def measure(provider):
+    settings.CODE_EXECUTOR_PROVIDER = provider
+    code, signature = PROGRAMS[args.language]
+    test_cases = [TestCase(input=f"{i}, {i}", expectedOutput=str(2 * i)) for i in range(args.cases)]
+    latencies = []
+    failures = 0
+
+    async def candidate(idx):
+        nonlocal failures
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            results = await coding_service.run_test_cases(
+                code, test_cases, args.language, signature, candidate_key=f"candidate-{idx}"
+            )
+            latencies.append(time.perf_counter() - start)
+            failures += sum(1 for result in results if not result.passed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(candidate(i) for i in range(args.candidates)))
+    elapsed = time.perf_counter() - start
+
+    evaluations = args.candidates * args.rounds
+    print(
+        f"{provider:<7} evaluations={evaluations} wall={elapsed:.2f}s "
+        f"throughput={evaluations / elapsed:.1f}/s "
+        f"p50={statistics.median(latencies) * 1000:.0f}ms "
+        f"p95={sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms "
+        f"failed_cases={failures}"
+    )
+
+
+async def main():
+    print(f"language={args.language} candidates={args.candidates} cases={args.cases} rounds={args.rounds}")
+    if not args.skip_judge0:
+        await measure("judge0")
+    await measure("local")
+    await judge0_client.aclose()
+    await local_executor.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Benchmark for the global (omnibox) search.
+
+Seeds a throwaway database's search_index with synthetic interview, report,
+screening and job entries built by the same code the write paths use, then
+times SearchService.search for type-ahead queries as a SUPER_ADMIN and as a
+user scoped to a handful of jobs.
+
+Needs a MongoDB server (from the backend directory):
+    python -m benchmarks.omnibox_search --uri mongodb://localhost:27017 --entries 1000000
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timezone, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"), help="MongoDB URI")
+    parser.add_argument("--db", default="omnibox_benchmark", help="Scratch database (dropped afterwards)")
+    parser.add_argument("--entries", type=int, default=1000000, help="Search entries to seed")
+    parser.add_argument("--jobs", type=int, default=5000, help="Distinct job postings the entries belong to")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to time per scenario")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so point them at the target before importing the app
+os.environ["MONGO_URI"] = args.uri
+os.environ["DB_NAME"] = args.db
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from app import database  # noqa: E402
+from app.database import SEARCH_INDEX_COLLECTION, JOB_POSTINGS_COLLECTION  # noqa: E402
+from app.services.search_service import search_service, KIND_ORDER  # noqa: E402
+from app.utils import omnibox_index  # noqa: E402
+
+FIRST_NAMES = ["james", "mary", "john", "patricia", "robert", "jennifer", "michael", "linda", "priya", "rahul",
+               "ananya", "arjun", "wei", "mei", "carlos", "sofia", "ahmed", "fatima", "olga", "ivan"]
+LAST_NAMES = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "patel", "sharma",
+              "kumar", "singh", "chen", "wang", "lopez", "gonzalez", "khan", "ali", "petrova", "ivanov"]
+ROLES = ["backend engineer", "frontend developer", "data scientist", "devops engineer", "product manager",
+         "qa analyst", "mobile developer", "ml engineer", "site reliability engineer", "designer"]
+
+
+def synthetic_entry(i, jobs, creators, now):
+    kind = KIND_ORDER[i % len(KIND_ORDER)]
+    first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    job = random.choice(jobs)
+    doc = {
+        "_id": ObjectId(),
+        "interview_id": str(ObjectId()),
+        "candidate_name": f"{first.title()} {last.title()}",
+        "candidate_email": f"{first}.{last}{i}@example.com",
+        "job_role": random.choice(ROLES),
+        "job_title": random.choice(ROLES).title(),
+        "company": "Acme",
+        "created_by": creators[job],
+        "job_posting_id": job,
+        "updated_at": now - timedelta(minutes=i),
+    }
+    return omnibox_index.build_entry(kind, doc)
+
+
+async def seed(db):
+    await db.client.drop_database(args.db)
+    now = datetime.now(timezone.utc)
+    jobs = [str(ObjectId()) for _ in range(args.jobs)]
+    creators = {job: str(ObjectId()) for job in jobs}
+
+    batch = []
+    for i in range(args.entries):
+        batch.append(synthetic_entry(i, jobs, creators, now))
+        if len(batch) == 10000:
+            await db[SEARCH_INDEX_COLLECTION].insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db[SEARCH_INDEX_COLLECTION].insert_many(batch, ordered=False)
+
+    # A scoped user owns a few jobs (get_accessible_job_ids reads visible_to)
+    user_id = str(ObjectId())
+    owned = random.sample(jobs, 5)
+    await db[JOB_POSTINGS_COLLECTION].insert_many(
+        [{"_id": ObjectId(job), "created_by": user_id, "visible_to": [user_id], "job_title": "Owned"} for job in owned]
+    )
+
+    # Same indexes connect_to_mongo creates
+    await db[SEARCH_INDEX_COLLECTION].create_index([("kind", 1), ("grams", 1), ("updated_at", -1)])
+    await db[JOB_POSTINGS_COLLECTION].create_index([("visible_to", 1), ("created_at", -1), ("_id", -1)])
+    return user_id
+
+
+def random_query():
+    first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    return random.choice([
+        first[:3],
+        f"{first} {last[:2]}",
+        f"{first}.{last}",
+        random.choice(ROLES).split()[0][:4],
+    ])
+
+
+async def measure(label, user_id, is_super_admin):
+    timings = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        await search_service.search(random_query(), user_id, KIND_ORDER, is_super_admin, limit=5)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} p50 {statistics.median(timings):7.1f} ms   p95 {p95:7.1f} ms   max {timings[-1]:7.1f} ms")
+
+
+async def main():
+    await database.connect_to_mongo()
+    db = database.get_database()
+    print(f"Seeding {args.entries} search entries over {args.jobs} jobs...")
+    user_id = await seed(db)
+
+    try:
+        await measure("super admin", user_id, True)
+        await measure("scoped user", user_id, False)
+    finally:
+        if not args.keep:
+            await db.client.drop_database(args.db)
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Proctoring throughput benchmark: frames analyzed per second per CPU core.
+
+Simulates N concurrent candidates, each uploading the same JPEG frame to the
+ProctoringEngine at --fps, and reports analyzed frames per second, per core
+(process CPU time, so it is independent of how many cores the box has),
+frame latency, the average micro-batch size and the share of frames the
+phone detector ran on. Run it with --batch-size 1 to compare against
+frame-at-a-time inference, and with --yolo-every 1 to disable the adaptive
+detection cadence.
+
+Use a frame with one face in it (--image), otherwise gaze and phone detection
+are skipped and only the face landmarker is measured.
+
+From the backend directory (opencv, mediapipe and ultralytics installed):
+    python -m benchmarks.proctoring_throughput --image face.jpg --sessions 1,10,50
+    python -m benchmarks.proctoring_throughput --image face.jpg --sessions 1,10,50 --batch-size 1
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="Frame to upload (JPEG/PNG); a blank frame is used if omitted")
+    parser.add_argument("--width", type=int, default=320, help="Width the frame is downscaled to, like the client does")
+    parser.add_argument("--sessions", default="1,10,50", help="Comma-separated concurrent session counts")
+    parser.add_argument("--fps", type=float, default=5.0, help="Upload rate per session (also the per-session cap)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration of each run")
+    parser.add_argument("--batch-size", type=int, default=None, help="Override PROCTORING_BATCH_SIZE")
+    parser.add_argument("--batch-wait-ms", type=float, default=None, help="Override PROCTORING_BATCH_WAIT_MS")
+    parser.add_argument("--workers", type=int, default=None, help="Override PROCTORING_WORKERS")
+    parser.add_argument("--yolo-every", type=int, default=None, help="Override PROCTORING_YOLO_EVERY_N_FRAMES (1 = every frame)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so apply the overrides before importing the app
+os.environ["PROCTORING_MAX_FPS"] = str(args.fps)
+# Measures in-process inference; a proctoring worker runs the same scheduler and models
+os.environ["PROCTORING_WORKER_SOCKET"] = ""
+for env, value in (
+    ("PROCTORING_BATCH_SIZE", args.batch_size),
+    ("PROCTORING_BATCH_WAIT_MS", args.batch_wait_ms),
+    ("PROCTORING_WORKERS", args.workers),
+    ("PROCTORING_YOLO_EVERY_N_FRAMES", args.yolo_every),
+):
+    if value is not None:
+        os.environ[env] = str(value)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.proctoring_service import ProctoringEngine  # noqa: E402
+
+
+def load_frame() -> bytes:
+    if args.image:
+        frame = cv2.imread(args.image)
+        if frame is None:
+            sys.exit(f"Could not read {args.image}")
+    else:
+        frame = np.full((480, 640, 3), 127, dtype=np.uint8)
+    height = round(frame.shape[0] * args.width / frame.shape[1])
+    frame = cv2.resize(frame, (args.width, height))
+    return cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 70])[1].tobytes()
+
+
+async def measure(engine, frame, sessions):
+    latencies = []
+    detector_runs = 0
+    interval = 1.0 / args.fps
+    deadline = time.perf_counter() + args.seconds
+
+    async def candidate(idx):
+        nonlocal detector_runs
+        session_id = f"bench-{sessions}-{idx}"
+        engine.open_session(session_id)
+        # Spread the sessions over one upload interval
+        await asyncio.sleep(interval * idx / sessions)
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if await engine.submit_frame(session_id, frame) is not None:
+                    latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+        finally:
+            detector_runs += engine.get_session(session_id).cadence.detections
+            engine.close_session(session_id)
+
+    batches, items = engine.scheduler.batches, engine.scheduler.items
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(candidate(i) for i in range(sessions)))
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    frames = len(latencies)
+    run_batches = engine.scheduler.batches - batches
+    cores_used = cpu / wall
+    print(
+        f"sessions={sessions:<3} frames={frames:<6} fps={frames / wall:7.1f} "
+        f"cores_used={cores_used:4.1f} fps_per_core={frames / cpu if cpu else 0:6.1f} "
+        f"p50={statistics.median(latencies) * 1000 if latencies else 0:5.0f}ms "
+        f"p95={sorted(latencies)[int(frames * 0.95) - 1] * 1000 if frames else 0:5.0f}ms "
+        f"avg_batch={(engine.scheduler.items - items) / run_batches if run_batches else 0:4.1f} "
+        f"yolo_frames={detector_runs / frames if frames else 0:4.0%} "
+        f"offered={sessions * args.fps:.0f}fps"
+    )
+
+
+async def main():
+    frame = load_frame()
+    engine = ProctoringEngine()
+    await engine.start()
+    print(
+        f"frame={len(frame)}B fps/session={args.fps} batch_size={settings.PROCTORING_BATCH_SIZE} "
+        f"batch_wait={settings.PROCTORING_BATCH_WAIT_MS}ms workers={settings.PROCTORING_WORKERS} "
+        f"yolo_every={settings.PROCTORING_YOLO_EVERY_N_FRAMES} "
+        f"cpus={os.cpu_count()}"
+    )
+
+    # Warm up the models (and each worker thread's landmarker) outside the measurement
+    engine.open_session("warmup")
+    await engine.submit_frame("warmup", frame)
+    engine.close_session("warmup")
+
+    try:
+        for sessions in (int(count) for count in args.sessions.split(",")):
+            await measure(engine, frame, sessions)
+    finally:
+        await engine.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Startup profile: how long `import app.main` takes, and what it pulls in.
+
+Imports the app in fresh interpreters and reports:
+
+    - wall time of the import (median of --runs)
+    - the packages that cost the most (self time summed per top-level package,
+      from `python -X importtime`)
+    - heavy packages that are meant to load lazily but were imported anyway
+
+Exits non-zero when the median import exceeds --budget seconds or a lazy
+package is imported at startup. tests/test_startup.py enforces the same
+budget and lazy-package check under pytest.
+
+From the backend directory:
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --budget 2.5 --top 25
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use (proctoring models, screening, PDFs, LLM clients), never at startup
+LAZY_PACKAGES = (
+    "cv2",
+    "mediapipe",
+    "ultralytics",
+    "torch",
+    "onnxruntime",
+    "openvino",
+    "pandas",
+    "sklearn",
+    "reportlab",
+    "fitz",
+    "langchain_openai",
+    "langchain_google_genai",
+    "langchain_core",
+)
+
+IMPORT_SNIPPET = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "print(json.dumps({'seconds': time.perf_counter() - start, "
+    "'modules': [name for name in sys.modules if name.split('.')[0] in %r]}))\n"
+) % (LAZY_PACKAGES,)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=3.0, help="Max median seconds for `import app.main`")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter imports to time")
+    parser.add_argument("--top", type=int, default=20, help="Packages to list in the import-time report")
+    return parser.parse_args()
+
+
+def run_python(*arguments):
+    return subprocess.run(
+        [sys.executable, *arguments], cwd=BACKEND_DIR, capture_output=True, text=True, check=False,
+    )
+
+
+def parse_importtime(stderr):
+    """Self time per top-level package and cumulative time per module (microseconds)."""
+    self_by_package = defaultdict(int)
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header row
+        module = name.strip()
+        self_by_package[module.split(".")[0]] += int(self_us)
+        cumulative[module] = int(cumulative_us)
+    return self_by_package, cumulative
+
+
+def main():
+    args = parse_args()
+
+    timings = []
+    eager = set()
+    for _ in range(args.runs):
+        result = run_python("-c", IMPORT_SNIPPET)
+        if result.returncode != 0:
+            sys.exit(f"import app.main failed:\n{result.stderr}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(report["seconds"])
+        eager.update(name.split(".")[0] for name in report["modules"])
+
+    profile = run_python("-X", "importtime", "-c", "import app.main")
+    self_by_package, cumulative = parse_importtime(profile.stderr)
+
+    median = statistics.median(timings)
+    print(f"import app.main: median={median:.2f}s runs={', '.join(f'{t:.2f}' for t in timings)} budget={args.budget:.2f}s")
+    if "app.main" in cumulative:
+        print(f"importtime total (with profiling overhead): {cumulative['app.main'] / 1e6:.2f}s")
+
+    print(f"\nSlowest packages (self time, top {args.top}):")
+    for package, micros in sorted(self_by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {micros / 1000:8.1f}ms  {package}")
+
+    app_modules = sorted(
+        ((module, micros) for module, micros in cumulative.items() if module.startswith("app.")),
+        key=lambda item: item[1], reverse=True,
+    )[:args.top]
+    print(f"\nSlowest app modules (cumulative, top {args.top}):")
+    for module, micros in app_modules:
+        print(f"  {micros / 1000:8.1f}ms  {module}")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"startup {median:.2f}s is over the {args.budget:.2f}s budget")
+    if eager:
+        failures.append(f"lazy packages imported at startup: {', '.join(sorted(eager))}")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark for the statistics pipelines.
+
+Seeds a throwaway database with job postings, interviews, users and roles, then
+compares the previous client-side implementations (one query per job / per user,
+or every interview loaded into Python) with the single aggregation pipelines
+now used by the routes. Round trips are counted with a pymongo command listener.
+
+Needs a MongoDB 5.0+ server (from the backend directory):
+    python -m benchmarks.statistics_pipelines --uri mongodb://localhost:27017 --jobs 1000 --interviews 100000
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime, timezone, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"), help="MongoDB URI")
+    parser.add_argument("--db", default="statistics_benchmark", help="Scratch database (dropped afterwards)")
+    parser.add_argument("--jobs", type=int, default=1000, help="Job postings to seed")
+    parser.add_argument("--interviews", type=int, default=100000, help="Interviews to seed")
+    parser.add_argument("--users", type=int, default=2000, help="Users to seed")
+    parser.add_argument("--roles", type=int, default=10, help="Roles to seed")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Settings are read at import time, so point them at the target before importing the app
+os.environ["MONGO_URI"] = args.uri
+os.environ["DB_NAME"] = args.db
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from app.database import (  # noqa: E402
+    JOB_POSTINGS_COLLECTION,
+    SCHEDULED_INTERVIEWS_COLLECTION,
+    USERS_COLLECTION,
+    ROLES_COLLECTION,
+)
+from app.routes.jobwise_statistics_route import build_jobwise_statistics_pipeline  # noqa: E402
+from app.services.org_tree_service import USER_HIERARCHY_PIPELINE  # noqa: E402
+from app.services.job_posting_summary_statistics_service import build_interview_status_pipeline  # noqa: E402
+
+STATUSES = ["draft", "scheduled", "in_progress", "mcq_completed", "completed"]
+CREATORS = [str(ObjectId()) for _ in range(20)]
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db):
+    await db.client.drop_database(args.db)
+    now = datetime.now(timezone.utc)
+
+    jobs = [
+        {
+            "_id": ObjectId(),
+            "job_title": f"Job {i}",
+            "status": random.choice(["draft", "active", "closed"]),
+            "created_by": random.choice(CREATORS),
+            "created_at": now - timedelta(days=random.randint(0, 365)),
+            "number_of_applications": random.randint(0, 500),
+        }
+        for i in range(args.jobs)
+    ]
+    await db[JOB_POSTINGS_COLLECTION].insert_many(jobs)
+
+    batch = []
+    for _ in range(args.interviews):
+        job = random.choice(jobs)
+        batch.append({
+            "job_posting_id": str(job["_id"]),
+            "created_by": job["created_by"],
+            "status": random.choice(STATUSES),
+            "created_at": now,
+        })
+        if len(batch) == 10000:
+            await db[SCHEDULED_INTERVIEWS_COLLECTION].insert_many(batch)
+            batch = []
+    if batch:
+        await db[SCHEDULED_INTERVIEWS_COLLECTION].insert_many(batch)
+
+    roles = [{"_id": ObjectId(), "role_name": f"ROLE_{i}"} for i in range(args.roles)]
+    await db[ROLES_COLLECTION].insert_many(roles)
+    users = []
+    for i in range(args.users):
+        users.append({
+            "_id": ObjectId(),
+            "first_name": f"User{i}",
+            "last_name": "Bench",
+            "email": f"user{i}@example.com",
+            "role_id": str(random.choice(roles)["_id"]),
+            "reporting_manager": str(random.choice(users)["_id"]) if users else None,
+        })
+    await db[USERS_COLLECTION].insert_many(users)
+
+    # Same indexes connect_to_mongo creates
+    await db[SCHEDULED_INTERVIEWS_COLLECTION].create_index([("job_posting_id", 1), ("status", 1)])
+    await db[SCHEDULED_INTERVIEWS_COLLECTION].create_index([("created_by", 1), ("job_posting_id", 1), ("status", 1)])
+    return jobs
+
+
+# ----------------------------------------------------
+# Previous implementations
+# ----------------------------------------------------
+async def legacy_jobwise(db):
+    results = []
+    async for doc in db[JOB_POSTINGS_COLLECTION].find({}, {"job_title": 1, "status": 1}):
+        interviewed = await db[SCHEDULED_INTERVIEWS_COLLECTION].count_documents(
+            {"job_posting_id": str(doc["_id"]), "status": "completed"}
+        )
+        results.append((doc["job_title"], interviewed))
+    return results
+
+
+async def legacy_job_summary(db, created_by, job_posting_id):
+    interviews = await db[SCHEDULED_INTERVIEWS_COLLECTION].find(
+        {"created_by": created_by, "job_posting_id": job_posting_id}
+    ).to_list(length=None)
+    breakdown = {}
+    for interview in interviews:
+        breakdown[interview.get("status", "unknown")] = breakdown.get(interview.get("status", "unknown"), 0) + 1
+    return breakdown
+
+
+async def legacy_hierarchy(db):
+    users = await db[USERS_COLLECTION].find({}, {"role_id": 1}).to_list(length=None)
+    for user in users:
+        role = await db[ROLES_COLLECTION].find_one({"_id": ObjectId(user["role_id"])})
+        user["role_name"] = role.get("role_name") if role else None
+    return users
+
+
+# ----------------------------------------------------
+# Pipelines used by the routes
+# ----------------------------------------------------
+async def pipeline_jobwise(db):
+    cursor = db[JOB_POSTINGS_COLLECTION].aggregate(build_jobwise_statistics_pipeline({}))
+    return [(doc["job_title"], doc["interviewed"]) async for doc in cursor]
+
+
+async def pipeline_job_summary(db, created_by, job_posting_id):
+    cursor = db[SCHEDULED_INTERVIEWS_COLLECTION].aggregate(build_interview_status_pipeline(created_by, job_posting_id))
+    return {row["_id"]: row["count"] async for row in cursor}
+
+
+async def pipeline_hierarchy(db):
+    return await db[USERS_COLLECTION].aggregate(USER_HIERARCHY_PIPELINE).to_list(length=None)
+
+
+async def measure(counter, label, func, *func_args):
+    counter.count = 0
+    start = time.perf_counter()
+    result = await func(*func_args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms {counter.count:8d} round trips")
+    return result
+
+
+async def main():
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(args.uri, event_listeners=[counter])
+    db = client[args.db]
+
+    print(f"Seeding {args.jobs} jobs, {args.interviews} interviews, {args.users} users, {args.roles} roles...")
+    jobs = await seed(db)
+    busiest = jobs[0]
+
+    try:
+        legacy = await measure(counter, "jobwise (N+1)", legacy_jobwise, db)
+        piped = await measure(counter, "jobwise (pipeline)", pipeline_jobwise, db)
+        assert sorted(legacy) == sorted(piped), "jobwise results differ"
+
+        legacy = await measure(counter, "job summary (load all)", legacy_job_summary, db, busiest["created_by"], str(busiest["_id"]))
+        piped = await measure(counter, "job summary (pipeline)", pipeline_job_summary, db, busiest["created_by"], str(busiest["_id"]))
+        assert legacy == piped, "job summary results differ"
+
+        legacy = await measure(counter, "user hierarchy (N+1)", legacy_hierarchy, db)
+        piped = await measure(counter, "user hierarchy (pipeline)", pipeline_hierarchy, db)
+        assert sorted(u["role_name"] for u in legacy) == sorted(u["role_name"] for u in piped), "hierarchy results differ"
+    finally:
+        if not args.keep:
+            await client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Result caching around the test harness: a case stopped by the harness's
+per-case time limit must not be cached, even when the run as a whole is
+Accepted, while the cases that finished are.
+"""
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+try:
+    from app.models.code import TestCase
+    from app.services.coding_service import coding_service
+    from app.utils import code_result_cache
+except ModuleNotFoundError as e:
+    if (e.name or "").split(".")[0] == "app":
+        raise
+    pytest.skip(f"backend dependency not installed: {e.name}", allow_module_level=True)
+
+SLOW_CODE = "def spin(n):\n    while n:\n        pass\n    return n\n"
+SIGNATURE = "def spin(n)"
+INTERVIEW_ID = "test-interview"
+
+
+async def run_python_harness(language, source_code, candidate_key=None):
+    """Stand-in for execute_code: runs the harness here and reports the run as Accepted."""
+    result = subprocess.run([sys.executable, "-c", source_code], capture_output=True, text=True, timeout=30)
+    return {
+        "stdout": result.stdout,
+        "stderr": result.stderr or None,
+        "compile_output": None,
+        "status": {"id": 3, "description": "Accepted"},
+    }
+
+
+@pytest.fixture
+def harness_run(monkeypatch):
+    monkeypatch.setattr(coding_service, "execute_code", run_python_harness)
+    yield
+    code_result_cache.purge_interview(INTERVIEW_ID)
+
+
+def test_case_timeout_is_not_cached(harness_run):
+    test_cases = [
+        TestCase(input="0", expectedOutput="0"),
+        TestCase(input="1", expectedOutput="1"),
+    ]
+
+    results = asyncio.run(
+        coding_service.run_test_cases(SLOW_CODE, test_cases, "python", SIGNATURE, interview_id=INTERVIEW_ID)
+    )
+    assert results[0].passed
+    assert not results[1].passed and "Time limit exceeded" in results[1].error
+
+    keys, cached = coding_service.lookup_cached_results(SLOW_CODE, test_cases, "python", SIGNATURE, INTERVIEW_ID)
+    assert cached[0] is not None and cached[0].passed
+    assert cached[1] is None
@@ -0,0 +1,34 @@
+"""
+Type-ahead against the stored job search terms: every prefix typed while
+spelling a word (from MIN_PREFIX characters) must keep matching the posting.
+"""
+from app.utils import job_search
+
+JOB = {"job_title": "Internationalization Engineer", "required_skills": ["Python"]}
+
+
+def matches(job, search):
+    """Evaluate search_filter and relevance_expression the way Mongo would, for one document."""
+    stored = {term["t"]: term["w"] for term in job_search.build_search_terms(job)}
+    terms = job_search.query_terms(search)
+    clauses = job_search.search_filter(terms)["$and"]
+    if not all(any(form in stored for form in clause["search_terms.t"]["$in"]) for clause in clauses):
+        return None
+    return sum(max(stored[form] for form in job_search.term_forms(term) if form in stored) for term in terms)
+
+
+def test_every_typed_prefix_matches():
+    word = "internationalization"
+    for length in range(job_search.MIN_PREFIX, len(word) + 1):
+        assert matches(JOB, word[:length]) is not None, word[:length]
+
+
+def test_whole_word_scores_above_its_prefix():
+    title_weight = job_search.FIELD_WEIGHTS["job_title"]
+    assert matches(JOB, "internationalizatio") == title_weight / 2
+    assert matches(JOB, "internationalization") == title_weight
+
+
+def test_other_words_still_filter():
+    assert matches(JOB, "internationalization java") is None
+    assert matches(JOB, "internationali pyth") is not None
@@ -0,0 +1,48 @@
+"""
+Startup-time budget: `import app.main` must stay fast and must not load the
+heavy packages that are meant to load lazily (see benchmarks/startup_profile.py
+for the detailed report).
+
+STARTUP_BUDGET_SECONDS overrides the budget (default 3.0s, median of 3 runs).
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup_profile import BACKEND_DIR, IMPORT_SNIPPET, LAZY_PACKAGES
+
+BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "3.0"))
+RUNS = 3
+
+
+def import_app():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        missing = re.search(r"ModuleNotFoundError: No module named '([^']+)'", result.stderr)
+        if missing and missing.group(1).split(".")[0] != "app":
+            pytest.skip(f"backend dependency not installed: {missing.group(1)}")
+        pytest.fail(f"import app.main failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def startup_runs():
+    import_app()  # warm the filesystem and bytecode caches
+    return [import_app() for _ in range(RUNS)]
+
+
+def test_startup_within_budget(startup_runs):
+    median = statistics.median(run["seconds"] for run in startup_runs)
+    assert median <= BUDGET_SECONDS, f"import app.main took {median:.2f}s (budget {BUDGET_SECONDS:.2f}s)"
+
+
+def test_no_lazy_packages_at_startup(startup_runs):
+    eager = sorted({name.split(".")[0] for run in startup_runs for name in run["modules"]})
+    assert not eager, f"loaded at startup but meant to load lazily: {', '.join(eager)} (lazy: {LAZY_PACKAGES})"
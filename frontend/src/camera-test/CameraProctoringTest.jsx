@@ -32,6 +32,7 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
   // loops
   const animationRef = useRef(null);
   const phoneIntervalRef = useRef(null);
+  const frameUploadIntervalRef = useRef(null);
 
   // state
   const [status, setStatus] = useState("idle");
@@ -57,6 +58,21 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
   const MULTIPLE_FACES_REQUIRED_FRAMES = 10; // stable multiple faces
   const LOOK_AWAY_REQUIRED_FRAMES = 14; // stable looking away
 
+  // ============================
+  // SERVER-SIDE ANALYSIS
+  // ============================
+  // Downscaled frames sent to the backend proctoring engine (it caps the rate per session too)
+  const FRAME_UPLOAD_INTERVAL_MS = 500;
+  const FRAME_UPLOAD_WIDTH = 320;
+  const FRAME_UPLOAD_QUALITY = 0.7;
+
+  const SERVER_WARNING_MESSAGES = {
+    FACE_MISSING: "Cheating: No face detected (server)",
+    MULTIPLE_FACES: "Cheating: Multiple faces detected (server)",
+    LOOKING_AWAY: "Cheating: Looking away (server)",
+    PHONE_DETECTED: "Cheating: Phone detected (server)",
+  };
+
   // counters
   const faceMissingFramesRef = useRef(0);
   const multipleFacesFramesRef = useRef(0);
@@ -122,6 +138,13 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
     ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
+        const serverEvent = data.type === "PROCTOR_EVENT" && data.event?.source === "server" ? data.event : null;
+        if (serverEvent) {
+          const message = SERVER_WARNING_MESSAGES[serverEvent.type] || `Cheating: ${serverEvent.type} (server)`;
+          addLog(message);
+          if (onCheatingDetected) onCheatingDetected(serverEvent.type, message);
+          return;
+        }
         addLog(`Server: ${JSON.stringify(data)}`);
       } catch {
         addLog("Server message received");
@@ -180,6 +203,7 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
 
       startFaceDetectionLoop();
       startPhoneDetectionLoop();
+      startFrameUploadLoop();
     } catch (err) {
       console.error(err);
       setStatus("denied");
@@ -209,6 +233,9 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
     if (phoneIntervalRef.current) clearInterval(phoneIntervalRef.current);
     phoneIntervalRef.current = null;
 
+    if (frameUploadIntervalRef.current) clearInterval(frameUploadIntervalRef.current);
+    frameUploadIntervalRef.current = null;
+
     if (cleanupFocusRef.current) cleanupFocusRef.current();
     cleanupFocusRef.current = null;
 
@@ -452,6 +479,37 @@ export default function CameraProctoringTest({ autoStart = false, sessionId: pro
     }, 1200);
   };
 
+  // =============================
+  // Frame upload loop (server-side analysis)
+  // =============================
+  const startFrameUploadLoop = () => {
+    const video = videoRef.current;
+    const uploadCanvas = document.createElement("canvas");
+    const uploadCtx = uploadCanvas.getContext("2d");
+
+    frameUploadIntervalRef.current = setInterval(() => {
+      const ws = wsRef.current;
+      if (!video || video.readyState < 2 || !video.videoWidth) return;
+      if (!ws || ws.readyState !== 1) return;
+      // Skip while the previous frame is still being sent
+      if (ws.bufferedAmount > 0) return;
+
+      uploadCanvas.width = FRAME_UPLOAD_WIDTH;
+      uploadCanvas.height = Math.round((video.videoHeight / video.videoWidth) * FRAME_UPLOAD_WIDTH);
+      uploadCtx.drawImage(video, 0, 0, uploadCanvas.width, uploadCanvas.height);
+
+      uploadCanvas.toBlob(
+        (blob) => {
+          if (blob && wsRef.current && wsRef.current.readyState === 1) {
+            wsRef.current.send(blob);
+          }
+        },
+        "image/jpeg",
+        FRAME_UPLOAD_QUALITY
+      );
+    }, FRAME_UPLOAD_INTERVAL_MS);
+  };
+
   useEffect(() => {
     return () => stopCamera();
   }, []);
@@ -1,62 +1,131 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import { Line } from 'react-chartjs-2';
+import {
+  Chart as ChartJS,
+  CategoryScale,
+  LinearScale,
+  PointElement,
+  LineElement,
+  Tooltip,
+  Legend
+} from 'chart.js';
+import interviewService from '../../services/interviewService';
+
+ChartJS.register(CategoryScale, LinearScale, PointElement, LineElement, Tooltip, Legend);
+
+const RANGES = [
+  { label: '24h', days: 1, granularity: 'hour' },
+  { label: '7d', days: 7, granularity: 'day' },
+  { label: '30d', days: 30, granularity: 'day' },
+  { label: '90d', days: 90, granularity: 'day' }
+];
+
+const SERIES = [
+  { key: 'interviews_scheduled', label: 'Interviews scheduled', color: '#2563EB', axis: 'y' },
+  { key: 'interviews_completed', label: 'Interviews completed', color: '#16A34A', axis: 'y' },
+  { key: 'screenings', label: 'Resumes screened', color: '#F59E0B', axis: 'y' },
+  { key: 'average_ats_score', label: 'Avg ATS score', color: '#9333EA', axis: 'score' }
+];
+
+const formatBucket = (bucket, granularity) => {
+  const date = new Date(bucket);
+  return granularity === 'hour'
+    ? date.toLocaleTimeString('en-US', { hour: 'numeric' })
+    : date.toLocaleDateString('en-US', { day: 'numeric', month: 'short' });
+};
 
 /**
- * MetricsChart component for displaying a circular chart with metrics
+ * MetricsChart component for displaying dashboard trends over time
  * @param {Object} props - Component props
- * @param {Array} props.metrics - Array of metric objects to display
+ * @param {string} props.jobPostingId - Restrict the trends to one job posting (optional)
  */
-const MetricsChart = ({ metrics = [] }) => {
-  // Default metrics if none provided
-  const defaultMetrics = [
-    { label: 'Metrics', value: 1 },
-    { label: 'Metrics', value: 2 },
-    { label: 'Metrics', value: 3 },
-    { label: 'Metrics', value: 4 },
-    { label: 'Metrics', value: 5 }
-  ];
-
-  const displayMetrics = metrics.length > 0 ? metrics : defaultMetrics;
+const MetricsChart = ({ jobPostingId }) => {
+  const [range, setRange] = useState(RANGES[3]);
+  const [trends, setTrends] = useState({ granularity: 'day', points: [] });
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    const fetchTrends = async () => {
+      setLoading(true);
+      setError(null);
+      try {
+        const params = { days: range.days, granularity: range.granularity };
+        if (jobPostingId) params.job_posting_id = jobPostingId;
+        setTrends(await interviewService.getMetricTrends(params));
+      } catch (err) {
+        console.error('Error fetching metric trends:', err);
+        setError(err.detail || 'Failed to load trends');
+      } finally {
+        setLoading(false);
+      }
+    };
+    fetchTrends();
+  }, [range, jobPostingId]);
+
+  const data = {
+    labels: trends.points.map(point => formatBucket(point.bucket, trends.granularity)),
+    datasets: SERIES.map(series => ({
+      label: series.label,
+      data: trends.points.map(point => point[series.key]),
+      borderColor: series.color,
+      backgroundColor: series.color,
+      yAxisID: series.axis,
+      borderDash: series.axis === 'score' ? [4, 4] : [],
+      spanGaps: true,
+      pointRadius: 0,
+      tension: 0.3
+    }))
+  };
+
+  const options = {
+    responsive: true,
+    maintainAspectRatio: false,
+    interaction: { mode: 'index', intersect: false },
+    plugins: {
+      legend: { position: 'bottom', labels: { boxWidth: 12 } },
+      // The dashboard registers the datalabels plugin globally; labels on every point are noise here
+      datalabels: { display: false }
+    },
+    scales: {
+      y: { beginAtZero: true, ticks: { precision: 0 }, position: 'left' },
+      score: { beginAtZero: true, max: 100, position: 'right', grid: { drawOnChartArea: false } }
+    }
+  };
 
   return (
     <div className="bg-white p-6 rounded-lg shadow-sm h-full">
       <div className="flex justify-between items-center mb-4">
-        <h3 className="text-lg font-semibold">Metrics</h3>
-      </div>
-      
-      <div className="relative flex justify-center items-center">
-        {/* Large circular background */}
-        <div className="w-64 h-64 rounded-full bg-gray-100 flex items-center justify-center">
-          <span className="text-8xl font-light text-gray-300">C</span>
-        </div>
-        
-        {/* Metrics positioned around the circle */}
-        <div className="absolute grid grid-cols-1 gap-4 w-full max-w-xs">
-          {displayMetrics.map((metric, index) => {
-            // Position metrics at different locations around the circle
-            const positions = [
-              "top-0 left-1/2 -translate-x-1/2 -translate-y-1/2",
-              "top-1/4 right-0 translate-x-1/2",
-              "bottom-1/4 right-0 translate-x-1/2",
-              "bottom-0 left-1/2 -translate-x-1/2 translate-y-1/2",
-              "top-1/4 left-0 -translate-x-1/2"
-            ];
-            
-            const position = positions[index % positions.length];
-            
-            return (
-              <div 
-                key={index} 
-                className={`absolute bg-gray-50 p-3 rounded flex items-center ${position}`}
-              >
-                <div className="w-3 h-3 bg-gray-200 rounded-sm mr-2"></div>
-                <span className="text-sm text-gray-600">{metric.label}</span>
-              </div>
-            );
-          })}
+        <h3 className="text-lg font-semibold">Trends</h3>
+        <div className="flex gap-1">
+          {RANGES.map(option => (
+            <button
+              key={option.label}
+              onClick={() => setRange(option)}
+              className={`px-2 py-1 text-xs rounded ${option.label === range.label
+                ? 'bg-[#2563EB] text-white'
+                : 'bg-gray-100 text-gray-600 hover:bg-gray-200'}`}
+            >
+              {option.label}
+            </button>
+          ))}
         </div>
       </div>
+
+      <div className="relative h-72">
+        {error ? (
+          <p className="text-sm text-red-500">{error}</p>
+        ) : (
+          <Line data={data} options={options} />
+        )}
+        {loading && (
+          <div className="absolute inset-0 flex items-center justify-center bg-white/60 text-sm text-gray-500">
+            Loading...
+          </div>
+        )}
+      </div>
     </div>
   );
 };
 
-export default MetricsChart;
\ No newline at end of file
+export default MetricsChart;
@@ -47,7 +47,7 @@ import CameraProctorNew from "./CameraProctorNew";
 import CodeEditorPanel from "./CodeEditorPanel";
 import {
   fetchCodingQuestions,
-  evaluateCode,
+  evaluateCodeStream,
   generateCodingQuestions,
   saveCodingAnswer
 } from "../services/codingService";
@@ -485,19 +485,23 @@ const LeetCodeLayout = () => {
         language
       );
 
-      // Use the backend API to evaluate the code
-      const results = await evaluateCode(
+      // Show every case as running, then fill results in as the backend streams them
+      setTestResults(currentQuestion.testCases.map(testCase => ({ ...testCase, pending: true })));
+      setShowTestResults(true);
+
+      const summary = await evaluateCodeStream(
         userCode,
         currentQuestion.testCases,
         language,
-        functionSignature
+        functionSignature,
+        interviewId,
+        (index, result) => {
+          setTestResults(prev => prev.map((item, idx) => (idx === index ? result : item)));
+        }
       );
 
-      setTestResults(results);
-      setShowTestResults(true);
-
       // Check if all tests passed
-      const allPassed = results.every(result => result.passed);
+      const allPassed = Boolean(summary && summary.all_passed);
 
       toast({
         title: allPassed ? "All tests passed!" : "Some tests failed",
@@ -636,7 +640,7 @@ const LeetCodeLayout = () => {
           interviewId,
           currentQuestion.id,
           userCode,
-          testResults.length > 0 ? testResults : []
+          testResults.filter(result => !result.pending)
         );
         return true;
       } catch (err) {
@@ -676,7 +680,7 @@ const LeetCodeLayout = () => {
           interviewId,
           currentQuestion.id,
           userCode,
-          testResults
+          testResults.filter(result => !result.pending)
         );
       } catch (saveError) {
         console.error("Error details:", saveError);
@@ -1002,6 +1006,14 @@ const LeetCodeLayout = () => {
                       {showTestResults ? (
                         <div className="space-y-3">
                           {testResults.map((result, idx) => (
+                            result.pending ? (
+                            <div key={idx} className="p-3 rounded-md border text-[12px] leading-snug bg-white/5 border-white/10">
+                              <div className="flex items-center justify-between">
+                                <span className="font-bold text-gray-400">Test Case {idx + 1}</span>
+                                <span className="text-[10px] font-bold px-2 py-0.5 rounded uppercase bg-white/10 text-gray-400">Running</span>
+                              </div>
+                            </div>
+                            ) : (
                             <div key={idx} className={`p-3 rounded-md border text-[12px] leading-snug ${result.passed ? 'bg-green-500/5 border-green-500/20' : 'bg-red-500/5 border-red-500/20'}`}>
                               <div className="flex items-center justify-between mb-2">
                                 <span className={`font-bold ${result.passed ? 'text-green-400' : 'text-red-400'}`}>Test Case {idx + 1}</span>
@@ -1014,6 +1026,7 @@ const LeetCodeLayout = () => {
                                 {result.error && <div className="text-red-400/80 mt-1 text-[11px]"><span className="text-red-400 font-bold">Error:</span> {result.error}</div>}
                               </div>
                             </div>
+                            )
                           ))}
                         </div>
                       ) : (
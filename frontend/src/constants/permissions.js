@@ -43,6 +43,7 @@ export const PERMISSIONS = {
   // Report Module
   // ======================
   REPORT_VIEW: "REPORT_VIEW",
+  REPORT_REGENERATE: "REPORT_REGENERATE",
 
   ASSIGN_USERS: "ASSIGN_USERS",
 };
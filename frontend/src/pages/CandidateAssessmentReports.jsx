@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import {
   Assessment as AssessmentIcon,
   Star as StarIcon,
@@ -21,8 +21,14 @@ import {
 
 import interviewService from "../services/interviewService";
 import Tooltip from "@mui/material/Tooltip";
+import { useAuth } from "../contexts/AuthContext";
+import { PERMISSIONS } from "../constants/permissions";
+
+const REPORT_STATUS_POLL_MS = 10000;
 
 function CandidateAssessmentReports({ jobPostingId = null }) {
+  const { hasPermission } = useAuth();
+  const canRegenerateReports = hasPermission(PERMISSIONS.REPORT_REGENERATE);
   const [candidateReports, setCandidateReports] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -32,6 +38,8 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
   const [totalReports, setTotalReports] = useState(0);
   const [downloadingPdf, setDownloadingPdf] = useState(false);
   const [downloadId, setDownloadId] = useState(null);
+  // page number -> cursor that starts it (keyset pagination; page 1 has none)
+  const pageCursors = useRef({});
 
   /* ------------------- DATA FETCH ------------------- */
 
@@ -40,17 +48,22 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
       setLoading(true);
       setError(null);
 
+      const cursor = pageCursors.current[page];
+      const filters = cursor ? { cursor } : {};
+
       let response;
       if (jobPostingId) {
         response = await interviewService.getJobPostingCandidateReports(
           jobPostingId,
           page,
-          pageSize
+          pageSize,
+          filters
         );
       } else {
         response = await interviewService.getCandidateReports(
           page,
-          pageSize
+          pageSize,
+          filters
         );
       }
 
@@ -73,6 +86,8 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
 
         return {
           id: report.interview_id,
+          // Reports built before the background pipeline have no status
+          reportStatus: report.report_status || "ready",
           name: report.candidate_name || "Unknown",
           email: report.candidate_email || "No email",
           position: report.job_role || "Unknown Role",
@@ -102,6 +117,9 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
       setCandidateReports(processedReports);
 
       const pagination = response.pagination || {};
+      if (pagination.next_cursor) {
+        pageCursors.current[page + 1] = pagination.next_cursor;
+      }
       setTotalPages(pagination.total_pages || 1);
       setTotalReports(pagination.total || processedReports.length);
     } catch (err) {
@@ -111,10 +129,23 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
     }
   };
 
+  useEffect(() => {
+    pageCursors.current = {};
+    setPage(1);
+  }, [jobPostingId]);
+
   useEffect(() => {
     fetchReports();
   }, [page, jobPostingId]);
 
+  // Reports are built in the background after an interview completes;
+  // refresh while any report on this page is still pending
+  useEffect(() => {
+    if (!candidateReports.some((report) => report.reportStatus === "pending")) return;
+    const timer = setTimeout(fetchReports, REPORT_STATUS_POLL_MS);
+    return () => clearTimeout(timer);
+  }, [candidateReports]);
+
   /* ------------------- HELPERS ------------------- */
 
   const calculateMcqScore = (mcqData) => {
@@ -166,6 +197,17 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
     }
   };
 
+  const handleRegenerateReport = async (id) => {
+    try {
+      await interviewService.regenerateReport(id);
+      setCandidateReports((prev) =>
+        prev.map((report) => (report.id === id ? { ...report, reportStatus: "pending" } : report))
+      );
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   // Helper function to get initials from name
   const getInitials = (name) => {
     if (!name) return "??";
@@ -372,16 +414,30 @@ function CandidateAssessmentReports({ jobPostingId = null }) {
 
                       <div className="flex items-center gap-2 w-full sm:w-auto">
 
-                        <button
-                          onClick={() => handleDownloadPdf(candidate.id)}
-                          disabled={downloadingPdf && downloadId === candidate.id}
-                          className="flex items-center text-sm bg-gray-100 px-4 py-2 rounded-lg hover:bg-gray-200 transition-colors disabled:opacity-50 flex-1 sm:flex-initial justify-center"
-                        >
-                          <DownloadIcon className="text-sm mr-1" />
-                          {downloadingPdf && downloadId === candidate.id
-                            ? "Downloading..."
-                            : "Download"}
-                        </button>
+                        {candidate.reportStatus === "failed" && canRegenerateReports ? (
+                          <button
+                            onClick={() => handleRegenerateReport(candidate.id)}
+                            className="flex items-center text-sm bg-red-50 text-red-600 px-4 py-2 rounded-lg hover:bg-red-100 transition-colors flex-1 sm:flex-initial justify-center"
+                            title="Report generation failed"
+                          >
+                            Retry report
+                          </button>
+                        ) : (
+                          <button
+                            onClick={() => handleDownloadPdf(candidate.id)}
+                            disabled={candidate.reportStatus === "pending" || candidate.reportStatus === "failed" || (downloadingPdf && downloadId === candidate.id)}
+                            className="flex items-center text-sm bg-gray-100 px-4 py-2 rounded-lg hover:bg-gray-200 transition-colors disabled:opacity-50 flex-1 sm:flex-initial justify-center"
+                          >
+                            <DownloadIcon className="text-sm mr-1" />
+                            {candidate.reportStatus === "pending"
+                              ? "Generating..."
+                              : candidate.reportStatus === "failed"
+                                ? "Report failed"
+                                : downloadingPdf && downloadId === candidate.id
+                                  ? "Downloading..."
+                                  : "Download"}
+                          </button>
+                        )}
 
                         <button
                           className="flex items-center justify-center text-sm bg-gray-100 p-2 rounded-lg hover:bg-gray-200 transition-colors"
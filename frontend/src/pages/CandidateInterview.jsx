@@ -76,6 +76,7 @@ function CandidateInterview() {
   const [showPermissionGuide, setShowPermissionGuide] = useState(false);
   const [mcqTimeTaken, setMcqTimeTaken] = useState(0);
   const isGeneratingRef = useRef(false);
+  const mcqsEtagRef = useRef(null);
 
   // Permission states
   const [permissionsGranted, setPermissionsGranted] = useState(false);
@@ -256,16 +257,24 @@ function CandidateInterview() {
     };
   }, [timerActive, instructionTimer, mcqsGenerated]);
 
-  // Fetch existing MCQs or check if they are ready
-  const fetchMCQsStatus = useCallback(async (id) => {
+  // Fetch existing MCQs or check if they are ready.
+  // `wait` long-polls the server while generation is still pending.
+  const fetchMCQsStatus = useCallback(async (id, wait = 0) => {
     try {
-      logger.info('Checking MCQ status...', { interviewId: id });
-      const response = await interviewService.getCandidateMCQs(id);
+      logger.info('Checking MCQ status...', { interviewId: id, wait });
+      const response = await interviewService.getCandidateMCQQuestions(id, {
+        wait,
+        etag: mcqsEtagRef.current
+      });
+
+      if (response.notModified) {
+        return mcqsEtagRef.current !== null;
+      }
 
-      if (response && response.length > 0) {
-        logger.info('MCQs fetched successfully', { responseLength: response.length });
-        const parsedMcqs = parseMcqs(response);
-        setMcqs(parsedMcqs);
+      if (response.status === 'ready' && response.questions?.length > 0) {
+        logger.info('MCQs fetched successfully', { count: response.questions.length });
+        mcqsEtagRef.current = response.etag;
+        setMcqs(response.questions);
         setMcqsGenerated(true);
 
         if (phase === 'waiting') {
@@ -276,15 +285,7 @@ function CandidateInterview() {
       }
       return false;
     } catch (err) {
-      // Handle the case where MCQs are not found yet (expected 404)
-      // interviewService handles the response and throws error.response?.data
-      // If we want the status, we might need to check if the error object from axios was passed down
-      // or check the detail message.
-      if (err.status === 404 || (err.detail && err.detail.toLowerCase().includes('not found'))) {
-        logger.info('MCQs not found yet (still generating or not started)');
-      } else {
-        logger.error('Error fetching MCQ status', err);
-      }
+      logger.error('Error fetching MCQ status', err);
       return false;
     }
   }, [phase]);
@@ -329,45 +330,35 @@ function CandidateInterview() {
     [handleMCQFlow]
   );
 
-  // Effect to poll for MCQ status when in waiting phase
+  // Effect to long-poll for MCQ status when in waiting phase
   useEffect(() => {
-    let pollInterval = null;
+    let cancelled = false;
     let pollCount = 0;
-    const maxPolls = 20;
+    const maxPolls = 8;
+    const longPollSeconds = 25;
 
     const startPolling = async () => {
       if (phase === 'waiting' && !mcqsGenerated) {
-        logger.info('Starting polling for MCQ status');
+        logger.info('Starting long-poll for MCQ status');
 
-        // Check immediately and ONLY start interval if it fails
-        const alreadyReady = await fetchMCQsStatus(interviewId);
+        while (!cancelled && pollCount < maxPolls) {
+          pollCount++;
+          logger.info(`Waiting for MCQs (attempt ${pollCount}/${maxPolls})`);
 
-        if (alreadyReady) return;
+          const ready = await fetchMCQsStatus(interviewId, longPollSeconds);
+          if (ready) return;
+        }
 
-        pollInterval = setInterval(async () => {
-          pollCount++;
-          logger.info(`Polling for MCQs (attempt ${pollCount}/${maxPolls})`);
-
-          if (pollCount >= maxPolls) {
-            logger.warn(`Reached maximum polling attempts (${maxPolls})`);
-            clearInterval(pollInterval);
-            return;
-          }
-
-          const ready = await fetchMCQsStatus(interviewId);
-          if (ready) {
-            clearInterval(pollInterval);
-          }
-        }, 5000);
+        if (!cancelled) {
+          logger.warn(`Reached maximum polling attempts (${maxPolls})`);
+        }
       }
     };
 
     startPolling();
 
     return () => {
-      if (pollInterval) {
-        clearInterval(pollInterval);
-      }
+      cancelled = true;
     };
   }, [phase, mcqsGenerated, interviewId, fetchMCQsStatus]);
 
@@ -431,66 +422,6 @@ function CandidateInterview() {
     }
   };
 
-  /**
-   * Parse MCQs from the response text
-   */
-  const parseMcqs = (mcqText) => {
-    logger.debug('Parsing MCQ text', { textLength: mcqText.length });
-    const questions = [];
-    const lines = mcqText.split('\n');
-
-    let currentQuestion = null;
-    let currentOptions = [];
-    let correctAnswer = null;
-
-    for (const line of lines) {
-      const trimmedLine = line.trim();
-
-      if (!trimmedLine) continue;
-
-      if (/^\d+\./.test(trimmedLine)) {
-        if (currentQuestion && currentOptions.length > 0) {
-          questions.push({
-            question: currentQuestion,
-            options: currentOptions.map(opt => opt.replace(/^[a-d][\)\.]\s*/i, '')),
-            correctAnswer: correctAnswer
-          });
-        }
-
-        currentQuestion = trimmedLine;
-        currentOptions = [];
-        correctAnswer = null;
-      }
-      else if (/^[a-d][\)\.]/.test(trimmedLine.toLowerCase())) {
-        currentOptions.push(trimmedLine);
-      }
-      else if (/^answer:/i.test(trimmedLine)) {
-        const answerMatch = trimmedLine.match(/^answer:\s*[a-d][\)\.]\s*(.*)/i);
-        if (answerMatch && answerMatch[1]) {
-          correctAnswer = answerMatch[1].trim();
-        } else {
-          correctAnswer = trimmedLine.replace(/^answer:\s*/i, '').trim();
-        }
-      }
-    }
-
-    if (currentQuestion && currentOptions.length > 0) {
-      questions.push({
-        question: currentQuestion,
-        options: currentOptions.map(opt => opt.replace(/^[a-d][\)\.]\s*/i, '')),
-        correctAnswer: correctAnswer
-      });
-    }
-
-    logger.debug('Parsed MCQs', {
-      count: questions.length,
-      firstQuestion: questions[0]?.question,
-      firstOptions: questions[0]?.options
-    });
-
-    return questions;
-  };
-
   /**
    * Handle answer selection
    */
@@ -536,36 +467,28 @@ function CandidateInterview() {
     setIsSubmitModalOpen(false);
 
     try {
-      const responses = mcqs.map((mcq, index) => {
-        const selectedAnswer = answers[index] || '';
-        return {
-          question: mcq.question,
-          question_id: index + 1,
-          selected_answer: selectedAnswer,
-          correct_answer: mcq.correctAnswer || '',
-          is_correct: selectedAnswer === mcq.correctAnswer
-        };
-      });
-
-      const correctAnswers = responses.filter(r => r.is_correct).length;
-      const totalScore = correctAnswers;
-      const maxScore = mcqs.length;
+      // Answers are scored by the server against the stored answers
+      const responses = mcqs.map((mcq, index) => ({
+        question: mcq.question,
+        question_id: mcq.question_id,
+        selected_answer: answers[index] || ''
+      }));
 
       logger.info('Submitting candidate answers to backend', {
         interviewId,
-        totalScore,
-        maxScore
+        answered: Object.keys(answers).length
       });
 
-      await interviewService.submitCandidateAnswers(
+      const result = await interviewService.submitCandidateAnswers(
         interviewId,
         interview.candidate_email,
-        responses,
-        totalScore,
-        maxScore
+        responses
       );
 
-      logger.info('Answers submitted successfully');
+      logger.info('Answers submitted successfully', {
+        totalScore: result?.total_score,
+        maxScore: result?.max_score
+      });
     } catch (err) {
       logger.error('Error submitting answers', err);
     }
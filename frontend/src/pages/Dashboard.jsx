@@ -4,6 +4,7 @@ import { useNavigate } from 'react-router-dom';
 import jobPostingService from '../services/jobPostingService';
 import interviewService from '../services/interviewService';
 import StatCard from '../components/Dashboard/StatCard';
+import MetricsChart from '../components/Dashboard/MetricsChart';
 import JobStatisticsTable from '../components/JobStatisticsTable/JobStatisticsTable';
 import { Doughnut, Bar } from 'react-chartjs-2';
 import ChartDataLabels from 'chartjs-plugin-datalabels';
@@ -520,6 +521,9 @@ function Dashboard() {
 
       </div>
 
+      {/* Trends */}
+      {hasPermission(PERMISSIONS.INTERVIEW_VIEW) && <MetricsChart />}
+
       {/* Table */}
       <div className="overflow-x-auto">
         <JobStatisticsTable />
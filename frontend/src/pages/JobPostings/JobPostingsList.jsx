@@ -87,7 +87,8 @@ function JobPostingsList() {
       ...filters,
       status: activeTab !== 'all' ? activeTab : undefined,
       search: searchQuery || undefined,
-      sort: sortOption
+      // Search results come back best match first
+      sort: searchQuery ? 'relevance' : sortOption
     };
 
     const response = await jobPostingService.getJobPostings(filterParams);
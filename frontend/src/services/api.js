@@ -201,4 +201,4 @@ api.interceptors.response.use(
 );
 
 export default api;
-export { updateStoredToken, parseTokenExpiry };
+export { updateStoredToken, parseTokenExpiry, apiBaseUrl };
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { apiBaseUrl } from './api';
 
 // Code execution api
 export const executeCode = async (language, sourceCode) => {
@@ -20,7 +20,7 @@ export const executeCode = async (language, sourceCode) => {
 };
 
 // Code evaluation api
-export const evaluateCode = async (code, testCases, language, functionSignature) => {
+export const evaluateCode = async (code, testCases, language, functionSignature, interviewId = null) => {
   try {
     console.log("Evaluating code in language:", language);
     console.log("Function signature:", functionSignature);
@@ -29,6 +29,7 @@ export const evaluateCode = async (code, testCases, language, functionSignature)
       testCases,
       language,
       functionSignature,
+      interview_id: interviewId,
     });
     return response.data.results;
   } catch (error) {
@@ -37,6 +38,65 @@ export const evaluateCode = async (code, testCases, language, functionSignature)
   }
 };
 
+// Streaming code evaluation api (Server-Sent Events over a POST response)
+// Calls onResult(index, result) as each test case finishes and resolves with the summary
+export const evaluateCodeStream = async (code, testCases, language, functionSignature, interviewId = null, onResult = () => {}) => {
+  const token = localStorage.getItem("access_token");
+  const response = await fetch(`${apiBaseUrl}/code/evaluate/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({
+      code,
+      testCases,
+      language,
+      functionSignature,
+      interview_id: interviewId,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Evaluation failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let summary = null;
+
+  const handleEvent = (rawEvent) => {
+    let event = "message";
+    let data = "";
+    rawEvent.split("\n").forEach((line) => {
+      if (line.startsWith("event:")) event = line.slice(6).trim();
+      else if (line.startsWith("data:")) data += line.slice(5).trim();
+    });
+    if (!data) return;
+
+    const payload = JSON.parse(data);
+    if (event === "result") onResult(payload.index, payload.result);
+    else if (event === "summary") summary = payload;
+    else if (event === "error") throw new Error(payload.detail || "Evaluation failed");
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      handleEvent(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+
+  return summary;
+};
+
 // Question generation api
 export const generateQuestion = async (difficulty = "easy", topic = null) => {
   try {
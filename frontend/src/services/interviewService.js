@@ -229,16 +229,40 @@ const interviewService = {
     }
   },
 
+  /**
+   * Get structured MCQs (without answers) for candidate interview (public endpoint)
+   * @param {string} interviewId - Interview ID
+   * @param {Object} options - { wait: seconds to long-poll while generating, etag: last seen ETag }
+   * @returns {Promise} - Promise with { status, questions, etag, notModified }
+   */
+  getCandidateMCQQuestions: async (interviewId, { wait = 0, etag = null } = {}) => {
+    try {
+      const response = await api.get(`/candidate/mcqs/${interviewId}`, {
+        params: { wait },
+        headers: etag ? { 'If-None-Match': etag } : {},
+        timeout: (wait + 10) * 1000,
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+      });
+
+      if (response.status === 304) {
+        return { notModified: true, etag };
+      }
+      return { ...response.data, etag: response.headers?.etag || null, notModified: false };
+    } catch (error) {
+      throw error.response?.data || { detail: 'An error occurred while fetching MCQs' };
+    }
+  },
+
   /**
    * Submit candidate answers for an interview (public endpoint)
    * @param {string} interviewId - Interview ID
    * @param {string} candidateEmail - Candidate email
-   * @param {Array} responses - Array of responses with question, selected answer, correct answer, and is_correct flag
-   * @param {number} totalScore - Total score achieved
-   * @param {number} maxScore - Maximum possible score
-   * @returns {Promise} - Promise with the submission result
+   * @param {Array} responses - Array of responses with question_id, question and selected answer
+   * @param {number} totalScore - Deprecated, the score is computed by the server
+   * @param {number} maxScore - Deprecated, the score is computed by the server
+   * @returns {Promise} - Promise with the submission result (including the server-side score)
    */
-  submitCandidateAnswers: async (interviewId, candidateEmail, responses, totalScore, maxScore) => {
+  submitCandidateAnswers: async (interviewId, candidateEmail, responses, totalScore = null, maxScore = null) => {
     try {
       const submission = {
         interview_id: interviewId,
@@ -398,6 +422,20 @@ const interviewService = {
     }
   },
 
+  /**
+   * Regenerate a candidate report (e.g. after the background build failed)
+   * @param {string} interviewId - Interview ID
+   * @returns {Promise} - Promise with { interview_id, report_status }
+   */
+  regenerateReport: async (interviewId) => {
+    try {
+      const response = await api.post(`/reports/regenerate/${interviewId}`);
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { detail: 'An error occurred while regenerating the report' };
+    }
+  },
+
   /**
    * Download a candidate report PDF
    * @param {string} interviewId - Interview ID
@@ -505,6 +543,22 @@ const interviewService = {
     }
   },
 
+  /**
+   * Get hourly/daily trends (interviews scheduled/completed, screenings, average ATS score)
+   * @param {Object} params - { days, granularity: 'day' | 'hour', job_posting_id }
+   * @returns {Promise} - Promise with { granularity, start, end, points }
+   */
+  getMetricTrends: async (params = {}) => {
+    try {
+      const response = await api.get('/dashboard-stats/metric-trends', { params });
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || {
+        detail: 'An error occurred while fetching metric trends'
+      };
+    }
+  },
+
 };
 
 export default interviewService;
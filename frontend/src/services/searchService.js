@@ -0,0 +1,25 @@
+import api from './api';
+
+/**
+ * Service for the global (omnibox) search
+ */
+const searchService = {
+  /**
+   * Search interviews, reports, screening results and job postings by name, email or job title
+   * @param {string} query - At least 2 characters; word prefixes match
+   * @param {Object} options - { kinds: ['interview', 'report', 'screening', 'job'], limit }
+   * @returns {Promise} Promise object with { query, results: [{ kind, id, title, subtitle, job_posting_id }] }
+   */
+  globalSearch: async (query, { kinds, limit } = {}) => {
+    try {
+      const response = await api.get('/search', {
+        params: { q: query, kinds: kinds?.join(','), limit }
+      });
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { detail: 'An error occurred while searching' };
+    }
+  }
+};
+
+export default searchService;
@@ -23,6 +23,40 @@ const userHierarchyService = {
       console.error('Error fetching user hierarchy:', error);
       throw error;
     }
+  },
+
+  /**
+   * Get everyone under a manager as a nested tree
+   * @param {string} userId - Manager's user id
+   * @param {number} maxDepth - Levels below the manager to include
+   * @returns {Promise} Promise object with the subtree (last-level nodes carry has_more_children)
+   */
+  getUserSubtree: async (userId, maxDepth = 2) => {
+    try {
+      const response = await api.get(`/user-management/user-hierarchy/${userId}/subtree`, {
+        params: { max_depth: maxDepth }
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching user subtree:', error);
+      throw error;
+    }
+  },
+
+  /**
+   * Get one page of a manager's direct reports
+   * @param {string} userId - Manager's user id
+   * @param {Object} params - { limit, cursor }
+   * @returns {Promise} Promise object with { children, next_cursor }
+   */
+  getUserChildren: async (userId, params = {}) => {
+    try {
+      const response = await api.get(`/user-management/user-hierarchy/${userId}/children`, { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching direct reports:', error);
+      throw error;
+    }
   }
 };
 